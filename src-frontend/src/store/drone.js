@@ -864,6 +864,42 @@ export const useDroneStore = defineStore('drone', {
       this.globalPathSignature = signature
     },
 
+    // 0x71 实时数据以展平坐标下发：路径点每 3 个数一组 [x, y, z]
+    _unflattenPlanningPath(values = []) {
+      if (!Array.isArray(values)) {
+        return []
+      }
+
+      const points = []
+      for (let index = 0; index + 2 < values.length; index += 3) {
+        points.push({ x: values[index], y: values[index + 1], z: values[index + 2] })
+      }
+      return this._normalizePlanningPathPoints(points)
+    },
+
+    // 障碍物每 9 个数一组 [cx, cy, cz, sx, sy, sz, vx, vy, vz]
+    _unflattenPlanningObstacles(values = []) {
+      if (!Array.isArray(values)) {
+        return []
+      }
+
+      const obstacles = []
+      for (let index = 0; index + 8 < values.length; index += 9) {
+        obstacles.push({
+          cx: values[index],
+          cy: values[index + 1],
+          cz: values[index + 2],
+          sx: values[index + 3],
+          sy: values[index + 4],
+          sz: values[index + 5],
+          vx: values[index + 6],
+          vy: values[index + 7],
+          vz: values[index + 8]
+        })
+      }
+      return this._normalizePlanningObstacles(obstacles)
+    },
+
     _normalizePlanningObstacles(obstacles = []) {
       if (!Array.isArray(obstacles)) {
         return []
@@ -1577,11 +1613,26 @@ export const useDroneStore = defineStore('drone', {
       const currentPosX = data.current_pos_x ?? position.x
       const currentPosY = data.current_pos_y ?? position.y
       const currentPosZ = data.current_pos_z ?? position.z
-      const globalPath = Array.isArray(data.global_path) ? this._normalizePlanningPathPoints(data.global_path) : null
-      const localTraj = Array.isArray(data.local_traj)
-        ? this._normalizePlanningPathPoints(data.local_traj)
-        : (Array.isArray(data.local_path) ? this._normalizePlanningPathPoints(data.local_path) : null)
-      const obstacles = Array.isArray(data.obstacles) ? this._normalizePlanningObstacles(data.obstacles) : null
+      let globalPath = null
+      if (Array.isArray(data.global_path_flat)) {
+        globalPath = this._unflattenPlanningPath(data.global_path_flat)
+      } else if (Array.isArray(data.global_path)) {
+        globalPath = this._normalizePlanningPathPoints(data.global_path)
+      }
+      let localTraj = null
+      if (Array.isArray(data.local_path_flat)) {
+        localTraj = this._unflattenPlanningPath(data.local_path_flat)
+      } else if (Array.isArray(data.local_traj)) {
+        localTraj = this._normalizePlanningPathPoints(data.local_traj)
+      } else if (Array.isArray(data.local_path)) {
+        localTraj = this._normalizePlanningPathPoints(data.local_path)
+      }
+      let obstacles = null
+      if (Array.isArray(data.obstacles_flat)) {
+        obstacles = this._unflattenPlanningObstacles(data.obstacles_flat)
+      } else if (Array.isArray(data.obstacles)) {
+        obstacles = this._normalizePlanningObstacles(data.obstacles)
+      }
 
       if (data.seq_id !== undefined) this.planningTelemetry.seqId = parseInt(data.seq_id)
       if (data.timestamp !== undefined) this.planningTelemetry.timestamp = parseInt(data.timestamp)
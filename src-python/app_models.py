@@ -1,4 +1,4 @@
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Union
 
 from pydantic import BaseModel
 
@@ -29,4 +29,41 @@ class CommandRequest(BaseModel):
 class RecordingConfig(BaseModel):
     session_id: str = ''
     base_directory: str = ''
-    case_id: str = ''
\ No newline at end of file
+    case_id: str = ''
+
+
+class PacketTraceConfig(BaseModel):
+    enabled: Optional[bool] = None
+    sample_rate: Optional[float] = None
+    ring_size: Optional[int] = None
+    clear: bool = False
+
+
+class IngressRateLimit(BaseModel):
+    rate: float
+    burst: Optional[float] = None
+
+
+class IngressLimitConfig(BaseModel):
+    enabled: Optional[bool] = None
+    # 键为端口号 / 功能字（可写 "0x71"），整体替换当前配置
+    port_limits: Optional[Dict[str, IngressRateLimit]] = None
+    func_limits: Optional[Dict[str, IngressRateLimit]] = None
+    latest_value_func_codes: Optional[List[Union[int, str]]] = None
+    clear: bool = False
+
+
+class DecimationRuleConfig(BaseModel):
+    # 未给出或为 null 的字段沿用现有规则；唯独 fields 显式给 null 表示取消投影
+    enabled: Optional[bool] = None
+    max_rate_hz: Optional[float] = None
+    keep: Optional[str] = None
+    fields: Optional[List[str]] = None
+
+
+class DecimationConfig(BaseModel):
+    # {消费方: {消息类型 | "*": 规则 | null}}，null 删除该类型的规则
+    rules: Optional[Dict[str, Dict[str, Optional[DecimationRuleConfig]]]] = None
+    replace: bool = False
+    reset: bool = False
+    clear: bool = False
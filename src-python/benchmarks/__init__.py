@@ -0,0 +1,37 @@
+"""
+协议吞吐基准模块
+合成 NCLink 帧流（可注入损坏），测量 NCLinkProtocolParser.feed_data 的吞吐、单帧延迟与内存分配
+
+用法（在 src-python 目录下）：
+    python -m benchmarks --help
+    python -m benchmarks loop --help             # asyncio / uvloop 端到端链路对比
+    python -m benchmarks codec_registry --help   # 其他基准套件见 benchmarks.__main__.SUITES
+"""
+
+from .feed_data_benchmark import (
+    RESULT_SCHEMA,
+    BenchmarkScenario,
+    compare_with_baseline,
+    default_scenarios,
+    run_scenario,
+)
+from .frame_generator import (
+    CorruptionConfig,
+    FrameStream,
+    build_frame_stream,
+    random_planning_payload,
+    random_telemetry_payload,
+)
+
+__all__ = [
+    'RESULT_SCHEMA',
+    'BenchmarkScenario',
+    'CorruptionConfig',
+    'FrameStream',
+    'build_frame_stream',
+    'compare_with_baseline',
+    'default_scenarios',
+    'random_planning_payload',
+    'random_telemetry_payload',
+    'run_scenario',
+]
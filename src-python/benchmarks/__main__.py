@@ -0,0 +1,127 @@
+"""协议吞吐基准入口
+
+用法（在 src-python 目录下）：
+    python -m benchmarks                                  # 运行全部默认场景
+    python -m benchmarks --scenario mixed_clean --frames 50000
+    python -m benchmarks --func-codes 0x42,0x71 --bad-tail-rate 0.05 --garbage-rate 0.1
+    python -m benchmarks --output bench.json              # 写出完整报告
+    python -m benchmarks --baseline bench.json            # 与历史报告比对，回退时返回码为 1
+    python -m benchmarks <套件名> --help                  # 其他基准套件（见 SUITES），参数由各套件解析
+
+标准输出每行一条 JSON：首行为运行环境，其后每个场景一行结果；各套件输出格式相同（见 report_results）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import logging
+import sys
+from pathlib import Path
+
+from .feed_data_benchmark import (
+    RESULT_SCHEMA,
+    BenchmarkScenario,
+    compare_with_baseline,
+    default_scenarios,
+    report_results,
+    run_scenario,
+)
+from .frame_generator import CorruptionConfig
+
+# 其他基准套件：套件名 -> 模块（按需导入，未安装可选依赖的套件不影响其他套件）
+SUITES = {
+    'loop': 'benchmarks.loop_benchmark',
+    'codec_registry': 'benchmarks.codec_registry_benchmark',
+    'checksum': 'benchmarks.checksum_benchmark',
+    'traffic_monitor': 'benchmarks.traffic_monitor_benchmark',
+    'standard_event': 'benchmarks.standard_event_benchmark',
+}
+
+
+def _parse_func_codes(text: str) -> tuple[int, ...]:
+    return tuple(int(item, 0) for item in text.split(',') if item.strip())
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description=f'NCLink feed_data 吞吐基准；其他套件: {", ".join(SUITES)}',
+    )
+    parser.add_argument('--frames', type=int, default=20000, help='每个场景的帧数')
+    parser.add_argument('--repeats', type=int, default=3, help='吞吐测量轮数（取最快一轮）')
+    parser.add_argument('--seed', type=int, default=20260330)
+    parser.add_argument('--scenario', action='append', default=[], help='只运行指定名称的默认场景，可重复')
+    parser.add_argument('--no-alloc', action='store_true', help='跳过 tracemalloc 内存统计')
+    parser.add_argument('--output', type=Path, help='完整报告（JSON）写入路径')
+    parser.add_argument('--baseline', type=Path, help='用于比对的历史报告（--output 生成）')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='判定回退的吞吐下降比例')
+    parser.add_argument('--log-level', default='ERROR', help='协议层日志级别（默认屏蔽损坏帧告警，避免日志输出计入耗时）')
+
+    custom = parser.add_argument_group('自定义场景（指定 --func-codes 时只运行该场景）')
+    custom.add_argument('--func-codes', type=_parse_func_codes, help='逗号分隔的功能字，如 0x42,0x44,0x71')
+    custom.add_argument('--chunk-size', type=int, default=0, help='0 为每帧一个 datagram')
+    custom.add_argument('--bad-tail-rate', type=float, default=0.0)
+    custom.add_argument('--checksum-error-rate', type=float, default=0.0)
+    custom.add_argument('--garbage-rate', type=float, default=0.0)
+    custom.add_argument('--garbage-max-bytes', type=int, default=64)
+    custom.add_argument('--planning-counts', default='20,50,10', help='0x71 全局路径/局部轨迹/障碍物数量上限')
+    custom.add_argument('--materialize', action='store_true', help='读取每条消息的 data，计入延迟解码开销')
+    return parser
+
+
+def _select_scenarios(args: argparse.Namespace) -> list[BenchmarkScenario]:
+    if args.func_codes:
+        planning_counts = tuple(int(item) for item in args.planning_counts.split(','))
+        return [BenchmarkScenario(
+            'custom',
+            args.func_codes,
+            args.frames,
+            corruption=CorruptionConfig(
+                bad_tail_rate=args.bad_tail_rate,
+                checksum_error_rate=args.checksum_error_rate,
+                garbage_rate=args.garbage_rate,
+                garbage_max_bytes=args.garbage_max_bytes,
+            ),
+            chunk_size=args.chunk_size,
+            planning_counts=planning_counts,
+            materialize=args.materialize,
+        )]
+
+    scenarios = default_scenarios(args.frames)
+    if args.scenario:
+        wanted = set(args.scenario)
+        unknown = wanted - {scenario.name for scenario in scenarios}
+        if unknown:
+            raise SystemExit(f'未知场景: {", ".join(sorted(unknown))}')
+        scenarios = [scenario for scenario in scenarios if scenario.name in wanted]
+    return scenarios
+
+
+def main(argv: list[str]) -> int:
+    if len(argv) > 1 and argv[1] in SUITES:
+        return importlib.import_module(SUITES[argv[1]]).main(argv[1:])
+
+    args = _build_parser().parse_args(argv[1:])
+    logging.getLogger('protocol').setLevel(args.log_level.upper())
+    results = report_results(
+        RESULT_SCHEMA,
+        (
+            run_scenario(scenario, repeats=args.repeats, seed=args.seed, measure_allocations=not args.no_alloc)
+            for scenario in _select_scenarios(args)
+        ),
+        args.output,
+    )
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        regressions = compare_with_baseline(results, baseline.get('results', []), args.tolerance)
+        print(json.dumps({'schema': RESULT_SCHEMA, 'regressions': regressions}, ensure_ascii=False))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main(sys.argv))
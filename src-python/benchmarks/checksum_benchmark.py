@@ -0,0 +1,86 @@
+"""XOR 校验和一致性校验与微基准
+
+用法（在 src-python 目录下）：
+    python -m benchmarks checksum [--samples 随机样本数] [--output checksum.json]
+
+先用随机载荷（含 bytes / bytearray / memoryview 及非 8 字节对齐长度）校验
+xor_checksum / frame_checksum 与逐字节参考实现一致，再按典型帧长各输出一行每次调用耗时
+（输出格式同 python -m benchmarks）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+from typing import Iterator, List
+
+from protocol.checksum import frame_checksum, xor_checksum, xor_checksum_reference
+from protocol.nclink_protocol import NCLINK_HEAD0, NCLINK_HEAD1
+
+from .feed_data_benchmark import report_results
+
+RESULT_SCHEMA = 'nclink-checksum-benchmark/1'
+DEFAULT_SAMPLES = 5000
+BENCH_SIZES = (3, 56, 126, 160, 245, 2448, 16384)
+
+
+def _assert(condition, message):
+    if not condition:
+        raise AssertionError(message)
+
+
+def _verify(samples: int, rng: random.Random) -> None:
+    for index in range(samples):
+        size = rng.randrange(0, 4096) if index % 4 else rng.randrange(0, 80)
+        payload = rng.randbytes(size)
+        expected = xor_checksum_reference(payload)
+        for candidate in (payload, bytearray(payload), memoryview(payload)):
+            _assert(xor_checksum(candidate) == expected, f'xor_checksum 不一致 size={size}')
+
+        func_code = rng.randrange(256)
+        header = bytes((NCLINK_HEAD0, NCLINK_HEAD1, func_code, (size >> 8) & 0xFF, size & 0xFF))
+        _assert(
+            frame_checksum(func_code, payload) == xor_checksum_reference(header + payload),
+            f'frame_checksum 不一致 size={size} func=0x{func_code:02X}',
+        )
+
+
+def _per_call_us(func, payload: bytes, number: int) -> float:
+    return timeit.timeit(lambda: func(payload), number=number) / number * 1e6
+
+
+def run_benchmark(rng: random.Random) -> Iterator[dict]:
+    for size in BENCH_SIZES:
+        payload = rng.randbytes(size)
+        number = max(200, 200000 // max(size, 1))
+        reference_us = _per_call_us(xor_checksum_reference, payload, number)
+        fast_us = _per_call_us(xor_checksum, payload, number)
+        yield {
+            'size': size,
+            'reference_us': round(reference_us, 3),
+            'fast_us': round(fast_us, 3),
+            'speedup': round(reference_us / fast_us, 2) if fast_us else None,
+        }
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks checksum', description='XOR 校验和一致性校验与微基准')
+    parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLES, help='一致性校验的随机样本数')
+    parser.add_argument('--seed', type=int, default=20260330)
+    parser.add_argument('--output', type=Path, help='完整报告（JSON）写入路径')
+    return parser
+
+
+def main(argv: List[str]) -> int:
+    args = _build_parser().parse_args(argv[1:])
+    rng = random.Random(args.seed)
+    _verify(args.samples, rng)
+    report_results(RESULT_SCHEMA, run_benchmark(rng), args.output, {'verified_samples': args.samples})
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main(sys.argv))
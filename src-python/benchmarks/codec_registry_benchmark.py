@@ -0,0 +1,169 @@
+"""功能字解码吞吐对比：dataclass from_bytes + to_json 路径 vs 预编译注册表路径
+
+用法（在 src-python 目录下）：
+    python -m benchmarks codec_registry [--frames 每个功能字的帧数] [--output codec.json]
+
+输出格式同 python -m benchmarks：首行运行环境，其后每个功能字一行结果
+（legacy_fps / registry_fps / parse_frame_fps / speedup），同时校验两条路径对同一 payload 的输出完全一致。
+legacy_fps 为先构造 dataclass 再 to_json 的路径（定长遥测的 from_bytes / to_json 同样由字段表生成），
+registry_fps 为注册表由解包元组直接构造字典的路径。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+from protocol.nclink_protocol import (
+    TELEMETRY_CODECS,
+    ExtY_FCS_AVOIFLAG_T,
+    ExtY_FCS_DATACTRL_T,
+    ExtY_FCS_DATAGCS_T,
+    ExtY_FCS_ESC_T,
+    ExtY_FCS_GNCBUS_T,
+    ExtY_FCS_LINESTRUC_ac_aim2AB_T,
+    ExtY_FCS_LINESTRUC_acAB_T,
+    ExtY_FCS_PARAM_T,
+    ExtY_FCS_PWMS_T,
+    ExtY_FCS_STATES_T,
+    GCSTelemetry_T,
+    NCLinkFrame,
+    NCLinkProtocolParser,
+    PortType,
+)
+
+from .feed_data_benchmark import report_results
+from .frame_generator import random_planning_payload, random_telemetry_payload
+
+RESULT_SCHEMA = 'nclink-codec-registry-benchmark/1'
+DEFAULT_FRAMES_PER_CODE = 20000
+
+
+def _assert(condition, message):
+    if not condition:
+        raise AssertionError(message)
+
+
+def _random_payload(func_code: int, rng: random.Random) -> bytes:
+    if func_code == 0x71:
+        return random_planning_payload(rng, 20, 50, 10)
+    return random_telemetry_payload(func_code, rng)
+
+
+def _legacy_decode(func_code: int, payload: bytes):
+    """基线实现：按重构前 parse_frame 的 if/elif 分支经 dataclass 解码"""
+    if func_code == 0x41:
+        return {'pwms': ExtY_FCS_PWMS_T.from_bytes(payload).pwms}
+    if func_code == 0x42:
+        return ExtY_FCS_STATES_T.from_bytes(payload).to_json()
+    if func_code == 0x43:
+        return ExtY_FCS_DATACTRL_T.from_bytes(payload).to_json()
+    if func_code == 0x44:
+        return ExtY_FCS_GNCBUS_T.from_bytes(payload).to_json()
+    if func_code == 0x45:
+        return ExtY_FCS_AVOIFLAG_T.from_bytes(payload).to_json()
+    if func_code == 0x46:
+        return ExtY_FCS_DATAGCS_T.from_bytes(payload).to_json()
+    if func_code == 0x47:
+        return ExtY_FCS_LINESTRUC_ac_aim2AB_T.from_bytes(payload).to_json()
+    if func_code == 0x48:
+        return ExtY_FCS_LINESTRUC_acAB_T.from_bytes(payload).to_json()
+    if func_code == 0x49:
+        return ExtY_FCS_PARAM_T.from_bytes(payload).to_json()
+    if func_code == 0x4A:
+        return ExtY_FCS_ESC_T.from_bytes(payload).to_json()
+    if func_code == 0x4B:
+        return {}
+    if func_code == 0x71:
+        return _flatten_planning_json(GCSTelemetry_T.from_bytes(payload).to_json())
+    raise KeyError(func_code)
+
+
+def _flatten_planning_json(nested: dict) -> dict:
+    """把旧版 0x71 嵌套 {x, y, z} 输出换算为注册表的展平坐标列表，便于逐项比对"""
+    def flatten_points(points):
+        return [value for point in points for value in (point['x'], point['y'], point['z'])]
+
+    flat = {key: nested[key] for key in (
+        'seq_id', 'timestamp', 'position', 'velocity', 'update_flags', 'status', 'global_path_count',
+    )}
+    flat['global_path_flat'] = flatten_points(nested['global_path'])
+    flat['local_traj_count'] = nested['local_traj_count']
+    flat['local_path_flat'] = flatten_points(nested['local_path'])
+    flat['obstacle_count'] = nested['obstacle_count']
+    flat['obstacles_flat'] = [
+        value
+        for obstacle in nested['obstacles']
+        for part in ('center', 'size', 'velocity')
+        for value in (obstacle[part]['x'], obstacle[part]['y'], obstacle[part]['z'])
+    ]
+    return flat
+
+
+def _frames_per_second(func, payloads: list) -> float:
+    started = time.perf_counter()
+    for payload in payloads:
+        func(payload)
+    elapsed = time.perf_counter() - started
+    return len(payloads) / elapsed if elapsed else float('inf')
+
+
+def _bench_func_code(func_code: int, frame_count: int, rng: random.Random) -> dict:
+    codec = TELEMETRY_CODECS[func_code]
+    samples = [_random_payload(func_code, rng) for _ in range(min(frame_count, 256))]
+    for payload in samples:
+        legacy = _legacy_decode(func_code, payload)
+        registry = codec.decode(payload)
+        _assert(
+            json.dumps(legacy, sort_keys=False) == json.dumps(registry, sort_keys=False),
+            f'0x{func_code:02X} 注册表输出与旧路径不一致',
+        )
+
+    payloads = [samples[index % len(samples)] for index in range(frame_count)]
+    frames = [NCLinkFrame.create_frame(func_code, payload).to_bytes() for payload in payloads]
+    parser = NCLinkProtocolParser()
+    legacy_fps = _frames_per_second(lambda payload: _legacy_decode(func_code, payload), payloads)
+    registry_fps = _frames_per_second(codec.decode, payloads)
+    parse_frame_fps = _frames_per_second(
+        lambda frame: parser.parse_frame(frame, PortType.PORT_18506_TELEMETRY),
+        frames,
+    )
+    return {
+        'func_code': f'0x{func_code:02X}',
+        'msg_type': codec.msg_type,
+        'payload_size': len(samples[0]),
+        'frames': frame_count,
+        'legacy_fps': round(legacy_fps, 1),
+        'registry_fps': round(registry_fps, 1),
+        'parse_frame_fps': round(parse_frame_fps, 1),
+        'speedup': round(registry_fps / legacy_fps, 2) if legacy_fps else None,
+    }
+
+
+def run_benchmark(frame_count: int = DEFAULT_FRAMES_PER_CODE, seed: int = 20260330) -> Iterator[dict]:
+    rng = random.Random(seed)
+    for func_code in sorted(TELEMETRY_CODECS):
+        yield _bench_func_code(func_code, frame_count, rng)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks codec_registry', description='功能字解码注册表吞吐对比')
+    parser.add_argument('--frames', type=int, default=DEFAULT_FRAMES_PER_CODE, help='每个功能字的帧数')
+    parser.add_argument('--seed', type=int, default=20260330)
+    parser.add_argument('--output', type=Path, help='完整报告（JSON）写入路径')
+    return parser
+
+
+def main(argv: List[str]) -> int:
+    args = _build_parser().parse_args(argv[1:])
+    report_results(RESULT_SCHEMA, run_benchmark(args.frames, args.seed), args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main(sys.argv))
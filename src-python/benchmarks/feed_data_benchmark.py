@@ -0,0 +1,282 @@
+"""
+NCLinkProtocolParser.feed_data 吞吐基准
+
+每个场景输出一条结果记录（RESULT_SCHEMA），包含：
+- frames_per_sec / mb_per_sec: 多轮中最快一轮的解析吞吐
+- latency_us: 单帧解析耗时分布（按 datagram 计时后摊到其中解析出的帧）
+- alloc: tracemalloc 统计的解析峰值内存与每条消息驻留字节
+结果可与历史基线逐场景对比，用于发现协议层的性能回退。
+"""
+
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from protocol.nclink_protocol import (
+    NCLINK_GCS_TELEMETRY,
+    STRICT_PAYLOAD_SIZES,
+    NCLinkProtocolParser,
+    PortType,
+)
+
+from .frame_generator import CorruptionConfig, FrameStream, build_frame_stream
+
+RESULT_SCHEMA = 'nclink-feed-data-benchmark/1'
+
+LATENCY_PERCENTILES = (50, 90, 99)
+
+
+@dataclass
+class BenchmarkScenario:
+    """单个基准场景"""
+    name: str
+    func_codes: Tuple[int, ...]
+    frame_count: int = 20000
+    corruption: CorruptionConfig = field(default_factory=CorruptionConfig)
+    # 0 表示每帧一个 datagram（与 UDP 接收一致），>0 表示按固定长度切分字节流
+    chunk_size: int = 0
+    planning_counts: Tuple[int, int, int] = (20, 50, 10)
+    # 为 True 时逐条读取 message['data']，把延迟解码的开销计入吞吐
+    materialize: bool = False
+    port_type: PortType = PortType.PORT_18506_TELEMETRY
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'func_codes': [f'0x{func_code:02X}' for func_code in self.func_codes],
+            'frame_count': self.frame_count,
+            'chunk_size': self.chunk_size,
+            'planning_counts': list(self.planning_counts),
+            'materialize': self.materialize,
+            'corruption': asdict(self.corruption),
+        }
+
+
+def default_scenarios(frame_count: int = 20000) -> List[BenchmarkScenario]:
+    """默认场景：STRICT_PAYLOAD_SIZES 中每个功能字、0x71 变长帧、混合流及损坏流"""
+    strict_codes = tuple(sorted(STRICT_PAYLOAD_SIZES))
+    all_codes = strict_codes + (NCLINK_GCS_TELEMETRY,)
+    scenarios = [
+        BenchmarkScenario(f'clean_0x{func_code:02X}', (func_code,), frame_count)
+        for func_code in all_codes
+    ]
+    scenarios.extend([
+        BenchmarkScenario('mixed_clean', all_codes, frame_count),
+        BenchmarkScenario('mixed_clean_materialized', all_codes, frame_count, materialize=True),
+        BenchmarkScenario('mixed_stream_4k', all_codes, frame_count, chunk_size=4096),
+        BenchmarkScenario(
+            'mixed_corrupted',
+            all_codes,
+            frame_count,
+            corruption=CorruptionConfig(bad_tail_rate=0.02, checksum_error_rate=0.02, garbage_rate=0.05),
+        ),
+    ])
+    return scenarios
+
+
+def _feed_stream(parser: NCLinkProtocolParser, stream: FrameStream, scenario: BenchmarkScenario) -> int:
+    parsed = 0
+    feed_data = parser.feed_data
+    port_type = scenario.port_type
+    for datagram in stream.datagrams:
+        messages = feed_data(datagram, port_type)
+        if scenario.materialize:
+            for message in messages:
+                message.get('data')
+        parsed += len(messages)
+    return parsed
+
+
+def _measure_throughput(stream: FrameStream, scenario: BenchmarkScenario, repeats: int) -> Tuple[float, int]:
+    best_elapsed = float('inf')
+    parsed = 0
+    for _ in range(max(1, repeats)):
+        parser = NCLinkProtocolParser()
+        started = time.perf_counter()
+        parsed = _feed_stream(parser, stream, scenario)
+        best_elapsed = min(best_elapsed, time.perf_counter() - started)
+    return best_elapsed, parsed
+
+
+def _measure_latency(stream: FrameStream, scenario: BenchmarkScenario) -> Dict[str, float]:
+    """逐 datagram 计时；未产出消息的块（垃圾、半帧）耗时并入下一次产出消息的块"""
+    parser = NCLinkProtocolParser()
+    feed_data = parser.feed_data
+    port_type = scenario.port_type
+    per_frame_ns: List[float] = []
+    carried_ns = 0
+    for datagram in stream.datagrams:
+        started = time.perf_counter_ns()
+        messages = feed_data(datagram, port_type)
+        if scenario.materialize:
+            for message in messages:
+                message.get('data')
+        carried_ns += time.perf_counter_ns() - started
+        if messages:
+            share = carried_ns / len(messages)
+            per_frame_ns.extend([share] * len(messages))
+            carried_ns = 0
+
+    if not per_frame_ns:
+        return {}
+    samples = np.asarray(per_frame_ns) / 1000.0
+    latency = {f'p{percentile}': round(float(np.percentile(samples, percentile)), 3) for percentile in LATENCY_PERCENTILES}
+    latency['mean'] = round(float(samples.mean()), 3)
+    latency['max'] = round(float(samples.max()), 3)
+    return latency
+
+
+def _measure_allocations(stream: FrameStream, scenario: BenchmarkScenario) -> Dict[str, Any]:
+    """峰值：丢弃消息时解析过程的瞬时占用；驻留：保留全部消息后的净增长"""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        parser = NCLinkProtocolParser()
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        _feed_stream(parser, stream, scenario)
+        _, peak = tracemalloc.get_traced_memory()
+
+        parser = NCLinkProtocolParser()
+        kept: List[dict] = []
+        before, _ = tracemalloc.get_traced_memory()
+        for datagram in stream.datagrams:
+            messages = parser.feed_data(datagram, scenario.port_type)
+            if scenario.materialize:
+                for message in messages:
+                    message.get('data')
+            kept.extend(messages)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    return {
+        'peak_bytes': max(0, peak - baseline),
+        'retained_bytes_per_message': round((after - before) / len(kept), 1) if kept else 0.0,
+    }
+
+
+def run_scenario(
+    scenario: BenchmarkScenario,
+    repeats: int = 3,
+    seed: int = 20260330,
+    measure_allocations: bool = True,
+) -> Dict[str, Any]:
+    """运行单个场景并返回一条结果记录"""
+    stream = build_frame_stream(
+        scenario.func_codes,
+        scenario.frame_count,
+        seed=seed,
+        corruption=scenario.corruption,
+        planning_counts=scenario.planning_counts,
+    ).rechunk(scenario.chunk_size)
+
+    elapsed, parsed = _measure_throughput(stream, scenario, repeats)
+    if scenario.corruption.is_clean() and parsed != stream.expected_messages:
+        raise AssertionError(f'{scenario.name}: 解析出 {parsed} 帧，期望 {stream.expected_messages} 帧')
+
+    total_bytes = stream.total_bytes
+    result: Dict[str, Any] = {
+        'schema': RESULT_SCHEMA,
+        'scenario': scenario.name,
+        'config': scenario.describe(),
+        'stream': {
+            'datagrams': len(stream.datagrams),
+            'bytes': total_bytes,
+            'frames': stream.frame_count,
+            'expected_messages': stream.expected_messages,
+            'bad_tail_frames': stream.bad_tail_frames,
+            'checksum_error_frames': stream.checksum_error_frames,
+            'garbage_bytes': stream.garbage_bytes,
+            'frames_by_func': stream.frames_by_func,
+        },
+        'parsed_messages': parsed,
+        'elapsed_sec': round(elapsed, 6),
+        'frames_per_sec': round(parsed / elapsed, 1) if elapsed else None,
+        'mb_per_sec': round(total_bytes / elapsed / 1e6, 3) if elapsed else None,
+        'latency_us': _measure_latency(stream, scenario),
+    }
+    if measure_allocations:
+        result['alloc'] = _measure_allocations(stream, scenario)
+    return result
+
+
+def environment_info() -> Dict[str, Any]:
+    return {
+        'schema': RESULT_SCHEMA,
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'numpy': np.__version__,
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def report_results(
+    schema: str,
+    results: Iterable[Dict[str, Any]],
+    output: Optional[Path] = None,
+    meta_extra: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """各基准共用的输出格式：标准输出首行为运行环境，其后每条结果一行 JSON；
+    指定 output 时另写出 {'schema', 'meta', 'results'} 完整报告"""
+    meta = environment_info()
+    meta['schema'] = schema
+    meta.update(meta_extra or {})
+    print(json.dumps(meta, ensure_ascii=False))
+
+    collected = []
+    for result in results:
+        result = {'schema': schema, **result}
+        collected.append(result)
+        print(json.dumps(result, ensure_ascii=False))
+
+    if output:
+        report = {'schema': schema, 'meta': meta, 'results': collected}
+        output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    return collected
+
+
+def compare_with_baseline(
+    results: Sequence[Dict[str, Any]],
+    baseline_results: Sequence[Dict[str, Any]],
+    tolerance: float = 0.10,
+) -> List[Dict[str, Any]]:
+    """按场景名比对 frames_per_sec，低于基线 (1 - tolerance) 的记为回退"""
+    baseline_by_name = {item.get('scenario'): item for item in baseline_results}
+    regressions = []
+    for result in results:
+        baseline = baseline_by_name.get(result.get('scenario'))
+        if not baseline:
+            continue
+        current_fps = result.get('frames_per_sec') or 0.0
+        baseline_fps = baseline.get('frames_per_sec') or 0.0
+        if baseline_fps and current_fps < baseline_fps * (1.0 - tolerance):
+            regressions.append({
+                'scenario': result['scenario'],
+                'metric': 'frames_per_sec',
+                'baseline': baseline_fps,
+                'current': current_fps,
+                'ratio': round(current_fps / baseline_fps, 3),
+            })
+    return regressions
+
+
+__all__ = [
+    'RESULT_SCHEMA',
+    'BenchmarkScenario',
+    'compare_with_baseline',
+    'default_scenarios',
+    'environment_info',
+    'report_results',
+    'run_scenario',
+]
@@ -0,0 +1,215 @@
+"""
+合成 NCLink 帧生成器
+
+定长遥测按 TELEMETRY_CODECS 的结构体布局生成随机字段值，经对应 dataclass 的
+from_bytes / to_bytes 编码；0x71 规划遥测由 PathPoint_T / Object3d_T / GCSTelemetry_T
+的 to_bytes 拼装，路径点与障碍物数量可配置。帧流可按比例注入帧尾错误、校验和错误
+以及帧间垃圾字节，用于衡量解析器在脏数据下的吞吐。
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from protocol import nclink_protocol
+from protocol.nclink_protocol import (
+    NCLINK_END0,
+    NCLINK_GCS_TELEMETRY,
+    NCLINK_HEAD0,
+    STRICT_PAYLOAD_SIZES,
+    TELEMETRY_CODECS,
+    GCSTelemetry_T,
+    NCLinkFrame,
+    Object3d_T,
+    PathPoint_T,
+)
+
+
+@dataclass
+class CorruptionConfig:
+    """帧流损坏注入配置（各比例按帧独立抽样）
+
+    - bad_tail_rate: 帧尾改写为非 A1 A2，解析器应拒收
+    - checksum_error_rate: 校验字节取反，解析器记录问题但仍解码
+    - garbage_rate: 在帧前插入随机垃圾字节；垃圾中不含 0xFF，避免伪造帧头导致期望帧数不可预测
+    - garbage_max_bytes: 单段垃圾的最大长度
+    """
+    bad_tail_rate: float = 0.0
+    checksum_error_rate: float = 0.0
+    garbage_rate: float = 0.0
+    garbage_max_bytes: int = 64
+
+    def is_clean(self) -> bool:
+        return not (self.bad_tail_rate or self.checksum_error_rate or self.garbage_rate)
+
+
+@dataclass
+class FrameStream:
+    """一段合成帧流：datagrams 中每项为一次 feed_data 的输入"""
+    datagrams: List[bytes]
+    frame_count: int = 0
+    expected_messages: int = 0
+    bad_tail_frames: int = 0
+    checksum_error_frames: int = 0
+    garbage_bytes: int = 0
+    frames_by_func: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(len(datagram) for datagram in self.datagrams)
+
+    def rechunk(self, chunk_size: int) -> 'FrameStream':
+        """把整段字节流按固定长度重新切片（模拟流式读取，帧可能跨块）"""
+        if chunk_size <= 0:
+            return self
+        data = b''.join(self.datagrams)
+        return FrameStream(
+            datagrams=[data[index:index + chunk_size] for index in range(0, len(data), chunk_size)],
+            frame_count=self.frame_count,
+            expected_messages=self.expected_messages,
+            bad_tail_frames=self.bad_tail_frames,
+            checksum_error_frames=self.checksum_error_frames,
+            garbage_bytes=self.garbage_bytes,
+            frames_by_func=dict(self.frames_by_func),
+        )
+
+
+def _iter_format_codes(fmt: str):
+    count = ''
+    for char in fmt.lstrip('<>!=@'):
+        if char.isdigit():
+            count += char
+            continue
+        for _ in range(int(count or 1)):
+            yield char
+        count = ''
+
+
+def _random_struct_value(code: str, rng: random.Random):
+    if code in 'fd':
+        return rng.uniform(-1000, 1000)
+    if code == 'b':
+        return rng.randrange(-128, 128)
+    if code == 'B':
+        return rng.randrange(256)
+    if code == 'h':
+        return rng.randrange(-(1 << 15), 1 << 15)
+    if code == 'H':
+        return rng.randrange(1 << 16)
+    if code == 'i':
+        return rng.randrange(-(1 << 31), 1 << 31)
+    if code == 'I':
+        return rng.randrange(1 << 32)
+    raise ValueError(f'不支持的 struct 格式字符: {code}')
+
+
+def random_telemetry_payload(func_code: int, rng: random.Random) -> bytes:
+    """生成定长遥测功能字的随机 payload（经 dataclass.to_bytes 编码）"""
+    codec = TELEMETRY_CODECS.get(func_code)
+    if codec is None or codec.layout is None:
+        return b''
+    values = [_random_struct_value(code, rng) for code in _iter_format_codes(codec.layout.format)]
+    struct_cls = getattr(nclink_protocol, codec.struct_name)
+    return struct_cls.from_bytes(codec.layout.pack(*values)).to_bytes()
+
+
+def random_planning_payload(
+    rng: random.Random,
+    global_count: int = 20,
+    local_count: int = 50,
+    obstacle_count: int = 10,
+) -> bytes:
+    """生成 0x71 规划遥测 payload，三段数组长度由参数指定"""
+    telemetry = GCSTelemetry_T(
+        seq_id=rng.randrange(1 << 32),
+        timestamp=rng.randrange(1 << 32),
+        current_pos_x=rng.uniform(-500, 500),
+        current_pos_y=rng.uniform(-500, 500),
+        current_pos_z=rng.uniform(0, 100),
+        current_vel=rng.uniform(0, 20),
+        update_flags=rng.randrange(8),
+        status=rng.randrange(4),
+        global_path=[PathPoint_T(*(rng.uniform(-500, 500) for _ in range(3))) for _ in range(global_count)],
+        local_path=[PathPoint_T(*(rng.uniform(-500, 500) for _ in range(3))) for _ in range(local_count)],
+        obstacles=[Object3d_T(*(rng.uniform(-50, 50) for _ in range(9))) for _ in range(obstacle_count)],
+    )
+    return telemetry.to_bytes()
+
+
+def _random_garbage(rng: random.Random, max_bytes: int) -> bytes:
+    size = rng.randint(1, max(1, max_bytes))
+    return bytes(rng.randrange(NCLINK_HEAD0) for _ in range(size))
+
+
+def build_frame_stream(
+    func_codes: Sequence[int],
+    frame_count: int,
+    seed: int = 20260330,
+    corruption: Optional[CorruptionConfig] = None,
+    planning_counts: Tuple[int, int, int] = (20, 50, 10),
+    sample_payloads: int = 64,
+) -> FrameStream:
+    """按 func_codes 轮转生成 frame_count 帧，每帧一个 datagram
+
+    每个功能字预生成 sample_payloads 个随机 payload 循环使用；0x71 的路径点/障碍物
+    数量在 [0, planning_counts] 内随机，覆盖变长帧。
+    """
+    rng = random.Random(seed)
+    corruption = corruption or CorruptionConfig()
+    samples: Dict[int, List[bytes]] = {}
+    for func_code in func_codes:
+        if func_code == NCLINK_GCS_TELEMETRY:
+            global_max, local_max, obstacle_max = planning_counts
+            samples[func_code] = [
+                random_planning_payload(
+                    rng,
+                    rng.randint(0, global_max),
+                    rng.randint(0, local_max),
+                    rng.randint(0, obstacle_max),
+                )
+                for _ in range(sample_payloads)
+            ]
+        elif func_code in STRICT_PAYLOAD_SIZES:
+            samples[func_code] = [random_telemetry_payload(func_code, rng) for _ in range(sample_payloads)]
+            expected_size = STRICT_PAYLOAD_SIZES[func_code]
+            if any(len(payload) != expected_size for payload in samples[func_code]):
+                raise ValueError(f'0x{func_code:02X} 编码长度与 STRICT_PAYLOAD_SIZES 不一致')
+        else:
+            raise ValueError(f'不支持生成功能字 0x{func_code:02X}')
+
+    stream = FrameStream(datagrams=[])
+    for index in range(frame_count):
+        func_code = func_codes[index % len(func_codes)]
+        payload = samples[func_code][index % sample_payloads]
+        frame = bytearray(NCLinkFrame.create_frame(func_code, payload).to_bytes())
+
+        if corruption.checksum_error_rate and rng.random() < corruption.checksum_error_rate:
+            frame[-3] ^= 0xFF
+            stream.checksum_error_frames += 1
+        bad_tail = bool(corruption.bad_tail_rate) and rng.random() < corruption.bad_tail_rate
+        if bad_tail:
+            frame[-2] = NCLINK_END0 ^ 0x0F
+            stream.bad_tail_frames += 1
+        else:
+            stream.expected_messages += 1
+
+        datagram = bytes(frame)
+        if corruption.garbage_rate and rng.random() < corruption.garbage_rate:
+            garbage = _random_garbage(rng, corruption.garbage_max_bytes)
+            stream.garbage_bytes += len(garbage)
+            datagram = garbage + datagram
+
+        stream.datagrams.append(datagram)
+        stream.frame_count += 1
+        key = f'0x{func_code:02X}'
+        stream.frames_by_func[key] = stream.frames_by_func.get(key, 0) + 1
+    return stream
+
+
+__all__ = [
+    'CorruptionConfig',
+    'FrameStream',
+    'build_frame_stream',
+    'random_planning_payload',
+    'random_telemetry_payload',
+]
@@ -0,0 +1,325 @@
+"""
+事件循环对比基准（asyncio / uvloop）
+
+每种事件循环实现各跑一轮完整链路：
+    发送线程按 30509 主聚合口的帧组成回放合成 datagram
+    -> UDPHandler（asyncio DatagramProtocol 接收 + NCLink 解析）
+    -> WebSocketManager.schedule_latest_broadcast（与 main.py 相同的按类型合并广播）
+    -> uvicorn 承载的 /ws 端点 -> N 个环回 WebSocket 客户端
+输出接收/解析吞吐（pps）、广播端到端延迟（消息交付给广播到客户端收到）与事件循环调度滞后。
+客户端与服务端在同一事件循环中运行，结果用于实现之间的横向对比，不代表绝对上限。
+
+用法（在 src-python 目录下）：
+    python -m benchmarks loop                                 # 对比全部已安装的实现（同 python -m benchmarks.loop_benchmark）
+    python -m benchmarks.loop_benchmark --clients 8 --frames 50000 --rate 20000
+    python -m benchmarks.loop_benchmark --loops asyncio --output loop.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import socket
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import uvicorn
+import websockets
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+
+from payload_builders import build_ws_payload
+from protocol.nclink_protocol import (
+    NCLINK_GCS_TELEMETRY,
+    NCLINK_RECEIVE_EXTY_FCS_AVOIFLAG,
+    NCLINK_RECEIVE_EXTY_FCS_DATACTRL,
+    NCLINK_RECEIVE_EXTY_FCS_DATAGCS,
+    NCLINK_RECEIVE_EXTY_FCS_ESC,
+    NCLINK_RECEIVE_EXTY_FCS_GNCBUS,
+    NCLINK_RECEIVE_EXTY_FCS_PWMS,
+    NCLINK_RECEIVE_EXTY_FCS_STATES,
+)
+from protocol.protocol_parser import UDPHandler
+from websocket.websocket_manager import WebSocketManager
+
+from .feed_data_benchmark import LATENCY_PERCENTILES, report_results
+from .frame_generator import build_frame_stream
+
+RESULT_SCHEMA = 'gcs-loop-benchmark/1'
+
+LOOP_IMPLEMENTATIONS = ('asyncio', 'uvloop')
+
+# 30509 主聚合口上的飞控遥测 + 规划遥测
+DEFAULT_FUNC_CODES = (
+    NCLINK_RECEIVE_EXTY_FCS_PWMS,
+    NCLINK_RECEIVE_EXTY_FCS_STATES,
+    NCLINK_RECEIVE_EXTY_FCS_DATACTRL,
+    NCLINK_RECEIVE_EXTY_FCS_GNCBUS,
+    NCLINK_RECEIVE_EXTY_FCS_AVOIFLAG,
+    NCLINK_RECEIVE_EXTY_FCS_DATAGCS,
+    NCLINK_RECEIVE_EXTY_FCS_ESC,
+    NCLINK_GCS_TELEMETRY,
+)
+
+# 事件循环调度滞后的采样周期（秒）
+LAG_PROBE_INTERVAL_SEC = 0.005
+
+
+@dataclass
+class LoopBenchmarkConfig:
+    """单轮基准参数"""
+    frames: int = 20000
+    clients: int = 4
+    func_codes: Tuple[int, ...] = DEFAULT_FUNC_CODES
+    # 发送速率（datagram/s），0 为不限速
+    rate: float = 0.0
+    seed: int = 20260330
+    # 发送结束后等待解析/广播收尾的最长时间（秒）
+    drain_timeout: float = 3.0
+
+    def describe(self) -> Dict[str, Any]:
+        described = asdict(self)
+        described['func_codes'] = [f'0x{func_code:02X}' for func_code in self.func_codes]
+        return described
+
+
+def available_loops() -> List[str]:
+    loops = ['asyncio']
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        return loops
+    loops.append('uvloop')
+    return loops
+
+
+def _new_event_loop(loop_name: str) -> asyncio.AbstractEventLoop:
+    if loop_name == 'uvloop':
+        import uvloop
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
+def _free_udp_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def _summarize_ms(samples_ns: Sequence[int]) -> Dict[str, float]:
+    if not samples_ns:
+        return {}
+    samples = np.asarray(samples_ns, dtype=np.float64) / 1e6
+    summary = {f'p{percentile}': round(float(np.percentile(samples, percentile)), 3) for percentile in LATENCY_PERCENTILES}
+    summary['mean'] = round(float(samples.mean()), 3)
+    summary['max'] = round(float(samples.max()), 3)
+    return summary
+
+
+def _send_datagrams(datagrams: Sequence[bytes], port: int, rate: float) -> Tuple[float, float]:
+    """发送线程：按速率回放 datagram，返回 (开始, 结束) perf_counter 时间"""
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    target = ('127.0.0.1', port)
+    interval = 1.0 / rate if rate > 0 else 0.0
+    started = time.perf_counter()
+    try:
+        for index, datagram in enumerate(datagrams):
+            if interval:
+                delay = started + index * interval - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            sender.sendto(datagram, target)
+    finally:
+        sender.close()
+    return started, time.perf_counter()
+
+
+async def _run_once(loop_name: str, cfg: LoopBenchmarkConfig) -> Dict[str, Any]:
+    stream = build_frame_stream(cfg.func_codes, cfg.frames, seed=cfg.seed)
+    manager = WebSocketManager()
+
+    app = FastAPI()
+
+    @app.websocket('/ws')
+    async def _ws_endpoint(websocket: WebSocket) -> None:
+        await manager.connect(websocket)
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            manager.disconnect(websocket)
+
+    http_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    http_sock.bind(('127.0.0.1', 0))
+    http_port = http_sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, log_level='error', lifespan='off'))
+    server_task = asyncio.create_task(server.serve(sockets=[http_sock]))
+    while not server.started:
+        if server_task.done():
+            server_task.result()
+        await asyncio.sleep(0.01)
+
+    # ---------------- UDP 接收 -> 广播 ----------------
+    dispatch = {'messages': 0, 'batches': 0, 'last_ns': 0}
+
+    def on_messages(messages: List[dict]) -> None:
+        now_ns = time.perf_counter_ns()
+        dispatch['messages'] += len(messages)
+        dispatch['batches'] += 1
+        dispatch['last_ns'] = now_ns
+        for message in messages:
+            msg_type = message.get('type', 'unknown')
+            payload = build_ws_payload(
+                'udp_data',
+                data=message,
+                timestamp=message.get('timestamp'),
+                extra={'bench_t_ns': now_ns},
+            )
+            manager.schedule_latest_broadcast(payload, f'udp_data:{msg_type}')
+
+    udp_port = _free_udp_port()
+    handler = UDPHandler(on_messages=on_messages)
+    await handler.start_server(host='127.0.0.1', ports=[udp_port], ingest_mode='asyncio')
+
+    # ---------------- WebSocket 客户端 ----------------
+    latencies_ns: List[int] = []
+    received = [0] * cfg.clients
+
+    async def client_reader(index: int, connection) -> None:
+        try:
+            async for raw in connection:
+                sent_ns = json.loads(raw).get('bench_t_ns')
+                if sent_ns is not None:
+                    latencies_ns.append(time.perf_counter_ns() - sent_ns)
+                    received[index] += 1
+        except websockets.ConnectionClosed:
+            pass
+
+    connections = [
+        await websockets.connect(f'ws://127.0.0.1:{http_port}/ws', max_size=None)
+        for _ in range(cfg.clients)
+    ]
+    readers = [asyncio.create_task(client_reader(index, conn)) for index, conn in enumerate(connections)]
+    while manager.get_connection_count() < cfg.clients:
+        await asyncio.sleep(0.01)
+
+    # ---------------- 事件循环调度滞后 ----------------
+    lag_ns: List[int] = []
+
+    async def lag_probe() -> None:
+        interval_ns = int(LAG_PROBE_INTERVAL_SEC * 1e9)
+        while True:
+            expected = time.perf_counter_ns() + interval_ns
+            await asyncio.sleep(LAG_PROBE_INTERVAL_SEC)
+            lag_ns.append(max(0, time.perf_counter_ns() - expected))
+
+    probe_task = asyncio.create_task(lag_probe())
+
+    # ---------------- 回放 ----------------
+    send_started, send_finished = await asyncio.to_thread(_send_datagrams, stream.datagrams, udp_port, cfg.rate)
+    deadline = time.perf_counter() + cfg.drain_timeout
+    last_seen = -1
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+        settled = dispatch['messages'] >= stream.expected_messages or dispatch['messages'] == last_seen
+        if settled and not manager._pending_latest_messages:
+            break
+        last_seen = dispatch['messages']
+    await asyncio.sleep(0.1)
+
+    probe_task.cancel()
+    stats = handler.get_runtime_stats()
+    rx_datagrams = stats['rx_datagrams']['packets_total']
+
+    # ---------------- 收尾 ----------------
+    for connection in connections:
+        await connection.close()
+    await asyncio.gather(*readers, probe_task, return_exceptions=True)
+    await handler.stop_server()
+    server.should_exit = True
+    await server_task
+
+    ingest_elapsed = max(1e-9, dispatch['last_ns'] / 1e9 - send_started) if dispatch['last_ns'] else 0.0
+    return {
+        'loop': loop_name,
+        'config': cfg.describe(),
+        'sent_datagrams': len(stream.datagrams),
+        'send_elapsed_sec': round(send_finished - send_started, 4),
+        'rx_datagrams': rx_datagrams,
+        'rx_loss_ratio': round(1.0 - rx_datagrams / max(1, len(stream.datagrams)), 4),
+        'parsed_messages': dispatch['messages'],
+        'dispatch_batches': dispatch['batches'],
+        'ingest_pps': round(dispatch['messages'] / ingest_elapsed, 1) if ingest_elapsed else 0.0,
+        'broadcasts_received': sum(received),
+        'broadcasts_per_client': round(sum(received) / max(1, cfg.clients), 1),
+        'broadcast_latency_ms': _summarize_ms(latencies_ns),
+        'loop_lag_ms': _summarize_ms(lag_ns),
+    }
+
+
+def run_loop_benchmark(loop_name: str, cfg: LoopBenchmarkConfig) -> Dict[str, Any]:
+    """在全新的 loop_name 事件循环上跑一轮完整链路"""
+    loop = _new_event_loop(loop_name)
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(_run_once(loop_name, cfg))
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+def _parse_func_codes(text: str) -> Tuple[int, ...]:
+    return tuple(int(item, 0) for item in text.split(',') if item.strip())
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.loop_benchmark', description='asyncio / uvloop 链路对比基准')
+    parser.add_argument('--loops', default='', help=f'逗号分隔，可选 {",".join(LOOP_IMPLEMENTATIONS)}（默认全部已安装的实现）')
+    parser.add_argument('--frames', type=int, default=20000, help='回放的帧数（每帧一个 datagram）')
+    parser.add_argument('--clients', type=int, default=4, help='环回 WebSocket 客户端数')
+    parser.add_argument('--rate', type=float, default=0.0, help='发送速率 datagram/s，0 为不限速')
+    parser.add_argument('--func-codes', type=_parse_func_codes, default=DEFAULT_FUNC_CODES, help='逗号分隔的功能字')
+    parser.add_argument('--seed', type=int, default=20260330)
+    parser.add_argument('--output', type=Path, help='完整报告（JSON）写入路径')
+    parser.add_argument('--log-level', default='ERROR', help='后端日志级别（默认屏蔽逐包日志，避免计入耗时）')
+    return parser
+
+
+def main(argv: List[str]) -> int:
+    args = _build_parser().parse_args(argv[1:])
+    logging.getLogger().setLevel(args.log_level.upper())
+    for log_handler in logging.getLogger().handlers:
+        log_handler.setLevel(args.log_level.upper())
+
+    installed = available_loops()
+    wanted = [item.strip() for item in args.loops.split(',') if item.strip()] or list(LOOP_IMPLEMENTATIONS)
+    cfg = LoopBenchmarkConfig(
+        frames=args.frames,
+        clients=max(1, args.clients),
+        func_codes=args.func_codes,
+        rate=args.rate,
+        seed=args.seed,
+    )
+
+    def results():
+        for loop_name in wanted:
+            if loop_name not in LOOP_IMPLEMENTATIONS:
+                raise SystemExit(f'未知事件循环实现: {loop_name}')
+            if loop_name not in installed:
+                yield {'loop': loop_name, 'skipped': 'not installed'}
+            else:
+                yield run_loop_benchmark(loop_name, cfg)
+
+    report_results(RESULT_SCHEMA, results(), args.output, {'loops_installed': installed})
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,185 @@
+"""处理阶段单帧开销：即时构造标准事件（SHA-1 事件 ID）vs 延迟构造（单调事件 ID）
+
+用法（在 src-python 目录下）：
+    python -m benchmarks standard_event [--frames 帧数] [--output event.json]
+
+原 _packet_processing_loop 的逐帧处理已并入处理阶段 main._process_udp_message_batch，
+这里直接以同一批解析结果驱动该函数，WebSocket 广播替换为只收集载荷的桩（不含发送开销），
+分别测量三种场景下每帧耗时：
+    throttled        默认抽稀规则（多数高频帧不构造载荷）
+    broadcast_all    WebSocket 不限速，每帧都构造广播载荷，但无人读取标准事件（无前端连接时的情形）
+    serialized       WebSocket 不限速，且每个广播载荷的标准事件都被 json 序列化（最坏情形）
+并校验延迟事件展开后与即时构造的字段一致（event_id 除外）。每个场景一行结果（输出格式同 python -m benchmarks）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import sys
+import time
+from hashlib import sha1
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+from events import LazyStandardEvent, build_standard_event
+from events.standard_event import (
+    EVENT_DESCRIPTOR_MAP,
+    _extract_sequence,
+    _infer_priority,
+    _normalize_port_type,
+)
+from pipeline.decimation import CONSUMER_WEBSOCKET, DEFAULT_DECIMATION_RULES, DecimationPolicy
+from protocol.nclink_protocol import NCLinkProtocolParser, PortType
+
+from .feed_data_benchmark import report_results
+from .frame_generator import build_frame_stream
+
+# 后端 main 导入时会在标准输出打印配置横幅，转到标准错误，保持标准输出逐行 JSON
+with contextlib.redirect_stdout(sys.stderr):
+    import main as backend_main
+
+RESULT_SCHEMA = 'gcs-standard-event-benchmark/1'
+DEFAULT_FRAMES = 20000
+ROUNDS = 5
+FUNC_CODES = (0x41, 0x42, 0x43, 0x44, 0x4A, 0x71)
+
+
+def _legacy_standard_event(message: Dict[str, Any], transport: str = 'udp') -> Dict[str, Any]:
+    """原实现：逐帧拼指纹串做 SHA-1 作为事件 ID，并立即构造完整事件（对照基准）"""
+    msg_type = str(message.get('type') or 'unknown')
+    descriptor = EVENT_DESCRIPTOR_MAP.get(msg_type, EVENT_DESCRIPTOR_MAP['unknown'])
+    func_code = int(message.get('func_code', 0) or 0)
+    func_code_hex = str(message.get('func_code_hex') or f'0x{func_code:02X}')
+    occurred_at_ms = int(message.get('timestamp', 0) or 0)
+    payload = message.get('data', {}) or {}
+    sequence = _extract_sequence(payload)
+    fingerprint = f'{msg_type}|{func_code_hex}|{occurred_at_ms}|{sequence}'
+    return {
+        'schema_version': 'canonical-event-v1',
+        'event_id': sha1(fingerprint.encode('utf-8')).hexdigest()[:16],
+        'event_type': descriptor['event_type'],
+        'category': descriptor['category'],
+        'domain': descriptor['domain'],
+        'producer': descriptor['producer'],
+        'routing_key': msg_type,
+        'priority': _infer_priority(msg_type),
+        'occurred_at_ms': occurred_at_ms,
+        'sequence': sequence,
+        'source': {
+            'system': 'apollo_gcs_backend',
+            'transport': transport,
+            'port_type': _normalize_port_type(message.get('port_type')),
+            'func_code': func_code,
+            'func_code_hex': func_code_hex,
+            'message_type': msg_type,
+        },
+        'quality': {
+            'payload_size': int(message.get('payload_size', 0) or 0),
+            'frame_size': int(message.get('frame_size', 0) or 0),
+            'skip_recording': bool(message.get('skip_recording')),
+        },
+        'payload': payload,
+    }
+
+
+class _CollectingManager:
+    """替换 WebSocket 管理器：快照照常缓存，待广播载荷只收集不发送"""
+
+    def __init__(self):
+        self.payloads: List[dict] = []
+        self.snapshots: Dict[str, dict] = {}
+
+    def cache_message(self, message: dict, cache_key: str) -> None:
+        self.snapshots[cache_key] = message
+
+    def schedule_latest_broadcast(self, message: dict, cache_key: str) -> None:
+        self.payloads.append(message)
+
+
+def _parse_rounds(frames: int) -> List[List[dict]]:
+    stream = build_frame_stream(FUNC_CODES, frames)
+    rounds = []
+    for _ in range(ROUNDS):
+        parser = NCLinkProtocolParser(emit_parsed_events=False)
+        messages: List[dict] = []
+        for datagram in stream.datagrams:
+            messages.extend(parser.feed_data(datagram, PortType.PORT_18506_TELEMETRY))
+        rounds.append(messages)
+    return rounds
+
+
+def _verify(messages: List[dict]) -> int:
+    checked = 0
+    for message in messages[:200]:
+        eager = build_standard_event(message)
+        lazy = LazyStandardEvent(message)
+        if lazy.get('routing_key') != eager['routing_key'] or lazy.is_materialized:
+            raise AssertionError('routing_key 读取不应展开延迟事件')
+        expanded = json.loads(json.dumps(lazy))
+        expected = json.loads(json.dumps(eager))
+        if expanded.pop('event_id') == expected.pop('event_id') or expanded != expected:
+            raise AssertionError(f'延迟事件与即时构造不一致: {message.get("type")}')
+        checked += 1
+    return checked
+
+
+def _run(event_factory: Callable[[dict], dict], rounds: List[List[dict]], throttled: bool, serialize: bool) -> float:
+    collector = _CollectingManager()
+    saved = (backend_main.LazyStandardEvent, backend_main.manager, backend_main.decimation_policy)
+    backend_main.LazyStandardEvent = event_factory
+    backend_main.manager = collector
+    rules = DEFAULT_DECIMATION_RULES if throttled else {**DEFAULT_DECIMATION_RULES, CONSUMER_WEBSOCKET: {}}
+    best = float('inf')
+    try:
+        for messages in rounds:
+            backend_main.decimation_policy = DecimationPolicy(rules)
+            collector.payloads.clear()
+            started = time.perf_counter()
+            backend_main._process_udp_message_batch(messages)
+            if serialize:
+                for payload in collector.payloads:
+                    json.dumps(payload['standard_event'], ensure_ascii=False, separators=(',', ':'))
+            best = min(best, (time.perf_counter() - started) / len(messages))
+    finally:
+        backend_main.LazyStandardEvent, backend_main.manager, backend_main.decimation_policy = saved
+    return best * 1e6
+
+
+def run_benchmark(frames: int = DEFAULT_FRAMES) -> Iterator[dict]:
+    for scenario, throttled, serialize in (
+        ('throttled', True, False),
+        ('broadcast_all', False, False),
+        ('serialized', False, True),
+    ):
+        # 每个场景、每种实现各用一组新解析的消息，避免延迟解码结果被上一轮缓存
+        eager_us = _run(_legacy_standard_event, _parse_rounds(frames), throttled, serialize)
+        lazy_us = _run(LazyStandardEvent, _parse_rounds(frames), throttled, serialize)
+        yield {
+            'scenario': scenario,
+            'frames': frames,
+            'eager_sha1_us_per_frame': round(eager_us, 3),
+            'lazy_monotonic_us_per_frame': round(lazy_us, 3),
+            'speedup': round(eager_us / lazy_us, 2) if lazy_us else None,
+        }
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks standard_event', description='处理阶段标准事件构造开销：即时 vs 延迟',
+    )
+    parser.add_argument('--frames', type=int, default=DEFAULT_FRAMES, help='每个场景的帧数')
+    parser.add_argument('--output', type=Path, help='完整报告（JSON）写入路径')
+    return parser
+
+
+def main(argv: List[str]) -> int:
+    args = _build_parser().parse_args(argv[1:])
+    verified = _verify(_parse_rounds(200)[0])
+    report_results(RESULT_SCHEMA, run_benchmark(args.frames), args.output, {'verified_events': verified})
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main(sys.argv))
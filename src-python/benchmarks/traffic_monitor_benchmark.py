@@ -0,0 +1,178 @@
+"""RuntimeTrafficMonitor 滚动窗口一致性校验与微基准
+
+用法（在 src-python 目录下）：
+    python -m benchmarks traffic_monitor [--calls 每项调用次数] [--output traffic.json]
+
+先用可控时钟驱动环形槽位窗口与原字典分桶实现（逐次 add 都 prune），校验两者在跨秒、
+跨窗口与长时间空闲后的快照完全一致；再分别以两种窗口实现测量
+record_rx_datagram / record_parsed_message / record_parsed_batch 的单次调用耗时，
+每项一行结果（输出格式同 python -m benchmarks）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+import timeit
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from protocol.protocol_parser import RuntimeTrafficMonitor, _RollingTrafficWindow
+
+from .feed_data_benchmark import report_results
+
+RESULT_SCHEMA = 'gcs-traffic-monitor-benchmark/1'
+DEFAULT_CALLS = 200000
+_WINDOW_ATTRS = ('_rx_window', '_tx_window', '_parsed_window', '_reject_window', '_issue_window')
+
+
+class _DictBucketWindow:
+    """原实现：每秒一个三字段字典，每次 add 都遍历全部键清理过期桶（对照基准）"""
+
+    def __init__(self, window_seconds: int = 10, clock=time.monotonic):
+        self.window_seconds = max(1, int(window_seconds))
+        self._clock = clock
+        self._overall: Dict[int, Dict[str, int]] = {}
+        self._by_key: Dict[str, Dict[int, Dict[str, int]]] = {}
+
+    def add(self, key: Optional[str], payload_bytes: int, frame_bytes: int, packets: int = 1) -> None:
+        now_sec = int(self._clock())
+        self._add_bucket(self._overall, now_sec, packets, payload_bytes, frame_bytes)
+        if key:
+            self._add_bucket(self._by_key.setdefault(key, {}), now_sec, packets, payload_bytes, frame_bytes)
+        self._prune(now_sec)
+
+    def snapshot(self) -> Dict[str, Any]:
+        now_sec = int(self._clock())
+        self._prune(now_sec)
+        cutoff = now_sec - self.window_seconds + 1
+        by_key = {}
+        for key, buckets in sorted(self._by_key.items()):
+            summary = self._summarize(buckets, cutoff)
+            if summary['packets'] > 0:
+                by_key[key] = _RollingTrafficWindow._build_rate_snapshot(self, summary)
+        return {
+            'window_seconds': self.window_seconds,
+            'overall': _RollingTrafficWindow._build_rate_snapshot(self, self._summarize(self._overall, cutoff)),
+            'by_key': by_key,
+        }
+
+    @staticmethod
+    def _add_bucket(container, second_key, packets, payload_bytes, frame_bytes) -> None:
+        bucket = container.setdefault(second_key, {'packets': 0, 'payload_bytes': 0, 'frame_bytes': 0})
+        bucket['packets'] += int(packets)
+        bucket['payload_bytes'] += max(0, int(payload_bytes))
+        bucket['frame_bytes'] += max(0, int(frame_bytes))
+
+    @staticmethod
+    def _summarize(buckets, cutoff) -> Dict[str, int]:
+        summary = {'packets': 0, 'payload_bytes': 0, 'frame_bytes': 0}
+        for second_key, values in buckets.items():
+            if second_key < cutoff:
+                continue
+            for name in summary:
+                summary[name] += values[name]
+        return summary
+
+    def _prune(self, now_sec: int) -> None:
+        cutoff = now_sec - self.window_seconds + 1
+        for second_key in [key for key in self._overall if key < cutoff]:
+            del self._overall[second_key]
+        for key in list(self._by_key):
+            buckets = self._by_key[key]
+            for second_key in [item for item in buckets if item < cutoff]:
+                del buckets[second_key]
+            if not buckets:
+                del self._by_key[key]
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _verify(rng: random.Random) -> int:
+    clock = _FakeClock()
+    window = _RollingTrafficWindow(10, clock=clock)
+    reference = _DictBucketWindow(10, clock=clock)
+    keys = ['30509', '18511', '18507', 'fcs_states', 'planning_telemetry', None]
+    checks = 0
+    for step in range(20000):
+        # 多数时间在同一秒内累加，偶尔跨秒或长时间空闲
+        roll = rng.random()
+        if roll < 0.02:
+            clock.now += rng.uniform(0.5, 3.0)
+        elif roll < 0.025:
+            clock.now += rng.uniform(10.0, 40.0)
+        key = rng.choice(keys)
+        payload = rng.randrange(0, 2000)
+        packets = rng.randrange(1, 4)
+        window.add(key, payload, payload + 8 * packets, packets=packets)
+        reference.add(key, payload, payload + 8 * packets, packets=packets)
+        if step % 97 == 0:
+            if window.snapshot() != reference.snapshot():
+                raise AssertionError(f'窗口快照不一致 step={step} now={clock.now}')
+            checks += 1
+    return checks
+
+
+def _per_call_us(func, number: int) -> float:
+    return timeit.timeit(func, number=number) / number * 1e6
+
+
+def _bench_monitor(window_cls, calls: int) -> Dict[str, float]:
+    monitor = RuntimeTrafficMonitor()
+    for attr in _WINDOW_ATTRS:
+        setattr(monitor, attr, window_cls(monitor.window_seconds))
+    # 预热出若干统计键，接近实际运行时的键数
+    for port in (30509, 18511, 18507, 18506):
+        monitor.record_rx_datagram(port, 160)
+    message = {'type': 'fcs_states', 'func_code': 0x42, 'payload_size': 245, 'frame_size': 253}
+    batch = [dict(message, type=msg_type) for msg_type in ('fcs_states', 'fcs_pwms', 'fcs_datactrl', 'fcs_gncbus')]
+    for item in batch:
+        monitor.record_parsed_message(item)
+
+    return {
+        'record_rx_datagram_us': round(_per_call_us(lambda: monitor.record_rx_datagram(30509, 253), calls), 3),
+        'record_parsed_message_us': round(_per_call_us(lambda: monitor.record_parsed_message(message), calls), 3),
+        'record_parsed_batch4_us': round(_per_call_us(lambda: monitor.record_parsed_batch(batch), calls // 4), 3),
+        'snapshot_us': round(_per_call_us(monitor.snapshot, 2000), 3),
+    }
+
+
+def run_benchmark(calls: int = DEFAULT_CALLS) -> Iterator[dict]:
+    legacy = _bench_monitor(_DictBucketWindow, calls)
+    ring = _bench_monitor(_RollingTrafficWindow, calls)
+    for name in legacy:
+        yield {
+            'metric': name,
+            'dict_buckets_us': legacy[name],
+            'ring_slots_us': ring[name],
+            'speedup': round(legacy[name] / ring[name], 2) if ring[name] else None,
+        }
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks traffic_monitor', description='RuntimeTrafficMonitor 滚动窗口一致性校验与微基准',
+    )
+    parser.add_argument('--calls', type=int, default=DEFAULT_CALLS, help='每项调用次数')
+    parser.add_argument('--seed', type=int, default=20260419)
+    parser.add_argument('--output', type=Path, help='完整报告（JSON）写入路径')
+    return parser
+
+
+def main(argv: List[str]) -> int:
+    args = _build_parser().parse_args(argv[1:])
+    checks = _verify(random.Random(args.seed))
+    report_results(RESULT_SCHEMA, run_benchmark(args.calls), args.output, {'verified_snapshots': checks})
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main(sys.argv))
@@ -11,25 +11,10 @@ from typing import Any, Dict, Iterable, List, Optional
 
 import numpy as np
 
-logger = logging.getLogger(__name__)
+from protocol.link_quality import EXPECTED_PERIOD_MS
 
+logger = logging.getLogger(__name__)
 
-EXPECTED_PERIOD_MS = {
-    0x41: 20.0,
-    0x42: 20.0,
-    0x43: 20.0,
-    0x44: 20.0,
-    0x45: 20.0,
-    0x46: 20.0,
-    0x47: 20.0,
-    0x48: 20.0,
-    0x49: 20.0,
-    0x4A: 20.0,
-    0x50: 100.0,
-    0x52: 100.0,
-    0x53: 500.0,
-    0x71: 100.0,
-}
 
 BUS_CAPACITY_BYTES_PER_SEC = 1_250_000.0
 
@@ -465,6 +450,12 @@ class RealTimeCalculator:
         if pos_x is None or pos_y is None or pos_z is None:
             return None
 
+        # 0x71 实时数据为展平坐标 [x0, y0, z0, x1, ...]，整段向量化求最近距离
+        flat_points = payload.get('local_path_flat') or payload.get('global_path_flat')
+        if isinstance(flat_points, list) and len(flat_points) >= 3:
+            points = np.asarray(flat_points[:len(flat_points) - len(flat_points) % 3], dtype=float).reshape(-1, 3)
+            return float(np.sqrt(((points - (pos_x, pos_y, pos_z)) ** 2).sum(axis=1)).min())
+
         path_points = payload.get('local_path') or payload.get('local_traj') or payload.get('global_path') or []
         if not isinstance(path_points, list) or not path_points:
             return None
@@ -2,6 +2,7 @@
 地面站配置管理
 """
 
+import json
 import logging
 import os
 from dataclasses import dataclass, field
@@ -30,6 +31,17 @@ def _env_int(name: str, default: int) -> int:
         return default
 
 
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name, "").strip()
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning("环境变量 %s=%r 不是合法数值，继续使用默认值 %s", name, value, default)
+        return default
+
+
 def _env_port_list(name: str, default: list[int]) -> list[int]:
     raw = os.getenv(name, "").strip()
     if not raw:
@@ -54,6 +66,103 @@ FIXED_COMMAND_SOURCE_PORT = _env_int("GCS_COMMAND_SOURCE_PORT", 18506)
 FIXED_TARGET_IP = _env_str("GCS_TARGET_IP", "192.168.16.13" if _LOCAL_TEST else "192.168.16.116")
 FIXED_TARGET_PORT = _env_int("GCS_TARGET_PORT", 18504)
 
+# UDP 接收模式：
+# - asyncio: 各监听端口由事件循环的 DatagramProtocol 接收（默认）
+# - thread: 独立接收线程持有全部监听 socket，线程内解析后按批次投递回事件循环
+# - process: 独立接收进程校验帧后写入共享内存环形缓冲，主进程轮询读出
+UDP_INGEST_MODES = ("asyncio", "thread", "process")
+FIXED_INGEST_MODE = _env_str("GCS_UDP_INGEST_MODE", "asyncio").lower()
+if FIXED_INGEST_MODE not in UDP_INGEST_MODES:
+    logger.warning("环境变量 GCS_UDP_INGEST_MODE=%r 不受支持，继续使用 asyncio 接收模式", FIXED_INGEST_MODE)
+    FIXED_INGEST_MODE = "asyncio"
+# thread 模式下每个端口的 SO_REUSEPORT 分片数（每个分片一个接收线程），1 为不分片
+FIXED_RECEIVE_SHARDS = min(16, max(1, _env_int("GCS_UDP_RECEIVE_SHARDS", 1)))
+# process 模式下环形缓冲每个定长功能字 lane 的槽位数
+FIXED_INGEST_RING_SLOTS = max(16, _env_int("GCS_INGEST_RING_SLOTS", 1024))
+
+# 原始数据包采样追踪（运行时可经 /api/trace/config 修改）
+FIXED_PACKET_TRACE_ENABLED = _env_str("GCS_PACKET_TRACE", "0").lower() in ("1", "true", "yes")
+FIXED_PACKET_TRACE_SAMPLE_RATE = min(1.0, max(0.0, _env_float("GCS_PACKET_TRACE_SAMPLE_RATE", 1.0)))
+FIXED_PACKET_TRACE_RING_SIZE = max(1, _env_int("GCS_PACKET_TRACE_RING_SIZE", 256))
+
+# 录制期间同时把原始 UDP datagram 写入会话目录下的 .gcscap 抓包文件（默认开启）
+FIXED_RAW_CAPTURE_ENABLED = _env_str("GCS_RAW_CAPTURE", "1").lower() in ("1", "true", "yes")
+
+def _env_rate_limits(name: str) -> dict[int, tuple[float, float]]:
+    """解析 "键:速率[:容量],..." 形式的限流配置，键可写十六进制（如 0x71:200:50）"""
+    raw = os.getenv(name, "").strip()
+    limits: dict[int, tuple[float, float]] = {}
+    for part in raw.split(","):
+        text = part.strip()
+        if not text:
+            continue
+        try:
+            fields = text.split(":")
+            rate = float(fields[1])
+            burst = float(fields[2]) if len(fields) > 2 else rate
+            limits[int(fields[0], 0)] = (rate, burst)
+        except (IndexError, ValueError):
+            logger.warning("环境变量 %s 中存在非法限流项 %r，已忽略", name, text)
+    return limits
+
+
+# UDP 接收入口限流：按端口 / 功能字的令牌桶，在解析前丢弃超额 datagram（运行时可经 /api/ingress/config 修改）
+FIXED_INGRESS_LIMIT_ENABLED = _env_str("GCS_INGRESS_LIMIT", "0").lower() in ("1", "true", "yes")
+FIXED_INGRESS_PORT_LIMITS = _env_rate_limits("GCS_INGRESS_PORT_LIMITS")
+FIXED_INGRESS_FUNC_LIMITS = _env_rate_limits("GCS_INGRESS_FUNC_LIMITS")
+
+def pipeline_stage_settings(stage: str, maxsize: int, batch_size: int, workers: int = 1) -> dict[str, int]:
+    """后台处理管线阶段参数：环境变量 GCS_PIPELINE_<阶段>_QUEUE / _BATCH / _WORKERS 覆盖代码中的默认值"""
+    prefix = f"GCS_PIPELINE_{stage.upper()}"
+    return {
+        "maxsize": max(1, _env_int(f"{prefix}_QUEUE", maxsize)),
+        "batch_size": max(1, _env_int(f"{prefix}_BATCH", batch_size)),
+        "workers": min(16, max(1, _env_int(f"{prefix}_WORKERS", workers))),
+    }
+
+
+def _env_json_object(name: str) -> dict[str, Any]:
+    """解析 JSON 对象形式的环境变量，非法时告警并返回空字典"""
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return {}
+    try:
+        value = json.loads(raw)
+    except ValueError as exc:
+        logger.warning("环境变量 %s 不是合法 JSON，已忽略: %s", name, exc)
+        return {}
+    if not isinstance(value, dict):
+        logger.warning("环境变量 %s 应为 JSON 对象，已忽略", name)
+        return {}
+    return value
+
+
+# 按消费方的消息抽稀规则，合并到内置缺省规则之上（运行时可经 /api/pipeline/decimation 修改），
+# 例如 GCS_DECIMATION_RULES='{"websocket": {"fcs_states": {"max_rate_hz": 5}}}'
+FIXED_DECIMATION_RULES = _env_json_object("GCS_DECIMATION_RULES")
+
+
+# 事件循环实现：
+# - auto: 已安装 uvloop 时使用 uvloop，否则使用标准 asyncio（默认）
+# - uvloop: 要求使用 uvloop，未安装时静默回退到 asyncio
+# - asyncio: 始终使用标准 asyncio
+EVENT_LOOP_IMPLS = ("auto", "asyncio", "uvloop")
+FIXED_EVENT_LOOP = _env_str("GCS_EVENT_LOOP", "auto").lower()
+if FIXED_EVENT_LOOP not in EVENT_LOOP_IMPLS:
+    logger.warning("环境变量 GCS_EVENT_LOOP=%r 不受支持，继续使用 auto", FIXED_EVENT_LOOP)
+    FIXED_EVENT_LOOP = "auto"
+
+
+def resolve_event_loop(preferred: str = FIXED_EVENT_LOOP) -> str:
+    """把事件循环配置解析为实际可用的实现名（uvloop / asyncio），供 uvicorn.run(loop=...) 使用"""
+    if preferred == "asyncio":
+        return "asyncio"
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        return "asyncio"
+    return "uvloop"
+
 @dataclass
 class UDPConfig:
     """UDP通信配置"""
@@ -66,6 +175,11 @@ class UDPConfig:
     target_ip: str = FIXED_TARGET_IP
     target_port: int = FIXED_TARGET_PORT
 
+    # 接收模式（asyncio / thread / process）
+    ingest_mode: str = FIXED_INGEST_MODE
+    receive_shards: int = FIXED_RECEIVE_SHARDS
+    ingest_ring_slots: int = FIXED_INGEST_RING_SLOTS
+
 class Config:
     """全局配置单例"""
     
@@ -98,6 +212,9 @@ class Config:
         # 默认发送目标（飞控IP和端口）
         self.udp_config.target_ip = FIXED_TARGET_IP
         self.udp_config.target_port = FIXED_TARGET_PORT
+        self.udp_config.ingest_mode = FIXED_INGEST_MODE
+        self.udp_config.receive_shards = FIXED_RECEIVE_SHARDS
+        self.udp_config.ingest_ring_slots = FIXED_INGEST_RING_SLOTS
         
     def get_udp_config(self) -> UDPConfig:
         """获取UDP配置"""
@@ -126,6 +243,9 @@ class Config:
         self.udp_config.listen_ports = FIXED_LISTEN_PORTS.copy()
         self.udp_config.target_ip = FIXED_TARGET_IP
         self.udp_config.target_port = FIXED_TARGET_PORT
+        self.udp_config.ingest_mode = FIXED_INGEST_MODE
+        self.udp_config.receive_shards = FIXED_RECEIVE_SHARDS
+        self.udp_config.ingest_ring_slots = FIXED_INGEST_RING_SLOTS
     
     def print_config(self):
         """打印当前配置"""
@@ -135,6 +255,9 @@ class Config:
         print(f"接收配置: {self.udp_config.listen_host}:{self.udp_config.listen_port}")
         print(f"监听端口列表: {self.udp_config.listen_ports}")
         print(f"发送目标: {self.udp_config.target_ip}:{self.udp_config.target_port}")
+        print(f"接收模式: {self.udp_config.ingest_mode}")
+        if self.udp_config.ingest_mode == "thread" and self.udp_config.receive_shards > 1:
+            print(f"接收分片: {self.udp_config.receive_shards} (SO_REUSEPORT)")
         print("=" * 60)
 
 
@@ -1,3 +1,3 @@
-from .standard_event import build_standard_event
+from .standard_event import LazyStandardEvent, build_standard_event, next_event_id
 
-__all__ = ['build_standard_event']
\ No newline at end of file
+__all__ = ['LazyStandardEvent', 'build_standard_event', 'next_event_id']
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from hashlib import sha1
+import itertools
+import os
+import time
 from typing import Any, Dict
 
 
@@ -97,6 +99,8 @@ EVENT_DESCRIPTOR_MAP = {
     },
 }
 
+SCHEMA_VERSION = 'canonical-event-v1'
+
 HIGH_FREQUENCY_ROUTING_KEYS = {
     'fcs_pwms',
     'fcs_states',
@@ -118,9 +122,14 @@ def _extract_sequence(payload: Dict[str, Any]) -> Any:
     return None
 
 
-def _build_event_id(msg_type: str, func_code_hex: str, occurred_at_ms: int, sequence: Any) -> str:
-    fingerprint = f'{msg_type}|{func_code_hex}|{occurred_at_ms}|{sequence}'
-    return sha1(fingerprint.encode('utf-8')).hexdigest()[:16]
+# 事件 ID = 进程纪元前缀（启动时刻毫秒 + pid，十六进制）+ 进程内单调递增序号。
+# 前缀保证重启后及多进程间不重复，序号生成只是一次 itertools.count 自增（GIL 下线程安全）。
+EVENT_ID_PREFIX = f'{time.time_ns() // 1_000_000:x}-{os.getpid():x}-'
+_event_sequence = itertools.count(1)
+
+
+def next_event_id() -> str:
+    return f'{EVENT_ID_PREFIX}{next(_event_sequence):x}'
 
 
 def _infer_priority(msg_type: str) -> str:
@@ -129,6 +138,12 @@ def _infer_priority(msg_type: str) -> str:
 
 def build_standard_event(message: Dict[str, Any], transport: str = 'udp') -> Dict[str, Any]:
     msg_type = str(message.get('type') or 'unknown')
+    event = {'schema_version': SCHEMA_VERSION, 'routing_key': msg_type}
+    _fill_standard_event(event, message, msg_type, transport)
+    return event
+
+
+def _fill_standard_event(event: Dict[str, Any], message: Dict[str, Any], msg_type: str, transport: str) -> None:
     descriptor = EVENT_DESCRIPTOR_MAP.get(msg_type, EVENT_DESCRIPTOR_MAP['unknown'])
     func_code = int(message.get('func_code', 0) or 0)
     func_code_hex = str(message.get('func_code_hex') or f'0x{func_code:02X}')
@@ -137,14 +152,12 @@ def build_standard_event(message: Dict[str, Any], transport: str = 'udp') -> Dic
     port_type_name = _normalize_port_type(message.get('port_type'))
     sequence = _extract_sequence(payload)
 
-    return {
-        'schema_version': 'canonical-event-v1',
-        'event_id': _build_event_id(msg_type, func_code_hex, occurred_at_ms, sequence),
+    dict.update(event, {
+        'event_id': next_event_id(),
         'event_type': descriptor['event_type'],
         'category': descriptor['category'],
         'domain': descriptor['domain'],
         'producer': descriptor['producer'],
-        'routing_key': msg_type,
         'priority': _infer_priority(msg_type),
         'occurred_at_ms': occurred_at_ms,
         'sequence': sequence,
@@ -162,4 +175,99 @@ def build_standard_event(message: Dict[str, Any], transport: str = 'udp') -> Dic
             'skip_recording': bool(message.get('skip_recording')),
         },
         'payload': payload,
-    }
\ No newline at end of file
+    })
+
+
+class LazyStandardEvent(dict):
+    """延迟构造的标准事件
+
+    创建时只写入 schema_version 与 routing_key（OnlineAnalysis 路由与合并只需要这两项），
+    其余字段在首次被读取（WebSocket 序列化、OnlineAnalysis 转发）时才从原始消息构造，
+    event_id 也在那时分配。被 WebSocket 最新值合并覆盖、或无人消费的事件因此不产生任何开销。
+    对外行为与普通 dict 一致，做法同 protocol.nclink_protocol.DecodedMessage。
+    """
+    __slots__ = ('_message', '_transport')
+
+    def __init__(self, message: Dict[str, Any], transport: str = 'udp'):
+        msg_type = str(message.get('type') or 'unknown')
+        super().__init__(schema_version=SCHEMA_VERSION, routing_key=msg_type)
+        self._message = message
+        self._transport = transport
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._message is None
+
+    def materialize(self) -> 'LazyStandardEvent':
+        message = self._message
+        if message is not None:
+            # 先写入字段再清除 _message：并发读取方在写入完成前仍会自行展开，不会读到缺失字段
+            _fill_standard_event(self, message, dict.__getitem__(self, 'routing_key'), self._transport)
+            self._message = None
+        return self
+
+    def __missing__(self, key):
+        if self._message is not None:
+            return dict.__getitem__(self.materialize(), key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if self._message is not None and not dict.__contains__(self, key):
+            self.materialize()
+        return dict.get(self, key, default)
+
+    def __contains__(self, key) -> bool:
+        if self._message is not None and not dict.__contains__(self, key):
+            self.materialize()
+        return dict.__contains__(self, key)
+
+    def __setitem__(self, key, value) -> None:
+        dict.__setitem__(self.materialize(), key, value)
+
+    def __iter__(self):
+        return dict.__iter__(self.materialize())
+
+    def __len__(self) -> int:
+        return dict.__len__(self.materialize())
+
+    def __bool__(self) -> bool:
+        return True
+
+    def keys(self):
+        return dict.keys(self.materialize())
+
+    def values(self):
+        return dict.values(self.materialize())
+
+    def items(self):
+        return dict.items(self.materialize())
+
+    def pop(self, key, *default):
+        return dict.pop(self.materialize(), key, *default)
+
+    def setdefault(self, key, default=None):
+        return dict.setdefault(self.materialize(), key, default)
+
+    def update(self, *args, **kwargs) -> None:
+        dict.update(self.materialize(), *args, **kwargs)
+
+    def copy(self) -> dict:
+        return dict(self.materialize())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyStandardEvent):
+            other.materialize()
+        return dict.__eq__(self.materialize(), other)
+
+    def __ne__(self, other) -> bool:
+        if isinstance(other, LazyStandardEvent):
+            other.materialize()
+        return dict.__ne__(self.materialize(), other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return dict.__repr__(self.materialize())
+
+    def __reduce__(self):
+        return dict, (dict(self.materialize()),)
@@ -15,6 +15,7 @@ from typing import Any, Dict, Optional
 
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 
 def _configure_console_encoding() -> None:
@@ -41,9 +42,17 @@ for candidate_path in (SCRIPT_DIR, RESOURCE_PYTHON_ROOT):
     if candidate_path and candidate_path not in sys.path:
         sys.path.insert(0, candidate_path)
 
-from app_models import CommandRequest, ConnectionConfig, LogConfig, RecordingConfig
-from config import config
-from events import build_standard_event
+from app_models import (
+    CommandRequest,
+    ConnectionConfig,
+    DecimationConfig,
+    IngressLimitConfig,
+    LogConfig,
+    PacketTraceConfig,
+    RecordingConfig,
+)
+from config import FIXED_RAW_CAPTURE_ENABLED, config, pipeline_stage_settings, resolve_event_loop
+from events import LazyStandardEvent
 from online_analysis_adapter import (
     build_online_analysis_ingest_envelope as _build_online_analysis_ingest_envelope,
     create_embedded_online_analysis_service as _create_embedded_online_analysis_service,
@@ -52,7 +61,6 @@ from online_analysis_adapter import (
     ingest_online_analysis_sync as _ingest_online_analysis_sync,
     is_online_analysis_embedded as _is_online_analysis_embedded,
     is_online_analysis_sidecar as _is_online_analysis_sidecar,
-    should_forward_to_online_analysis as _should_forward_to_online_analysis,
 )
 from payload_builders import (
     build_command_log_params as _build_command_log_params,
@@ -63,6 +71,16 @@ from payload_builders import (
     build_ws_payload as _build_ws_payload,
     normalize_log_value as _normalize_log_value,
 )
+from pipeline import (
+    CONSUMER_LEGACY_LOG,
+    CONSUMER_ONLINE_ANALYSIS,
+    CONSUMER_RECORDER,
+    CONSUMER_WEBSOCKET,
+    DROP_POLICY_COALESCE,
+    PipelineStage,
+    StagePipeline,
+    decimation_policy,
+)
 from protocol.nclink_protocol import (
     NCLINK_GCS_COMMAND,
     NCLINK_SEND_EXTU_FCS,
@@ -71,13 +89,25 @@ from protocol.nclink_protocol import (
     encode_gcs_command,
     encode_waypoints_upload,
 )
+from protocol.data_age import data_age_tracker
+from protocol.ingress_limit import ingress_limiter
+from protocol.packet_trace import packet_tracer
 from protocol.protocol_parser import UDPHandler
 from recorder import RawDataRecorder
+from recorder.raw_capture import DEFAULT_CAPTURE_FILENAME
 from recorder.csv_helper_full import get_data_for_type, get_full_header
-from routes import create_config_router, create_general_router, create_operations_router
+from routes import (
+    create_config_router,
+    create_general_router,
+    create_ingress_router,
+    create_operations_router,
+    create_pipeline_router,
+    create_trace_router,
+)
 from runtime_helpers import (
     build_default_session_id as _build_default_session_id,
     cache_ws_snapshot as _runtime_cache_ws_snapshot,
+    get_ingest_status as _runtime_get_ingest_status,
     get_pipeline_status as _runtime_get_pipeline_status,
     get_transport_runtime_stats as _runtime_get_transport_runtime_stats,
     resolve_command_channel as _runtime_resolve_command_channel,
@@ -99,18 +129,6 @@ ONLINE_ANALYSIS_PROJECT_ROOT = os.path.abspath(
 )
 ONLINE_ANALYSIS_BASE_URL = os.getenv('ONLINE_ANALYSIS_BASE_URL', 'http://127.0.0.1:8010').rstrip('/')
 ONLINE_ANALYSIS_TIMEOUT_MS = max(int(os.getenv('ONLINE_ANALYSIS_TIMEOUT_MS', '250') or 250), 50)
-ONLINE_ANALYSIS_FORWARD_TYPES = {
-    'fcs_states',
-    'fcs_pwms',
-    'fcs_datactrl',
-    'fcs_gncbus',
-    'fcs_datagcs',
-    'planning_telemetry',
-    'lidar_obstacles',
-    'lidar_performance',
-    'lidar_status',
-    'avoiflag',
-}
 
 
 def _build_fixed_connection_config() -> ConnectionConfig:
@@ -190,24 +208,9 @@ manager = WebSocketManager()
 udp_handler: Optional[UDPHandler] = None
 udp_server_started = False
 heartbeat_task: Optional[asyncio.Task] = None
-packet_processing_queue: Optional[asyncio.Queue] = None
-packet_processing_task: Optional[asyncio.Task] = None
-recording_queue: Optional[asyncio.Queue] = None
-recording_task: Optional[asyncio.Task] = None
-online_analysis_queue: Optional[asyncio.Queue] = None
-online_analysis_task: Optional[asyncio.Task] = None
 recording_active = False
 current_session_id: Optional[str] = None
 recorder: Optional[RawDataRecorder] = None
-pending_latest_packets: Dict[str, dict] = {}
-pending_online_analysis_packets: Dict[str, dict] = {}
-packet_drop_counters: Dict[str, int] = {
-    'processing_queue_full': 0,
-    'processing_queue_coalesced': 0,
-    'recording_queue_full': 0,
-    'online_analysis_queue_full': 0,
-    'online_analysis_queue_coalesced': 0,
-}
 
 HEARTBEAT_FUNC_CODE = 0x00
 HEARTBEAT_INTERVAL_SEC = 10.0
@@ -251,33 +254,12 @@ cached_pid_params = {
     'XaccLMT': 1.0, 'YaccLMT': 1.0, 'Hground': 0.4, 'AutoTakeoffHcmd': 10.0,
 }
 
-last_broadcast_times: Dict[str, float] = {}
-
-BROADCAST_INTERVALS = {
-    'fcs_states': 0.05,
-    'fcs_pwms': 0.05,
-    'fcs_datactrl': 0.05,
-    'fcs_gncbus': 0.05,
-    'fcs_esc': 0.10,
-    'fcs_datagcs': 0.10,
-    'fcs_param': 0.20,
-    'fcs_line_aim2ab': 0.10,
-    'fcs_line_ab': 0.10,
-    'avoiflag': 0.10,
-    'planning_telemetry': 0.10,
-    'heartbeat_ack': 1.00,
-}
-
 PACKET_PROCESSING_QUEUE_MAXSIZE = 2048
 RECORDING_QUEUE_MAXSIZE = 8192
 PACKET_PROCESSING_BATCH_SIZE = 64
 RECORDING_BATCH_SIZE = 32
 ONLINE_ANALYSIS_QUEUE_MAXSIZE = 256
 ONLINE_ANALYSIS_BATCH_SIZE = 8
-HIGH_FREQUENCY_PACKET_TYPES = {
-    msg_type for msg_type, interval in BROADCAST_INTERVALS.items()
-    if 0 < interval <= 0.10 and msg_type != 'heartbeat_ack'
-}
 
 
 def _normalize_listen_ports() -> list[int]:
@@ -298,7 +280,7 @@ def _normalize_listen_ports() -> list[int]:
 
 async def _forward_to_online_analysis(envelope: dict[str, Any]) -> None:
     routing_key = _get_online_analysis_routing_key(envelope)
-    if not _should_forward_to_online_analysis(ONLINE_ANALYSIS_ENABLED, routing_key, ONLINE_ANALYSIS_FORWARD_TYPES):
+    if not ONLINE_ANALYSIS_ENABLED or not decimation_policy.accepts(CONSUMER_ONLINE_ANALYSIS, routing_key):
         return
 
     try:
@@ -311,6 +293,8 @@ async def _forward_to_online_analysis(envelope: dict[str, Any]) -> None:
             timeout_ms=ONLINE_ANALYSIS_TIMEOUT_MS,
             service=online_analysis_service,
         )
+        message = envelope.get('data') or {}
+        data_age_tracker.record_message('online_analysis', message)
         online_analysis_runtime['last_forward_ok_at'] = int(time.time() * 1000)
         online_analysis_runtime['last_error'] = ''
 
@@ -325,103 +309,39 @@ async def _forward_to_online_analysis(envelope: dict[str, Any]) -> None:
         online_analysis_runtime['last_error'] = str(exc)
 
 
-def _build_pipeline_control_message(control_type: str) -> dict[str, Any]:
-    return {
-        '__pipeline_control__': control_type,
-        'future': asyncio.get_running_loop().create_future(),
-    }
-
-
-def _is_pipeline_control_message(message: Any) -> bool:
-    return isinstance(message, dict) and '__pipeline_control__' in message
-
-
-async def _await_queue_barrier(queue: Optional[asyncio.Queue]) -> None:
-    if queue is None:
-        return
-
-    barrier_message = _build_pipeline_control_message('barrier')
-    future = barrier_message['future']
-    await queue.put(barrier_message)
-    await future
-
-
-def _flush_pending_online_analysis_packets_to_queue() -> None:
-    if online_analysis_queue is None or online_analysis_queue.full() or not pending_online_analysis_packets:
-        return
-
-    for msg_type in list(pending_online_analysis_packets.keys()):
-        if online_analysis_queue.full():
-            break
-        online_analysis_queue.put_nowait(pending_online_analysis_packets.pop(msg_type))
-
-
 def _enqueue_online_analysis_message(payload: dict[str, Any]) -> None:
-    if online_analysis_queue is None:
+    if not pipeline['online_analysis'].offer(payload):
         asyncio.create_task(_forward_to_online_analysis(payload))
-        return
 
-    msg_type = _get_online_analysis_routing_key(payload) or 'unknown'
-    try:
-        online_analysis_queue.put_nowait(payload)
-    except asyncio.QueueFull:
-        if _is_high_frequency_packet(msg_type):
-            pending_online_analysis_packets[msg_type] = payload
-            packet_drop_counters['online_analysis_queue_coalesced'] += 1
-            if packet_drop_counters['online_analysis_queue_coalesced'] % 200 == 0:
-                logger.warning(
-                    'OnlineAnalysis 高频消息正在合并以限制积压: coalesced=%d queue=%d pending=%d',
-                    packet_drop_counters['online_analysis_queue_coalesced'],
-                    online_analysis_queue.qsize(),
-                    len(pending_online_analysis_packets),
-                )
-            return
 
-        packet_drop_counters['online_analysis_queue_full'] += 1
-        if packet_drop_counters['online_analysis_queue_full'] % 50 == 0:
-            logger.warning(
-                'OnlineAnalysis 队列已满，丢弃消息: dropped=%d type=%s queue=%d',
-                packet_drop_counters['online_analysis_queue_full'],
-                msg_type,
-                online_analysis_queue.qsize(),
-            )
+def _cache_ws_snapshot(payload: dict, cache_key: str) -> dict:
+    return _runtime_cache_ws_snapshot(manager, payload, cache_key)
 
 
-def _is_high_frequency_packet(msg_type: str) -> bool:
-    return msg_type in HIGH_FREQUENCY_PACKET_TYPES
+def _get_pipeline_status() -> dict:
+    status = _runtime_get_pipeline_status(pipeline.snapshot())
+    # 各阶段数据自 UDP 到达（及自处理阶段取出）以来的时延，用于定位显示滞后来自网络、队列还是 WebSocket；
+    # 按消息类型的明细见 /api/pipeline/latency
+    status['data_age'] = data_age_tracker.snapshot()
+    return status
 
 
-def _cache_ws_snapshot(payload: dict, cache_key: str) -> dict:
-    return _runtime_cache_ws_snapshot(manager, payload, cache_key)
+def _record_broadcast_age(payloads: list[dict]) -> None:
+    data_age_tracker.record_messages('broadcast', [payload.get('data') for payload in payloads])
 
 
-def _get_pipeline_status() -> dict:
-    return _runtime_get_pipeline_status(
-        packet_processing_queue,
-        recording_queue,
-        online_analysis_queue,
-        pending_latest_packets,
-        pending_online_analysis_packets,
-        packet_drop_counters,
-    )
+def _stamp_processing(messages: list[dict]) -> None:
+    """处理阶段取出时打上 processed_ns，作为后续各阶段时延的起点"""
+    now_ns = time.monotonic_ns()
+    for message in messages:
+        message['processed_ns'] = now_ns
+    data_age_tracker.record_messages('processing', messages, now_ns)
 
 
 def _get_transport_runtime_stats() -> dict:
     return _runtime_get_transport_runtime_stats(udp_handler, _build_empty_recent_traffic_snapshot())
 
 
-def _should_broadcast_packet(msg_type: str, func_code: int, current_time: float) -> bool:
-    key = msg_type or f'func_{func_code:02X}'
-    interval = BROADCAST_INTERVALS.get(msg_type, 0.0)
-    if interval <= 0:
-        return True
-    last_time = last_broadcast_times.get(key, 0.0)
-    if current_time - last_time < interval:
-        return False
-    last_broadcast_times[key] = current_time
-    return True
-
-
 def save_data_to_log(category: str, message: dict) -> None:
     global log_file_handles, log_write_counters
 
@@ -532,279 +452,213 @@ async def _heartbeat_loop() -> None:
         raise
 
 
+def _build_udp_payload(message: dict) -> dict:
+    # 标准事件只在 WebSocket 序列化或 OnlineAnalysis 转发时才展开
+    return _build_ws_payload(
+        'udp_data',
+        data=message,
+        session_id=current_session_id,
+        case_id=getattr(recorder, 'case_id', None) if recorder else None,
+        timestamp=message.get('timestamp', int(time.time() * 1000)),
+        extra={'standard_event': LazyStandardEvent(message)},
+    )
+
+
 def _prepare_udp_message_result(message: dict) -> dict:
-    msg_type = message.get('type', 'unknown')
-    func_code = int(message.get('func_code', 0) or 0)
-    current_time = time.time()
-    standard_event = build_standard_event(message)
+    """按各消费方的抽稀规则决定这条消息的去向；未放行的消费方不构造任何载荷"""
+    msg_type = str(message.get('type') or 'unknown')
+    now = time.monotonic()
 
-    should_broadcast = _should_broadcast_packet(msg_type, func_code, current_time)
     payload = None
     cache_key = None
-    if should_broadcast:
-        payload = _build_ws_payload(
-            'udp_data',
-            data=message,
-            session_id=current_session_id,
-            case_id=getattr(recorder, 'case_id', None) if recorder else None,
-            timestamp=message.get('timestamp', int(current_time * 1000)),
-            extra={'standard_event': standard_event},
-        )
+    websocket_rule = decimation_policy.admit(CONSUMER_WEBSOCKET, msg_type, now)
+    if websocket_rule is not None:
+        payload = _build_udp_payload(decimation_policy.project(websocket_rule, message))
         cache_key = f'udp_data:{msg_type}'
 
+    forward_payload = None
+    if ONLINE_ANALYSIS_ENABLED:
+        forward_rule = decimation_policy.admit(CONSUMER_ONLINE_ANALYSIS, msg_type, now)
+        if forward_rule is not None:
+            if payload is not None and forward_rule.fields == websocket_rule.fields:
+                forward_payload = payload
+            else:
+                forward_payload = _build_udp_payload(decimation_policy.project(forward_rule, message))
+
+    record_entry = None
+    recorder_message = None
+    log_message = None
+    if recording_active and recorder:
+        recorder_rule = decimation_policy.admit(CONSUMER_RECORDER, msg_type, now)
+        if recorder_rule is not None:
+            recorder_message = decimation_policy.project(recorder_rule, message)
+    if log_config.autoRecord:
+        log_rule = decimation_policy.admit(CONSUMER_LEGACY_LOG, msg_type, now)
+        if log_rule is not None:
+            log_message = decimation_policy.project(log_rule, message)
+    if recorder_message is not None or log_message is not None:
+        record_entry = {'type': msg_type, CONSUMER_RECORDER: recorder_message, CONSUMER_LEGACY_LOG: log_message}
+
     return {
         'msg_type': msg_type,
         'payload': payload,
         'cache_key': cache_key,
-        'standard_event': standard_event,
-        'should_forward': bool(
-            payload and _should_forward_to_online_analysis(ONLINE_ANALYSIS_ENABLED, msg_type, ONLINE_ANALYSIS_FORWARD_TYPES)
-        ),
+        'forward_payload': forward_payload,
+        'record_entry': record_entry,
     }
 
 
-def _record_udp_message_sync(message: dict) -> None:
-    msg_type = message.get('type', 'unknown')
-
-    if recording_active and recorder:
+def _record_udp_message_sync(entry: dict) -> None:
+    """录制阶段：entry 由处理阶段按录制器 / 旧版日志的抽稀规则生成"""
+    message = entry.get(CONSUMER_RECORDER)
+    if message is not None and recording_active and recorder:
         recorder.record_decoded_packet(message)
+        data_age_tracker.record_message('recording', message)
 
-    if log_config.autoRecord:
-        save_data_to_log(msg_type, message)
+    log_message = entry.get(CONSUMER_LEGACY_LOG)
+    if log_message is not None and log_config.autoRecord:
+        save_data_to_log(entry['type'], log_message)
 
 
-def _record_udp_message_batch_sync(messages: list[dict]) -> None:
-    for message in messages:
-        _record_udp_message_sync(message)
+def _record_udp_message_batch_sync(entries: list[dict]) -> None:
+    for entry in entries:
+        _record_udp_message_sync(entry)
 
 
-def _flush_pending_latest_packets_to_processing_queue() -> None:
-    if packet_processing_queue is None or packet_processing_queue.full() or not pending_latest_packets:
-        return
+def _process_udp_message_inline(message: dict) -> None:
+    _stamp_processing([message])
+    result = _prepare_udp_message_result(message)
+    payload = result.get('payload')
+    cache_key = result.get('cache_key')
+    if payload and cache_key:
+        _cache_ws_snapshot(payload, cache_key)
+        manager.schedule_latest_broadcast(payload, cache_key)
+    if result.get('forward_payload'):
+        _enqueue_online_analysis_message(result['forward_payload'])
+    if result.get('record_entry'):
+        _record_udp_message_sync(result['record_entry'])
 
-    for msg_type in list(pending_latest_packets.keys()):
-        if packet_processing_queue.full():
-            break
-        packet_processing_queue.put_nowait(pending_latest_packets.pop(msg_type))
 
+# 各阶段满队列时按对应消费方的 keep 规则合并：latest 的类型只保留最新一条，其余丢弃新消息。
+# 处理阶段是实时显示的上游，按 WebSocket 规则合并。
+def _processing_coalesce_key(message: dict) -> Optional[str]:
+    msg_type = str(message.get('type') or 'unknown')
+    return msg_type if decimation_policy.keeps_latest(CONSUMER_WEBSOCKET, msg_type) else None
 
-def _enqueue_processing_message(message: dict) -> None:
-    if packet_processing_queue is None:
-        result = _prepare_udp_message_result(message)
-        payload = result.get('payload')
-        cache_key = result.get('cache_key')
-        if payload and cache_key:
-            _cache_ws_snapshot(payload, cache_key)
-            manager.schedule_latest_broadcast(payload, cache_key)
-            if result.get('should_forward'):
-                _enqueue_online_analysis_message(payload)
-        if recording_active or log_config.autoRecord:
-            _record_udp_message_sync(message)
-        return
-
-    try:
-        packet_processing_queue.put_nowait(message)
-    except asyncio.QueueFull:
-        msg_type = str(message.get('type') or 'unknown')
-        if _is_high_frequency_packet(msg_type):
-            pending_latest_packets[msg_type] = message
-            packet_drop_counters['processing_queue_coalesced'] += 1
-            if packet_drop_counters['processing_queue_coalesced'] % 500 == 0:
-                logger.warning(
-                    '高频UDP消息正在合并以限制积压: coalesced=%d queue=%d pending=%d',
-                    packet_drop_counters['processing_queue_coalesced'],
-                    packet_processing_queue.qsize(),
-                    len(pending_latest_packets),
-                )
-            return
-
-        packet_drop_counters['processing_queue_full'] += 1
-        logger.warning('UDP处理队列已满，丢弃低频消息: type=%s queue=%d', msg_type, packet_processing_queue.qsize())
 
+def _recording_coalesce_key(entry: dict) -> Optional[str]:
+    msg_type = entry.get('type') or 'unknown'
+    if entry.get(CONSUMER_RECORDER) is not None and not decimation_policy.keeps_latest(CONSUMER_RECORDER, msg_type):
+        return None
+    if entry.get(CONSUMER_LEGACY_LOG) is not None and not decimation_policy.keeps_latest(CONSUMER_LEGACY_LOG, msg_type):
+        return None
+    return msg_type
 
-def _enqueue_recording_message(message: dict) -> None:
-    if recording_queue is None:
-        _record_udp_message_sync(message)
-        return
 
-    try:
-        recording_queue.put_nowait(message)
-    except asyncio.QueueFull:
-        packet_drop_counters['recording_queue_full'] += 1
-        msg_type = str(message.get('type') or 'unknown')
-        if packet_drop_counters['recording_queue_full'] % 100 == 0:
-            logger.warning(
-                '录制队列已满，开始丢弃消息: dropped=%d type=%s queue=%d',
-                packet_drop_counters['recording_queue_full'],
-                msg_type,
-                recording_queue.qsize(),
-            )
+def _online_analysis_coalesce_key(payload: dict[str, Any]) -> Optional[str]:
+    msg_type = _get_online_analysis_routing_key(payload) or 'unknown'
+    return msg_type if decimation_policy.keeps_latest(CONSUMER_ONLINE_ANALYSIS, msg_type) else None
 
 
-async def _packet_processing_loop() -> None:
-    while True:
-        message = await packet_processing_queue.get()
-        batch = [message]
-        try:
-            while len(batch) < PACKET_PROCESSING_BATCH_SIZE:
-                try:
-                    batch.append(packet_processing_queue.get_nowait())
-                except asyncio.QueueEmpty:
-                    break
-
-            for item in batch:
-                if _is_pipeline_control_message(item):
-                    item['future'].set_result(True)
-                    continue
-
-                result = _prepare_udp_message_result(item)
-                payload = result.get('payload')
-                cache_key = result.get('cache_key')
-                if payload and cache_key:
-                    _cache_ws_snapshot(payload, cache_key)
-                    manager.schedule_latest_broadcast(payload, cache_key)
-                    if result.get('should_forward'):
-                        _enqueue_online_analysis_message(payload)
-
-                if recording_active or log_config.autoRecord:
-                    _enqueue_recording_message(item)
-        except asyncio.CancelledError:
-            raise
-        except Exception as exc:
-            logger.error('后台处理UDP消息失败: %s', exc)
-        finally:
-            for _ in batch:
-                packet_processing_queue.task_done()
-            _flush_pending_latest_packets_to_processing_queue()
+def _enqueue_processing_batch(messages: list[dict]) -> None:
+    """同一 datagram 解析出的消息作为一个队列项入队，入队、满队列处理与丢弃计数每批一次"""
+    if not messages:
+        return
 
+    if not pipeline['processing'].offer(messages if len(messages) > 1 else messages[0]):
+        for message in messages:
+            _process_udp_message_inline(message)
 
-async def _recording_loop() -> None:
-    while True:
-        message = await recording_queue.get()
-        batch = [message]
-        try:
-            while len(batch) < RECORDING_BATCH_SIZE:
-                try:
-                    batch.append(recording_queue.get_nowait())
-                except asyncio.QueueEmpty:
-                    break
-
-            record_batch = []
-            for item in batch:
-                if _is_pipeline_control_message(item):
-                    item['future'].set_result(True)
-                    continue
-                record_batch.append(item)
-
-            if record_batch:
-                await asyncio.to_thread(_record_udp_message_batch_sync, record_batch)
-        except asyncio.CancelledError:
-            raise
-        except Exception as exc:
-            logger.error('后台录制UDP消息失败: %s', exc)
-        finally:
-            for _ in batch:
-                recording_queue.task_done()
 
+def _process_udp_message_batch(messages: list[dict]) -> dict[str, list]:
+    """处理阶段：按抽稀规则广播，挑出转发 OnlineAnalysis 的载荷与录制项，分别交给下游阶段"""
+    _stamp_processing(messages)
+    record_entries = []
+    forward_payloads = []
+    for message in messages:
+        result = _prepare_udp_message_result(message)
+        payload = result.get('payload')
+        cache_key = result.get('cache_key')
+        if payload and cache_key:
+            _cache_ws_snapshot(payload, cache_key)
+            manager.schedule_latest_broadcast(payload, cache_key)
+        if result.get('forward_payload'):
+            forward_payloads.append(result['forward_payload'])
+        if result.get('record_entry'):
+            record_entries.append(result['record_entry'])
 
-async def _online_analysis_loop() -> None:
-    while True:
-        message = await online_analysis_queue.get()
-        batch = [message]
-        try:
-            while len(batch) < ONLINE_ANALYSIS_BATCH_SIZE:
-                try:
-                    batch.append(online_analysis_queue.get_nowait())
-                except asyncio.QueueEmpty:
-                    break
-
-            for item in batch:
-                if _is_pipeline_control_message(item):
-                    item['future'].set_result(True)
-                    continue
-                await _forward_to_online_analysis(item)
-        except asyncio.CancelledError:
-            raise
-        except Exception as exc:
-            logger.error('后台转发 OnlineAnalysis 失败: %s', exc)
-        finally:
-            for _ in batch:
-                online_analysis_queue.task_done()
-            _flush_pending_online_analysis_packets_to_queue()
+    return {
+        'record': record_entries,
+        'online_analysis': forward_payloads,
+    }
 
 
-async def _ensure_packet_processing_pipeline() -> None:
-    global packet_processing_queue, packet_processing_task, recording_queue, recording_task
-    global online_analysis_queue, online_analysis_task
+async def _record_udp_message_batch(entries: list[dict]) -> None:
+    await asyncio.to_thread(_record_udp_message_batch_sync, entries)
 
-    if packet_processing_queue is None:
-        packet_processing_queue = asyncio.Queue(maxsize=PACKET_PROCESSING_QUEUE_MAXSIZE)
 
-    if recording_queue is None:
-        recording_queue = asyncio.Queue(maxsize=RECORDING_QUEUE_MAXSIZE)
+async def _forward_online_analysis_batch(payloads: list[dict[str, Any]]) -> None:
+    for payload in payloads:
+        await _forward_to_online_analysis(payload)
 
-    if online_analysis_queue is None:
-        online_analysis_queue = asyncio.Queue(maxsize=ONLINE_ANALYSIS_QUEUE_MAXSIZE)
 
-    if packet_processing_task is None or packet_processing_task.done():
-        packet_processing_task = asyncio.create_task(_packet_processing_loop())
+# 后台处理管线：processing -(record)-> recording
+#                         \-(online_analysis)-> online_analysis
+# 队列长度、批大小与 worker 数可由 GCS_PIPELINE_<阶段>_QUEUE / _BATCH / _WORKERS 覆盖
+pipeline = StagePipeline()
+pipeline.add_stage(PipelineStage(
+    'processing',
+    _process_udp_message_batch,
+    **pipeline_stage_settings('processing', PACKET_PROCESSING_QUEUE_MAXSIZE, PACKET_PROCESSING_BATCH_SIZE),
+    drop_policy=DROP_POLICY_COALESCE,
+    coalesce_key=_processing_coalesce_key,
+    label='UDP处理队列',
+    drain_timeout=2.0,
+))
+pipeline.add_stage(PipelineStage(
+    'recording',
+    _record_udp_message_batch,
+    **pipeline_stage_settings('recording', RECORDING_QUEUE_MAXSIZE, RECORDING_BATCH_SIZE),
+    drop_policy=DROP_POLICY_COALESCE,
+    coalesce_key=_recording_coalesce_key,
+    label='录制队列',
+    drain_timeout=5.0,
+))
+pipeline.add_stage(PipelineStage(
+    'online_analysis',
+    _forward_online_analysis_batch,
+    **pipeline_stage_settings('online_analysis', ONLINE_ANALYSIS_QUEUE_MAXSIZE, ONLINE_ANALYSIS_BATCH_SIZE),
+    drop_policy=DROP_POLICY_COALESCE,
+    coalesce_key=_online_analysis_coalesce_key,
+    label='OnlineAnalysis 队列',
+    drain_timeout=2.0,
+    warn_every=50,
+))
+pipeline.connect('processing', 'record', 'recording')
+pipeline.connect('processing', 'online_analysis', 'online_analysis')
 
-    if recording_task is None or recording_task.done():
-        recording_task = asyncio.create_task(_recording_loop())
 
-    if online_analysis_task is None or online_analysis_task.done():
-        online_analysis_task = asyncio.create_task(_online_analysis_loop())
+async def _ensure_packet_processing_pipeline() -> None:
+    pipeline.start()
 
 
 async def _stop_packet_processing_pipeline() -> None:
-    global packet_processing_task, recording_task, online_analysis_task
-
-    if packet_processing_queue is not None:
-        try:
-            await asyncio.wait_for(packet_processing_queue.join(), timeout=2.0)
-        except asyncio.TimeoutError:
-            logger.warning('UDP消息后台队列在关闭时仍有积压，继续执行停机')
+    await pipeline.stop()
 
-    if recording_queue is not None:
-        try:
-            await asyncio.wait_for(recording_queue.join(), timeout=5.0)
-        except asyncio.TimeoutError:
-            logger.warning('录制后台队列在关闭时仍有积压，继续执行停机')
 
-    if online_analysis_queue is not None:
-        try:
-            await asyncio.wait_for(online_analysis_queue.join(), timeout=2.0)
-        except asyncio.TimeoutError:
-            logger.warning('OnlineAnalysis 后台队列在关闭时仍有积压，继续执行停机')
-
-    if packet_processing_task is not None:
-        packet_processing_task.cancel()
-        try:
-            await packet_processing_task
-        except asyncio.CancelledError:
-            pass
-        packet_processing_task = None
-
-    if recording_task is not None:
-        recording_task.cancel()
-        try:
-            await recording_task
-        except asyncio.CancelledError:
-            pass
-        recording_task = None
-
-    if online_analysis_task is not None:
-        online_analysis_task.cancel()
-        try:
-            await online_analysis_task
-        except asyncio.CancelledError:
-            pass
-        online_analysis_task = None
+async def _drain_recording_pipeline() -> None:
+    await pipeline.drain(('processing', 'recording'))
 
 
-async def _drain_recording_pipeline() -> None:
-    await _await_queue_barrier(packet_processing_queue)
-    await _await_queue_barrier(recording_queue)
+def _start_raw_capture(active_recorder: RawDataRecorder) -> None:
+    """录制开始时把原始 UDP datagram 同步写入会话 records 目录下的抓包文件"""
+    if not FIXED_RAW_CAPTURE_ENABLED or udp_handler is None:
+        return
+    path = os.path.join(active_recorder.records_directory, DEFAULT_CAPTURE_FILENAME)
+    try:
+        udp_handler.start_raw_capture(path)
+    except OSError as exc:
+        logger.warning('原始数据包抓包启动失败，录制继续: %s', exc)
 
 
 async def _stop_active_recording() -> tuple[Optional[str], Optional[dict]]:
@@ -819,6 +673,8 @@ async def _stop_active_recording() -> tuple[Optional[str], Optional[dict]]:
     except Exception as exc:
         logger.warning('停止录制前排空后台队列失败，将继续执行收尾: %s', exc)
 
+    if udp_handler is not None:
+        await udp_handler.stop_raw_capture()
     session_info = recorder.get_session_info()
     await asyncio.to_thread(recorder.stop_recording)
     recording_active = False
@@ -827,7 +683,11 @@ async def _stop_active_recording() -> tuple[Optional[str], Optional[dict]]:
 
 
 def on_udp_message_received(message: dict) -> None:
-    _enqueue_processing_message(message)
+    _enqueue_processing_batch([message])
+
+
+def on_udp_messages_received(messages: list[dict]) -> None:
+    _enqueue_processing_batch(messages)
 
 
 async def send_pid_params_to_drone(pids_data: dict) -> dict:
@@ -881,6 +741,7 @@ async def handle_client_message(message: dict, websocket: WebSocket) -> None:
             recorder = RawDataRecorder(session_id, base_directory)
             recorder.enabled_ports = _normalize_listen_ports()
             await asyncio.to_thread(recorder.start_recording)
+            _start_raw_capture(recorder)
             recording_active = True
             current_session_id = session_id
             _append_session_communication_log(
@@ -937,6 +798,7 @@ async def health_check() -> dict:
         'status': 'healthy',
         'websocket_connections': manager.get_connection_count(),
         'pipeline': _get_pipeline_status(),
+        'ingest': _runtime_get_ingest_status(udp_handler),
         'traffic': _get_transport_runtime_stats(),
         'online_analysis': {
             'enabled': ONLINE_ANALYSIS_ENABLED,
@@ -1083,6 +945,133 @@ async def save_log_entry(data: dict) -> dict:
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+async def get_packet_trace_config() -> dict:
+    return {
+        'type': 'packet_trace_config',
+        'data': packet_tracer.get_config(),
+        'timestamp': int(time.time() * 1000),
+    }
+
+
+async def update_packet_trace_config(config_payload: PacketTraceConfig) -> dict:
+    if config_payload.clear:
+        packet_tracer.clear()
+    data = packet_tracer.configure(
+        enabled=config_payload.enabled,
+        sample_rate=config_payload.sample_rate,
+        ring_size=config_payload.ring_size,
+    )
+    logger.info('原始数据包追踪配置已更新: %s', data)
+    return {
+        'type': 'packet_trace_config',
+        'data': data,
+        'timestamp': int(time.time() * 1000),
+    }
+
+
+async def download_packet_trace(port: Optional[int] = None) -> JSONResponse:
+    snapshot = packet_tracer.snapshot(port)
+    filename = f"packet_trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    return JSONResponse(
+        content={
+            'type': 'packet_trace',
+            'data': snapshot,
+            'timestamp': int(time.time() * 1000),
+        },
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
+
+
+async def get_ingress_config() -> dict:
+    data = udp_handler.get_ingress_stats() if udp_handler is not None else ingress_limiter.snapshot()
+    return {
+        'type': 'ingress_config',
+        'data': data,
+        'timestamp': int(time.time() * 1000),
+    }
+
+
+async def update_ingress_config(config_payload: IngressLimitConfig) -> dict:
+    def _limits(items):
+        if items is None:
+            return None
+        return {key: (item.rate, item.burst) for key, item in items.items()}
+
+    options = {
+        'enabled': config_payload.enabled,
+        'port_limits': _limits(config_payload.port_limits),
+        'func_limits': _limits(config_payload.func_limits),
+        'latest_value_func_codes': config_payload.latest_value_func_codes,
+        'clear': config_payload.clear,
+    }
+    try:
+        if udp_handler is not None:
+            data = udp_handler.configure_ingress_limits(**options)
+        else:
+            data = ingress_limiter.configure(**options)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f'入口限流配置无效: {exc}')
+    logger.info('UDP入口限流配置已更新: %s', data)
+    return {
+        'type': 'ingress_config',
+        'data': data,
+        'timestamp': int(time.time() * 1000),
+    }
+
+
+async def get_pipeline_latency() -> dict:
+    return {
+        'type': 'pipeline_latency',
+        'data': data_age_tracker.snapshot_by_type(),
+        'timestamp': int(time.time() * 1000),
+    }
+
+
+async def reset_pipeline_latency() -> dict:
+    data_age_tracker.reset()
+    logger.info('管线时延统计已清零')
+    return {
+        'type': 'pipeline_latency',
+        'data': data_age_tracker.snapshot_by_type(),
+        'timestamp': int(time.time() * 1000),
+    }
+
+
+async def get_decimation_config() -> dict:
+    return {
+        'type': 'decimation_config',
+        'data': decimation_policy.snapshot(),
+        'timestamp': int(time.time() * 1000),
+    }
+
+
+async def update_decimation_config(config_payload: DecimationConfig) -> dict:
+    rules = None
+    if config_payload.rules is not None:
+        rules = {
+            consumer: {
+                msg_type: rule.dict(exclude_unset=True) if rule is not None else None
+                for msg_type, rule in table.items()
+            }
+            for consumer, table in config_payload.rules.items()
+        }
+    try:
+        data = decimation_policy.configure(
+            rules,
+            replace=config_payload.replace,
+            reset=config_payload.reset,
+            clear=config_payload.clear,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f'抽稀规则无效: {exc}')
+    logger.info('消息抽稀规则已更新: %s', rules if rules is not None else ('reset' if config_payload.reset else '-'))
+    return {
+        'type': 'decimation_config',
+        'data': data,
+        'timestamp': int(time.time() * 1000),
+    }
+
+
 async def start_udp_server() -> dict:
     global udp_handler, udp_server_started, heartbeat_task
 
@@ -1094,7 +1083,7 @@ async def start_udp_server() -> dict:
             udp_server_started = False
 
         if udp_handler is None:
-            udp_handler = UDPHandler(on_udp_message_received)
+            udp_handler = UDPHandler(on_udp_message_received, on_messages=on_udp_messages_received)
 
         active_config = _reset_connection_config()
         ports = _normalize_listen_ports()
@@ -1435,6 +1424,7 @@ async def start_recording(config_payload: RecordingConfig) -> dict:
         )
         recorder.enabled_ports = _normalize_listen_ports()
         await asyncio.to_thread(recorder.start_recording)
+        _start_raw_capture(recorder)
         recording_active = True
         current_session_id = session_id
         _append_session_communication_log(
@@ -1524,6 +1514,24 @@ app.include_router(create_operations_router(
     stop_recording_handler=stop_recording,
 ))
 
+app.include_router(create_trace_router(
+    get_packet_trace_config_handler=get_packet_trace_config,
+    update_packet_trace_config_handler=update_packet_trace_config,
+    download_packet_trace_handler=download_packet_trace,
+))
+
+app.include_router(create_pipeline_router(
+    get_pipeline_latency_handler=get_pipeline_latency,
+    reset_pipeline_latency_handler=reset_pipeline_latency,
+    get_decimation_config_handler=get_decimation_config,
+    update_decimation_config_handler=update_decimation_config,
+))
+
+app.include_router(create_ingress_router(
+    get_ingress_config_handler=get_ingress_config,
+    update_ingress_config_handler=update_ingress_config,
+))
+
 manager.cache_message({
     'type': 'config_update',
     'config_type': 'connection',
@@ -1569,11 +1577,12 @@ async def startup_event() -> None:
     logger.info('=' * 60)
 
     command_send_lock = asyncio.Lock()
+    manager.on_latest_broadcast = _record_broadcast_age
     await _ensure_packet_processing_pipeline()
 
     try:
         if udp_handler is None:
-            udp_handler = UDPHandler(on_udp_message_received)
+            udp_handler = UDPHandler(on_udp_message_received, on_messages=on_udp_messages_received)
 
         ports = _normalize_listen_ports()
         await udp_handler.start_server(host=connection_config.listenAddress, ports=ports)
@@ -1622,10 +1631,13 @@ async def shutdown_event() -> None:
 if __name__ == '__main__':
     import uvicorn
 
+    event_loop = resolve_event_loop()
+    logger.info('事件循环实现: %s', event_loop)
     uvicorn.run(
         app,
         host=BACKEND_HTTP_HOST,
         port=BACKEND_HTTP_PORT,
         reload=False,
         log_level='info',
+        loop=event_loop,
     )
\ No newline at end of file
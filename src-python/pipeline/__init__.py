@@ -0,0 +1,41 @@
+from .coalescing_queue import CoalescingQueue
+from .decimation import (
+    CONSUMER_LEGACY_LOG,
+    CONSUMER_ONLINE_ANALYSIS,
+    CONSUMER_RECORDER,
+    CONSUMER_WEBSOCKET,
+    CONSUMERS,
+    KEEP_ALL,
+    KEEP_LATEST,
+    DecimationPolicy,
+    DecimationRule,
+    decimation_policy,
+)
+from .stage import (
+    DROP_POLICIES,
+    DROP_POLICY_BLOCK,
+    DROP_POLICY_COALESCE,
+    DROP_POLICY_DROP_NEWEST,
+    PipelineStage,
+    StagePipeline,
+)
+
+__all__ = [
+    'CONSUMERS',
+    'CONSUMER_LEGACY_LOG',
+    'CONSUMER_ONLINE_ANALYSIS',
+    'CONSUMER_RECORDER',
+    'CONSUMER_WEBSOCKET',
+    'CoalescingQueue',
+    'DROP_POLICIES',
+    'DROP_POLICY_BLOCK',
+    'DROP_POLICY_COALESCE',
+    'DROP_POLICY_DROP_NEWEST',
+    'DecimationPolicy',
+    'DecimationRule',
+    'KEEP_ALL',
+    'KEEP_LATEST',
+    'PipelineStage',
+    'StagePipeline',
+    'decimation_policy',
+]
@@ -0,0 +1,132 @@
+"""
+带最新值合并的 asyncio 队列
+
+CoalescingQueue 提供与 asyncio.Queue 相同的接口（put / put_nowait / get / get_nowait / task_done / join，
+满与空分别抛 asyncio.QueueFull / asyncio.QueueEmpty），内部为两条通道：
+    - FIFO 通道：普通入队（put / put_nowait），受 maxsize 约束，满时 put 等待、put_nowait 抛 QueueFull
+    - 最新值通道：replace(key, item) 写入按键有序的映射，同键只保留最新一项且位置不变，
+      不受 maxsize 约束（容量即不同键的个数）
+
+get 先取 FIFO 通道，FIFO 为空时按键首次写入的顺序取最新值通道，等价于“溢出的最新值排在
+已入队消息之后”，不再需要单独的 pending 字典和每批之后的补入。put / replace / get 均为 O(1)，
+replace 写入新键时与 put 一样唤醒等待中的消费者，并计入 join / task_done 的未完成数；
+替换已有键不新增未完成项（被替换的旧项永远不会被取出）。
+
+put_barrier 用于排空：先把最新值通道整体移入 FIFO，再放入屏障项，
+保证屏障之前写入的最新值也在屏障之前被取出。
+
+只依赖 deque / OrderedDict 与三个 asyncio.Event（可读、FIFO 可写、全部完成），不使用 asyncio.Queue 的私有成员；
+等待方被唤醒后重新检查条件，多个消费者同时被唤醒时没取到的继续等待。只应在事件循环线程中使用。
+"""
+
+import asyncio
+from collections import OrderedDict, deque
+from typing import Any, Deque, Hashable
+
+
+class CoalescingQueue:
+    """FIFO 通道 + 按键合并的最新值通道"""
+
+    def __init__(self, maxsize: int = 0):
+        self.maxsize = max(0, int(maxsize))
+        self._fifo: Deque[Any] = deque()
+        self._latest: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._unfinished_tasks = 0
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self._all_done = asyncio.Event()
+        self._all_done.set()
+        self.superseded = 0
+
+    def qsize(self) -> int:
+        return len(self._fifo) + len(self._latest)
+
+    def empty(self) -> bool:
+        return not self._fifo and not self._latest
+
+    def full(self) -> bool:
+        """只看 FIFO 通道；最新值通道始终可写"""
+        return 0 < self.maxsize <= len(self._fifo)
+
+    @property
+    def fifo_size(self) -> int:
+        return len(self._fifo)
+
+    @property
+    def latest_size(self) -> int:
+        return len(self._latest)
+
+    def _added(self) -> None:
+        self._unfinished_tasks += 1
+        self._all_done.clear()
+        self._readable.set()
+
+    # ------------------------------------------------------------
+    # 入队
+    # ------------------------------------------------------------
+
+    async def put(self, item: Any) -> None:
+        while self.full():
+            self._writable.clear()
+            await self._writable.wait()
+        self.put_nowait(item)
+
+    def put_nowait(self, item: Any) -> None:
+        if self.full():
+            raise asyncio.QueueFull
+        self._fifo.append(item)
+        self._added()
+
+    def replace(self, key: Hashable, item: Any) -> bool:
+        """写入 key 的最新值；返回 True 表示替换了尚未取出的旧值"""
+        latest = self._latest
+        if key in latest:
+            latest[key] = item
+            self.superseded += 1
+            return True
+        latest[key] = item
+        self._added()
+        return False
+
+    def put_barrier(self, item: Any) -> None:
+        """放入屏障项（不受 maxsize 约束），排在当前全部最新值之后"""
+        latest = self._latest
+        while latest:
+            self._fifo.append(latest.popitem(last=False)[1])
+        self._fifo.append(item)
+        self._added()
+
+    # ------------------------------------------------------------
+    # 出队
+    # ------------------------------------------------------------
+
+    async def get(self) -> Any:
+        while self.empty():
+            self._readable.clear()
+            await self._readable.wait()
+        return self.get_nowait()
+
+    def get_nowait(self) -> Any:
+        if self._fifo:
+            item = self._fifo.popleft()
+            if not self.full():
+                self._writable.set()
+            return item
+        if self._latest:
+            return self._latest.popitem(last=False)[1]
+        raise asyncio.QueueEmpty
+
+    def task_done(self) -> None:
+        if self._unfinished_tasks <= 0:
+            raise ValueError('task_done() called too many times')
+        self._unfinished_tasks -= 1
+        if self._unfinished_tasks == 0:
+            self._all_done.set()
+
+    async def join(self) -> None:
+        if self._unfinished_tasks:
+            await self._all_done.wait()
+
+
+__all__ = ['CoalescingQueue']
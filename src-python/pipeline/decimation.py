@@ -0,0 +1,294 @@
+"""
+按消费方的消息抽稀策略
+
+处理阶段取出的每条消息分发给四个消费方：WebSocket 广播、录制器、OnlineAnalysis 转发与旧版文本日志。
+每个消费方一张规则表，键为消息类型，'*' 为该消费方的缺省规则；每条规则包含：
+
+    enabled      是否向该消费方分发此类型
+    max_rate_hz  每种类型每秒最多分发的条数，0 表示不限；超出的消息直接跳过（按上次分发时刻判断）
+    keep         latest / all：消费方队列积压时的处理方式。latest 表示同类型只保留最新一条
+                 （对应阶段的 coalesce 合并），all 表示已放行的消息逐条保留、满队列时丢弃新消息
+    fields       可选的 data 字段投影，只保留列出的顶层字段（None 表示原样分发）
+
+判断一次为两次字典查找加一次时间比较，与规则数量无关。规则表在 configure 时整体重建后替换引用，
+分发路径不加锁；admit 只应在事件循环（处理阶段）中调用。规则可经 /api/pipeline/decimation 在运行时修改，
+例如录制器保持全速率、WebSocket 对带宽受限的远端降到 5Hz，无需改代码。
+"""
+
+import logging
+import time
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from config import FIXED_DECIMATION_RULES
+
+logger = logging.getLogger(__name__)
+
+CONSUMER_WEBSOCKET = 'websocket'
+CONSUMER_RECORDER = 'recorder'
+CONSUMER_ONLINE_ANALYSIS = 'online_analysis'
+CONSUMER_LEGACY_LOG = 'legacy_log'
+CONSUMERS = (CONSUMER_WEBSOCKET, CONSUMER_RECORDER, CONSUMER_ONLINE_ANALYSIS, CONSUMER_LEGACY_LOG)
+
+KEEP_LATEST = 'latest'
+KEEP_ALL = 'all'
+KEEP_MODES = (KEEP_LATEST, KEEP_ALL)
+DEFAULT_RULE_KEY = '*'
+MAX_RATE_HZ = 1_000_000.0
+
+# 高频遥测：WebSocket 最多 20Hz / 10Hz，积压时只保留最新值
+_HIGH_FREQUENCY_RATES = {
+    'fcs_states': 20.0,
+    'fcs_pwms': 20.0,
+    'fcs_datactrl': 20.0,
+    'fcs_gncbus': 20.0,
+    'fcs_esc': 10.0,
+    'fcs_datagcs': 10.0,
+    'fcs_line_aim2ab': 10.0,
+    'fcs_line_ab': 10.0,
+    'avoiflag': 10.0,
+    'planning_telemetry': 10.0,
+}
+_ONLINE_ANALYSIS_TYPES = (
+    'fcs_states',
+    'fcs_pwms',
+    'fcs_datactrl',
+    'fcs_gncbus',
+    'fcs_datagcs',
+    'planning_telemetry',
+    'lidar_obstacles',
+    'lidar_performance',
+    'lidar_status',
+    'avoiflag',
+)
+
+# 缺省规则：WebSocket 与 OnlineAnalysis 沿用原广播节流间隔，录制与旧版日志全速率逐条保留
+DEFAULT_DECIMATION_RULES: Dict[str, Dict[str, Dict[str, Any]]] = {
+    CONSUMER_WEBSOCKET: {
+        DEFAULT_RULE_KEY: {'keep': KEEP_ALL},
+        **{msg_type: {'max_rate_hz': rate, 'keep': KEEP_LATEST} for msg_type, rate in _HIGH_FREQUENCY_RATES.items()},
+        'fcs_param': {'max_rate_hz': 5.0, 'keep': KEEP_ALL},
+        'heartbeat_ack': {'max_rate_hz': 1.0, 'keep': KEEP_ALL},
+    },
+    CONSUMER_RECORDER: {
+        DEFAULT_RULE_KEY: {'keep': KEEP_ALL},
+    },
+    CONSUMER_ONLINE_ANALYSIS: {
+        DEFAULT_RULE_KEY: {'enabled': False},
+        **{
+            msg_type: (
+                {'max_rate_hz': _HIGH_FREQUENCY_RATES[msg_type], 'keep': KEEP_LATEST}
+                if msg_type in _HIGH_FREQUENCY_RATES else {'keep': KEEP_ALL}
+            )
+            for msg_type in _ONLINE_ANALYSIS_TYPES
+        },
+    },
+    CONSUMER_LEGACY_LOG: {
+        DEFAULT_RULE_KEY: {'keep': KEEP_ALL},
+    },
+}
+
+
+_RULE_FIELDS = ('enabled', 'max_rate_hz', 'keep', 'fields')
+
+
+class DecimationRule:
+    """单条抽稀规则（只读；修改规则时整体替换）"""
+    __slots__ = ('enabled', 'max_rate_hz', 'keep', 'fields', 'interval')
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_rate_hz: float = 0.0,
+        keep: str = KEEP_ALL,
+        fields: Optional[Iterable[str]] = None,
+    ):
+        keep = str(keep or KEEP_ALL).lower()
+        if keep not in KEEP_MODES:
+            raise ValueError(f'keep 必须为 {"/".join(KEEP_MODES)}: {keep!r}')
+        rate = float(max_rate_hz or 0.0)
+        if rate < 0:
+            raise ValueError(f'max_rate_hz 不能为负: {max_rate_hz!r}')
+        self.enabled = bool(enabled)
+        self.max_rate_hz = min(MAX_RATE_HZ, rate)
+        self.keep = keep
+        self.fields = tuple(str(name) for name in fields) if fields is not None else None
+        self.interval = 1.0 / self.max_rate_hz if self.max_rate_hz > 0 else 0.0
+
+    @classmethod
+    def from_value(cls, value: Any, base: Optional['DecimationRule'] = None) -> 'DecimationRule':
+        """接受 DecimationRule 或字段字典；字典中缺省或为 None 的字段沿用 base（fields 为 None 表示取消投影）"""
+        if isinstance(value, DecimationRule):
+            return value
+        if not isinstance(value, Mapping):
+            raise ValueError(f'规则必须为对象: {value!r}')
+        merged = base.to_dict() if base is not None else {}
+        merged.update({
+            key: item for key, item in value.items()
+            if key in _RULE_FIELDS and (item is not None or key == 'fields')
+        })
+        return cls(**merged)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'max_rate_hz': self.max_rate_hz,
+            'keep': self.keep,
+            'fields': list(self.fields) if self.fields is not None else None,
+        }
+
+
+def _build_tables(rules: Mapping[str, Mapping[str, Any]]) -> Dict[str, Dict[str, DecimationRule]]:
+    tables: Dict[str, Dict[str, DecimationRule]] = {}
+    for consumer in CONSUMERS:
+        table = {
+            str(msg_type): DecimationRule.from_value(value)
+            for msg_type, value in (rules.get(consumer) or {}).items()
+        }
+        table.setdefault(DEFAULT_RULE_KEY, DecimationRule())
+        tables[consumer] = table
+    return tables
+
+
+class DecimationPolicy:
+    """按消费方、消息类型的分发判断：启用、限速、积压方式与字段投影"""
+
+    def __init__(self, rules: Mapping[str, Mapping[str, Any]] = DEFAULT_DECIMATION_RULES):
+        self._tables = _build_tables(rules)
+        self._last_delivered: Dict[str, Dict[str, float]] = {consumer: {} for consumer in CONSUMERS}
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        self._delivered: Dict[str, Dict[str, int]] = {consumer: {} for consumer in CONSUMERS}
+        self._decimated: Dict[str, Dict[str, int]] = {consumer: {} for consumer in CONSUMERS}
+
+    # ------------------------------------------------------------
+    # 分发路径
+    # ------------------------------------------------------------
+
+    def rule(self, consumer: str, msg_type: str) -> DecimationRule:
+        table = self._tables[consumer]
+        rule = table.get(msg_type)
+        return rule if rule is not None else table[DEFAULT_RULE_KEY]
+
+    def admit(self, consumer: str, msg_type: str, now: Optional[float] = None) -> Optional[DecimationRule]:
+        """判断一条消息是否分发给 consumer；放行返回对应规则，否则返回 None"""
+        rule = self.rule(consumer, msg_type)
+        if not rule.enabled:
+            return None
+        if rule.interval:
+            if now is None:
+                now = time.monotonic()
+            last_delivered = self._last_delivered[consumer]
+            if now - last_delivered.get(msg_type, float('-inf')) < rule.interval:
+                decimated = self._decimated[consumer]
+                decimated[msg_type] = decimated.get(msg_type, 0) + 1
+                return None
+            last_delivered[msg_type] = now
+        delivered = self._delivered[consumer]
+        delivered[msg_type] = delivered.get(msg_type, 0) + 1
+        return rule
+
+    def accepts(self, consumer: str, msg_type: str) -> bool:
+        """只看是否启用，不计限速（用于已放行消息的二次确认）"""
+        return self.rule(consumer, msg_type).enabled
+
+    def keeps_latest(self, consumer: str, msg_type: str) -> bool:
+        return self.rule(consumer, msg_type).keep == KEEP_LATEST
+
+    @staticmethod
+    def project(rule: DecimationRule, message: dict) -> dict:
+        """按规则的 fields 投影 message['data']；无投影时原样返回"""
+        fields = rule.fields
+        if fields is None:
+            return message
+        data = message.get('data')
+        projected = dict(message)
+        if isinstance(data, Mapping):
+            projected['data'] = {name: data[name] for name in fields if name in data}
+        return projected
+
+    # ------------------------------------------------------------
+    # 配置
+    # ------------------------------------------------------------
+
+    def configure(
+        self,
+        rules: Optional[Mapping[str, Mapping[str, Any]]] = None,
+        replace: bool = False,
+        reset: bool = False,
+        clear: bool = False,
+    ) -> Dict[str, Any]:
+        """修改规则
+
+        rules 为 {消费方: {消息类型: 规则字段 | None}}；默认按字段合并到现有规则，值为 None 删除该类型的规则，
+        replace=True 时整张表替换为给出的规则（未给出 '*' 时缺省规则为不限速、逐条保留）。
+        reset=True 先恢复内置缺省规则，clear=True 清零计数。
+        """
+        tables = _build_tables(DEFAULT_DECIMATION_RULES) if reset else {
+            consumer: dict(table) for consumer, table in self._tables.items()
+        }
+        for consumer, updates in (rules or {}).items():
+            if consumer not in tables:
+                raise ValueError(f'未知消费方: {consumer!r}（可选 {", ".join(CONSUMERS)}）')
+            table = {} if replace else tables[consumer]
+            for msg_type, value in (updates or {}).items():
+                msg_type = str(msg_type)
+                if value is None:
+                    table.pop(msg_type, None)
+                else:
+                    table[msg_type] = DecimationRule.from_value(value, None if replace else table.get(msg_type))
+            table.setdefault(DEFAULT_RULE_KEY, DecimationRule())
+            tables[consumer] = table
+
+        self._tables = tables
+        self._last_delivered = {
+            consumer: {
+                msg_type: last for msg_type, last in self._last_delivered[consumer].items()
+                if self.rule(consumer, msg_type).interval
+            }
+            for consumer in CONSUMERS
+        }
+        if clear:
+            self._reset_counters()
+        return self.get_config()
+
+    def get_config(self) -> Dict[str, Any]:
+        return {
+            'consumers': list(CONSUMERS),
+            'rules': {
+                consumer: {msg_type: rule.to_dict() for msg_type, rule in sorted(table.items())}
+                for consumer, table in self._tables.items()
+            },
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.get_config(),
+            'delivered': {consumer: dict(sorted(counts.items())) for consumer, counts in self._delivered.items()},
+            'decimated': {consumer: dict(sorted(counts.items())) for consumer, counts in self._decimated.items()},
+        }
+
+
+# 全局抽稀策略（main 的处理阶段与 /api/pipeline/decimation 共用）
+decimation_policy = DecimationPolicy()
+if FIXED_DECIMATION_RULES:
+    try:
+        decimation_policy.configure(FIXED_DECIMATION_RULES)
+    except (TypeError, ValueError) as exc:
+        logger.warning('GCS_DECIMATION_RULES 规则无效，继续使用缺省规则: %s', exc)
+
+
+__all__ = [
+    'CONSUMERS',
+    'CONSUMER_LEGACY_LOG',
+    'CONSUMER_ONLINE_ANALYSIS',
+    'CONSUMER_RECORDER',
+    'CONSUMER_WEBSOCKET',
+    'DEFAULT_DECIMATION_RULES',
+    'DEFAULT_RULE_KEY',
+    'DecimationPolicy',
+    'DecimationRule',
+    'KEEP_ALL',
+    'KEEP_LATEST',
+    'decimation_policy',
+]
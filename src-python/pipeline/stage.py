@@ -0,0 +1,398 @@
+"""
+后台处理管线的阶段引擎
+
+每个阶段（PipelineStage）持有一个有界 CoalescingQueue、一组 worker 协程与内置计数：
+    - 队列项可以是单条消息，也可以是一整批消息（list，如同一 datagram 解析出的多帧），
+      按消息数凑批，每批最多 batch_size 条后交给 handler
+    - 满队列时按 drop_policy 处理：
+        block        put() 等待队列空位（上游阶段被反压）；同步 offer() 无法等待，按丢弃计数
+        drop_newest  丢弃新到的消息
+        coalesce     coalesce_key 返回非 None 的消息写入队列的最新值通道（按键只保留最新一条，
+                     排在已入队消息之后取出，见 pipeline.coalescing_queue）；其余消息丢弃
+    - handler 可以是普通函数或协程函数，返回 {输出名: 消息列表} 时按 StagePipeline.connect
+      建立的边把消息送往下游阶段（同一输出可连接多个下游，逐一投递）
+
+屏障（barrier）：排空时向队列放入控制项，worker 先处理屏障之前的消息并投递下游，
+再等其他 worker 手中的批次结束后才放行，保证“屏障之前入队的消息都已处理”。
+依次对上下游阶段放屏障即可按顺序排空整条链路（见 StagePipeline.drain）。
+
+worker 数大于 1 时同一阶段内的批次并发处理，不再保证消息顺序。
+batch_size 可在运行时修改并立即生效；workers 在下次 start 时生效。
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .coalescing_queue import CoalescingQueue
+
+logger = logging.getLogger(__name__)
+
+DROP_POLICY_BLOCK = 'block'
+DROP_POLICY_DROP_NEWEST = 'drop_newest'
+DROP_POLICY_COALESCE = 'coalesce'
+DROP_POLICIES = (DROP_POLICY_BLOCK, DROP_POLICY_DROP_NEWEST, DROP_POLICY_COALESCE)
+
+_CONTROL_KEY = '__pipeline_control__'
+
+StageHandler = Callable[[List[Any]], Any]
+
+
+def _build_barrier() -> dict:
+    return {_CONTROL_KEY: 'barrier', 'future': asyncio.get_running_loop().create_future()}
+
+
+def is_control_item(item: Any) -> bool:
+    return isinstance(item, dict) and _CONTROL_KEY in item
+
+
+class PipelineStage:
+    """一个有界队列 + worker 协程的处理阶段"""
+
+    def __init__(
+        self,
+        name: str,
+        handler: StageHandler,
+        *,
+        maxsize: int,
+        batch_size: int = 1,
+        workers: int = 1,
+        drop_policy: str = DROP_POLICY_DROP_NEWEST,
+        coalesce_key: Optional[Callable[[Any], Optional[str]]] = None,
+        label: Optional[str] = None,
+        drain_timeout: float = 2.0,
+        warn_every: int = 100,
+    ):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f'不支持的丢弃策略: {drop_policy}')
+        if drop_policy == DROP_POLICY_COALESCE and coalesce_key is None:
+            raise ValueError('coalesce 策略需要提供 coalesce_key')
+        self.name = name
+        self.handler = handler
+        self.maxsize = max(1, int(maxsize))
+        self.batch_size = max(1, int(batch_size))
+        self.workers = max(1, int(workers))
+        self.drop_policy = drop_policy
+        self.coalesce_key = coalesce_key
+        self.label = label or name
+        self.drain_timeout = drain_timeout
+        self.warn_every = max(1, int(warn_every))
+        # 输出名 -> 下游阶段列表（由 StagePipeline.connect 填充）
+        self.outputs: Dict[str, List['PipelineStage']] = {}
+
+        self._is_async = asyncio.iscoroutinefunction(handler)
+        self._queue: Optional[CoalescingQueue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._active_batches = 0
+        self._barrier_waiters = 0
+        self._idle: Optional[asyncio.Condition] = None
+        self.counters: Dict[str, int] = {
+            'enqueued': 0,
+            'processed': 0,
+            'batches': 0,
+            'dropped': 0,
+            'coalesced': 0,
+            'blocked': 0,
+            'errors': 0,
+            'max_queue_size': 0,
+        }
+        self.busy_ns = 0
+
+    # ------------------------------------------------------------
+    # 生命周期
+    # ------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    @property
+    def accepting(self) -> bool:
+        """队列已创建即接收入队（停机后队列保留，与原全局队列行为一致）"""
+        return self._queue is not None
+
+    def start(self) -> None:
+        if self._queue is None:
+            self._queue = CoalescingQueue(maxsize=self.maxsize)
+            self._idle = asyncio.Condition()
+        self._tasks = [task for task in self._tasks if not task.done()]
+        for index in range(len(self._tasks), self.workers):
+            self._tasks.append(asyncio.create_task(self._worker(), name=f'pipeline-{self.name}-{index}'))
+
+    async def join(self) -> bool:
+        """等待队列中已有的消息处理完毕；超时返回 False"""
+        if self._queue is None:
+            return True
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=self.drain_timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning('%s在关闭时仍有积压，继续执行停机', self.label)
+            return False
+
+    async def cancel(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def barrier(self) -> None:
+        """等待屏障之前入队的消息全部处理完毕（含投递给下游）"""
+        if self._queue is None:
+            return
+        barrier = _build_barrier()
+        self._queue.put_barrier(barrier)
+        await barrier['future']
+
+    def configure(self, batch_size: Optional[int] = None, workers: Optional[int] = None) -> Dict[str, Any]:
+        if batch_size is not None:
+            self.batch_size = max(1, int(batch_size))
+        if workers is not None:
+            self.workers = max(1, int(workers))
+        return self.get_config()
+
+    def get_config(self) -> Dict[str, Any]:
+        return {
+            'maxsize': self.maxsize,
+            'batch_size': self.batch_size,
+            'workers': self.workers,
+            'drop_policy': self.drop_policy,
+        }
+
+    # ------------------------------------------------------------
+    # 入队
+    # ------------------------------------------------------------
+
+    def offer(self, item: Any) -> bool:
+        """非阻塞入队一条消息或一批消息（list）；队列未创建时返回 False，由调用方自行处理"""
+        queue = self._queue
+        if queue is None:
+            return False
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self._handle_overflow(item if isinstance(item, list) else [item])
+            return True
+        self._count_enqueued(item)
+        return True
+
+    async def put(self, item: Any) -> bool:
+        """入队；block 策略下队列满时等待空位，其余策略同 offer"""
+        queue = self._queue
+        if queue is None:
+            return False
+        if self.drop_policy != DROP_POLICY_BLOCK or not queue.full():
+            return self.offer(item)
+        self.counters['blocked'] += 1
+        await queue.put(item)
+        self._count_enqueued(item)
+        return True
+
+    def _count_enqueued(self, item: Any) -> None:
+        counters = self.counters
+        counters['enqueued'] += len(item) if isinstance(item, list) else 1
+        size = self._queue.qsize()
+        if size > counters['max_queue_size']:
+            counters['max_queue_size'] = size
+
+    def _handle_overflow(self, messages: List[Any]) -> None:
+        """满队列：按策略合并或丢弃；整批只计数、告警一次"""
+        counters = self.counters
+        coalesced = 0
+        dropped_keys: List[str] = []
+        key_of = self.coalesce_key if self.drop_policy == DROP_POLICY_COALESCE else None
+        for message in messages:
+            key = key_of(message) if key_of is not None else None
+            if key is not None:
+                self._queue.replace(key, message)
+                coalesced += 1
+            else:
+                dropped_keys.append(str(message.get('type') or 'unknown') if isinstance(message, dict) else 'unknown')
+
+        if coalesced:
+            before = counters['coalesced']
+            counters['coalesced'] = before + coalesced
+            if (before + coalesced) // (self.warn_every * 5) > before // (self.warn_every * 5):
+                logger.warning(
+                    '%s高频消息正在合并以限制积压: coalesced=%d queue=%d pending=%d',
+                    self.label, counters['coalesced'], self._queue.fifo_size, self._queue.latest_size,
+                )
+
+        if dropped_keys:
+            before = counters['dropped']
+            counters['dropped'] = before + len(dropped_keys)
+            if (before + len(dropped_keys)) // self.warn_every > before // self.warn_every:
+                logger.warning(
+                    '%s已满，丢弃消息: dropped=%d types=%s queue=%d',
+                    self.label, counters['dropped'], ','.join(sorted(set(dropped_keys))), self._queue.qsize(),
+                )
+
+    # ------------------------------------------------------------
+    # worker
+    # ------------------------------------------------------------
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        while True:
+            first_item = await queue.get()
+            taken = 1
+            items: List[Any] = []
+            self._extend(items, first_item)
+            while len(items) < self.batch_size:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                taken += 1
+                self._extend(items, item)
+
+            self._active_batches += 1
+            try:
+                await self._run_segments(items)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.counters['errors'] += 1
+                logger.error('%s处理失败: %s', self.label, exc)
+            finally:
+                self._active_batches -= 1
+                async with self._idle:
+                    self._idle.notify_all()
+                for _ in range(taken):
+                    queue.task_done()
+
+    @staticmethod
+    def _extend(items: List[Any], item: Any) -> None:
+        if isinstance(item, list):
+            items.extend(item)
+        else:
+            items.append(item)
+
+    async def _run_segments(self, items: List[Any]) -> None:
+        segment: List[Any] = []
+        for item in items:
+            if not is_control_item(item):
+                segment.append(item)
+                continue
+            # 屏障：先处理并投递它之前的消息，再等其他 worker 的在途批次结束
+            await self._run_batch(segment)
+            segment = []
+            self._barrier_waiters += 1
+            try:
+                async with self._idle:
+                    self._idle.notify_all()
+                    await self._idle.wait_for(lambda: self._active_batches - self._barrier_waiters <= 0)
+            finally:
+                self._barrier_waiters -= 1
+            if not item['future'].done():
+                item['future'].set_result(True)
+        await self._run_batch(segment)
+
+    async def _run_batch(self, batch: List[Any]) -> None:
+        if not batch:
+            return
+        started = time.perf_counter_ns()
+        try:
+            result = self.handler(batch)
+            if self._is_async:
+                result = await result
+        finally:
+            self.busy_ns += time.perf_counter_ns() - started
+            self.counters['batches'] += 1
+            self.counters['processed'] += len(batch)
+        if result:
+            await self._emit(result)
+
+    async def _emit(self, result: Dict[str, List[Any]]) -> None:
+        for output, messages in result.items():
+            if not messages:
+                continue
+            for target in self.outputs.get(output, ()):
+                if not await target.put(messages if len(messages) > 1 else messages[0]):
+                    await target._run_inline(messages)
+
+    async def _run_inline(self, messages: List[Any]) -> None:
+        """下游阶段未启动时直接在当前 worker 中处理"""
+        await self._run_batch(list(messages))
+
+    # ------------------------------------------------------------
+    # 状态
+    # ------------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.get_config(),
+            'running_workers': sum(1 for task in self._tasks if not task.done()),
+            'queue_size': self._queue.qsize() if self._queue is not None else 0,
+            'pending_keys': self._queue.latest_size if self._queue is not None else 0,
+            'superseded': self._queue.superseded if self._queue is not None else 0,
+            'busy_ms': round(self.busy_ns / 1e6, 3),
+            'outputs': {output: [target.name for target in targets] for output, targets in self.outputs.items()},
+            **self.counters,
+        }
+
+
+class StagePipeline:
+    """按名称登记阶段并以 (阶段, 输出名) -> 下游阶段 的边连接成图"""
+
+    def __init__(self):
+        self.stages: Dict[str, PipelineStage] = {}
+
+    def add_stage(self, stage: PipelineStage) -> PipelineStage:
+        if stage.name in self.stages:
+            raise ValueError(f'管线阶段已存在: {stage.name}')
+        self.stages[stage.name] = stage
+        return stage
+
+    def connect(self, source: str, output: str, target: str) -> None:
+        self.stages[source].outputs.setdefault(output, []).append(self.stages[target])
+
+    def get(self, name: str) -> Optional[PipelineStage]:
+        return self.stages.get(name)
+
+    def __getitem__(self, name: str) -> PipelineStage:
+        return self.stages[name]
+
+    def start(self) -> None:
+        for stage in self.stages.values():
+            stage.start()
+
+    async def stop(self) -> None:
+        """按拓扑顺序等待各阶段排空（各自 drain_timeout），再取消全部 worker"""
+        for stage in self._topological_order():
+            await stage.join()
+        for stage in self.stages.values():
+            await stage.cancel()
+
+    async def drain(self, names: Iterable[str]) -> None:
+        """依次对给定阶段放屏障，按上下游顺序排空"""
+        for name in names:
+            await self.stages[name].barrier()
+
+    def _topological_order(self) -> List[PipelineStage]:
+        indegree: Dict[str, int] = {name: 0 for name in self.stages}
+        for stage in self.stages.values():
+            for targets in stage.outputs.values():
+                for target in targets:
+                    indegree[target.name] += 1
+        ordered: List[PipelineStage] = []
+        ready = [name for name, degree in indegree.items() if degree == 0]
+        while ready:
+            stage = self.stages[ready.pop(0)]
+            ordered.append(stage)
+            for targets in stage.outputs.values():
+                for target in targets:
+                    indegree[target.name] -= 1
+                    if indegree[target.name] == 0:
+                        ready.append(target.name)
+        # 有环时剩余阶段按登记顺序追加
+        ordered.extend(stage for stage in self.stages.values() if stage not in ordered)
+        return ordered
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stage.snapshot() for name, stage in self.stages.items()}
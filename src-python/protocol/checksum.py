@@ -0,0 +1,55 @@
+"""
+NCLink 帧 XOR 校验和
+
+校验范围：帧头(2) + 功能码(1) + 长度(2, 大端) + 载荷(N)，逐字节异或。
+短数据直接逐字节异或；长数据按 8 字节字用 numpy 归约，再把 64 位结果折叠到 1 字节，
+避免对 GNCBUS / 0x71 规划遥测这类大帧在 Python 层逐字节循环。
+"""
+
+import numpy as np
+
+# 帧头 FF FC 的异或值（与 nclink_protocol.NCLINK_HEAD0/HEAD1 一致）
+_FRAME_HEAD_XOR = 0xFF ^ 0xFC
+
+# 低于该长度时逐字节异或比调用 numpy 更快
+_VECTORIZE_MIN_SIZE = 160
+
+_U64_LE = np.dtype('<u8')
+
+
+def xor_checksum_reference(data, initial: int = 0) -> int:
+    """参考实现：逐字节异或（用于一致性校验）"""
+    checksum = initial
+    for byte in data:
+        checksum ^= byte
+    return checksum
+
+
+def xor_checksum(data, initial: int = 0) -> int:
+    """对 bytes / bytearray / memoryview 计算 XOR 校验和"""
+    size = len(data)
+    if size < _VECTORIZE_MIN_SIZE:
+        checksum = initial
+        for byte in data:
+            checksum ^= byte
+        return checksum
+
+    word_bytes = size & ~7
+    word = int(np.bitwise_xor.reduce(np.frombuffer(data, dtype=_U64_LE, count=word_bytes >> 3)))
+    word ^= word >> 32
+    word ^= word >> 16
+    word ^= word >> 8
+    checksum = (word & 0xFF) ^ initial
+    for index in range(word_bytes, size):
+        checksum ^= data[index]
+    return checksum
+
+
+def frame_checksum(func_code: int, payload) -> int:
+    """计算完整帧校验和，帧头/功能码/长度字段直接折算，不再拼接临时字节串"""
+    data_len = len(payload)
+    header_checksum = _FRAME_HEAD_XOR ^ func_code ^ ((data_len >> 8) & 0xFF) ^ (data_len & 0xFF)
+    return xor_checksum(payload, header_checksum)
+
+
+__all__ = ['xor_checksum', 'xor_checksum_reference', 'frame_checksum']
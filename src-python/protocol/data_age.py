@@ -0,0 +1,273 @@
+"""
+数据时延（data age）统计
+
+每条消息携带所在 datagram 的到达时刻 arrival_ns（time.monotonic_ns 时基；thread / process
+接收模式下由内核 SO_TIMESTAMPNS 换算而来），各处理阶段用当前单调时钟减去到达时刻，
+得到数据在该阶段时的“年龄”，用于区分显示滞后来自哪一段：
+
+    socket          内核收到 datagram -> 应用从 socket 读出（仅内核时间戳可用时）
+    dispatch        到达 -> UDPHandler 交付消息（接收线程/进程投递、解析）
+    processing      到达 -> 后台处理队列取出（处理队列排队）
+    broadcast       到达 -> WebSocket 广播写出完成
+    recording       到达 -> 写入录制文件
+    online_analysis 到达 -> OnlineAnalysis 转发完成
+
+处理阶段取出消息时另打上 processed_ns，broadcast / recording / online_analysis 在同一次记录中
+再统计一份自 processed_ns 起算的时延（since_processing），把“处理队列排队”与“下游消费”分开。
+
+按 (阶段, 起点, 消息类型) 分流统计：累计计数/均值/最大值，以及当前/上一个滚动窗口
+（窗口长度 window_seconds）的对数分桶直方图，recent_* 分位数反映最近一段时间的时延。
+直方图以微秒为单位，小于 2 * SUB_BUCKETS 的值线性计数，更大的值每个 2 的幂区间再等分为
+SUB_BUCKETS 个子桶，相对误差不超过 1 / SUB_BUCKETS，记录一次为 O(1)；分位数取所在桶的最高等效值。
+接收线程、录制线程与事件循环均会写入，按批次加锁。
+"""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DATA_AGE_STAGES = ('socket', 'dispatch', 'processing', 'broadcast', 'recording', 'online_analysis')
+# 同时统计自处理阶段取出（processed_ns）起算时延的阶段
+PROCESSED_ORIGIN_STAGES = frozenset(('broadcast', 'recording', 'online_analysis'))
+ORIGIN_ARRIVAL = 'arrival'
+ORIGIN_PROCESSING = 'processing'
+DEFAULT_WINDOW_SECONDS = 10
+SUB_BUCKET_BITS = 3
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_LINEAR_LIMIT = SUB_BUCKETS * 2
+PERCENTILES = ((50, 0.50), (90, 0.90), (95, 0.95), (99, 0.99))
+
+
+def bucket_index(value_us: int) -> int:
+    if value_us < _LINEAR_LIMIT:
+        return value_us if value_us > 0 else 0
+    shift = value_us.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift + 1) * SUB_BUCKETS + (value_us >> shift) - SUB_BUCKETS
+
+
+def bucket_highest_value(index: int) -> int:
+    """桶内最高等效值（微秒）"""
+    if index < _LINEAR_LIMIT:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    mantissa = index % SUB_BUCKETS + SUB_BUCKETS
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """对数分桶直方图（微秒），计数数组按需增长"""
+    __slots__ = ('counts', 'count', 'max_us')
+
+    def __init__(self):
+        self.counts: List[int] = []
+        self.count = 0
+        self.max_us = 0
+
+    def add(self, value_us: int) -> None:
+        index = bucket_index(value_us)
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        self.count += 1
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        counts = self.counts
+        if len(other.counts) > len(counts):
+            counts.extend([0] * (len(other.counts) - len(counts)))
+        for index, value in enumerate(other.counts):
+            counts[index] += value
+        self.count += other.count
+        self.max_us = max(self.max_us, other.max_us)
+        return self
+
+    def percentile_us(self, fraction: float) -> Optional[int]:
+        if not self.count:
+            return None
+        target = self.count * fraction
+        running = 0
+        for index, value in enumerate(self.counts):
+            running += value
+            if value and running >= target:
+                return min(bucket_highest_value(index), self.max_us)
+        return self.max_us
+
+
+class _AgeStream:
+    """单条 (阶段, 起点, 消息类型) 统计流：累计计数 + 当前/上一个窗口直方图"""
+    __slots__ = ('count', 'total_ns', 'max_ns', 'last_ns', 'last_at_ns', 'current', 'previous', 'window_start_ns')
+
+    def __init__(self, now_ns: int):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.last_ns = 0
+        self.last_at_ns = 0
+        self.current = LatencyHistogram()
+        self.previous = LatencyHistogram()
+        self.window_start_ns = now_ns
+
+    def rotate(self, now_ns: int, window_ns: int) -> None:
+        elapsed = now_ns - self.window_start_ns
+        if elapsed < window_ns:
+            return
+        self.previous = LatencyHistogram() if elapsed >= 2 * window_ns else self.current
+        self.current = LatencyHistogram()
+        self.window_start_ns = now_ns
+
+    def add(self, age_ns: int, now_ns: int) -> None:
+        if age_ns < 0:
+            age_ns = 0
+        self.count += 1
+        self.total_ns += age_ns
+        if age_ns > self.max_ns:
+            self.max_ns = age_ns
+        self.last_ns = age_ns
+        self.last_at_ns = now_ns
+        self.current.add(age_ns // 1000)
+
+
+def _summarize(streams: Iterable[_AgeStream]) -> Dict[str, Any]:
+    count = total_ns = max_ns = 0
+    last: Optional[_AgeStream] = None
+    recent = LatencyHistogram()
+    for stream in streams:
+        count += stream.count
+        total_ns += stream.total_ns
+        max_ns = max(max_ns, stream.max_ns)
+        if last is None or stream.last_at_ns > last.last_at_ns:
+            last = stream
+        recent.merge(stream.current).merge(stream.previous)
+
+    item: Dict[str, Any] = {
+        'count': count,
+        'mean_ms': round(total_ns / count / 1e6, 3) if count else 0.0,
+        'max_ms': round(max_ns / 1e6, 3),
+        'last_ms': round(last.last_ns / 1e6, 3) if last is not None else 0.0,
+    }
+    if recent.count:
+        for label, fraction in PERCENTILES:
+            item[f'recent_p{label}_ms'] = round(recent.percentile_us(fraction) / 1000, 3)
+    return item
+
+
+class DataAgeTracker:
+    """按处理阶段、消息类型统计消息自到达（及自处理阶段取出）以来的时延"""
+
+    def __init__(self, stages: Iterable[str] = DATA_AGE_STAGES, window_seconds: int = DEFAULT_WINDOW_SECONDS):
+        self.window_seconds = window_seconds
+        self._window_ns = int(window_seconds * 1e9)
+        self._stage_names = tuple(stages)
+        self._lock = threading.Lock()
+        # (阶段, 起点, 消息类型) -> 统计流；消息类型为 None 表示未按类型区分的样本（如 socket）
+        self._streams: Dict[Tuple[str, str, Optional[str]], _AgeStream] = {}
+
+    def _stream_locked(self, key: Tuple[str, str, Optional[str]], now_ns: int) -> _AgeStream:
+        stream = self._streams.get(key)
+        if stream is None:
+            stream = self._streams[key] = _AgeStream(now_ns)
+        else:
+            stream.rotate(now_ns, self._window_ns)
+        return stream
+
+    def record_age(self, stage: str, age_ns: int) -> None:
+        self.record_ages(stage, (age_ns,))
+
+    def record_ages(self, stage: str, ages_ns: Iterable[int], msg_type: Optional[str] = None) -> None:
+        now = time.monotonic_ns()
+        with self._lock:
+            stream = self._stream_locked((stage, ORIGIN_ARRIVAL, msg_type), now)
+            for age in ages_ns:
+                stream.add(age, now)
+
+    def record_arrivals(self, stage: str, arrivals_ns: Iterable[Optional[int]], now_ns: Optional[int] = None) -> None:
+        """以同一个当前时刻记录一批（不区分类型的）到达时刻，缺少到达时刻的跳过"""
+        now = time.monotonic_ns() if now_ns is None else now_ns
+        with self._lock:
+            stream = self._stream_locked((stage, ORIGIN_ARRIVAL, None), now)
+            for arrival in arrivals_ns:
+                if arrival is not None:
+                    stream.add(now - arrival, now)
+
+    def record_message(self, stage: str, message: Any, now_ns: Optional[int] = None) -> None:
+        self.record_messages(stage, (message,), now_ns)
+
+    def record_messages(self, stage: str, messages: Iterable[Any], now_ns: Optional[int] = None) -> None:
+        """按消息类型记录一批消息的 arrival_ns 时延；下游阶段同时记录 processed_ns 起算的时延"""
+        now = time.monotonic_ns() if now_ns is None else now_ns
+        with_processed = stage in PROCESSED_ORIGIN_STAGES
+        with self._lock:
+            for message in messages:
+                if not isinstance(message, dict):
+                    continue
+                msg_type = str(message.get('type') or 'unknown')
+                arrival = message.get('arrival_ns')
+                if arrival is not None:
+                    self._stream_locked((stage, ORIGIN_ARRIVAL, msg_type), now).add(now - arrival, now)
+                if with_processed:
+                    processed = message.get('processed_ns')
+                    if processed is not None:
+                        self._stream_locked((stage, ORIGIN_PROCESSING, msg_type), now).add(now - processed, now)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._streams = {}
+
+    def _grouped_locked(self) -> Dict[str, Dict[str, Dict[Optional[str], _AgeStream]]]:
+        """阶段 -> 起点 -> 消息类型 -> 统计流（读取前先滚动窗口）"""
+        now_ns = time.monotonic_ns()
+        grouped: Dict[str, Dict[str, Dict[Optional[str], _AgeStream]]] = {
+            stage: {} for stage in self._stage_names
+        }
+        for (stage, origin, msg_type), stream in self._streams.items():
+            stream.rotate(now_ns, self._window_ns)
+            grouped.setdefault(stage, {}).setdefault(origin, {})[msg_type] = stream
+        return grouped
+
+    @staticmethod
+    def _stage_summary(origins: Dict[str, Dict[Optional[str], _AgeStream]]) -> Dict[str, Any]:
+        item = _summarize(origins.get(ORIGIN_ARRIVAL, {}).values())
+        processed = origins.get(ORIGIN_PROCESSING)
+        if processed:
+            item['since_processing'] = _summarize(processed.values())
+        return item
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """各阶段汇总全部消息类型后的时延（用于管线状态 / health）"""
+        with self._lock:
+            return {stage: self._stage_summary(origins) for stage, origins in self._grouped_locked().items()}
+
+    def snapshot_by_type(self) -> Dict[str, Any]:
+        """各阶段汇总及按消息类型的时延明细"""
+        with self._lock:
+            stages: Dict[str, Any] = {}
+            for stage, origins in self._grouped_locked().items():
+                types = sorted({
+                    msg_type for streams in origins.values() for msg_type in streams if msg_type is not None
+                })
+                stages[stage] = {
+                    'overall': self._stage_summary(origins),
+                    'by_type': {
+                        msg_type: self._stage_summary({
+                            origin: {msg_type: streams[msg_type]}
+                            for origin, streams in origins.items() if msg_type in streams
+                        })
+                        for msg_type in types
+                    },
+                }
+        return {'window_seconds': self.window_seconds, 'unit': 'ms', 'stages': stages}
+
+
+# 全局统计器（接收通路与 main 中的处理管线共用）
+data_age_tracker = DataAgeTracker()
+
+
+__all__ = [
+    'DATA_AGE_STAGES',
+    'DataAgeTracker',
+    'LatencyHistogram',
+    'PROCESSED_ORIGIN_STAGES',
+    'data_age_tracker',
+]
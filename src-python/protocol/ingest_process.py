@@ -0,0 +1,574 @@
+"""
+UDP 独立接收进程
+
+接收与 NCLink 帧校验放到单独的进程中执行，绕开主进程（FastAPI / WebSocket）的 GIL 竞争：
+    接收进程：selectors 等待 -> 非阻塞 recvmsg 读到 EAGAIN -> 帧同步/校验
+              -> 把载荷原样写入共享内存环形缓冲（每个功能字一条 lane）
+    主进程：  事件循环内定时轮询环形缓冲 -> build_message 还原消息（字段仍按需延迟解码）
+              -> 以 IngestBatch 交给 UDPHandler，与接收线程模式走同一条分发路径
+
+监听 socket 由主进程创建并绑定后交给接收进程（主进程保留副本用于发送指令）。
+接收统计与拒帧/异常计数按统计周期聚合后经 multiprocessing.Queue 回传。
+入口限流（protocol.ingress_limit）在接收进程内按同样规则执行，运行时参数经控制队列下发。
+录制期间的原始抓包（recorder.raw_capture）同样由接收进程写入：抓包路径经控制队列下发，
+主进程发出的 datagram 经抓包队列转交接收进程，由同一个写入器落盘。
+"""
+
+import asyncio
+import heapq
+import logging
+import multiprocessing
+import queue
+import selectors
+import socket
+import time
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from recorder.raw_capture import RawCaptureWriter
+
+from .ingress_limit import HELD_RELEASE_INTERVAL_SEC, IngressLimiter
+from .nclink_protocol import NCLinkProtocolParser, PortType
+from .shm_ring import DEFAULT_SLOT_COUNT, RingLaneSpec, SharedMemoryRing, default_lane_specs
+from .udp_receiver import (
+    MAX_DATAGRAM_SIZE,
+    MAX_DATAGRAMS_PER_SOCKET,
+    RX_ANCILLARY_SIZE,
+    SELECT_TIMEOUT_SEC,
+    IngestBatch,
+    collect_parser_events,
+    enable_kernel_timestamps,
+    resolve_arrival,
+)
+
+logger = logging.getLogger(__name__)
+
+# 帧头(2) + 功能码(1) + 长度(2) + 校验(1) + 帧尾(2)
+_FRAME_OVERHEAD = 8
+# 接收进程回传统计的周期（秒）
+STATS_INTERVAL_SEC = 0.1
+# 每个统计周期最多回传的内核收包延迟样本数
+MAX_SOCKET_DELAY_SAMPLES = 256
+# 接收进程内帧解析/写环形缓冲异常的日志最小间隔（秒），期间的异常只计数
+FEED_ERROR_LOG_INTERVAL_SEC = 5.0
+# 主进程轮询环形缓冲的间隔（秒）与单轮最多读取的记录数
+POLL_INTERVAL_SEC = 0.002
+MAX_RECORDS_PER_POLL = 4096
+# 主进程转交接收进程写入抓包文件的发送方向记录队列长度，以及结束抓包时等待接收进程落盘的时间（秒）
+CAPTURE_QUEUE_SIZE = 4096
+CAPTURE_STOP_TIMEOUT_SEC = 5.0
+
+_arrival_key = attrgetter('arrival_ns')
+
+
+# ================================================================
+# 接收进程
+# ================================================================
+
+class _RingWriterParser(NCLinkProtocolParser):
+    """帧校验通过后不构造消息，直接把载荷写入环形缓冲"""
+
+    def __init__(self, ring: SharedMemoryRing, on_event=None, local_port: Optional[int] = None):
+        super().__init__(on_event=on_event, emit_parsed_events=False, local_port=local_port)
+        self.ring = ring
+        self.written = 0
+
+    def build_message(
+        self, func_code, payload, port_type, frame_size,
+        timestamp=None, payload_size=None, arrival_ns=None, local_port=None,
+    ):
+        self.ring.write(
+            func_code, payload, self._rx_timestamp or 0, int(port_type), payload_size,
+            self._rx_arrival_ns or 0, self.local_port or 0,
+        )
+        self.written += 1
+        return None
+
+
+def _merge_reasons(target: Dict[str, List[int]], items: List[Tuple[str, int, int]]) -> None:
+    for reason, frame_size, count in items:
+        entry = target.setdefault(reason, [0, 0])
+        entry[0] += frame_size
+        entry[1] += count
+
+
+def run_ingest_worker(
+    shm_name: str,
+    lane_specs: Sequence[RingLaneSpec],
+    sockets: Dict[int, socket.socket],
+    port_types: Dict[int, int],
+    stats_queue,
+    stop_event,
+    max_datagrams_per_socket: int = MAX_DATAGRAMS_PER_SOCKET,
+    ingress_config: Optional[Dict[str, Any]] = None,
+    control_queue=None,
+    capture_queue=None,
+    capture_idle=None,
+) -> None:
+    """接收进程入口：读 socket、校验帧、写环形缓冲，直到 stop_event 置位
+
+    control_queue 下发 {'config': 入口限流参数, 'clear': bool} 或 {'capture': {'path', 'local_host'} | None}；
+    capture_queue 为主进程发送方向的抓包记录，capture_idle 在没有进行中的抓包时置位。
+    """
+    ring = SharedMemoryRing.attach(shm_name, lane_specs)
+    limiter = IngressLimiter(**(ingress_config or {}))
+    pending_events: List[dict] = []
+    parsers = {port: _RingWriterParser(ring, on_event=pending_events.append, local_port=port) for port in sockets}
+    types = {port: PortType(value) for port, value in port_types.items()}
+
+    selector = selectors.DefaultSelector()
+    kernel_timestamps = True
+    for port, sock in sockets.items():
+        sock.setblocking(False)
+        kernel_timestamps = enable_kernel_timestamps(sock) and kernel_timestamps
+        selector.register(sock, selectors.EVENT_READ, port)
+    ancillary_size = RX_ANCILLARY_SIZE if kernel_timestamps else 0
+
+    rx_by_port: Dict[int, List[int]] = {}
+    rejections: Dict[str, List[int]] = {}
+    issues: Dict[str, List[int]] = {}
+    socket_delays: List[int] = []
+    counters = {
+        'datagrams': 0, 'bytes': 0, 'records': 0, 'receive_errors': 0, 'feed_errors': 0,
+        'kernel_timestamps': kernel_timestamps,
+    }
+    next_report = time.monotonic() + STATS_INTERVAL_SEC
+    # [下次允许记日志的时刻, 上次记日志后新增的异常数]
+    feed_error_log = [0.0, 0]
+    # [进行中的抓包写入器, 最近一次抓包的统计]
+    capture_state: List[Any] = [None, None]
+
+    def report() -> None:
+        counters['records'] = sum(parser.written for parser in parsers.values())
+        delta = {
+            'rx_by_port': [(port, packets, size) for port, (packets, size) in rx_by_port.items()],
+            'rejections': [(reason, size, count) for reason, (size, count) in rejections.items()],
+            'issues': [(reason, size, count) for reason, (size, count) in issues.items()],
+            'socket_delays': socket_delays[-MAX_SOCKET_DELAY_SAMPLES:],
+            'totals': dict(counters),
+        }
+        if limiter.enabled or limiter.shed_total:
+            delta['totals']['ingress'] = limiter.snapshot()
+        capture = capture_state[0]
+        if capture is not None:
+            capture_state[1] = capture.snapshot()
+        if capture_state[1] is not None:
+            delta['totals']['capture'] = capture_state[1]
+        try:
+            stats_queue.put_nowait(delta)
+        except queue.Full:
+            # 主进程来不及取走时保留增量，下个周期合并上报
+            return
+        rx_by_port.clear()
+        rejections.clear()
+        issues.clear()
+        socket_delays.clear()
+
+    def set_capture(options: Optional[Dict[str, Any]]) -> None:
+        capture = capture_state[0]
+        if capture is not None:
+            drain_capture_queue()
+            capture.stop()
+            capture_state[:] = [None, capture.snapshot()]
+        if options:
+            capture = RawCaptureWriter(options['path'], local_host=options.get('local_host'))
+            try:
+                capture.start()
+            except OSError as e:
+                logger.error(f"UDP接收进程打开抓包文件失败: {e}")
+            else:
+                capture_state[0] = capture
+        if capture_idle is not None and capture_state[0] is None:
+            capture_idle.set()
+
+    def drain_capture_queue() -> None:
+        if capture_queue is None:
+            return
+        capture = capture_state[0]
+        while True:
+            try:
+                local_port, data, peer, direction, timestamp_ns = capture_queue.get_nowait()
+            except queue.Empty:
+                return
+            except (OSError, ValueError, EOFError):
+                return
+            if capture is not None:
+                capture.write(local_port, data, peer, direction, timestamp_ns)
+
+    def apply_control() -> None:
+        while True:
+            try:
+                command = control_queue.get_nowait()
+            except queue.Empty:
+                return
+            except (OSError, ValueError, EOFError):
+                return
+            if 'capture' in command:
+                set_capture(command['capture'])
+            if 'config' in command:
+                limiter.configure(**command['config'], clear=bool(command.get('clear')))
+
+    def feed(parser, port_type, data, arrival, timestamp) -> None:
+        try:
+            parser.feed_data(data, port_type, arrival, timestamp)
+        except Exception as e:
+            counters['feed_errors'] += 1
+            feed_error_log[1] += 1
+            now = time.monotonic()
+            if now >= feed_error_log[0]:
+                logger.error(
+                    f"[端口{parser.local_port}] UDP接收进程处理数据包失败: {e}"
+                    f"（自上次记录以来共 {feed_error_log[1]} 次）"
+                )
+                feed_error_log[0] = now + FEED_ERROR_LOG_INTERVAL_SEC
+                feed_error_log[1] = 0
+
+    try:
+        while not stop_event.is_set():
+            holding = limiter.enabled and limiter.has_held
+            try:
+                ready = selector.select(HELD_RELEASE_INTERVAL_SEC if holding else SELECT_TIMEOUT_SEC)
+            except OSError:
+                if stop_event.is_set():
+                    break
+                time.sleep(SELECT_TIMEOUT_SEC)
+                continue
+
+            for key, _ in ready:
+                port = key.data
+                sock = key.fileobj
+                parser = parsers[port]
+                port_type = types.get(port, PortType.PORT_18504_RECEIVE)
+                datagrams = 0
+                total_bytes = 0
+                capture = capture_state[0]
+                while datagrams < max_datagrams_per_socket:
+                    try:
+                        data, ancdata, _, addr = sock.recvmsg(MAX_DATAGRAM_SIZE, ancillary_size)
+                    except (BlockingIOError, InterruptedError):
+                        break
+                    except OSError:
+                        counters['receive_errors'] += 1
+                        break
+                    datagrams += 1
+                    total_bytes += len(data)
+                    arrival, timestamp, delay = resolve_arrival(ancdata)
+                    if delay is not None and len(socket_delays) < MAX_SOCKET_DELAY_SAMPLES * 4:
+                        socket_delays.append(delay)
+                    if capture is not None:
+                        capture.write(port, data, addr)
+                    if limiter.enabled and not limiter.admit(port, data, (data, arrival, timestamp)):
+                        continue
+                    feed(parser, port_type, data, arrival, timestamp)
+                if datagrams:
+                    entry = rx_by_port.setdefault(port, [0, 0])
+                    entry[0] += datagrams
+                    entry[1] += total_bytes
+                    counters['datagrams'] += datagrams
+                    counters['bytes'] += total_bytes
+
+            if holding:
+                for port, (data, arrival, timestamp) in limiter.release_held():
+                    feed(parsers[port], types.get(port, PortType.PORT_18504_RECEIVE), data, arrival, timestamp)
+
+            if pending_events:
+                batch = IngestBatch()
+                collect_parser_events(pending_events, batch)
+                _merge_reasons(rejections, batch.rejections)
+                _merge_reasons(issues, batch.issues)
+
+            now = time.monotonic()
+            if now >= next_report:
+                if control_queue is not None:
+                    apply_control()
+                drain_capture_queue()
+                report()
+                next_report = now + STATS_INTERVAL_SEC
+        report()
+    finally:
+        set_capture(None)
+        selector.close()
+        for sock in sockets.values():
+            try:
+                sock.close()
+            except OSError:
+                pass
+        ring.close()
+
+
+# ================================================================
+# 主进程侧控制器
+# ================================================================
+
+class IngestProcess:
+    """启动接收进程，并在事件循环中轮询环形缓冲、还原消息批次"""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        sockets: Dict[int, socket.socket],
+        port_types: Dict[int, PortType],
+        on_batch,
+        slot_count: int = DEFAULT_SLOT_COUNT,
+        ingress_config: Optional[Dict[str, Any]] = None,
+    ):
+        self.loop = loop
+        self.sockets = dict(sockets)
+        self.port_types = dict(port_types)
+        self.on_batch = on_batch
+        self.lane_specs = default_lane_specs(max(1, int(slot_count)))
+        self.ingress_config = ingress_config
+
+        self.ring: Optional[SharedMemoryRing] = None
+        self._process = None
+        self._stop_event = None
+        self._stats_queue = None
+        self._control_queue = None
+        self._capture_queue = None
+        self._capture_idle = None
+        self._poll_task: Optional[asyncio.Task] = None
+        self._pending_events: List[dict] = []
+        # 主进程只用解析器的 build_message 还原消息，不做帧同步
+        self._builder = NCLinkProtocolParser(on_event=self._pending_events.append, emit_parsed_events=False)
+        self._worker_totals: Dict[str, Any] = {}
+        self._exit_reported = False
+        self.stats: Dict[str, Any] = {
+            'polls': 0,
+            'records': 0,
+            'messages': 0,
+            'max_poll_records': 0,
+        }
+
+    def start(self) -> None:
+        if self._process is not None and self._process.is_alive():
+            return
+        # spawn 在各平台行为一致，且不会把事件循环/线程状态带进子进程
+        ctx = multiprocessing.get_context('spawn')
+        self.ring = SharedMemoryRing.create(self.lane_specs)
+        self._stop_event = ctx.Event()
+        self._stats_queue = ctx.Queue(maxsize=64)
+        self._control_queue = ctx.Queue(maxsize=16)
+        self._capture_queue = ctx.Queue(maxsize=CAPTURE_QUEUE_SIZE)
+        self._capture_idle = ctx.Event()
+        self._capture_idle.set()
+        self._process = ctx.Process(
+            target=run_ingest_worker,
+            args=(
+                self.ring.name,
+                self.lane_specs,
+                self.sockets,
+                {port: int(port_type) for port, port_type in self.port_types.items()},
+                self._stats_queue,
+                self._stop_event,
+                MAX_DATAGRAMS_PER_SOCKET,
+                self.ingress_config,
+                self._control_queue,
+                self._capture_queue,
+                self._capture_idle,
+            ),
+            name='nclink-udp-ingest',
+            daemon=True,
+        )
+        self._process.start()
+        self._exit_reported = False
+        self._poll_task = self.loop.create_task(self._poll_loop())
+        logger.info(
+            f"UDP接收进程已启动 (pid={self._process.pid})，端口: {sorted(self.sockets)}，"
+            f"共享内存环形缓冲 {self.ring.shm.size} 字节"
+        )
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """停止接收进程并释放共享内存（阻塞调用，事件循环中请经 to_thread 执行）"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+        if self._process is not None:
+            self._process.join(timeout)
+            if self._process.is_alive():
+                logger.warning("UDP接收进程未能在超时时间内退出，强制终止")
+                self._process.terminate()
+                self._process.join(timeout)
+        self._process = None
+        for channel in (self._stats_queue, self._control_queue, self._capture_queue):
+            if channel is not None:
+                channel.close()
+        self._stats_queue = None
+        self._control_queue = None
+        self._capture_queue = None
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    def configure_ingress(self, ingress_config: Dict[str, Any], clear: bool = False) -> None:
+        """把新的入口限流参数下发给接收进程（下个统计周期生效）"""
+        self.ingress_config = ingress_config
+        if not self._send_control({'config': ingress_config, 'clear': clear}):
+            logger.warning("UDP接收进程控制队列已满，入口限流参数未能下发")
+
+    def start_capture(self, path: str, local_host: Optional[str] = None) -> 'WorkerCapture':
+        """让接收进程开始把收到的 datagram 写入抓包文件（下个统计周期生效）"""
+        if self._capture_idle is not None:
+            self._capture_idle.clear()
+        if not self._send_control({'capture': {'path': path, 'local_host': local_host}}):
+            if self._capture_idle is not None:
+                self._capture_idle.set()
+            raise OSError(f"UDP接收进程控制队列不可用，原始抓包未能开始: {path}")
+        return WorkerCapture(self, path)
+
+    def _send_control(self, command: Dict[str, Any]) -> bool:
+        if self._control_queue is None:
+            return False
+        try:
+            self._control_queue.put_nowait(command)
+        except (queue.Full, OSError, ValueError):
+            return False
+        return True
+
+    def cancel_polling(self) -> None:
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats['alive'] = self.is_alive()
+        stats['pid'] = self._process.pid if self._process is not None else None
+        stats['worker'] = dict(self._worker_totals)
+        stats['ring'] = self.ring.snapshot() if self.ring is not None else None
+        return stats
+
+    # ------------------------------------------------------------
+    # 事件循环侧轮询
+    # ------------------------------------------------------------
+
+    async def _poll_loop(self) -> None:
+        while True:
+            try:
+                batch, full = self.poll()
+                if not batch.is_empty():
+                    self.on_batch(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"读取UDP接收进程环形缓冲失败: {e}")
+                full = False
+
+            if not self._exit_reported and self._process is not None and not self._process.is_alive():
+                self._exit_reported = True
+                logger.error(f"UDP接收进程意外退出 (exitcode={self._process.exitcode})")
+
+            # 本轮读满说明仍有积压，让出一次事件循环后立即继续
+            await asyncio.sleep(0 if full else POLL_INTERVAL_SEC)
+
+    def poll(self) -> Tuple[IngestBatch, bool]:
+        """读出环形缓冲中的新记录与接收进程回传的统计增量"""
+        batch = IngestBatch()
+        ring = self.ring
+        if ring is None:
+            return batch, False
+
+        self._drain_stats(batch)
+
+        # 环形缓冲按 lane 分组读出，归并为到达顺序后再还原消息，保证批内跨功能字的先后与接收一致
+        records = list(heapq.merge(*ring.read_lanes(MAX_RECORDS_PER_POLL), key=_arrival_key))
+        build_message = self._builder.build_message
+        messages = batch.messages
+        for record in records:
+            try:
+                port_type = PortType(record.port_type)
+            except ValueError:
+                port_type = PortType.PORT_18504_RECEIVE
+            message = build_message(
+                record.func_code,
+                record.payload,
+                port_type,
+                record.payload_size + _FRAME_OVERHEAD,
+                record.timestamp,
+                record.payload_size,
+                record.arrival_ns,
+                record.local_port,
+            )
+            if message is not None:
+                messages.append(message)
+                batch.arrivals.append(record.arrival_ns)
+        collect_parser_events(self._pending_events, batch)
+
+        stats = self.stats
+        stats['polls'] += 1
+        stats['records'] += len(records)
+        stats['messages'] += len(messages)
+        if len(records) > stats['max_poll_records']:
+            stats['max_poll_records'] = len(records)
+        return batch, len(records) >= MAX_RECORDS_PER_POLL
+
+    def _drain_stats(self, batch: IngestBatch) -> None:
+        stats_queue = self._stats_queue
+        if stats_queue is None:
+            return
+        while True:
+            try:
+                delta = stats_queue.get_nowait()
+            except queue.Empty:
+                return
+            except (OSError, ValueError, EOFError):
+                return
+            batch.rx_by_port.extend(delta.get('rx_by_port', ()))
+            batch.rejections.extend(delta.get('rejections', ()))
+            batch.issues.extend(delta.get('issues', ()))
+            batch.socket_delays.extend(delta.get('socket_delays', ()))
+            self._worker_totals = delta.get('totals', self._worker_totals)
+
+
+class WorkerCapture:
+    """process 接收模式下的原始抓包句柄，接口与 RawCaptureWriter 一致（write / stop / snapshot）
+
+    抓包文件只由接收进程写入：接收方向在接收进程内直接写，
+    发送方向（主进程发出的 datagram）经抓包队列转交，队列满时丢弃并计数。
+    """
+
+    def __init__(self, ingest: IngestProcess, path: str):
+        self.ingest = ingest
+        self.path = path
+        self.tx_dropped = 0
+
+    def write(
+        self,
+        local_port: int,
+        data: bytes,
+        peer: Optional[Tuple[str, int]] = None,
+        direction: str = 'rx',
+        timestamp_ns: Optional[int] = None,
+    ) -> None:
+        capture_queue = self.ingest._capture_queue
+        if capture_queue is None:
+            self.tx_dropped += 1
+            return
+        record = (local_port, bytes(data), peer, direction, time.time_ns() if timestamp_ns is None else timestamp_ns)
+        try:
+            capture_queue.put_nowait(record)
+        except (queue.Full, OSError, ValueError):
+            self.tx_dropped += 1
+
+    def stop(self, timeout: float = CAPTURE_STOP_TIMEOUT_SEC) -> None:
+        """通知接收进程结束抓包，并等待其写完剩余记录（阻塞调用）"""
+        ingest = self.ingest
+        if not ingest._send_control({'capture': None}):
+            return
+        if ingest._capture_idle is not None and not ingest._capture_idle.wait(timeout):
+            logger.warning(f"UDP接收进程未能在超时时间内结束抓包: {self.path}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = dict(self.ingest._worker_totals.get('capture') or {})
+        stats['path'] = self.path
+        stats['tx_dropped'] = self.tx_dropped
+        stats['writer'] = 'ingest_process'
+        return stats
+
+
+__all__ = [
+    'IngestProcess',
+    'WorkerCapture',
+    'run_ingest_worker',
+]
@@ -0,0 +1,367 @@
+"""
+UDP 接收入口限流（令牌桶准入）
+
+机载进程异常时可能以远超正常频率的速度向某个端口（如 18507 / 18511）灌包，
+而 datagram 一旦进入 feed_data 就要完成帧同步、校验与消息构造，处理管线的合并/丢弃发生得太晚。
+这里在 feed_data 之前按 datagram 做准入判断：
+
+    - 端口令牌桶：每个本地端口一个桶，rate 为每秒补充的 datagram 数，burst 为桶容量
+    - 功能字令牌桶：按 datagram 首帧功能字（帧头 FF FC 后一字节，不解析载荷）跨端口共用一个桶
+    - datagram 需两个桶都有令牌才放行，任一桶不足即丢弃并按端口/功能字/原因计数
+
+对 latest_value_func_codes 中的高频遥测功能字保留“最新值”语义：被丢弃的 datagram 按
+(端口, 功能字) 暂存最新的一个，之后有令牌时补发（期间该键有新 datagram 放行则直接作废），
+限流只降低这些类型的更新频率，不会让界面停在洪泛开始前的旧值上。
+暂存按持有者（owner，如分片接收线程名）分开：分片接收时各线程共用一个限流器，但每个线程
+只补发自己暂存的 datagram，交给自己的解析器，不会取走其他分片的数据或把帧喂给别的帧缓冲。
+
+首帧不以 FF FC 开头的 datagram（跨 datagram 的帧后半段等）只受端口桶约束；
+一个 datagram 内含多帧时按首帧功能字计。丢弃跨 datagram 帧的前半段后，后半段会被解析器按失步处理。
+
+关闭时调用方只读取一次 enabled 属性；开启后接收线程与事件循环均可调用，内部加锁。
+限流参数可在运行时通过 /api/ingress/config 修改。
+"""
+
+import threading
+import time
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+from config import FIXED_INGRESS_FUNC_LIMITS, FIXED_INGRESS_LIMIT_ENABLED, FIXED_INGRESS_PORT_LIMITS
+
+from .nclink_protocol import (
+    NCLINK_GCS_TELEMETRY,
+    NCLINK_HEAD0,
+    NCLINK_HEAD1,
+    NCLINK_RECEIVE_EXTY_FCS_AVOIFLAG,
+    NCLINK_RECEIVE_EXTY_FCS_DATACTRL,
+    NCLINK_RECEIVE_EXTY_FCS_DATAGCS,
+    NCLINK_RECEIVE_EXTY_FCS_ESC,
+    NCLINK_RECEIVE_EXTY_FCS_GNCBUS,
+    NCLINK_RECEIVE_EXTY_FCS_LINESTRUC_AB,
+    NCLINK_RECEIVE_EXTY_FCS_LINESTRUC_AIM2AB,
+    NCLINK_RECEIVE_EXTY_FCS_PWMS,
+    NCLINK_RECEIVE_EXTY_FCS_STATES,
+)
+
+# 默认保留最新值的功能字：与 pipeline.decimation 缺省规则中 keep=latest 的高频遥测对应
+DEFAULT_LATEST_VALUE_FUNC_CODES = (
+    NCLINK_RECEIVE_EXTY_FCS_PWMS,
+    NCLINK_RECEIVE_EXTY_FCS_STATES,
+    NCLINK_RECEIVE_EXTY_FCS_DATACTRL,
+    NCLINK_RECEIVE_EXTY_FCS_GNCBUS,
+    NCLINK_RECEIVE_EXTY_FCS_AVOIFLAG,
+    NCLINK_RECEIVE_EXTY_FCS_DATAGCS,
+    NCLINK_RECEIVE_EXTY_FCS_LINESTRUC_AIM2AB,
+    NCLINK_RECEIVE_EXTY_FCS_LINESTRUC_AB,
+    NCLINK_RECEIVE_EXTY_FCS_ESC,
+    NCLINK_GCS_TELEMETRY,
+)
+# 有暂存最新值时的补发检查间隔（秒），与 50Hz 遥测周期相当
+HELD_RELEASE_INTERVAL_SEC = 0.02
+MAX_RATE = 1_000_000.0
+
+# (每秒补充令牌数, 桶容量)
+RateLimit = Tuple[float, float]
+
+
+def _normalize_limit(value: Any) -> RateLimit:
+    """接受 rate、(rate, burst) 或 {'rate': .., 'burst': ..}；burst 缺省为 1 秒的令牌量"""
+    if isinstance(value, Mapping):
+        rate, burst = value.get('rate'), value.get('burst')
+    elif isinstance(value, (tuple, list)):
+        rate, burst = (list(value) + [None])[:2]
+    else:
+        rate, burst = value, None
+    rate = min(MAX_RATE, max(0.0, float(rate)))
+    if rate <= 0.0:
+        # 速率为 0 表示全部丢弃
+        return 0.0, 0.0
+    burst = max(1.0, float(burst) if burst is not None else rate)
+    return rate, burst
+
+
+def _parse_key(key: Any) -> int:
+    """端口号或功能字，字符串可写十六进制（如 "0x71"）"""
+    return int(key, 0) if isinstance(key, str) else int(key)
+
+
+def _normalize_limits(limits: Mapping[Any, Any]) -> Dict[int, RateLimit]:
+    return {_parse_key(key): _normalize_limit(value) for key, value in limits.items()}
+
+
+def peek_func_code(data: bytes) -> Optional[int]:
+    """不解析载荷，取 datagram 首帧的功能字；不以帧头开头时返回 None"""
+    if len(data) >= 3 and data[0] == NCLINK_HEAD0 and data[1] == NCLINK_HEAD1:
+        return data[2]
+    return None
+
+
+class TokenBucket:
+    """按单调时钟连续补充令牌的令牌桶，每次判断 O(1)"""
+    __slots__ = ('rate', 'burst', 'tokens', 'updated')
+
+    def __init__(self, rate: float, burst: float, now: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic() if now is None else now
+
+    def refill(self, now: float) -> float:
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.updated = now
+        return self.tokens
+
+
+class IngressLimiter:
+    """按端口与功能字的 datagram 准入控制"""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        port_limits: Optional[Mapping[Any, Any]] = None,
+        func_limits: Optional[Mapping[Any, Any]] = None,
+        latest_value_func_codes: Iterable[int] = DEFAULT_LATEST_VALUE_FUNC_CODES,
+    ):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._port_limits: Dict[int, RateLimit] = {}
+        self._func_limits: Dict[int, RateLimit] = {}
+        self._port_buckets: Dict[int, TokenBucket] = {}
+        self._func_buckets: Dict[int, TokenBucket] = {}
+        self._latest_value: frozenset = frozenset()
+        # 持有者 -> {(端口, 功能字) -> 最近一个被丢弃的高频遥测 datagram（调用方给定的不透明对象）}
+        self._held: Dict[Hashable, Dict[Tuple[int, int], Any]] = {}
+        self._reset_counters()
+        self.configure(
+            enabled=enabled,
+            port_limits=port_limits or {},
+            func_limits=func_limits or {},
+            latest_value_func_codes=latest_value_func_codes,
+        )
+
+    def _reset_counters(self) -> None:
+        self.shed_total = 0
+        self.held_released = 0
+        self.held_superseded = 0
+        # 端口 -> [端口桶丢弃数, 功能字桶丢弃数]
+        self._shed_by_port: Dict[int, List[int]] = {}
+        # 功能字 -> 丢弃数（不区分原因）
+        self._shed_by_func: Dict[int, int] = {}
+
+    def configure(
+        self,
+        enabled: Optional[bool] = None,
+        port_limits: Optional[Mapping[Any, Any]] = None,
+        func_limits: Optional[Mapping[Any, Any]] = None,
+        latest_value_func_codes: Optional[Iterable[int]] = None,
+        clear: bool = False,
+    ) -> Dict[str, Any]:
+        """修改限流参数；port_limits / func_limits 整体替换
+
+        已有的令牌桶按新参数调整速率与容量，不重置当前令牌数（不超过新容量）。
+        """
+        with self._lock:
+            if port_limits is not None:
+                self._port_limits = _normalize_limits(port_limits)
+                self._port_buckets = self._rebuild_buckets(self._port_buckets, self._port_limits)
+            if func_limits is not None:
+                self._func_limits = _normalize_limits(func_limits)
+                self._func_buckets = self._rebuild_buckets(self._func_buckets, self._func_limits)
+            if latest_value_func_codes is not None:
+                self._latest_value = frozenset(_parse_key(code) for code in latest_value_func_codes)
+                self._held = {
+                    owner: kept for owner, kept in (
+                        (owner, {key: item for key, item in held.items() if key[1] in self._latest_value})
+                        for owner, held in self._held.items()
+                    ) if kept
+                }
+            if clear:
+                self._reset_counters()
+            if enabled is not None:
+                self.enabled = bool(enabled)
+                if not self.enabled:
+                    self._held = {}
+        return self.get_config()
+
+    @staticmethod
+    def _rebuild_buckets(buckets: Dict[int, TokenBucket], limits: Dict[int, RateLimit]) -> Dict[int, TokenBucket]:
+        now = time.monotonic()
+        rebuilt: Dict[int, TokenBucket] = {}
+        for key, (rate, burst) in limits.items():
+            bucket = buckets.get(key)
+            if bucket is None:
+                rebuilt[key] = TokenBucket(rate, burst, now)
+                continue
+            bucket.refill(now)
+            bucket.rate = rate
+            bucket.burst = burst
+            bucket.tokens = min(bucket.tokens, burst)
+            rebuilt[key] = bucket
+        return rebuilt
+
+    def get_config(self) -> Dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'port_limits': {
+                str(port): {'rate': rate, 'burst': burst} for port, (rate, burst) in sorted(self._port_limits.items())
+            },
+            'func_limits': {
+                f'0x{code:02X}': {'rate': rate, 'burst': burst}
+                for code, (rate, burst) in sorted(self._func_limits.items())
+            },
+            'latest_value_func_codes': [f'0x{code:02X}' for code in sorted(self._latest_value)],
+        }
+
+    def export_config(self) -> Dict[str, Any]:
+        """可直接传回 configure(**config) 的参数（用于同步到接收进程）"""
+        return {
+            'enabled': self.enabled,
+            'port_limits': dict(self._port_limits),
+            'func_limits': dict(self._func_limits),
+            'latest_value_func_codes': sorted(self._latest_value),
+        }
+
+    @property
+    def has_held(self) -> bool:
+        return bool(self._held)
+
+    def holds(self, owner: Hashable = None) -> bool:
+        """owner 是否有暂存的 datagram"""
+        return owner in self._held
+
+    def admit(
+        self,
+        port: int,
+        data: bytes,
+        item: Any = None,
+        now: Optional[float] = None,
+        owner: Hashable = None,
+    ) -> bool:
+        """判断一个 datagram 是否放行；调用方应先检查 enabled
+
+        被丢弃的高频遥测 datagram 以 item（缺省为 data 本身）暂存在 owner 名下，
+        之后由同一 owner 调用 release_held 取回补发。
+        """
+        func_code = peek_func_code(data)
+        with self._lock:
+            if now is None:
+                now = time.monotonic()
+            if self._try_consume(port, func_code, now):
+                held = self._held.get(owner) if self._held else None
+                if held and held.pop((port, func_code), None) is not None:
+                    self.held_superseded += 1
+                    if not held:
+                        del self._held[owner]
+                return True
+
+            self.shed_total += 1
+            if func_code is not None:
+                self._shed_by_func[func_code] = self._shed_by_func.get(func_code, 0) + 1
+                if func_code in self._latest_value:
+                    held = self._held.get(owner)
+                    if held is None:
+                        held = self._held[owner] = {}
+                    held[(port, func_code)] = data if item is None else item
+            return False
+
+    def _try_consume(self, port: int, func_code: Optional[int], now: float) -> bool:
+        port_bucket = self._port_buckets.get(port)
+        func_bucket = self._func_buckets.get(func_code) if func_code is not None else None
+        if port_bucket is not None and port_bucket.refill(now) < 1.0:
+            self._count_port_shed(port, 0)
+            return False
+        if func_bucket is not None and func_bucket.refill(now) < 1.0:
+            self._count_port_shed(port, 1)
+            return False
+        if port_bucket is not None:
+            port_bucket.tokens -= 1.0
+        if func_bucket is not None:
+            func_bucket.tokens -= 1.0
+        return True
+
+    def _count_port_shed(self, port: int, reason_index: int) -> None:
+        entry = self._shed_by_port.get(port)
+        if entry is None:
+            entry = self._shed_by_port[port] = [0, 0]
+        entry[reason_index] += 1
+
+    def release_held(
+        self,
+        ports: Optional[Iterable[int]] = None,
+        now: Optional[float] = None,
+        owner: Hashable = None,
+    ) -> List[Tuple[int, Any]]:
+        """取回 owner 名下令牌已恢复的暂存 datagram，返回 [(端口, item)]；ports 限定只取这些端口的"""
+        if owner not in self._held:
+            return []
+        port_filter = None if ports is None else set(ports)
+        released: List[Tuple[int, Any]] = []
+        with self._lock:
+            held = self._held.get(owner)
+            if not held:
+                return []
+            if now is None:
+                now = time.monotonic()
+            for key in list(held):
+                port, func_code = key
+                if port_filter is not None and port not in port_filter:
+                    continue
+                port_bucket = self._port_buckets.get(port)
+                func_bucket = self._func_buckets.get(func_code)
+                if port_bucket is not None and port_bucket.refill(now) < 1.0:
+                    continue
+                if func_bucket is not None and func_bucket.refill(now) < 1.0:
+                    continue
+                if port_bucket is not None:
+                    port_bucket.tokens -= 1.0
+                if func_bucket is not None:
+                    func_bucket.tokens -= 1.0
+                released.append((port, held.pop(key)))
+            if not held:
+                del self._held[owner]
+            self.held_released += len(released)
+        return released
+
+    def discard_held(self, owner: Hashable = None) -> int:
+        """丢弃 owner 名下的全部暂存（接收线程退出时调用），返回丢弃数"""
+        with self._lock:
+            held = self._held.pop(owner, None)
+        return len(held) if held else 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            by_port = {
+                str(port): {'shed_port_limit': entry[0], 'shed_func_limit': entry[1]}
+                for port, entry in sorted(self._shed_by_port.items())
+            }
+            by_func = {f'0x{code:02X}': count for code, count in sorted(self._shed_by_func.items())}
+            held = sum(len(items) for items in self._held.values())
+        return {
+            **self.get_config(),
+            'shed_total': self.shed_total,
+            'shed_by_port': by_port,
+            'shed_by_func_code': by_func,
+            'held_latest': held,
+            'held_released': self.held_released,
+            'held_superseded': self.held_superseded,
+        }
+
+
+# 全局限流器（UDPHandler 重建时保留运行时配置与计数）
+ingress_limiter = IngressLimiter(
+    enabled=FIXED_INGRESS_LIMIT_ENABLED,
+    port_limits=FIXED_INGRESS_PORT_LIMITS,
+    func_limits=FIXED_INGRESS_FUNC_LIMITS,
+)
+
+
+__all__ = [
+    'DEFAULT_LATEST_VALUE_FUNC_CODES',
+    'HELD_RELEASE_INTERVAL_SEC',
+    'IngressLimiter',
+    'TokenBucket',
+    'ingress_limiter',
+    'peek_func_code',
+]
@@ -0,0 +1,307 @@
+"""
+链路质量流式统计
+
+按 (本地端口, 功能字) 维护一条统计流，每条消息 O(1) 更新、内存固定：
+    - 到达间隔直方图（固定分桶）与最大间隔
+    - 抖动：相对期望周期（EXPECTED_PERIOD_MS，未登记时相对间隔 EWMA）的偏差直方图，
+      以及 RFC 3550 风格的平滑抖动估计
+    - 序号缺口：登记了序号字段的功能字（目前为 0x71 seq_id）统计丢包、重复、乱序与发送端重启
+    - 速率偏差：最近窗口的实际速率相对期望速率的偏差百分比
+
+直方图分为累计与“当前/上一个”两个滚动窗口（窗口长度 window_seconds），
+分位数取两个窗口合并后的分桶上界，反映最近一段时间的链路状态。
+到达时刻取消息的 arrival_ns（见 protocol.data_age），同一 datagram 内的帧间隔为 0。
+"""
+
+import struct
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .nclink_protocol import NCLINK_GCS_TELEMETRY
+
+# 各功能字的期望发送周期（毫秒）
+EXPECTED_PERIOD_MS = {
+    0x41: 20.0,
+    0x42: 20.0,
+    0x43: 20.0,
+    0x44: 20.0,
+    0x45: 20.0,
+    0x46: 20.0,
+    0x47: 20.0,
+    0x48: 20.0,
+    0x49: 20.0,
+    0x4A: 20.0,
+    0x50: 100.0,
+    0x52: 100.0,
+    0x53: 500.0,
+    0x71: 100.0,
+}
+
+# 带序号字段的功能字：(载荷内偏移, 编码)
+SEQUENCE_FIELDS: Dict[int, Tuple[int, struct.Struct]] = {
+    NCLINK_GCS_TELEMETRY: (0, struct.Struct('<I')),
+}
+_SEQ_MODULUS = 1 << 32
+_SEQ_HALF = 1 << 31
+# 序号前跳超过该值视为发送端重启，不计入丢包
+SEQUENCE_RESET_THRESHOLD = 10000
+
+# 分桶上界（毫秒），最后一个桶收纳超出上界的样本
+INTERVAL_BUCKETS_MS = (1, 2, 5, 10, 15, 20, 25, 30, 40, 50, 75, 100, 150, 200, 300, 500, 1000, 2000)
+JITTER_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _histogram_percentile(counts: List[int], edges: Tuple[float, ...], fraction: float) -> Optional[float]:
+    """分桶分位数：返回累计占比达到 fraction 的桶上界（落在溢出桶时返回最后一个上界）"""
+    total = sum(counts)
+    if not total:
+        return None
+    target = total * fraction
+    running = 0
+    for index, count in enumerate(counts):
+        running += count
+        if running >= target:
+            return float(edges[index]) if index < len(edges) else float(edges[-1])
+    return float(edges[-1])
+
+
+def _histogram_dict(counts: List[int], edges: Tuple[float, ...]) -> Dict[str, int]:
+    labels = [f'<={edge:g}' for edge in edges] + [f'>{edges[-1]:g}']
+    return {label: count for label, count in zip(labels, counts) if count}
+
+
+class _StreamStats:
+    """单条 (端口, 功能字) 统计流"""
+    __slots__ = (
+        'expected_ms', 'count', 'last_arrival_ns', 'interval_ewma_ms', 'jitter_ms',
+        'max_interval_ms', 'interval_total', 'interval_window', 'jitter_window',
+        'window_start_ns', 'window_count', 'prev_window_count', 'prev_window_ns',
+        'seq_last', 'seq_received', 'seq_lost', 'seq_gap_events', 'seq_duplicates',
+        'seq_reordered', 'seq_resets', 'window_lost',
+    )
+
+    def __init__(self, expected_ms: Optional[float], now_ns: int):
+        self.expected_ms = expected_ms
+        self.count = 0
+        self.last_arrival_ns: Optional[int] = None
+        self.interval_ewma_ms: Optional[float] = None
+        self.jitter_ms = 0.0
+        self.max_interval_ms = 0.0
+        self.interval_total = [0] * (len(INTERVAL_BUCKETS_MS) + 1)
+        # [当前窗口, 上一个窗口]
+        self.interval_window = ([0] * (len(INTERVAL_BUCKETS_MS) + 1), [0] * (len(INTERVAL_BUCKETS_MS) + 1))
+        self.jitter_window = ([0] * (len(JITTER_BUCKETS_MS) + 1), [0] * (len(JITTER_BUCKETS_MS) + 1))
+        self.window_start_ns = now_ns
+        self.window_count = 0
+        self.prev_window_count = 0
+        self.prev_window_ns = 0
+        self.window_lost = [0, 0]
+        self.seq_last: Optional[int] = None
+        self.seq_received = 0
+        self.seq_lost = 0
+        self.seq_gap_events = 0
+        self.seq_duplicates = 0
+        self.seq_reordered = 0
+        self.seq_resets = 0
+
+    def rotate(self, now_ns: int, window_ns: int) -> None:
+        elapsed = now_ns - self.window_start_ns
+        if elapsed < window_ns:
+            return
+        current, previous = self.interval_window
+        # 超过两个窗口没有数据时上一个窗口也已过期
+        stale = elapsed >= 2 * window_ns
+        for index in range(len(current)):
+            previous[index] = 0 if stale else current[index]
+            current[index] = 0
+        current, previous = self.jitter_window
+        for index in range(len(current)):
+            previous[index] = 0 if stale else current[index]
+            current[index] = 0
+        self.prev_window_count = 0 if stale else self.window_count
+        self.prev_window_ns = 0 if stale else elapsed
+        self.window_lost[1] = 0 if stale else self.window_lost[0]
+        self.window_lost[0] = 0
+        self.window_count = 0
+        self.window_start_ns = now_ns
+
+    def add_arrival(self, arrival_ns: int) -> None:
+        self.count += 1
+        self.window_count += 1
+        last = self.last_arrival_ns
+        self.last_arrival_ns = arrival_ns
+        if last is None:
+            return
+        interval = (arrival_ns - last) / 1e6
+        if interval < 0:
+            interval = 0.0
+        if interval > self.max_interval_ms:
+            self.max_interval_ms = interval
+        bucket = bisect_left(INTERVAL_BUCKETS_MS, interval)
+        self.interval_total[bucket] += 1
+        self.interval_window[0][bucket] += 1
+
+        ewma = self.interval_ewma_ms
+        ewma = interval if ewma is None else ewma + (interval - ewma) / 16.0
+        self.interval_ewma_ms = ewma
+        reference = self.expected_ms if self.expected_ms else ewma
+        deviation = abs(interval - reference)
+        self.jitter_window[0][bisect_left(JITTER_BUCKETS_MS, deviation)] += 1
+        self.jitter_ms += (deviation - self.jitter_ms) / 16.0
+
+    def add_sequence(self, seq: int) -> None:
+        self.seq_received += 1
+        last = self.seq_last
+        if last is None:
+            self.seq_last = seq
+            return
+        delta = (seq - last) % _SEQ_MODULUS
+        if delta == 0:
+            self.seq_duplicates += 1
+        elif delta < _SEQ_HALF:
+            if delta > SEQUENCE_RESET_THRESHOLD:
+                self.seq_resets += 1
+            elif delta > 1:
+                self.seq_lost += delta - 1
+                self.window_lost[0] += delta - 1
+                self.seq_gap_events += 1
+            self.seq_last = seq
+        elif _SEQ_MODULUS - delta > SEQUENCE_RESET_THRESHOLD:
+            # 序号大幅回退：发送端重启
+            self.seq_resets += 1
+            self.seq_last = seq
+        else:
+            # 迟到的旧序号：此前按缺口计入的丢包减一
+            self.seq_reordered += 1
+            if self.seq_lost:
+                self.seq_lost -= 1
+
+    def snapshot(self, now_ns: int) -> Dict[str, Any]:
+        current, previous = self.interval_window
+        intervals = [a + b for a, b in zip(current, previous)]
+        current, previous = self.jitter_window
+        jitter = [a + b for a, b in zip(current, previous)]
+
+        span_ns = (now_ns - self.window_start_ns) + self.prev_window_ns
+        recent_count = self.window_count + self.prev_window_count
+        rate_hz = recent_count / (span_ns / 1e9) if span_ns > 0 else 0.0
+        expected_hz = 1000.0 / self.expected_ms if self.expected_ms else None
+
+        result: Dict[str, Any] = {
+            'messages_total': self.count,
+            'last_seen_ms_ago': round((now_ns - self.last_arrival_ns) / 1e6, 1) if self.last_arrival_ns else None,
+            'expected_period_ms': self.expected_ms,
+            'recent_rate_hz': round(rate_hz, 2),
+            'expected_rate_hz': round(expected_hz, 2) if expected_hz else None,
+            'rate_deviation_pct': round((rate_hz - expected_hz) / expected_hz * 100.0, 1) if expected_hz else None,
+            'interval_ms': {
+                'ewma': round(self.interval_ewma_ms, 3) if self.interval_ewma_ms is not None else None,
+                'max': round(self.max_interval_ms, 3),
+                'recent_p50': _histogram_percentile(intervals, INTERVAL_BUCKETS_MS, 0.50),
+                'recent_p95': _histogram_percentile(intervals, INTERVAL_BUCKETS_MS, 0.95),
+                'recent_p99': _histogram_percentile(intervals, INTERVAL_BUCKETS_MS, 0.99),
+                'recent_histogram': _histogram_dict(intervals, INTERVAL_BUCKETS_MS),
+                'total_histogram': _histogram_dict(self.interval_total, INTERVAL_BUCKETS_MS),
+            },
+            'jitter_ms': {
+                'smoothed': round(self.jitter_ms, 3),
+                'recent_p50': _histogram_percentile(jitter, JITTER_BUCKETS_MS, 0.50),
+                'recent_p95': _histogram_percentile(jitter, JITTER_BUCKETS_MS, 0.95),
+                'recent_p99': _histogram_percentile(jitter, JITTER_BUCKETS_MS, 0.99),
+            },
+        }
+        if self.seq_last is not None:
+            expected_total = self.seq_received + self.seq_lost
+            recent_lost = self.window_lost[0] + self.window_lost[1]
+            result['sequence'] = {
+                'last': self.seq_last,
+                'received': self.seq_received,
+                'lost': self.seq_lost,
+                'loss_rate': round(self.seq_lost / expected_total, 6) if expected_total else 0.0,
+                'recent_lost': recent_lost,
+                'recent_loss_rate': round(recent_lost / (recent_count + recent_lost), 6) if recent_count + recent_lost else 0.0,
+                'gap_events': self.seq_gap_events,
+                'duplicates': self.seq_duplicates,
+                'reordered': self.seq_reordered,
+                'resets': self.seq_resets,
+            }
+        return result
+
+
+def _message_sequence(message: dict, func_code: int) -> Optional[int]:
+    spec = SEQUENCE_FIELDS.get(func_code)
+    if spec is None:
+        return None
+    offset, layout = spec
+    # 延迟解码的消息直接读原始载荷，不触发解码
+    raw = getattr(message, 'raw_payload', None)
+    if raw is not None:
+        if len(raw) < offset + layout.size:
+            return None
+        return layout.unpack_from(raw, offset)[0]
+    data = dict.get(message, 'data')
+    if isinstance(data, dict):
+        seq = data.get('seq_id')
+        return int(seq) if seq is not None else None
+    return None
+
+
+class LinkQualityMonitor:
+    """按 (端口, 功能字) 统计到达间隔、抖动、序号缺口与速率偏差（仅在事件循环中调用）"""
+
+    def __init__(self, window_seconds: int = 10):
+        self.window_seconds = window_seconds
+        self._window_ns = int(window_seconds * 1e9)
+        self._streams: Dict[Tuple[int, int], _StreamStats] = {}
+
+    def record_messages(self, messages: Iterable[dict], local_port: Optional[int] = None) -> None:
+        """记录一批消息；local_port 缺省时取消息的 local_port 字段"""
+        streams = self._streams
+        window_ns = self._window_ns
+        for message in messages:
+            func_code = message.get('func_code')
+            arrival = message.get('arrival_ns')
+            if func_code is None or arrival is None:
+                continue
+            port = local_port if local_port is not None else (message.get('local_port') or 0)
+            key = (port, func_code)
+            stream = streams.get(key)
+            if stream is None:
+                stream = streams[key] = _StreamStats(EXPECTED_PERIOD_MS.get(func_code), arrival)
+            stream.rotate(arrival, window_ns)
+            stream.add_arrival(arrival)
+            if func_code in SEQUENCE_FIELDS:
+                seq = _message_sequence(message, func_code)
+                if seq is not None:
+                    stream.add_sequence(seq)
+
+    def reset(self) -> None:
+        self._streams = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        now_ns = time.monotonic_ns()
+        by_port: Dict[str, Dict[str, Any]] = {}
+        degraded: List[str] = []
+        for (port, func_code), stream in sorted(self._streams.items()):
+            stream.rotate(now_ns, self._window_ns)
+            item = stream.snapshot(now_ns)
+            func_key = f'0x{func_code:02X}'
+            by_port.setdefault(str(port), {})[func_key] = item
+            deviation = item['rate_deviation_pct']
+            sequence = item.get('sequence') or {}
+            if (deviation is not None and deviation < -20.0) or sequence.get('recent_loss_rate', 0.0) > 0.01:
+                degraded.append(f'{port}/{func_key}')
+        return {
+            'window_seconds': self.window_seconds,
+            'streams': len(self._streams),
+            'degraded_streams': degraded,
+            'by_port': by_port,
+        }
+
+
+__all__ = [
+    'EXPECTED_PERIOD_MS',
+    'SEQUENCE_FIELDS',
+    'LinkQualityMonitor',
+]
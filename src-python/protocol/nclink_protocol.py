@@ -3,13 +3,33 @@ MiniQGCLinkV2.0 协议定义
 完整实现地面站与飞控/雷达的通信协议
 """
 
-from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple
 from enum import IntEnum
 import struct
 import time
 import logging
 
+import numpy as np
+
+from .checksum import frame_checksum, xor_checksum
+from .telemetry_schema import (
+    AVOIFLAG_SCHEMA,
+    DATACTRL_SCHEMA,
+    DATAFUTABA_SCHEMA,
+    DATAGCS_SCHEMA,
+    ESC_SCHEMA,
+    GNCBUS_SCHEMA,
+    LINESTRUC_AB_SCHEMA,
+    LINESTRUC_AIM2AB_SCHEMA,
+    PARAM_SCHEMA,
+    PWMS_SCHEMA,
+    STATES_SCHEMA,
+    TelemetrySchema,
+    make_json_builder,
+    make_partial_unpacker,
+)
+
 # 获取logger实例
 logger = logging.getLogger(__name__)
 
@@ -96,28 +116,68 @@ RESPONSE_BUSY = 0x05
 # 飞控数据结构体定义
 # ================================================================
 
+class _SchemaStruct:
+    """定长遥测 dataclass 基类：from_bytes / to_bytes / to_json 由 telemetry_schema 的字段表生成
+
+    子类以 class X(_SchemaStruct, schema=...) 声明，dataclass 字段与字段表逐一对应（顺序一致）。
+    payload 短于结构体长度时只解出完整落在 payload 内的前缀字段，其余字段取 0。
+    """
+    schema: ClassVar[TelemetrySchema]
+    _layout: ClassVar[struct.Struct]
+    _unpack_partial: ClassVar[Callable[[bytes], tuple]]
+    _build_json: ClassVar[Callable[[tuple], dict]]
+
+    def __init_subclass__(cls, schema: TelemetrySchema, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.schema = schema
+        cls._layout = schema.layout
+        cls._unpack_partial = staticmethod(make_partial_unpacker(schema))
+        cls._build_json = staticmethod(make_json_builder(schema))
+
+    @classmethod
+    def unpack(cls, data) -> tuple:
+        """按字段表解包为元组（顺序与 schema.field_names 一致）"""
+        layout = cls._layout
+        if len(data) >= layout.size:
+            return layout.unpack_from(data)
+        return cls._unpack_partial(data)
+
+    @classmethod
+    def from_values(cls, values: tuple):
+        return cls(*values)
+
+    def values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.schema.field_names)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        return cls.from_values(cls.unpack(data))
+
+    def to_bytes(self) -> bytes:
+        """编码为字节数据"""
+        return self._layout.pack(*self.values())
+
+    def to_json(self) -> dict:
+        return self._build_json(self.values())
+
+
 @dataclass
-class ExtY_FCS_PWMS_T:
+class ExtY_FCS_PWMS_T(_SchemaStruct, schema=PWMS_SCHEMA):
     """PWM输出数据"""
     pwms: List[real_T] = field(default_factory=list)  # 8个PWM通道
-    
+
     @classmethod
-    def from_bytes(cls, data: bytes) -> 'ExtY_FCS_PWMS_T':
-        # C++飞控使用小端序发送payload数据
-        fmt = '<8d'  # 小端序：8个double
-        values = struct.unpack(fmt, data[:64])
+    def from_values(cls, values: tuple) -> 'ExtY_FCS_PWMS_T':
         return cls(pwms=list(values))
-    
-    def to_bytes(self) -> bytes:
-        """编码为字节数据"""
-        fmt = '<8d'  # 小端序：8个double = 64 bytes
-        # 确保有8个PWM值
-        pwms_list = self.pwms[:8] if len(self.pwms) >= 8 else self.pwms + [0.0] * (8 - len(self.pwms))
-        return struct.pack(fmt, *pwms_list)
+
+    def values(self) -> tuple:
+        # 不足 8 路时补 0，多余的截断
+        count = len(self.schema.fields)
+        return tuple(self.pwms[:count]) + (0.0,) * (count - len(self.pwms[:count]))
 
 
 @dataclass
-class ExtY_FCS_DATACTRL_T:
+class ExtY_FCS_DATACTRL_T(_SchemaStruct, schema=DATACTRL_SCHEMA):
     """控制数据循环状态
     
     完整的DATACTRL结构体，包含所有控制循环数据：
@@ -200,227 +260,10 @@ class ExtY_FCS_DATACTRL_T:
     dataCtrl_n_colInLoop_col_Vx: real32_T = 0.0
     dataCtrl_n_colInLoop_col_law: real32_T = 0.0
     dataCtrl_n_colInLoop_col_law_out: real32_T = 0.0
-    
-    @classmethod
-    def from_bytes(cls, data: bytes) -> 'ExtY_FCS_DATACTRL_T':
-        """从字节数据解析控制数据
-        
-        总计：53个real32_T = 212字节
-        """
-        if len(data) < 212:
-            print(f"[ExtY_FCS_DATACTRL_T] Payload长度不足: {len(data)} < 212")
-            return cls()
-        
-        fmt = '<53f'  # 小端序：53 floats = 212 bytes
-        values = struct.unpack(fmt, data[:212])
-        
-        return cls(
-            # ailOutLoop (0-7)
-            dataCtrl_n_ailOutLoop_dY_delta=values[0],
-            dataCtrl_n_ailOutLoop_Vy_dY2Vy=values[1],
-            dataCtrl_n_ailOutLoop_Vy_var=values[2],
-            dataCtrl_n_ailOutLoop_Vy_delta=values[3],
-            dataCtrl_n_ailOutLoop_Vy_P=values[4],
-            dataCtrl_n_ailOutLoop_Vy_Int=values[5],
-            dataCtrl_n_ailOutLoop_Vy_D=values[6],
-            dataCtrl_n_ailOutLoop_ail_ffc=values[7],
-            # ailInLoop (8-15)
-            dataCtrl_n_ailInLoop_ail_trim=values[8],
-            dataCtrl_n_ailInLoop_phi_trim=values[9],
-            dataCtrl_n_ailInLoop_phi_var=values[10],
-            dataCtrl_n_ailInLoop_delta_phi=values[11],
-            dataCtrl_n_ailInLoop_phi_P=values[12],
-            dataCtrl_n_ailInLoop_phi_D=values[13],
-            dataCtrl_n_ailInLoop_ail_fbc=values[14],
-            dataCtrl_n_ailInLoop_ail_law_out=values[15],
-            # eleOutLoop (16-23)
-            dataCtrl_n_eleOutLoop_dX_delta=values[16],
-            dataCtrl_n_eleOutLoop_Vx_dX2Vx=values[17],
-            dataCtrl_n_eleOutLoop_Vx_var=values[18],
-            dataCtrl_n_eleOutLoop_Vx_delta=values[19],
-            dataCtrl_n_eleOutLoop_Vx_P=values[20],
-            dataCtrl_n_eleOutLoop_Vx_Int=values[21],
-            dataCtrl_n_eleOutLoop_Vx_D=values[22],
-            dataCtrl_n_eleOutLoop_ele_ffc=values[23],
-            # EleInLoop (24-31)
-            dataCtrl_n_EleInLoop_theta_trim=values[24],
-            dataCtrl_n_EleInLoop_ele_trim=values[25],
-            dataCtrl_n_EleInLoop_theta_var=values[26],
-            dataCtrl_n_EleInLoop_delta_theta=values[27],
-            dataCtrl_n_EleInLoop_theta_P=values[28],
-            dataCtrl_n_EleInLoop_theta_D=values[29],
-            dataCtrl_n_EleInLoop_ele_fbc=values[30],
-            dataCtrl_n_EleInLoop_ele_law_out=values[31],
-            # RudOutLoop (32-34)
-            dataCtrl_n_RudOutLoop_psi_dy=values[32],
-            dataCtrl_n_RudOutLoop_psi_delta=values[33],
-            dataCtrl_n_RudOutLoop_R_dPsi2R=values[34],
-            # rudInLoop (35-40)
-            dataCtrl_n_rudInLoop_rud_trim=values[35],
-            dataCtrl_n_rudInLoop_R_var=values[36],
-            dataCtrl_n_rudInLoop_dR_delta=values[37],
-            dataCtrl_n_rudInLoop_R_P=values[38],
-            dataCtrl_n_rudInLoop_R_Int=values[39],
-            dataCtrl_n_rudInLoop_rud_fbc=values[40],
-            dataCtrl_n_rudInLoop_rud_law_out=values[41],
-            # colOutLoop (42-49)
-            dataCtrl_n_colOutLoop_H_delta=values[42],
-            dataCtrl_n_colOutLoop_Hdot_dH2Vz=values[43],
-            dataCtrl_n_colOutLoop_Hdot_var=values[44],
-            dataCtrl_n_colOutLoop_Hdot_delta=values[45],
-            dataCtrl_n_colOutLoop_Hdot_P=values[46],
-            dataCtrl_n_colOutLoop_Hdot_Int=values[47],
-            dataCtrl_n_colOutLoop_Hdot_D=values[48],
-            dataCtrl_n_colOutLoop_col_fbc=values[49],
-            # colInLoop (50-52)
-            dataCtrl_n_colInLoop_col_Vx=values[50],
-            dataCtrl_n_colInLoop_col_law=values[51],
-            dataCtrl_n_colInLoop_col_law_out=values[52]
-        )
-    
-    def to_bytes(self) -> bytes:
-        """编码为字节数据"""
-        fmt = '<53f'  # 小端序：53 floats = 212 bytes
-        return struct.pack(fmt,
-            # ailOutLoop
-            self.dataCtrl_n_ailOutLoop_dY_delta,
-            self.dataCtrl_n_ailOutLoop_Vy_dY2Vy,
-            self.dataCtrl_n_ailOutLoop_Vy_var,
-            self.dataCtrl_n_ailOutLoop_Vy_delta,
-            self.dataCtrl_n_ailOutLoop_Vy_P,
-            self.dataCtrl_n_ailOutLoop_Vy_Int,
-            self.dataCtrl_n_ailOutLoop_Vy_D,
-            self.dataCtrl_n_ailOutLoop_ail_ffc,
-            # ailInLoop
-            self.dataCtrl_n_ailInLoop_ail_trim,
-            self.dataCtrl_n_ailInLoop_phi_trim,
-            self.dataCtrl_n_ailInLoop_phi_var,
-            self.dataCtrl_n_ailInLoop_delta_phi,
-            self.dataCtrl_n_ailInLoop_phi_P,
-            self.dataCtrl_n_ailInLoop_phi_D,
-            self.dataCtrl_n_ailInLoop_ail_fbc,
-            self.dataCtrl_n_ailInLoop_ail_law_out,
-            # eleOutLoop
-            self.dataCtrl_n_eleOutLoop_dX_delta,
-            self.dataCtrl_n_eleOutLoop_Vx_dX2Vx,
-            self.dataCtrl_n_eleOutLoop_Vx_var,
-            self.dataCtrl_n_eleOutLoop_Vx_delta,
-            self.dataCtrl_n_eleOutLoop_Vx_P,
-            self.dataCtrl_n_eleOutLoop_Vx_Int,
-            self.dataCtrl_n_eleOutLoop_Vx_D,
-            self.dataCtrl_n_eleOutLoop_ele_ffc,
-            # EleInLoop
-            self.dataCtrl_n_EleInLoop_theta_trim,
-            self.dataCtrl_n_EleInLoop_ele_trim,
-            self.dataCtrl_n_EleInLoop_theta_var,
-            self.dataCtrl_n_EleInLoop_delta_theta,
-            self.dataCtrl_n_EleInLoop_theta_P,
-            self.dataCtrl_n_EleInLoop_theta_D,
-            self.dataCtrl_n_EleInLoop_ele_fbc,
-            self.dataCtrl_n_EleInLoop_ele_law_out,
-            # RudOutLoop
-            self.dataCtrl_n_RudOutLoop_psi_dy,
-            self.dataCtrl_n_RudOutLoop_psi_delta,
-            self.dataCtrl_n_RudOutLoop_R_dPsi2R,
-            # rudInLoop
-            self.dataCtrl_n_rudInLoop_rud_trim,
-            self.dataCtrl_n_rudInLoop_R_var,
-            self.dataCtrl_n_rudInLoop_dR_delta,
-            self.dataCtrl_n_rudInLoop_R_P,
-            self.dataCtrl_n_rudInLoop_R_Int,
-            self.dataCtrl_n_rudInLoop_rud_fbc,
-            self.dataCtrl_n_rudInLoop_rud_law_out,
-            # colOutLoop
-            self.dataCtrl_n_colOutLoop_H_delta,
-            self.dataCtrl_n_colOutLoop_Hdot_dH2Vz,
-            self.dataCtrl_n_colOutLoop_Hdot_var,
-            self.dataCtrl_n_colOutLoop_Hdot_delta,
-            self.dataCtrl_n_colOutLoop_Hdot_P,
-            self.dataCtrl_n_colOutLoop_Hdot_Int,
-            self.dataCtrl_n_colOutLoop_Hdot_D,
-            self.dataCtrl_n_colOutLoop_col_fbc,
-            # colInLoop
-            self.dataCtrl_n_colInLoop_col_Vx,
-            self.dataCtrl_n_colInLoop_col_law,
-            self.dataCtrl_n_colInLoop_col_law_out
-        )
-    
-    def to_json(self) -> dict:
-        return {
-            'ailOutLoop': {
-                'dY_delta': self.dataCtrl_n_ailOutLoop_dY_delta,
-                'Vy_dY2Vy': self.dataCtrl_n_ailOutLoop_Vy_dY2Vy,
-                'Vy_var': self.dataCtrl_n_ailOutLoop_Vy_var,
-                'Vy_delta': self.dataCtrl_n_ailOutLoop_Vy_delta,
-                'Vy_P': self.dataCtrl_n_ailOutLoop_Vy_P,
-                'Vy_Int': self.dataCtrl_n_ailOutLoop_Vy_Int,
-                'Vy_D': self.dataCtrl_n_ailOutLoop_Vy_D,
-                'ail_ffc': self.dataCtrl_n_ailOutLoop_ail_ffc
-            },
-            'ailInLoop': {
-                'ail_trim': self.dataCtrl_n_ailInLoop_ail_trim,
-                'phi_trim': self.dataCtrl_n_ailInLoop_phi_trim,
-                'phi_var': self.dataCtrl_n_ailInLoop_phi_var,
-                'delta_phi': self.dataCtrl_n_ailInLoop_delta_phi,
-                'phi_P': self.dataCtrl_n_ailInLoop_phi_P,
-                'phi_D': self.dataCtrl_n_ailInLoop_phi_D,
-                'ail_fbc': self.dataCtrl_n_ailInLoop_ail_fbc,
-                'ail_law_out': self.dataCtrl_n_ailInLoop_ail_law_out
-            },
-            'eleOutLoop': {
-                'dX_delta': self.dataCtrl_n_eleOutLoop_dX_delta,
-                'Vx_dX2Vx': self.dataCtrl_n_eleOutLoop_Vx_dX2Vx,
-                'Vx_var': self.dataCtrl_n_eleOutLoop_Vx_var,
-                'Vx_delta': self.dataCtrl_n_eleOutLoop_Vx_delta,
-                'Vx_P': self.dataCtrl_n_eleOutLoop_Vx_P,
-                'Vx_Int': self.dataCtrl_n_eleOutLoop_Vx_Int,
-                'Vx_D': self.dataCtrl_n_eleOutLoop_Vx_D,
-                'ele_ffc': self.dataCtrl_n_eleOutLoop_ele_ffc
-            },
-            'EleInLoop': {
-                'theta_trim': self.dataCtrl_n_EleInLoop_theta_trim,
-                'ele_trim': self.dataCtrl_n_EleInLoop_ele_trim,
-                'theta_var': self.dataCtrl_n_EleInLoop_theta_var,
-                'delta_theta': self.dataCtrl_n_EleInLoop_delta_theta,
-                'theta_P': self.dataCtrl_n_EleInLoop_theta_P,
-                'theta_D': self.dataCtrl_n_EleInLoop_theta_D,
-                'ele_fbc': self.dataCtrl_n_EleInLoop_ele_fbc,
-                'ele_law_out': self.dataCtrl_n_EleInLoop_ele_law_out
-            },
-            'RudOutLoop': {
-                'psi_dy': self.dataCtrl_n_RudOutLoop_psi_dy,
-                'psi_delta': self.dataCtrl_n_RudOutLoop_psi_delta,
-                'R_dPsi2R': self.dataCtrl_n_RudOutLoop_R_dPsi2R
-            },
-            'rudInLoop': {
-                'rud_trim': self.dataCtrl_n_rudInLoop_rud_trim,
-                'R_var': self.dataCtrl_n_rudInLoop_R_var,
-                'dR_delta': self.dataCtrl_n_rudInLoop_dR_delta,
-                'R_P': self.dataCtrl_n_rudInLoop_R_P,
-                'R_Int': self.dataCtrl_n_rudInLoop_R_Int,
-                'rud_fbc': self.dataCtrl_n_rudInLoop_rud_fbc,
-                'rud_law_out': self.dataCtrl_n_rudInLoop_rud_law_out
-            },
-            'colOutLoop': {
-                'H_delta': self.dataCtrl_n_colOutLoop_H_delta,
-                'Hdot_dH2Vz': self.dataCtrl_n_colOutLoop_Hdot_dH2Vz,
-                'Hdot_var': self.dataCtrl_n_colOutLoop_Hdot_var,
-                'Hdot_delta': self.dataCtrl_n_colOutLoop_Hdot_delta,
-                'Hdot_P': self.dataCtrl_n_colOutLoop_Hdot_P,
-                'Hdot_Int': self.dataCtrl_n_colOutLoop_Hdot_Int,
-                'Hdot_D': self.dataCtrl_n_colOutLoop_Hdot_D,
-                'col_fbc': self.dataCtrl_n_colOutLoop_col_fbc
-            },
-            'colInLoop': {
-                'col_Vx': self.dataCtrl_n_colInLoop_col_Vx,
-                'col_law': self.dataCtrl_n_colInLoop_col_law,
-                'col_law_out': self.dataCtrl_n_colInLoop_col_law_out
-            }
-        }
 
 
 @dataclass
-class ExtY_FCS_STATES_T:
+class ExtY_FCS_STATES_T(_SchemaStruct, schema=STATES_SCHEMA):
     """飞行状态数据
     
     - real_T states_lat (8字节，double)
@@ -442,83 +285,9 @@ class ExtY_FCS_STATES_T:
     states_theta: real32_T = 0.0 # float (4字节)
     states_psi: real32_T = 0.0    # float (4字节)
 
-    def to_bytes(self) -> bytes:
-        """编码为字节数据"""
-        fmt = '<ddffffffffff'  # 小端序：2 doubles + 10 floats = 56 bytes
-        return struct.pack(fmt,
-            self.states_lat,
-            self.states_lon,
-            self.states_height,
-            self.states_Vx_GS,
-            self.states_Vy_GS,
-            self.states_Vz_GS,
-            self.states_p,
-            self.states_q,
-            self.states_r,
-            self.states_phi,
-            self.states_theta,
-            self.states_psi
-        )
-    
-    @classmethod
-    def from_bytes(cls, data: bytes) -> 'ExtY_FCS_STATES_T':
-        # 根据C++ interface.h V2.0定义（第68-81行）
-        # 实际接收的payload是56字节
-        # 格式：2个double (16字节) + 10个float (40字节) = 56字节
-        # 字段：states_lat(double), states_lon(double),
-        #       states_height(float), states_Vx_GS(float), states_Vy_GS(float),
-        #       states_Vz_GS(float), states_p(float), states_q(float),
-        #       states_r(float), states_phi(float), states_theta(float), states_psi(float)
-        #
-        # ⚠️ 重要：C++飞控使用小端序（x86平台）发送payload数据
-        
-        fmt = '<ddffffffffff'  # 小端序：2 doubles + 10 floats = 56 bytes
-        try:
-            values = struct.unpack(fmt, data[:56])
-            return cls(
-                states_lat=values[0],
-                states_lon=values[1],
-                states_height=values[2],
-                states_Vx_GS=values[3],
-                states_Vy_GS=values[4],
-                states_Vz_GS=values[5],
-                states_p=values[6],
-                states_q=values[7],
-                states_r=values[8],
-                states_phi=values[9],
-                states_theta=values[10],
-                states_psi=values[11]
-            )
-        except Exception as e:
-            print(f"[ExtY_FCS_STATES_T] 解析失败: {e}")
-            print(f"[ExtY_FCS_STATES_T] Payload hex: {data[:56].hex()}")
-            return cls()
-    
-    def to_json(self) -> dict:
-        """返回符合interface.h命名规范的JSON格式
-        
-        为了兼容旧代码，同时提供新旧两种字段名
-        """
-        json_data = {
-            # 新字段名（符合interface.h规范）
-            'states_lat': float(self.states_lat),
-            'states_lon': float(self.states_lon),
-            'states_height': float(self.states_height),
-            'states_Vx_GS': float(self.states_Vx_GS),
-            'states_Vy_GS': float(self.states_Vy_GS),
-            'states_Vz_GS': float(self.states_Vz_GS),
-            'states_p': float(self.states_p),
-            'states_q': float(self.states_q),
-            'states_r': float(self.states_r),
-            'states_phi': float(self.states_phi),
-            'states_theta': float(self.states_theta),
-            'states_psi': float(self.states_psi),
-        }
-        return json_data
-
 
 @dataclass
-class ExtY_FCS_GNCBUS_T:
+class ExtY_FCS_GNCBUS_T(_SchemaStruct, schema=GNCBUS_SCHEMA):
     """GN&C总线状态
     
     根据C++ interface.h第114-209行完整定义
@@ -618,547 +387,10 @@ class ExtY_FCS_GNCBUS_T:
     # HomeValue展开（第206-208行）
     GNCBus_HomeValue_lon_home: real_T = 0.0
     GNCBus_HomeValue_lat_home: real_T = 0.0
-    
-    @classmethod
-    def from_bytes(cls, data: bytes) -> 'ExtY_FCS_GNCBUS_T':
-        """从字节数据解析GN&C总线状态（渐进式解析）
-        
-        根据C++ interface.h第114-209行完整定义
-        实际按字段顺序解析（各段累计偏移）：
-        - TokenMode:  17个int8        = 17字节   (累计 0→17)
-        - FtbOpt:     9个float+1个int8 = 37字节  (累计 17→54)
-        - SrcValue:   2个int8          = 2字节   (累计 54→56)
-        - MixValue:   10个float        = 40字节  (累计 56→96)
-        - CmdValue:   7个float         = 28字节  (累计 96→124)
-        - VarValue:   4个float         = 16字节  (累计 124→140)
-        - TrimValue:  3个float         = 12字节  (累计 140→152)
-        - ParamsLMT:  11个float        = 44字节  (累计 152→196)
-        - AcValue:    4个float         = 16字节  (累计 196→212)
-        - HoverValue: 2个double+1个int8= 17字节  (累计 212→229)
-        - HomeValue:  2个double        = 16字节  (累计 229→245)
-        总计：245字节
-        
-        采用渐进式解析：至少需要 TokenMode(17)+FtbOpt(37)+SrcValue(2)=56 字节，
-        后续字段按剩余长度逐步解析，不足则保留默认值。
-        """
-        data_len = len(data)
-        if data_len < 56:
-            # 至少需要 TokenMode(17) + FtbOpt(37) + SrcValue(2) = 56 字节
-            return cls()
-        
-        try:
-            offset = 0
-            
-            # 1. TokenMode (17个int8)
-            tokenmode_values = struct.unpack_from('<17b', data, offset)
-            offset += 17
-            
-            # 2. FtbOpt (9个float + 1个int8)
-            ftbopt_floats = struct.unpack_from('<9f', data, offset)
-            offset += 36  # 9*4
-            ftbopt_switch = struct.unpack_from('<b', data, offset)
-            offset += 1
-            
-            # 3. SrcValue (2个int8)
-            srcvalue_values = struct.unpack_from('<2b', data, offset)
-            offset += 2
-            
-            # --- 以下为渐进式解析：根据剩余长度决定是否解析 ---
-            
-            # 4. MixValue (10个float) — 需要 40 字节 (累计偏移 96)
-            mixvalue_values = None
-            if data_len >= 96:
-                mixvalue_values = struct.unpack_from('<10f', data, offset)
-                offset += 40  # 10*4
-            else:
-                offset = data_len
-            
-            # 5. CmdValue (7个float) — 需要 28 字节 (累计偏移 124)
-            cmdvalue_values = None
-            if data_len >= 124:
-                cmdvalue_values = struct.unpack_from('<7f', data, offset)
-                offset += 28  # 7*4
-            else:
-                offset = data_len
-
-            # 6. VarValue (4个float) — 需要 16 字节 (累计偏移 140)
-            varvalue_values = None
-            if data_len >= 140:
-                varvalue_values = struct.unpack_from('<4f', data, offset)
-                offset += 16
-            else:
-                offset = data_len
-
-            # 7. TrimValue (3个float) — 需要 12 字节 (累计偏移 152)
-            trimvalue_values = None
-            if data_len >= 152:
-                trimvalue_values = struct.unpack_from('<3f', data, offset)
-                offset += 12
-            else:
-                offset = data_len
-
-            # 8. ParamsLMT (11个float) — 需要 44 字节 (累计偏移 196)
-            paramslmt_values = None
-            if data_len >= 196:
-                paramslmt_values = struct.unpack_from('<11f', data, offset)
-                offset += 44
-            else:
-                offset = data_len
-
-            # 9. AcValue (4个float) — 需要 16 字节 (累计偏移 212)
-            acvalue_values = None
-            if data_len >= 212:
-                acvalue_values = struct.unpack_from('<4f', data, offset)
-                offset += 16
-            else:
-                offset = data_len
-
-            # 10. HoverValue (2个double + 1个int8) — 需要 17 字节 (累计偏移 229)
-            hovervalue_values = None
-            if data_len >= 229:
-                hovervalue_values = struct.unpack_from('<2db', data, offset)
-                offset += 17
-            else:
-                offset = data_len
-
-            # 11. HomeValue (2个double) — 需要 16 字节 (累计偏移 245)
-            homevalue_values = None
-            if data_len >= 245:
-                homevalue_values = struct.unpack_from('<2d', data, offset)
-                offset += 16
-            
-            # 构建返回对象（渐进式：不足的字段保留默认值 0）
-            return cls(
-                # TokenMode (必有)
-                GNCBus_TokenMode_OnSky=tokenmode_values[0],
-                GNCBus_TokenMode_Ctrl_Mode=tokenmode_values[1],
-                GNCBus_TokenMode_Pre_CMD=tokenmode_values[2],
-                GNCBus_TokenMode_rud_state=tokenmode_values[3],
-                GNCBus_TokenMode_ail_state=tokenmode_values[4],
-                GNCBus_TokenMode_ele_state=tokenmode_values[5],
-                GNCBus_TokenMode_col_state=tokenmode_values[6],
-                GNCBus_TokenMode_nav_guid=tokenmode_values[7],
-                GNCBus_TokenMode_cmd_guid=tokenmode_values[8],
-                GNCBus_TokenMode_mode_guid=tokenmode_values[9],
-                GNCBus_TokenMode_step_guid=tokenmode_values[10],
-                GNCBus_TokenMode_mode_nav=tokenmode_values[11],
-                GNCBus_TokenMode_token_nav=tokenmode_values[12],
-                GNCBus_TokenMode_step_nav=tokenmode_values[13],
-                GNCBus_TokenMode_mode_vert=tokenmode_values[14],
-                GNCBus_TokenMode_token_vert=tokenmode_values[15],
-                GNCBus_TokenMode_step_vert=tokenmode_values[16],
-                
-                # FtbOpt (必有)
-                GNCBus_FtbOpt_ele_opt=ftbopt_floats[0],
-                GNCBus_FtbOpt_ail_opt=ftbopt_floats[1],
-                GNCBus_FtbOpt_rud_opt=ftbopt_floats[2],
-                GNCBus_FtbOpt_col_opt=ftbopt_floats[3],
-                GNCBus_FtbOpt_R_opt=ftbopt_floats[4],
-                GNCBus_FtbOpt_Vx_opt=ftbopt_floats[5],
-                GNCBus_FtbOpt_Vy_opt=ftbopt_floats[6],
-                GNCBus_FtbOpt_coldt_opt=ftbopt_floats[7],
-                GNCBus_FtbOpt_col0_opt=ftbopt_floats[8],
-                GNCBus_FtbOpt_Ftb_Switch=ftbopt_switch[0],
-                
-                # SrcValue (必有)
-                GNCBus_SrcValue_ac_SrcCmdV=srcvalue_values[0],
-                GNCBus_SrcValue_SrcV_fus=srcvalue_values[1],
-                
-                # MixValue (渐进)
-                GNCBus_MixValue_col_mix=mixvalue_values[0] if mixvalue_values else 0.0,
-                GNCBus_MixValue_phi_mix=mixvalue_values[1] if mixvalue_values else 0.0,
-                GNCBus_MixValue_Vx_mix=mixvalue_values[2] if mixvalue_values else 0.0,
-                GNCBus_MixValue_dX_mix=mixvalue_values[3] if mixvalue_values else 0.0,
-                GNCBus_MixValue_theta_mix=mixvalue_values[4] if mixvalue_values else 0.0,
-                GNCBus_MixValue_Vy_mix=mixvalue_values[5] if mixvalue_values else 0.0,
-                GNCBus_MixValue_dY_mix=mixvalue_values[6] if mixvalue_values else 0.0,
-                GNCBus_MixValue_psi_mix=mixvalue_values[7] if mixvalue_values else 0.0,
-                GNCBus_MixValue_Hdot_mix=mixvalue_values[8] if mixvalue_values else 0.0,
-                GNCBus_MixValue_height_mix=mixvalue_values[9] if mixvalue_values else 0.0,
-                
-                # CmdValue (渐进)
-                GNCBus_CmdValue_phi_cmd=cmdvalue_values[0] if cmdvalue_values else 0.0,
-                GNCBus_CmdValue_Hdot_cmd=cmdvalue_values[1] if cmdvalue_values else 0.0,
-                GNCBus_CmdValue_R_cmd=cmdvalue_values[2] if cmdvalue_values else 0.0,
-                GNCBus_CmdValue_psi_cmd=cmdvalue_values[3] if cmdvalue_values else 0.0,
-                GNCBus_CmdValue_Vx_cmd=cmdvalue_values[4] if cmdvalue_values else 0.0,
-                GNCBus_CmdValue_Vy_cmd=cmdvalue_values[5] if cmdvalue_values else 0.0,
-                GNCBus_CmdValue_height_cmd=cmdvalue_values[6] if cmdvalue_values else 0.0,
-
-                # VarValue (渐进)
-                GNCBus_VarValue_psi_var=varvalue_values[0] if varvalue_values else 0.0,
-                GNCBus_VarValue_height_var=varvalue_values[1] if varvalue_values else 0.0,
-                GNCBus_VarValue_dX_var=varvalue_values[2] if varvalue_values else 0.0,
-                GNCBus_VarValue_dY_var=varvalue_values[3] if varvalue_values else 0.0,
-
-                # TrimValue (渐进)
-                GNCBus_TrimValue_Vx_trim=trimvalue_values[0] if trimvalue_values else 0.0,
-                GNCBus_TrimValue_col_trim=trimvalue_values[1] if trimvalue_values else 0.0,
-                GNCBus_TrimValue_col_autotrim=trimvalue_values[2] if trimvalue_values else 0.0,
-
-                # ParamsLMT (渐进)
-                GNCBus_ParamsLMT_Vx_LMT=paramslmt_values[0] if paramslmt_values else 0.0,
-                GNCBus_ParamsLMT_Vy_LMT=paramslmt_values[1] if paramslmt_values else 0.0,
-                GNCBus_ParamsLMT_R_LMT=paramslmt_values[2] if paramslmt_values else 0.0,
-                GNCBus_ParamsLMT_Hdot_ILmt=paramslmt_values[3] if paramslmt_values else 0.0,
-                GNCBus_ParamsLMT_Hdot_UpLMT=paramslmt_values[4] if paramslmt_values else 0.0,
-                GNCBus_ParamsLMT_Hdot_DownLMT=paramslmt_values[5] if paramslmt_values else 0.0,
-                GNCBus_ParamsLMT_R_FLYTURN=paramslmt_values[6] if paramslmt_values else 0.0,
-                GNCBus_ParamsLMT_R_unit=paramslmt_values[7] if paramslmt_values else 0.0,
-                GNCBus_ParamsLMT_Hdot_unit=paramslmt_values[8] if paramslmt_values else 0.0,
-                GNCBus_ParamsLMT_Vx_unit=paramslmt_values[9] if paramslmt_values else 0.0,
-                GNCBus_ParamsLMT_Vy_unit=paramslmt_values[10] if paramslmt_values else 0.0,
-
-                # AcValue (渐进)
-                GNCBus_AcValue_ac_dY=acvalue_values[0] if acvalue_values else 0.0,
-                GNCBus_AcValue_ac_dX=acvalue_values[1] if acvalue_values else 0.0,
-                GNCBus_AcValue_ac_dPsi=acvalue_values[2] if acvalue_values else 0.0,
-                GNCBus_AcValue_ac_dL=acvalue_values[3] if acvalue_values else 0.0,
-
-                # HoverValue (渐进)
-                GNCBus_HoverValue_lon_hov=hovervalue_values[0] if hovervalue_values else 0.0,
-                GNCBus_HoverValue_lat_hov=hovervalue_values[1] if hovervalue_values else 0.0,
-                GNCBus_HoverValue_IsHovStatus_hov=hovervalue_values[2] if hovervalue_values else 0,
-
-                # HomeValue (渐进)
-                GNCBus_HomeValue_lon_home=homevalue_values[0] if homevalue_values else 0.0,
-                GNCBus_HomeValue_lat_home=homevalue_values[1] if homevalue_values else 0.0,
-            )
-        except Exception as e:
-            print(f"[ExtY_FCS_GNCBUS_T] 解析失败: {e}")
-            print(f"[ExtY_FCS_GNCBUS_T] Payload hex: {data[:100].hex()}")
-            return cls()
-    
-    def to_json(self) -> dict:
-        """返回符合interface.h命名规范的JSON格式
-        
-        包含GNC指令值字段，用于导航标签页显示
-        使用解析后的实际值，而不是硬编码的0
-        """
-        token_mode = {
-            'OnSky': bool(self.GNCBus_TokenMode_OnSky),
-            'Ctrl_Mode': bool(self.GNCBus_TokenMode_Ctrl_Mode),
-            'Pre_CMD': int(self.GNCBus_TokenMode_Pre_CMD),
-            'rud_state': int(self.GNCBus_TokenMode_rud_state),
-            'ail_state': int(self.GNCBus_TokenMode_ail_state),
-            'ele_state': int(self.GNCBus_TokenMode_ele_state),
-            'col_state': int(self.GNCBus_TokenMode_col_state),
-            'nav_guid': int(self.GNCBus_TokenMode_nav_guid),
-            'cmd_guid': int(self.GNCBus_TokenMode_cmd_guid),
-            'mode_guid': int(self.GNCBus_TokenMode_mode_guid),
-            'step_guid': int(self.GNCBus_TokenMode_step_guid),
-            'mode_nav': int(self.GNCBus_TokenMode_mode_nav),
-            'token_nav': int(self.GNCBus_TokenMode_token_nav),
-            'step_nav': int(self.GNCBus_TokenMode_step_nav),
-            'mode_vert': int(self.GNCBus_TokenMode_mode_vert),
-            'token_vert': int(self.GNCBus_TokenMode_token_vert),
-            'step_vert': int(self.GNCBus_TokenMode_step_vert),
-        }
-        ftb_opt = {
-            'ele_opt': float(self.GNCBus_FtbOpt_ele_opt),
-            'ail_opt': float(self.GNCBus_FtbOpt_ail_opt),
-            'rud_opt': float(self.GNCBus_FtbOpt_rud_opt),
-            'col_opt': float(self.GNCBus_FtbOpt_col_opt),
-            'R_opt': float(self.GNCBus_FtbOpt_R_opt),
-            'Vx_opt': float(self.GNCBus_FtbOpt_Vx_opt),
-            'Vy_opt': float(self.GNCBus_FtbOpt_Vy_opt),
-            'coldt_opt': float(self.GNCBus_FtbOpt_coldt_opt),
-            'col0_opt': float(self.GNCBus_FtbOpt_col0_opt),
-            'Ftb_Switch': int(self.GNCBus_FtbOpt_Ftb_Switch),
-        }
-        src_value = {
-            'ac_SrcCmdV': int(self.GNCBus_SrcValue_ac_SrcCmdV),
-            'SrcV_fus': int(self.GNCBus_SrcValue_SrcV_fus),
-        }
-        mix_value = {
-            'col_mix': float(self.GNCBus_MixValue_col_mix),
-            'phi_mix': float(self.GNCBus_MixValue_phi_mix),
-            'Vx_mix': float(self.GNCBus_MixValue_Vx_mix),
-            'dX_mix': float(self.GNCBus_MixValue_dX_mix),
-            'theta_mix': float(self.GNCBus_MixValue_theta_mix),
-            'Vy_mix': float(self.GNCBus_MixValue_Vy_mix),
-            'dY_mix': float(self.GNCBus_MixValue_dY_mix),
-            'psi_mix': float(self.GNCBus_MixValue_psi_mix),
-            'Hdot_mix': float(self.GNCBus_MixValue_Hdot_mix),
-            'height_mix': float(self.GNCBus_MixValue_height_mix),
-        }
-        cmd_value = {
-            'phi_cmd': float(self.GNCBus_CmdValue_phi_cmd),
-            'Hdot_cmd': float(self.GNCBus_CmdValue_Hdot_cmd),
-            'R_cmd': float(self.GNCBus_CmdValue_R_cmd),
-            'psi_cmd': float(self.GNCBus_CmdValue_psi_cmd),
-            'Vx_cmd': float(self.GNCBus_CmdValue_Vx_cmd),
-            'Vy_cmd': float(self.GNCBus_CmdValue_Vy_cmd),
-            'height_cmd': float(self.GNCBus_CmdValue_height_cmd),
-        }
-        var_value = {
-            'psi_var': float(self.GNCBus_VarValue_psi_var),
-            'height_var': float(self.GNCBus_VarValue_height_var),
-            'dX_var': float(self.GNCBus_VarValue_dX_var),
-            'dY_var': float(self.GNCBus_VarValue_dY_var),
-        }
-        trim_value = {
-            'Vx_trim': float(self.GNCBus_TrimValue_Vx_trim),
-            'col_trim': float(self.GNCBus_TrimValue_col_trim),
-            'col_autotrim': float(self.GNCBus_TrimValue_col_autotrim),
-        }
-        params_lmt = {
-            'Vx_LMT': float(self.GNCBus_ParamsLMT_Vx_LMT),
-            'Vy_LMT': float(self.GNCBus_ParamsLMT_Vy_LMT),
-            'R_LMT': float(self.GNCBus_ParamsLMT_R_LMT),
-            'Hdot_ILmt': float(self.GNCBus_ParamsLMT_Hdot_ILmt),
-            'Hdot_UpLMT': float(self.GNCBus_ParamsLMT_Hdot_UpLMT),
-            'Hdot_DownLMT': float(self.GNCBus_ParamsLMT_Hdot_DownLMT),
-            'R_FLYTURN': float(self.GNCBus_ParamsLMT_R_FLYTURN),
-            'R_unit': float(self.GNCBus_ParamsLMT_R_unit),
-            'Hdot_unit': float(self.GNCBus_ParamsLMT_Hdot_unit),
-            'Vx_unit': float(self.GNCBus_ParamsLMT_Vx_unit),
-            'Vy_unit': float(self.GNCBus_ParamsLMT_Vy_unit),
-        }
-        ac_value = {
-            'ac_dY': float(self.GNCBus_AcValue_ac_dY),
-            'ac_dX': float(self.GNCBus_AcValue_ac_dX),
-            'ac_dPsi': float(self.GNCBus_AcValue_ac_dPsi),
-            'ac_dL': float(self.GNCBus_AcValue_ac_dL),
-        }
-        hover_value = {
-            'lon_hov': float(self.GNCBus_HoverValue_lon_hov),
-            'lat_hov': float(self.GNCBus_HoverValue_lat_hov),
-            'IsHovStatus_hov': int(self.GNCBus_HoverValue_IsHovStatus_hov),
-        }
-        home_value = {
-            'lon_home': float(self.GNCBus_HomeValue_lon_home),
-            'lat_home': float(self.GNCBus_HomeValue_lat_home),
-        }
-        return {
-            'GNCBus_TokenMode_OnSky': token_mode['OnSky'],
-            'GNCBus_TokenMode_Ctrl_Mode': token_mode['Ctrl_Mode'],
-            'GNCBus_TokenMode_Pre_CMD': token_mode['Pre_CMD'],
-            'GNCBus_TokenMode_rud_state': token_mode['rud_state'],
-            'GNCBus_TokenMode_ail_state': token_mode['ail_state'],
-            'GNCBus_TokenMode_ele_state': token_mode['ele_state'],
-            'GNCBus_TokenMode_col_state': token_mode['col_state'],
-            'GNCBus_TokenMode_nav_guid': token_mode['nav_guid'],
-            'GNCBus_TokenMode_cmd_guid': token_mode['cmd_guid'],
-            'GNCBus_TokenMode_mode_guid': token_mode['mode_guid'],
-            'GNCBus_TokenMode_step_guid': token_mode['step_guid'],
-            'GNCBus_TokenMode_mode_nav': token_mode['mode_nav'],
-            'GNCBus_TokenMode_token_nav': token_mode['token_nav'],
-            'GNCBus_TokenMode_step_nav': token_mode['step_nav'],
-            'GNCBus_TokenMode_mode_vert': token_mode['mode_vert'],
-            'GNCBus_TokenMode_token_vert': token_mode['token_vert'],
-            'GNCBus_TokenMode_step_vert': token_mode['step_vert'],
-            'GNCBus_FtbOpt_ele_opt': ftb_opt['ele_opt'],
-            'GNCBus_FtbOpt_ail_opt': ftb_opt['ail_opt'],
-            'GNCBus_FtbOpt_rud_opt': ftb_opt['rud_opt'],
-            'GNCBus_FtbOpt_col_opt': ftb_opt['col_opt'],
-            'GNCBus_FtbOpt_R_opt': ftb_opt['R_opt'],
-            'GNCBus_FtbOpt_Vx_opt': ftb_opt['Vx_opt'],
-            'GNCBus_FtbOpt_Vy_opt': ftb_opt['Vy_opt'],
-            'GNCBus_FtbOpt_coldt_opt': ftb_opt['coldt_opt'],
-            'GNCBus_FtbOpt_col0_opt': ftb_opt['col0_opt'],
-            'GNCBus_FtbOpt_Ftb_Switch': ftb_opt['Ftb_Switch'],
-            'GNCBus_SrcValue_ac_SrcCmdV': src_value['ac_SrcCmdV'],
-            'GNCBus_SrcValue_SrcV_fus': src_value['SrcV_fus'],
-            'GNCBus_MixValue_col_mix': mix_value['col_mix'],
-            'GNCBus_MixValue_phi_mix': mix_value['phi_mix'],
-            'GNCBus_MixValue_Vx_mix': mix_value['Vx_mix'],
-            'GNCBus_MixValue_dX_mix': mix_value['dX_mix'],
-            'GNCBus_MixValue_theta_mix': mix_value['theta_mix'],
-            'GNCBus_MixValue_Vy_mix': mix_value['Vy_mix'],
-            'GNCBus_MixValue_dY_mix': mix_value['dY_mix'],
-            'GNCBus_MixValue_psi_mix': mix_value['psi_mix'],
-            'GNCBus_MixValue_Hdot_mix': mix_value['Hdot_mix'],
-            'GNCBus_MixValue_height_mix': mix_value['height_mix'],
-            'GNCBus_CmdValue_phi_cmd': cmd_value['phi_cmd'],
-            'GNCBus_CmdValue_Hdot_cmd': cmd_value['Hdot_cmd'],
-            'GNCBus_CmdValue_R_cmd': cmd_value['R_cmd'],
-            'GNCBus_CmdValue_psi_cmd': cmd_value['psi_cmd'],
-            'GNCBus_CmdValue_Vx_cmd': cmd_value['Vx_cmd'],
-            'GNCBus_CmdValue_Vy_cmd': cmd_value['Vy_cmd'],
-            'GNCBus_CmdValue_height_cmd': cmd_value['height_cmd'],
-            'GNCBus_VarValue_psi_var': var_value['psi_var'],
-            'GNCBus_VarValue_height_var': var_value['height_var'],
-            'GNCBus_VarValue_dX_var': var_value['dX_var'],
-            'GNCBus_VarValue_dY_var': var_value['dY_var'],
-            'GNCBus_TrimValue_Vx_trim': trim_value['Vx_trim'],
-            'GNCBus_TrimValue_col_trim': trim_value['col_trim'],
-            'GNCBus_TrimValue_col_autotrim': trim_value['col_autotrim'],
-            'GNCBus_ParamsLMT_Vx_LMT': params_lmt['Vx_LMT'],
-            'GNCBus_ParamsLMT_Vy_LMT': params_lmt['Vy_LMT'],
-            'GNCBus_ParamsLMT_R_LMT': params_lmt['R_LMT'],
-            'GNCBus_ParamsLMT_Hdot_ILmt': params_lmt['Hdot_ILmt'],
-            'GNCBus_ParamsLMT_Hdot_UpLMT': params_lmt['Hdot_UpLMT'],
-            'GNCBus_ParamsLMT_Hdot_DownLMT': params_lmt['Hdot_DownLMT'],
-            'GNCBus_ParamsLMT_R_FLYTURN': params_lmt['R_FLYTURN'],
-            'GNCBus_ParamsLMT_R_unit': params_lmt['R_unit'],
-            'GNCBus_ParamsLMT_Hdot_unit': params_lmt['Hdot_unit'],
-            'GNCBus_ParamsLMT_Vx_unit': params_lmt['Vx_unit'],
-            'GNCBus_ParamsLMT_Vy_unit': params_lmt['Vy_unit'],
-            'GNCBus_AcValue_ac_dY': ac_value['ac_dY'],
-            'GNCBus_AcValue_ac_dX': ac_value['ac_dX'],
-            'GNCBus_AcValue_ac_dPsi': ac_value['ac_dPsi'],
-            'GNCBus_AcValue_ac_dL': ac_value['ac_dL'],
-            'GNCBus_HoverValue_lon_hov': hover_value['lon_hov'],
-            'GNCBus_HoverValue_lat_hov': hover_value['lat_hov'],
-            'GNCBus_HoverValue_IsHovStatus_hov': hover_value['IsHovStatus_hov'],
-            'GNCBus_HomeValue_lon_home': home_value['lon_home'],
-            'GNCBus_HomeValue_lat_home': home_value['lat_home'],
-            'TokenMode': token_mode,
-            'FtbOpt': ftb_opt,
-            'SrcValue': src_value,
-            'MixValue': mix_value,
-            'CmdValue': cmd_value,
-            'VarValue': var_value,
-            'TrimValue': trim_value,
-            'ParamsLMT': params_lmt,
-            'AcValue': ac_value,
-            'HoverValue': hover_value,
-            'HomeValue': home_value,
-        }
-    
-    def to_bytes(self) -> bytes:
-        """编码为字节数据
-        
-        根据from_bytes的解析顺序编码：
-        - TokenMode: 17个int8 = 17字节
-        - FtbOpt: 9个real32 + 1个int8 = 36+1 = 37字节
-        - SrcValue: 2个int8 = 2字节
-        - MixValue: 10个real32 = 40字节
-        - CmdValue: 7个real32 = 28字节
-        - VarValue: 4个real32 = 16字节
-        - TrimValue: 3个real32 = 12字节
-        - ParamsLMT: 10个real32 = 40字节
-        - AcValue: 4个real32 = 16字节
-        - HoverValue: 2个real_T + 1个int8 = 16+1 = 17字节
-        - HomeValue: 2个real_T = 16字节
-        
-        总计：17 + 37 + 2 + 40 + 28 + 16 + 12 + 40 + 16 + 17 + 16 = 241字节
-        """
-        result = b''
-        
-        # 1. TokenMode (17个int8)
-        result += struct.pack('<17b',
-            self.GNCBus_TokenMode_OnSky,
-            self.GNCBus_TokenMode_Ctrl_Mode,
-            self.GNCBus_TokenMode_Pre_CMD,
-            self.GNCBus_TokenMode_rud_state,
-            self.GNCBus_TokenMode_ail_state,
-            self.GNCBus_TokenMode_ele_state,
-            self.GNCBus_TokenMode_col_state,
-            self.GNCBus_TokenMode_nav_guid,
-            self.GNCBus_TokenMode_cmd_guid,
-            self.GNCBus_TokenMode_mode_guid,
-            self.GNCBus_TokenMode_step_guid,
-            self.GNCBus_TokenMode_mode_nav,
-            self.GNCBus_TokenMode_token_nav,
-            self.GNCBus_TokenMode_step_nav,
-            self.GNCBus_TokenMode_mode_vert,
-            self.GNCBus_TokenMode_token_vert,
-            self.GNCBus_TokenMode_step_vert
-        )
-        
-        # 2. FtbOpt (9个float + 1个int8)
-        result += struct.pack('<9fb',
-            self.GNCBus_FtbOpt_ele_opt,
-            self.GNCBus_FtbOpt_ail_opt,
-            self.GNCBus_FtbOpt_rud_opt,
-            self.GNCBus_FtbOpt_col_opt,
-            self.GNCBus_FtbOpt_R_opt,
-            self.GNCBus_FtbOpt_Vx_opt,
-            self.GNCBus_FtbOpt_Vy_opt,
-            self.GNCBus_FtbOpt_coldt_opt,
-            self.GNCBus_FtbOpt_col0_opt,
-            self.GNCBus_FtbOpt_Ftb_Switch
-        )
-        
-        # 3. SrcValue (2个int8)
-        result += struct.pack('<2b',
-            self.GNCBus_SrcValue_ac_SrcCmdV,
-            self.GNCBus_SrcValue_SrcV_fus
-        )
-        
-        # 4. MixValue (10个float)
-        result += struct.pack('<10f',
-            self.GNCBus_MixValue_col_mix,
-            self.GNCBus_MixValue_phi_mix,
-            self.GNCBus_MixValue_Vx_mix,
-            self.GNCBus_MixValue_dX_mix,
-            self.GNCBus_MixValue_theta_mix,
-            self.GNCBus_MixValue_Vy_mix,
-            self.GNCBus_MixValue_dY_mix,
-            self.GNCBus_MixValue_psi_mix,
-            self.GNCBus_MixValue_Hdot_mix,
-            self.GNCBus_MixValue_height_mix
-        )
-        
-        # 5. CmdValue (7个float)
-        result += struct.pack('<7f',
-            self.GNCBus_CmdValue_phi_cmd,
-            self.GNCBus_CmdValue_Hdot_cmd,
-            self.GNCBus_CmdValue_R_cmd,
-            self.GNCBus_CmdValue_psi_cmd,
-            self.GNCBus_CmdValue_Vx_cmd,
-            self.GNCBus_CmdValue_Vy_cmd,
-            self.GNCBus_CmdValue_height_cmd
-        )
-        
-        # 6. VarValue (4个float)
-        result += struct.pack('<4f',
-            self.GNCBus_VarValue_psi_var,
-            self.GNCBus_VarValue_height_var,
-            self.GNCBus_VarValue_dX_var,
-            self.GNCBus_VarValue_dY_var
-        )
-        
-        # 7. TrimValue (3个float)
-        result += struct.pack('<3f',
-            self.GNCBus_TrimValue_Vx_trim,
-            self.GNCBus_TrimValue_col_trim,
-            self.GNCBus_TrimValue_col_autotrim
-        )
-        
-        # 8. ParamsLMT (11个float)
-        result += struct.pack('<11f',
-            self.GNCBus_ParamsLMT_Vx_LMT,
-            self.GNCBus_ParamsLMT_Vy_LMT,
-            self.GNCBus_ParamsLMT_R_LMT,
-            self.GNCBus_ParamsLMT_Hdot_ILmt,
-            self.GNCBus_ParamsLMT_Hdot_UpLMT,
-            self.GNCBus_ParamsLMT_Hdot_DownLMT,
-            self.GNCBus_ParamsLMT_R_FLYTURN,
-            self.GNCBus_ParamsLMT_R_unit,
-            self.GNCBus_ParamsLMT_Hdot_unit,
-            self.GNCBus_ParamsLMT_Vx_unit,
-            self.GNCBus_ParamsLMT_Vy_unit
-        )
-        
-        # 9. AcValue (4个float)
-        result += struct.pack('<4f',
-            self.GNCBus_AcValue_ac_dY,
-            self.GNCBus_AcValue_ac_dX,
-            self.GNCBus_AcValue_ac_dPsi,
-            self.GNCBus_AcValue_ac_dL
-        )
-        
-        # 10. HoverValue (2个double + 1个int8)
-        result += struct.pack('<ddb',
-            self.GNCBus_HoverValue_lon_hov,
-            self.GNCBus_HoverValue_lat_hov,
-            self.GNCBus_HoverValue_IsHovStatus_hov
-        )
-        
-        # 11. HomeValue (2个double)
-        result += struct.pack('<dd',
-            self.GNCBus_HomeValue_lon_home,
-            self.GNCBus_HomeValue_lat_home
-        )
-        
-        return result
 
 
 @dataclass
-class ExtY_FCS_PARAM_T:
+class ExtY_FCS_PARAM_T(_SchemaStruct, schema=PARAM_SCHEMA):
     """飞控回传参数 (ExtY_FCS_PARAM)
     
     包含30个real32参数，与飞控侧ExtY_FCS_PARAM结构保持一致
@@ -1198,78 +430,18 @@ class ExtY_FCS_PARAM_T:
     ParamScale_F_scale_factor: real32_T = 0.0
     ParamGuide_Hground: real32_T = 0.0
     ParamGuide_AutoTakeoffHcmd: real32_T = 0.0
-    
-    @classmethod
-    def from_bytes(cls, data: bytes) -> 'ExtY_FCS_PARAM_T':
-        # 30个float32 = 120字节
-        if len(data) < 120:
-            print(f"[ExtY_FCS_PARAM_T] Payload长度不足: {len(data)} < 120")
-            return cls()
-        
-        fmt = '<30f'  # 小端序
-        values = struct.unpack(fmt, data[:120])
-        
-        return cls(*values)
-    
-    def to_bytes(self) -> bytes:
-        """编码为字节数据"""
-        fmt = '<30f'
-        return struct.pack(fmt,
-            self.ParamAil_F_KaPHI, self.ParamAil_F_KaP, self.ParamAil_F_KaY, self.ParamAil_F_IaY,
-            self.ParamAil_F_KaVy, self.ParamAil_F_IaVy, self.ParamAil_F_KaAy, self.ParamAil_YaccLMT,
-            self.ParamEle_F_KeTHETA, self.ParamEle_F_KeQ, self.ParamEle_F_KeX, self.ParamEle_F_IeX,
-            self.ParamEle_F_KeVx, self.ParamEle_F_IeVx, self.ParamEle_F_KeAx, self.ParamEle_XaccLMT,
-            self.ParamRud_F_KrR, self.ParamRud_F_IrR, self.ParamRud_F_KrAy, self.ParamRud_F_KrPSI,
-            self.ParamH_F_KcH, self.ParamH_F_IcH, self.ParamH_F_KcHdot, self.ParamH_F_IcHdot, self.ParamH_F_KcAz,
-            self.ParamRPM_F_KgRPM, self.ParamRPM_F_IgRPM,
-            self.ParamScale_F_scale_factor,
-            self.ParamGuide_Hground, self.ParamGuide_AutoTakeoffHcmd
-        )
-    
-    def to_json(self) -> dict:
-        return {k: v for k, v in self.__dict__.items() if not k.startswith('_')}
 
 
 @dataclass
-class ExtY_FCS_AVOIFLAG_T:
+class ExtY_FCS_AVOIFLAG_T(_SchemaStruct, schema=AVOIFLAG_SCHEMA):
     """避障标志"""
     AvoiFlag_LaserRadar_Enabled: uint8_T = 0
     AvoiFlag_AvoidanceFlag: uint8_T = 0
     AvoiFlag_GuideFlag: uint8_T = 0
-    
-    @classmethod
-    def from_bytes(cls, data: bytes) -> 'ExtY_FCS_AVOIFLAG_T':
-        # uint8不受字节序影响
-        fmt = '<BBB'  # 3个uint8
-        values = struct.unpack(fmt, data[:3])
-        return cls(
-            AvoiFlag_LaserRadar_Enabled=values[0],
-            AvoiFlag_AvoidanceFlag=values[1],
-            AvoiFlag_GuideFlag=values[2]
-        )
-    
-    def to_bytes(self) -> bytes:
-        """编码为字节数据"""
-        fmt = '<BBB'  # 3个uint8 = 3 bytes
-        return struct.pack(fmt,
-            self.AvoiFlag_LaserRadar_Enabled,
-            self.AvoiFlag_AvoidanceFlag,
-            self.AvoiFlag_GuideFlag
-        )
-    
-    def to_json(self) -> dict:
-        """返回符合interface.h命名规范的JSON格式"""
-        json_data = {
-            # 新字段名（符合interface.h规范）
-            'AvoiFlag_LaserRadar_Enabled': bool(self.AvoiFlag_LaserRadar_Enabled),
-            'AvoiFlag_AvoidanceFlag': bool(self.AvoiFlag_AvoidanceFlag),
-            'AvoiFlag_GuideFlag': bool(self.AvoiFlag_GuideFlag),
-        }
-        return json_data
 
 
 @dataclass
-class ExtY_FCS_ESC_T:
+class ExtY_FCS_ESC_T(_SchemaStruct, schema=ESC_SCHEMA):
     """电机参数。
 
     协议版本 2026-03-29:
@@ -1317,61 +489,10 @@ class ExtY_FCS_ESC_T:
     esc4_power_rating_pct: uint8_T = 0
     esc5_power_rating_pct: uint8_T = 0
     esc6_power_rating_pct: uint8_T = 0
-    
-    @classmethod
-    def from_bytes(cls, data: bytes) -> 'ExtY_FCS_ESC_T':
-        if len(data) < 126:
-            print(f"[ExtY_FCS_ESC_T] Payload长度不足: {len(data)} < 126")
-            return cls()
-
-        fmt = '<6I18f6i6B'
-        values = struct.unpack(fmt, data[:126])
-        return cls(
-            esc1_error_count=values[0], esc2_error_count=values[1],
-            esc3_error_count=values[2], esc4_error_count=values[3],
-            esc5_error_count=values[4], esc6_error_count=values[5],
-            esc1_voltage=values[6], esc2_voltage=values[7],
-            esc3_voltage=values[8], esc4_voltage=values[9],
-            esc5_voltage=values[10], esc6_voltage=values[11],
-            esc1_current=values[12], esc2_current=values[13],
-            esc3_current=values[14], esc4_current=values[15],
-            esc5_current=values[16], esc6_current=values[17],
-            esc1_temperature=values[18], esc2_temperature=values[19],
-            esc3_temperature=values[20], esc4_temperature=values[21],
-            esc5_temperature=values[22], esc6_temperature=values[23],
-            esc1_rpm=values[24], esc2_rpm=values[25],
-            esc3_rpm=values[26], esc4_rpm=values[27],
-            esc5_rpm=values[28], esc6_rpm=values[29],
-            esc1_power_rating_pct=values[30], esc2_power_rating_pct=values[31],
-            esc3_power_rating_pct=values[32], esc4_power_rating_pct=values[33],
-            esc5_power_rating_pct=values[34], esc6_power_rating_pct=values[35]
-        )
-    
-    def to_bytes(self) -> bytes:
-        """编码为字节数据"""
-        fmt = '<6I18f6i6B'
-        return struct.pack(fmt,
-            self.esc1_error_count, self.esc2_error_count, self.esc3_error_count,
-            self.esc4_error_count, self.esc5_error_count, self.esc6_error_count,
-            self.esc1_voltage, self.esc2_voltage, self.esc3_voltage,
-            self.esc4_voltage, self.esc5_voltage, self.esc6_voltage,
-            self.esc1_current, self.esc2_current, self.esc3_current,
-            self.esc4_current, self.esc5_current, self.esc6_current,
-            self.esc1_temperature, self.esc2_temperature, self.esc3_temperature,
-            self.esc4_temperature, self.esc5_temperature, self.esc6_temperature,
-            self.esc1_rpm, self.esc2_rpm, self.esc3_rpm,
-            self.esc4_rpm, self.esc5_rpm, self.esc6_rpm,
-            self.esc1_power_rating_pct, self.esc2_power_rating_pct,
-            self.esc3_power_rating_pct, self.esc4_power_rating_pct,
-            self.esc5_power_rating_pct, self.esc6_power_rating_pct
-        )
-
-    def to_json(self) -> dict:
-        return {k: v for k, v in self.__dict__.items() if not k.startswith('_')}
 
 
 @dataclass
-class ExtY_FCS_DATAFUTABA_T:
+class ExtY_FCS_DATAFUTABA_T(_SchemaStruct, schema=DATAFUTABA_SCHEMA):
     """Futaba遥控数据（第218-226行）
     
     遥控器输入数据，用于控制标签页显示
@@ -1382,114 +503,21 @@ class ExtY_FCS_DATAFUTABA_T:
     Tele_ftb_Col: uint16_T = 0        # 油门 (0-2000)
     Tele_ftb_Switch: int8_T = 0         # 开关状态
     Tele_ftb_com_Ftb_fail: int8_T = 0  # 遥控故障标志
-    
-    @classmethod
-    def from_bytes(cls, data: bytes) -> 'ExtY_FCS_DATAFUTABA_T':
-        """从字节数据解析Futaba遥控数据
-        
-        总共：4个uint16 + 2个int8 = 8+2 = 10字节
-        """
-        if len(data) < 10:
-            print(f"[ExtY_FCS_DATAFUTABA_T] Payload长度不足: {len(data)} < 10")
-            return cls()
-        
-        # 格式：4个uint16 + 2个int8
-        fmt = '<HHHHbb'  # 小端序：4*uint16 + 2*int8 = 10 bytes
-        values = struct.unpack(fmt, data[:10])
-        
-        return cls(
-            Tele_ftb_Roll=values[0],
-            Tele_ftb_Pitch=values[1],
-            Tele_ftb_Yaw=values[2],
-            Tele_ftb_Col=values[3],
-            Tele_ftb_Switch=values[4],
-            Tele_ftb_com_Ftb_fail=values[5]
-        )
-    
-    def to_bytes(self) -> bytes:
-        """编码为字节数据"""
-        fmt = '<HHHHbb'  # 小端序：4*uint16 + 2*int8 = 10 bytes
-        return struct.pack(fmt,
-            self.Tele_ftb_Roll,
-            self.Tele_ftb_Pitch,
-            self.Tele_ftb_Yaw,
-            self.Tele_ftb_Col,
-            self.Tele_ftb_Switch,
-            self.Tele_ftb_com_Ftb_fail
-        )
-    
-    def to_json(self) -> dict:
-        """返回符合interface.h命名规范的JSON格式"""
-        return {
-            'Tele_ftb_Roll': self.Tele_ftb_Roll,
-            'Tele_ftb_Pitch': self.Tele_ftb_Pitch,
-            'Tele_ftb_Yaw': self.Tele_ftb_Yaw,
-            'Tele_ftb_Col': self.Tele_ftb_Col,
-            'Tele_ftb_Switch': self.Tele_ftb_Switch,
-            'Tele_ftb_com_Ftb_fail': self.Tele_ftb_com_Ftb_fail
-        }
 
 
 @dataclass
-class ExtY_FCS_DATAGCS_T:
+class ExtY_FCS_DATAGCS_T(_SchemaStruct, schema=DATAGCS_SCHEMA):
     """地面站发送数据（第228-234行）"""
     Tele_GCS_CmdIdx: int32_T = 0
     Tele_GCS_Mission: int32_T = 0
     Tele_GCS_Val: real32_T = 0.0
     Tele_GCS_com_GCS_fail: int8_T = 0
-    
-    @classmethod
-    def from_bytes(cls, data: bytes) -> 'ExtY_FCS_DATAGCS_T':
-        """从字节数据解析GCS数据
-        
-        总共：2个int32 + 1个float32 + 1个int8 = 8+4+1 = 13字节
-        """
-        if len(data) < 13:
-            print(f"[ExtY_FCS_DATAGCS_T] Payload长度不足: {len(data)} < 13")
-            return cls()
-        
-        # 格式：2个int32 + 1个float32 + 1个int8
-        fmt = '<iifb'  # 小端序：2*int32 + 1*float32 + 1*int8 = 13 bytes
-        values = struct.unpack(fmt, data[:13])
-        
-        return cls(
-            Tele_GCS_CmdIdx=values[0],
-            Tele_GCS_Mission=values[1],
-            Tele_GCS_Val=values[2],
-            Tele_GCS_com_GCS_fail=values[3]
-        )
-    
-    def to_bytes(self) -> bytes:
-        """编码为字节数据"""
-        fmt = '<iifb'  # 小端序：2*int32 + 1*float32 + 1*int8 = 13 bytes
-        return struct.pack(fmt,
-            self.Tele_GCS_CmdIdx,
-            self.Tele_GCS_Mission,
-            self.Tele_GCS_Val,
-            self.Tele_GCS_com_GCS_fail
-        )
-    
-    def to_json(self) -> dict:
-        return {
-            'Tele_GCS_CmdIdx': self.Tele_GCS_CmdIdx,
-            'Tele_GCS_Mission': self.Tele_GCS_Mission,
-            'Tele_GCS_Val': self.Tele_GCS_Val,
-            'Tele_GCS_com_GCS_fail': self.Tele_GCS_com_GCS_fail,
-            # Backward compatibility
-            'CmdIdx': self.Tele_GCS_CmdIdx,
-            'Mission': self.Tele_GCS_Mission,
-            'Val': self.Tele_GCS_Val,
-            'fail': bool(self.Tele_GCS_com_GCS_fail)
-        }
 
 
-# 航迹线结构体
-_LINESTRUC_FORMAT = '<dd5fbb2Bf2Bf6B'
-_LINESTRUC_SIZE = struct.calcsize(_LINESTRUC_FORMAT)
-
+# 航迹线结构体（0x47 / 0x48 共用同一布局）
 
 @dataclass
-class ExtY_FCS_LINESTRUC_ac_aim2AB_T:
+class ExtY_FCS_LINESTRUC_ac_aim2AB_T(_SchemaStruct, schema=LINESTRUC_AIM2AB_SCHEMA):
     """航迹线结构 ac_aim2AB
     
     从当前位置到下一个路径点的航迹线信息
@@ -1515,118 +543,10 @@ class ExtY_FCS_LINESTRUC_ac_aim2AB_T:
     ac_aim2AB_turn_type: uint8_T = 0
     ac_aim2AB_Inv_type: uint8_T = 0
     ac_aim2AB_type_line: uint8_T = 0
-    
-    @classmethod
-    def from_bytes(cls, data: bytes) -> 'ExtY_FCS_LINESTRUC_ac_aim2AB_T':
-        """从字节数据解析航迹线信息。
-
-        按照 pack(1) C 结构解析：
-        2*double + 5*float + 2*int8 + 2*uint8 + 1*float + 2*uint8 + 1*float + 6*uint8 = 56 字节。
-        """
-        if len(data) < _LINESTRUC_SIZE:
-            print(f"[ExtY_FCS_LINESTRUC_ac_aim2AB_T] Payload长度不足: {len(data)} < {_LINESTRUC_SIZE}")
-            return cls()
-        values = struct.unpack(_LINESTRUC_FORMAT, data[:_LINESTRUC_SIZE])
-        
-        return cls(
-            ac_aim2AB_lon=values[0],
-            ac_aim2AB_lat=values[1],
-            ac_aim2AB_psi=values[2],
-            ac_aim2AB_alt=values[3],
-            ac_aim2AB_len=values[4],
-            ac_aim2AB_rad=values[5],
-            ac_aim2AB_Vx2nextdot=values[6],
-            ac_aim2AB_next_num=values[7],
-            ac_aim2AB_next_dot=values[8],
-            ac_aim2AB_type_dot=values[9],
-            ac_aim2AB_clockwise_WP=values[10],
-            ac_aim2AB_R_WP=values[11],
-            ac_aim2AB_type_WP=values[12],
-            ac_aim2AB_Num_type_WP=values[13],
-            ac_aim2AB_dL_WP=values[14],
-            ac_aim2AB_Vx_type=values[15],
-            ac_aim2AB_TTC_Fault_Mode=values[16],
-            ac_aim2AB_deltaY_ctrl=values[17],
-            ac_aim2AB_turn_type=values[18],
-            ac_aim2AB_Inv_type=values[19],
-            ac_aim2AB_type_line=values[20]
-        )
-    
-    def to_bytes(self) -> bytes:
-        """编码为 pack(1) C 结构对应的 56 字节布局。"""
-        return struct.pack(_LINESTRUC_FORMAT,
-            self.ac_aim2AB_lon,
-            self.ac_aim2AB_lat,
-            self.ac_aim2AB_psi,
-            self.ac_aim2AB_alt,
-            self.ac_aim2AB_len,
-            self.ac_aim2AB_rad,
-            self.ac_aim2AB_Vx2nextdot,
-            self.ac_aim2AB_next_num,
-            self.ac_aim2AB_next_dot,
-            self.ac_aim2AB_type_dot,
-            self.ac_aim2AB_clockwise_WP,
-            self.ac_aim2AB_R_WP,
-            self.ac_aim2AB_type_WP,
-            self.ac_aim2AB_Num_type_WP,
-            self.ac_aim2AB_dL_WP,
-            self.ac_aim2AB_Vx_type,
-            self.ac_aim2AB_TTC_Fault_Mode,
-            self.ac_aim2AB_deltaY_ctrl,
-            self.ac_aim2AB_turn_type,
-            self.ac_aim2AB_Inv_type,
-            self.ac_aim2AB_type_line
-        )
-    
-    def to_json(self) -> dict:
-        return {
-            'ac_aim2AB_lon': float(self.ac_aim2AB_lon),
-            'ac_aim2AB_lat': float(self.ac_aim2AB_lat),
-            'ac_aim2AB_psi': float(self.ac_aim2AB_psi),
-            'ac_aim2AB_alt': float(self.ac_aim2AB_alt),
-            'ac_aim2AB_len': float(self.ac_aim2AB_len),
-            'ac_aim2AB_rad': float(self.ac_aim2AB_rad),
-            'ac_aim2AB_Vx2nextdot': float(self.ac_aim2AB_Vx2nextdot),
-            'ac_aim2AB_next_num': self.ac_aim2AB_next_num,
-            'ac_aim2AB_next_dot': self.ac_aim2AB_next_dot,
-            'ac_aim2AB_type_dot': self.ac_aim2AB_type_dot,
-            'ac_aim2AB_clockwise_WP': self.ac_aim2AB_clockwise_WP,
-            'ac_aim2AB_R_WP': float(self.ac_aim2AB_R_WP),
-            'ac_aim2AB_type_WP': self.ac_aim2AB_type_WP,
-            'ac_aim2AB_Num_type_WP': self.ac_aim2AB_Num_type_WP,
-            'ac_aim2AB_dL_WP': float(self.ac_aim2AB_dL_WP),
-            'ac_aim2AB_Vx_type': self.ac_aim2AB_Vx_type,
-            'ac_aim2AB_TTC_Fault_Mode': self.ac_aim2AB_TTC_Fault_Mode,
-            'ac_aim2AB_deltaY_ctrl': self.ac_aim2AB_deltaY_ctrl,
-            'ac_aim2AB_turn_type': self.ac_aim2AB_turn_type,
-            'ac_aim2AB_Inv_type': self.ac_aim2AB_Inv_type,
-            'ac_aim2AB_type_line': self.ac_aim2AB_type_line,
-            'lon': float(self.ac_aim2AB_lon),
-            'lat': float(self.ac_aim2AB_lat),
-            'psi': float(self.ac_aim2AB_psi),
-            'alt': float(self.ac_aim2AB_alt),
-            'len': float(self.ac_aim2AB_len),
-            'rad': float(self.ac_aim2AB_rad),
-            'Vx2nextdot': float(self.ac_aim2AB_Vx2nextdot),
-            'next_num': self.ac_aim2AB_next_num,
-            'next_dot': self.ac_aim2AB_next_dot,
-            'type_dot': self.ac_aim2AB_type_dot,
-            'clockwise_WP': bool(self.ac_aim2AB_clockwise_WP),
-            'R_WP': float(self.ac_aim2AB_R_WP),
-            'type_WP': self.ac_aim2AB_type_WP,
-            'Num_type_WP': self.ac_aim2AB_Num_type_WP,
-            'dL_WP': float(self.ac_aim2AB_dL_WP),
-            'Vx_type': self.ac_aim2AB_Vx_type,
-            'TTC_Fault_Mode': self.ac_aim2AB_TTC_Fault_Mode,
-            'deltaY_ctrl': self.ac_aim2AB_deltaY_ctrl,
-            'turn_type': self.ac_aim2AB_turn_type,
-            'Inv_type': self.ac_aim2AB_Inv_type,
-            'type_line': self.ac_aim2AB_type_line
-        }
 
 
 @dataclass
-class ExtY_FCS_LINESTRUC_acAB_T:
+class ExtY_FCS_LINESTRUC_acAB_T(_SchemaStruct, schema=LINESTRUC_AB_SCHEMA):
     """航迹线结构 acAB
     
     AB段航迹线信息
@@ -1652,110 +572,6 @@ class ExtY_FCS_LINESTRUC_acAB_T:
     acAB_turn_type: uint8_T = 0
     acAB_Inv_type: uint8_T = 0
     acAB_type_line: uint8_T = 0
-    
-    @classmethod
-    def from_bytes(cls, data: bytes) -> 'ExtY_FCS_LINESTRUC_acAB_T':
-        """从字节数据解析 AB 段航迹线信息。"""
-        if len(data) < _LINESTRUC_SIZE:
-            print(f"[ExtY_FCS_LINESTRUC_acAB_T] Payload长度不足: {len(data)} < {_LINESTRUC_SIZE}")
-            return cls()
-        values = struct.unpack(_LINESTRUC_FORMAT, data[:_LINESTRUC_SIZE])
-        
-        return cls(
-            acAB_lon=values[0],
-            acAB_lat=values[1],
-            acAB_psi=values[2],
-            acAB_alt=values[3],
-            acAB_len=values[4],
-            acAB_rad=values[5],
-            acAB_Vx2nextdot=values[6],
-            acAB_next_num=values[7],
-            acAB_next_dot=values[8],
-            acAB_type_dot=values[9],
-            acAB_clockwise_WP=values[10],
-            acAB_R_WP=values[11],
-            acAB_type_WP=values[12],
-            acAB_Num_type_WP=values[13],
-            acAB_dL_WP=values[14],
-            acAB_Vx_type=values[15],
-            acAB_TTC_Fault_Mode=values[16],
-            acAB_deltaY_ctrl=values[17],
-            acAB_turn_type=values[18],
-            acAB_Inv_type=values[19],
-            acAB_type_line=values[20]
-        )
-
-    def to_bytes(self) -> bytes:
-        """编码为 pack(1) C 结构对应的 56 字节布局。"""
-        return struct.pack(_LINESTRUC_FORMAT,
-            self.acAB_lon,
-            self.acAB_lat,
-            self.acAB_psi,
-            self.acAB_alt,
-            self.acAB_len,
-            self.acAB_rad,
-            self.acAB_Vx2nextdot,
-            self.acAB_next_num,
-            self.acAB_next_dot,
-            self.acAB_type_dot,
-            self.acAB_clockwise_WP,
-            self.acAB_R_WP,
-            self.acAB_type_WP,
-            self.acAB_Num_type_WP,
-            self.acAB_dL_WP,
-            self.acAB_Vx_type,
-            self.acAB_TTC_Fault_Mode,
-            self.acAB_deltaY_ctrl,
-            self.acAB_turn_type,
-            self.acAB_Inv_type,
-            self.acAB_type_line
-        )
-
-    def to_json(self) -> dict:
-        return {
-            'acAB_lon': float(self.acAB_lon),
-            'acAB_lat': float(self.acAB_lat),
-            'acAB_psi': float(self.acAB_psi),
-            'acAB_alt': float(self.acAB_alt),
-            'acAB_len': float(self.acAB_len),
-            'acAB_rad': float(self.acAB_rad),
-            'acAB_Vx2nextdot': float(self.acAB_Vx2nextdot),
-            'acAB_next_num': self.acAB_next_num,
-            'acAB_next_dot': self.acAB_next_dot,
-            'acAB_type_dot': self.acAB_type_dot,
-            'acAB_clockwise_WP': self.acAB_clockwise_WP,
-            'acAB_R_WP': float(self.acAB_R_WP),
-            'acAB_type_WP': self.acAB_type_WP,
-            'acAB_Num_type_WP': self.acAB_Num_type_WP,
-            'acAB_dL_WP': float(self.acAB_dL_WP),
-            'acAB_Vx_type': self.acAB_Vx_type,
-            'acAB_TTC_Fault_Mode': self.acAB_TTC_Fault_Mode,
-            'acAB_deltaY_ctrl': self.acAB_deltaY_ctrl,
-            'acAB_turn_type': self.acAB_turn_type,
-            'acAB_Inv_type': self.acAB_Inv_type,
-            'acAB_type_line': self.acAB_type_line,
-            'lon': float(self.acAB_lon),
-            'lat': float(self.acAB_lat),
-            'psi': float(self.acAB_psi),
-            'alt': float(self.acAB_alt),
-            'len': float(self.acAB_len),
-            'rad': float(self.acAB_rad),
-            'Vx2nextdot': float(self.acAB_Vx2nextdot),
-            'next_num': self.acAB_next_num,
-            'next_dot': self.acAB_next_dot,
-            'type_dot': self.acAB_type_dot,
-            'clockwise_WP': bool(self.acAB_clockwise_WP),
-            'R_WP': float(self.acAB_R_WP),
-            'type_WP': self.acAB_type_WP,
-            'Num_type_WP': self.acAB_Num_type_WP,
-            'dL_WP': float(self.acAB_dL_WP),
-            'Vx_type': self.acAB_Vx_type,
-            'TTC_Fault_Mode': self.acAB_TTC_Fault_Mode,
-            'deltaY_ctrl': self.acAB_deltaY_ctrl,
-            'turn_type': self.acAB_turn_type,
-            'Inv_type': self.acAB_Inv_type,
-            'type_line': self.acAB_type_line
-        }
 
 
 # 地面遥控指令枚举
@@ -1975,23 +791,11 @@ class GCSTelemetry_T:
                 logger.warning(f"[GCSTelemetry_T] 数据长度不足，无法解析动态数组: {len(data)} < {expected_len}")
                 return None
 
-            # 解析全局路径
-            global_path = []
-            for _ in range(global_path_count):
-                global_path.append(PathPoint_T.from_bytes(data[offset:offset+24]))
-                offset += 24
-
-            # 解析局部路径
-            local_path = []
-            for _ in range(local_traj_count):
-                local_path.append(PathPoint_T.from_bytes(data[offset:offset+24]))
-                offset += 24
-
-            # 解析障碍物
-            obstacles = []
-            for _ in range(obstacle_count):
-                obstacles.append(Object3d_T.from_bytes(data[offset:offset+72]))
-                offset += 72
+            # 三段数组各一次 np.frombuffer，再批量转换为 dataclass
+            arrays = GCSTelemetryArrays.from_bytes(data)
+            global_path = [PathPoint_T(*row) for row in arrays.global_path.tolist()]
+            local_path = [PathPoint_T(*row) for row in arrays.local_path.tolist()]
+            obstacles = [Object3d_T(*row) for row in arrays.obstacles.tolist()]
             
             return cls(
                 seq_id=seq_id,
@@ -2013,6 +817,22 @@ class GCSTelemetry_T:
             logger.error(f"解析 GCSTelemetry_T 失败: {e}")
             return None
 
+    def to_bytes(self) -> bytes:
+        """编码为字节数据，数组长度以实际列表为准"""
+        header = struct.pack(
+            '<II4dBB3H',
+            self.seq_id, self.timestamp,
+            self.current_pos_x, self.current_pos_y, self.current_pos_z, self.current_vel,
+            self.update_flags, self.status,
+            len(self.global_path), len(self.local_path), len(self.obstacles),
+        )
+        return b''.join([
+            header,
+            *(point.to_bytes() for point in self.global_path),
+            *(point.to_bytes() for point in self.local_path),
+            *(obstacle.to_bytes() for obstacle in self.obstacles),
+        ])
+
     def to_json(self) -> dict:
         """将遥测数据转换为JSON格式"""
         local_path_json = [p.to_json() for p in self.local_path]
@@ -2033,6 +853,281 @@ class GCSTelemetry_T:
         }
 
 
+# 0x71 动态数组的元素布局：路径点 x/y/z，障碍物 center/size/velocity 各 x/y/z
+_PATH_POINT_DOUBLES = 3
+_OBJECT3D_DOUBLES = 9
+_F64_LE = np.dtype('<f8')
+
+
+@dataclass
+class GCSTelemetryArrays:
+    """GCS遥测数据的数组视图，对应功能码 0x71
+
+    global_path / local_path 为 (N, 3) 的 [x, y, z]，obstacles 为 (K, 9) 的
+    [cx, cy, cz, sx, sy, sz, vx, vy, vz]，均为 np.frombuffer 得到的只读视图，
+    不复制 payload。传入接收缓冲区的 memoryview 时，不要在缓冲区被裁剪后继续持有这些数组。
+    """
+    seq_id: uint32_T = 0
+    timestamp: uint32_T = 0
+    current_pos_x: real_T = 0.0
+    current_pos_y: real_T = 0.0
+    current_pos_z: real_T = 0.0
+    current_vel: real_T = 0.0
+    update_flags: uint8_T = 0
+    status: uint8_T = 0
+    global_path_count: uint16_T = 0
+    local_traj_count: uint16_T = 0
+    obstacle_count: uint16_T = 0
+    global_path: np.ndarray = field(default_factory=lambda: np.empty((0, _PATH_POINT_DOUBLES), dtype=_F64_LE))
+    local_path: np.ndarray = field(default_factory=lambda: np.empty((0, _PATH_POINT_DOUBLES), dtype=_F64_LE))
+    obstacles: np.ndarray = field(default_factory=lambda: np.empty((0, _OBJECT3D_DOUBLES), dtype=_F64_LE))
+
+    @classmethod
+    def from_bytes(cls, data) -> Optional['GCSTelemetryArrays']:
+        """从字节数据解析，长度不足时返回None"""
+        data_len = len(data)
+        header_size = _GCS_TELEMETRY_HEADER_STRUCT.size
+        if data_len < header_size:
+            logger.warning(f"[GCSTelemetry_T] 数据长度不足，无法解析固定头部: {data_len} < {header_size}")
+            return None
+
+        header = _GCS_TELEMETRY_HEADER_STRUCT.unpack_from(data, 0)
+        global_path_count, local_traj_count, obstacle_count = header[8:11]
+        global_path_end = header_size + global_path_count * _PATH_POINT_STRUCT.size
+        local_path_end = global_path_end + local_traj_count * _PATH_POINT_STRUCT.size
+        obstacles_end = local_path_end + obstacle_count * _OBJECT3D_STRUCT.size
+        if data_len < obstacles_end:
+            logger.warning(f"[GCSTelemetry_T] 数据长度不足，无法解析动态数组: {data_len} < {obstacles_end}")
+            return None
+
+        return cls(
+            *header,
+            global_path=np.frombuffer(
+                data, dtype=_F64_LE, count=global_path_count * _PATH_POINT_DOUBLES, offset=header_size,
+            ).reshape(global_path_count, _PATH_POINT_DOUBLES),
+            local_path=np.frombuffer(
+                data, dtype=_F64_LE, count=local_traj_count * _PATH_POINT_DOUBLES, offset=global_path_end,
+            ).reshape(local_traj_count, _PATH_POINT_DOUBLES),
+            obstacles=np.frombuffer(
+                data, dtype=_F64_LE, count=obstacle_count * _OBJECT3D_DOUBLES, offset=local_path_end,
+            ).reshape(obstacle_count, _OBJECT3D_DOUBLES),
+        )
+
+    def to_json(self) -> dict:
+        """转换为JSON格式，动态数组按行展平为一维坐标列表（*_flat）"""
+        return {
+            'seq_id': self.seq_id,
+            'timestamp': self.timestamp,
+            'position': {'x': self.current_pos_x, 'y': self.current_pos_y, 'z': self.current_pos_z},
+            'velocity': self.current_vel,
+            'update_flags': self.update_flags,
+            'status': self.status,
+            'global_path_count': self.global_path_count,
+            'global_path_flat': self.global_path.ravel().tolist(),
+            'local_traj_count': self.local_traj_count,
+            'local_path_flat': self.local_path.ravel().tolist(),
+            'obstacle_count': self.obstacle_count,
+            'obstacles_flat': self.obstacles.ravel().tolist(),
+        }
+
+
+# ================================================================
+# 功能字编解码注册表
+# ================================================================
+
+@dataclass(frozen=True)
+class TelemetryCodec:
+    """单个功能字的预编译解码器
+
+    - layout: 预编译的 struct.Struct（按 interface.h 的 pack(1) 小端布局）
+    - field_names: 与 layout 解包顺序一致的字段名
+    - build_json: 由解包元组直接生成输出字典，不再经过 dataclass
+    - unpack_partial: payload 短于 layout.size 时按完整字段前缀解包（其余字段取 0），
+      与对应 dataclass 的 from_bytes 语义一致
+    """
+    func_code: int
+    msg_type: str
+    struct_name: str
+    layout: Optional[struct.Struct]
+    field_names: Tuple[str, ...]
+    build_json: Callable[..., Optional[dict]]
+    unpack_partial: Optional[Callable[[bytes], tuple]] = None
+    skip_recording: bool = False
+
+    def decode(self, payload) -> Optional[dict]:
+        layout = self.layout
+        if layout is None:
+            return self.build_json(payload)
+        if len(payload) >= layout.size:
+            return self.build_json(layout.unpack_from(payload))
+        if self.unpack_partial is not None:
+            return self.build_json(self.unpack_partial(payload))
+        raise struct.error(f'{self.struct_name} 需要 {layout.size} 字节, 实际 {len(payload)} 字节')
+
+
+def _field_names(struct_cls) -> Tuple[str, ...]:
+    return tuple(item.name for item in fields(struct_cls))
+
+
+_GCS_TELEMETRY_HEADER_STRUCT = struct.Struct('<II4dBB3H')
+_PATH_POINT_STRUCT = struct.Struct('<3d')
+_OBJECT3D_STRUCT = struct.Struct('<9d')
+
+
+def _schema_codec(func_code: int, struct_cls: type) -> TelemetryCodec:
+    """由定长遥测 dataclass 的字段表生成功能字解码器（与 from_bytes / to_json 共用布局与 JSON 构造函数）"""
+    schema = struct_cls.schema
+    # PWMS 的 dataclass 以单个列表字段承载 8 路通道，不做逐字段名比对
+    if schema.json_flat or schema.json_nested:
+        if _field_names(struct_cls) != schema.field_names:
+            raise ValueError(f'{schema.struct_name} 字段表与 dataclass 定义不一致')
+    return TelemetryCodec(
+        func_code, schema.msg_type, schema.struct_name,
+        struct_cls._layout, schema.field_names, struct_cls._build_json,
+        struct_cls._unpack_partial,
+    )
+
+
+def _build_root_json(payload) -> dict:
+    return {}
+
+
+def _build_gcs_telemetry_json(payload) -> Optional[dict]:
+    """0x71 规划遥测：三段变长数组各一次 np.frombuffer，输出展平坐标列表"""
+    arrays = GCSTelemetryArrays.from_bytes(payload)
+    if arrays is None:
+        return None
+    return arrays.to_json()
+
+
+TELEMETRY_CODECS: Dict[int, TelemetryCodec] = {
+    codec.func_code: codec
+    for codec in (
+        _schema_codec(NCLINK_RECEIVE_EXTY_FCS_PWMS, ExtY_FCS_PWMS_T),
+        _schema_codec(NCLINK_RECEIVE_EXTY_FCS_STATES, ExtY_FCS_STATES_T),
+        _schema_codec(NCLINK_RECEIVE_EXTY_FCS_DATACTRL, ExtY_FCS_DATACTRL_T),
+        _schema_codec(NCLINK_RECEIVE_EXTY_FCS_GNCBUS, ExtY_FCS_GNCBUS_T),
+        _schema_codec(NCLINK_RECEIVE_EXTY_FCS_AVOIFLAG, ExtY_FCS_AVOIFLAG_T),
+        _schema_codec(NCLINK_RECEIVE_EXTY_FCS_DATAGCS, ExtY_FCS_DATAGCS_T),
+        _schema_codec(NCLINK_RECEIVE_EXTY_FCS_LINESTRUC_AIM2AB, ExtY_FCS_LINESTRUC_ac_aim2AB_T),
+        _schema_codec(NCLINK_RECEIVE_EXTY_FCS_LINESTRUC_AB, ExtY_FCS_LINESTRUC_acAB_T),
+        _schema_codec(NCLINK_RECEIVE_EXTY_FCS_PARAM, ExtY_FCS_PARAM_T),
+        _schema_codec(NCLINK_RECEIVE_EXTY_FCS_ESC, ExtY_FCS_ESC_T),
+        TelemetryCodec(
+            NCLINK_RECEIVE_EXTY_FCS_ROOT, 'fcs_root', 'ExtY_FCS_ROOT_T',
+            None, (), _build_root_json,
+            skip_recording=True,
+        ),
+        TelemetryCodec(
+            NCLINK_GCS_TELEMETRY, 'planning_telemetry', 'GCSTelemetry_T',
+            None, _field_names(GCSTelemetry_T), _build_gcs_telemetry_json,
+        ),
+    )
+}
+
+
+def get_telemetry_codec(func_code: int) -> Optional[TelemetryCodec]:
+    """按功能字查找预编译解码器，未注册返回None"""
+    return TELEMETRY_CODECS.get(func_code)
+
+
+class DecodedMessage(dict):
+    """延迟解码的解析结果
+
+    帧元数据（type / func_code / timestamp / payload_size ...）在解析时立即写入；
+    'data' 字段保留原始 payload，直到首次被读取（广播、录制、在线分析）时才按
+    注册表解码并缓存。被节流丢弃的高频帧因此不会构造任何 JSON 字典。
+    对外行为与普通 dict 一致：下标、get、in、迭代、json.dumps 均会先完成解码。
+    """
+    __slots__ = ('_codec', 'raw_payload')
+
+    def __init__(self, frame_fields: dict, codec: TelemetryCodec, raw_payload: bytes):
+        super().__init__(frame_fields)
+        self._codec = codec
+        self.raw_payload = raw_payload
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._codec is None
+
+    def materialize(self) -> 'DecodedMessage':
+        codec = self._codec
+        if codec is not None:
+            # 先写入 data 再清除 _codec：录制线程可能与事件循环同时读取同一条消息，
+            # 任何时刻都能看到“待解码”或“已有 data”之一；并发时至多重复解码一次
+            data = codec.decode(self.raw_payload)
+            dict.__setitem__(self, 'data', data)
+            self._codec = None
+        return self
+
+    def __missing__(self, key):
+        if key == 'data' and self._codec is not None:
+            return dict.__getitem__(self.materialize(), 'data')
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key == 'data' and self._codec is not None:
+            self.materialize()
+        return dict.get(self, key, default)
+
+    def __contains__(self, key) -> bool:
+        return (key == 'data' and self._codec is not None) or dict.__contains__(self, key)
+
+    def __setitem__(self, key, value) -> None:
+        if key == 'data':
+            self._codec = None
+        dict.__setitem__(self, key, value)
+
+    def __iter__(self):
+        return dict.__iter__(self.materialize())
+
+    def __len__(self) -> int:
+        return dict.__len__(self) + (1 if self._codec is not None and not dict.__contains__(self, 'data') else 0)
+
+    def __bool__(self) -> bool:
+        return True
+
+    def keys(self):
+        return dict.keys(self.materialize())
+
+    def values(self):
+        return dict.values(self.materialize())
+
+    def items(self):
+        return dict.items(self.materialize())
+
+    def pop(self, key, *default):
+        if key == 'data':
+            self.materialize()
+        return dict.pop(self, key, *default)
+
+    def setdefault(self, key, default=None):
+        if key == 'data':
+            self.materialize()
+        return dict.setdefault(self, key, default)
+
+    def copy(self) -> dict:
+        return dict(self.materialize())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, DecodedMessage):
+            other.materialize()
+        return dict.__eq__(self.materialize(), other)
+
+    def __ne__(self, other) -> bool:
+        if isinstance(other, DecodedMessage):
+            other.materialize()
+        return dict.__ne__(self.materialize(), other)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return dict.__repr__(self.materialize())
+
+    def __reduce__(self):
+        return dict, (dict(self.materialize()),)
+
+
 # ================================================================
 # NCLink帧结构定义
 # ================================================================
@@ -2071,13 +1166,8 @@ class NCLinkFrame:
             data_len & 0xFF            # 字节4: 长度低字节 (大端序)
         ])
         
-        # 构建完整帧（不含校验和和帧尾）
-        frame_without_checksum = header + data
-        
         # 计算校验和：对整个帧（不含校验和和帧尾）进行XOR运算
-        checksum = 0
-        for byte in frame_without_checksum:
-            checksum ^= byte
+        checksum = frame_checksum(func_code, data)
         
         frame = cls(
             head0=NCLINK_HEAD0,
@@ -2122,18 +1212,8 @@ class NCLinkFrame:
         
         注意：这个方法是为了向后兼容保留的接口，实际计算应该使用完整的frame
         """
-        data_len = len(data)
-        # 构建完整帧（不含校验和和帧尾）
-        # 帧头(2) + 功能码(1) + 数据长度(2, 大端) + 数据(N)
-        frame_without_checksum = struct.pack('!BBBH',
-                                              NCLINK_HEAD0, NCLINK_HEAD1,
-                                              func_code, data_len) + data
-        
-        # 计算校验和：对整个帧进行XOR运算
-        checksum = 0
-        for byte in frame_without_checksum:
-            checksum ^= byte
-        return checksum
+        # 帧头(2) + 功能码(1) + 数据长度(2, 大端) + 数据(N) 逐字节异或
+        return frame_checksum(func_code, data)
     
     def validate(self) -> bool:
         """验证帧校验和"""
@@ -2145,6 +1225,11 @@ class NCLinkFrame:
 # NCLink数据包解析器
 # ================================================================
 
+# 帧头字节序列与帧固定开销：head(2) + func(1) + len(2) + checksum(1) + tail(2)
+_FRAME_HEAD = bytes((NCLINK_HEAD0, NCLINK_HEAD1))
+_FRAME_OVERHEAD = 8
+
+
 class PortType(IntEnum):
     """端口类型枚举"""
     PORT_18504_RECEIVE = 0      # 地面站接收端口（飞控发送指令响应）
@@ -2156,19 +1241,23 @@ class PortType(IntEnum):
 class NCLinkProtocolParser:
     """NCLink协议解析器"""
     
-    def __init__(self, on_event: Optional[Callable[[dict[str, Any]], None]] = None):
+    def __init__(
+        self,
+        on_event: Optional[Callable[[dict[str, Any]], None]] = None,
+        emit_parsed_events: bool = True,
+        local_port: Optional[int] = None,
+    ):
         self.buffer = bytearray()
+        # 接收该数据流的本地 UDP 端口（写入消息的 local_port 字段，用于按端口统计链路质量）
+        self.local_port = local_port
         self.on_event = on_event
-        self.fcs_states: Optional[ExtY_FCS_STATES_T] = None
-        self.fcs_pwms: Optional[ExtY_FCS_PWMS_T] = None
-        self.fcs_datactrl: Optional[ExtY_FCS_DATACTRL_T] = None
-        self.fcs_gncbus: Optional[ExtY_FCS_GNCBUS_T] = None
-        self.avoiflag: Optional[ExtY_FCS_AVOIFLAG_T] = None
-        self.fcs_datafutaba: Optional[ExtY_FCS_DATAFUTABA_T] = None
-        self.fcs_datagcs: Optional[ExtY_FCS_DATAGCS_T] = None
-        self.fcs_esc: Optional[ExtY_FCS_ESC_T] = None
-        self.fcs_param: Optional[ExtY_FCS_PARAM_T] = None
-        self.gcs_telemetry: Optional[GCSTelemetry_T] = None
+        # 为 False 时不再逐帧发出 message_parsed 事件（调用方按 feed_data 返回的批次自行统计）
+        self.emit_parsed_events = emit_parsed_events
+        # 各功能字最近一次解析结果（按功能字索引，延迟解码的消息不会因缓存而被解码）
+        self.latest_messages: Dict[int, dict] = {}
+        # 当前 feed_data 所处理 datagram 的到达时刻（单调时钟 ns / 墙钟 ms），同一 datagram 内的帧共用
+        self._rx_arrival_ns: Optional[int] = None
+        self._rx_timestamp: Optional[int] = None
 
     def _emit_event(self, event_type: str, **payload: Any) -> None:
         if not self.on_event:
@@ -2234,69 +1323,215 @@ class NCLinkProtocolParser:
 
         return None
     
-    def feed_data(self, data: bytes, port_type: PortType = PortType.PORT_18504_RECEIVE) -> List[dict]:
+    def feed_data(
+        self,
+        data: bytes,
+        port_type: PortType = PortType.PORT_18504_RECEIVE,
+        arrival_ns: Optional[int] = None,
+        timestamp: Optional[int] = None,
+    ) -> List[dict]:
         """feeding数据并解析
         
         Args:
             data: 接收到的字节数据
             port_type: 端口类型（用于区分不同来源的数据）
+            arrival_ns: datagram 到达时刻（time.monotonic_ns 时基），默认取当前时刻
+            timestamp: datagram 到达墙钟时间（毫秒），默认取当前时间
         
         Returns:
             解析后的消息列表
         """
-        self.buffer.extend(data)
+        # 每个 datagram 只取一次到达时间，解析出的全部帧共用
+        self._rx_arrival_ns = time.monotonic_ns() if arrival_ns is None else arrival_ns
+        self._rx_timestamp = int(time.time() * 1000) if timestamp is None else timestamp
+        buffer = self.buffer
+        buffer.extend(data)
+        buffer_len = len(buffer)
         messages = []
-        
-        while len(self.buffer) >= 6:  # 最小帧长度: head(2) + len(2) + func_code(1) + checksum(1)
-            # 查找帧头
-            if self.buffer[0] != NCLINK_HEAD0 or self.buffer[1] != NCLINK_HEAD1:
-                self.buffer.pop(0)
+        offset = 0
+
+        # 在 memoryview 上按偏移扫描，帧切片零拷贝交给 parse_frame；
+        # 丢失同步时用 find 直接跳到下一个帧头，已消费字节在末尾一次性压缩
+        with memoryview(buffer) as view:
+            while buffer_len - offset >= 6:  # 最小帧长度: head(2) + len(2) + func_code(1) + checksum(1)
+                # 查找帧头
+                if buffer[offset] != NCLINK_HEAD0 or buffer[offset + 1] != NCLINK_HEAD1:
+                    next_head = buffer.find(_FRAME_HEAD, offset + 1)
+                    if next_head < 0:
+                        # 末字节可能是被拆到下一个数据报的帧头前半部分
+                        offset = buffer_len - 1 if buffer[-1] == NCLINK_HEAD0 else buffer_len
+                        break
+                    offset = next_head
+                    continue
+
+                # 读取功能码和长度字段（正确偏移：功能码在byte 2，长度在byte 3-4）
+                func_code = buffer[offset + 2]
+                data_len = (buffer[offset + 3] << 8) | buffer[offset + 4]
+
+                # 长度字段超限说明是伪帧头，不等待后续数据，直接向后重新同步
+                if data_len > BUFFER_SIZE_MAX:
+                    self._reject_frame(
+                        'payload_length_overflow',
+                        func_code=func_code,
+                        port_type=port_type,
+                        frame_size=data_len + _FRAME_OVERHEAD,
+                        payload_size=data_len,
+                        details='payload length exceeds BUFFER_SIZE_MAX while scanning buffer',
+                    )
+                    offset += 1
+                    continue
+
+                # 检查帧是否完整
+                # 格式: head(2) + func(1) + len(2) + data(data_len) + checksum(1) + tail(2)
+                total_len = data_len + _FRAME_OVERHEAD
+                frame_end = offset + total_len
+                if frame_end > buffer_len:
+                    break
+
+                # 验证帧尾
+                if buffer[frame_end - 2] != NCLINK_END0 or buffer[frame_end - 1] != NCLINK_END1:
+                    self._reject_frame(
+                        'tail_mismatch',
+                        func_code=func_code,
+                        port_type=port_type,
+                        frame_size=total_len,
+                        payload_size=data_len,
+                        details='invalid frame tail while scanning buffer',
+                    )
+                    offset += 1
+                    continue
+
+                # 解析帧
+                try:
+                    frame = self.parse_frame(view[offset:frame_end], port_type)
+                    if frame is not None:
+                        messages.append(frame)
+                except Exception as e:
+                    logger.error(f"解析帧失败: {e}")
+
+                offset = frame_end
+
+        # 移除已处理的字节
+        if offset:
+            del buffer[:offset]
+
+        self._rx_arrival_ns = None
+        self._rx_timestamp = None
+        return messages
+
+    def decode_batch(
+        self,
+        frames,
+        port_type: PortType = PortType.PORT_18504_RECEIVE,
+        verify_checksum: bool = False,
+    ) -> Dict[int, Any]:
+        """批量解码完整帧，按功能字返回列式结构化数组（离线分析 / 回放使用）
+
+        Args:
+            frames: 完整 NCLink 帧序列（bytes / bytearray / memoryview）
+            port_type: 端口类型（仅用于拒帧事件）
+            verify_checksum: 为True时丢弃校验和不匹配的帧
+
+        Returns:
+            {功能字: numpy 结构化数组}，每行一帧、每个字段一列（arr['states_lat'] 即整列）。
+            定长遥测按 TELEMETRY_DTYPES 解出全部字段；0x71 仅解出固定头部，
+            变长路径/障碍物数组不在此处展开。无 dtype 的功能字（0x4B、心跳、未知）被忽略。
+        """
+        from .telemetry_dtypes import TELEMETRY_DTYPES, TELEMETRY_HEADER_DTYPES
+
+        grouped: Dict[int, List[Any]] = {}
+        row_sizes: Dict[int, int] = {}
+        for frame in frames:
+            frame_size = len(frame)
+            if frame_size < _FRAME_OVERHEAD or frame[0] != NCLINK_HEAD0 or frame[1] != NCLINK_HEAD1:
+                self._reject_frame(
+                    'header_mismatch',
+                    func_code=frame[2] if frame_size > 2 else None,
+                    port_type=port_type,
+                    frame_size=frame_size,
+                    payload_size=0,
+                    details='invalid frame header in decode_batch',
+                )
                 continue
-            
-            # 读取功能码和长度字段（正确偏移：功能码在byte 2，长度在byte 3-4）
-            func_code = self.buffer[2]
-            data_len = struct.unpack_from('!H', self.buffer, 3)[0]
-            
-            # 检查帧是否完整
-            # 格式: head(2) + func(1) + len(2) + data(data_len) + checksum(1) + tail(2)
-            total_len = 2 + 1 + 2 + data_len + 1 + 2  # head + func + len + data + checksum + end
-            if len(self.buffer) < total_len:
-                break
-            
-            # 提取帧数据
-            frame_data = bytes(self.buffer[:total_len])
-            
-            # 验证帧尾
-            if frame_data[-2] != NCLINK_END0 or frame_data[-1] != NCLINK_END1:
+
+            func_code = frame[2]
+            data_len = (frame[3] << 8) | frame[4]
+            payload_end = 5 + data_len
+            if frame_size < payload_end + 3 or frame[payload_end + 1] != NCLINK_END0 or frame[payload_end + 2] != NCLINK_END1:
                 self._reject_frame(
                     'tail_mismatch',
                     func_code=func_code,
                     port_type=port_type,
-                    frame_size=total_len,
+                    frame_size=frame_size,
                     payload_size=data_len,
-                    details='invalid frame tail while scanning buffer',
+                    details='invalid frame tail in decode_batch',
                 )
-                self.buffer.pop(0)
                 continue
-            
-            # 解析帧
-            try:
-                frame = self.parse_frame(frame_data, port_type)
-                if frame:
-                    messages.append(frame)
-            except Exception as e:
-                logger.error(f"解析帧失败: {e}")
-            
-            # 移除已处理的帧
-            del self.buffer[:total_len]
-        
-        return messages
-    
+
+            dtype = TELEMETRY_DTYPES.get(func_code) or TELEMETRY_HEADER_DTYPES.get(func_code)
+            if dtype is None:
+                continue
+
+            if data_len < dtype.itemsize:
+                self._reject_frame(
+                    'decode_error',
+                    func_code=func_code,
+                    port_type=port_type,
+                    frame_size=frame_size,
+                    payload_size=data_len,
+                    details=f'payload shorter than {dtype.itemsize} bytes in decode_batch',
+                )
+                continue
+
+            # 只保留 帧头 + 载荷 + 校验字节，同一功能字帧长一致时可整体 reshape 成二维字节矩阵
+            grouped.setdefault(func_code, []).append(memoryview(frame)[:payload_end + 1])
+            row_size = payload_end + 1
+            if row_sizes.setdefault(func_code, row_size) != row_size:
+                row_sizes[func_code] = -1
+
+        arrays: Dict[int, Any] = {}
+        for func_code, rows in grouped.items():
+            dtype = TELEMETRY_DTYPES.get(func_code) or TELEMETRY_HEADER_DTYPES[func_code]
+            row_size = row_sizes[func_code]
+            if row_size > 0:
+                matrix = np.frombuffer(b''.join(rows), dtype=np.uint8).reshape(-1, row_size)
+                if verify_checksum:
+                    valid = np.bitwise_xor.reduce(matrix[:, :-1], axis=1) == matrix[:, -1]
+                    for _ in range(int(matrix.shape[0] - np.count_nonzero(valid))):
+                        self._reject_frame(
+                            'checksum_mismatch',
+                            func_code=func_code,
+                            port_type=port_type,
+                            frame_size=row_size + 2,
+                            payload_size=row_size - 6,
+                            details='checksum mismatch in decode_batch',
+                        )
+                    matrix = matrix[valid]
+                arrays[func_code] = np.ascontiguousarray(matrix[:, 5:5 + dtype.itemsize]).view(dtype).reshape(-1)
+                continue
+
+            # 变长功能字（0x71）逐帧校验后只拼接固定头部
+            payloads = []
+            for row in rows:
+                if verify_checksum and xor_checksum(row[:-1]) != row[-1]:
+                    self._reject_frame(
+                        'checksum_mismatch',
+                        func_code=func_code,
+                        port_type=port_type,
+                        frame_size=len(row) + 2,
+                        payload_size=len(row) - 6,
+                        details='checksum mismatch in decode_batch',
+                    )
+                    continue
+                payloads.append(row[5:5 + dtype.itemsize])
+            arrays[func_code] = np.frombuffer(b''.join(payloads), dtype=dtype)
+        return arrays
+
     def parse_frame(self, frame_data: bytes, port_type: PortType) -> Optional[dict]:
         """解析单个帧
         
         Args:
-            frame_data: 帧数据
+            frame_data: 帧数据（bytes 或 feed_data 传入的 memoryview 切片）
             port_type: 端口类型
         
         Returns:
@@ -2353,10 +1588,7 @@ class NCLinkProtocolParser:
             return None
         
         # 飞控遥测校验和计算：对 帧头(2) + 功能码(1) + 长度(2) + 载荷(N) 进行异或
-        frame_for_checksum = frame_data[:5+data_len]
-        expected_checksum = 0
-        for byte in frame_for_checksum:
-            expected_checksum ^= byte
+        expected_checksum = xor_checksum(frame_data[:5+data_len])
 
         if checksum != expected_checksum:
             logger.warning(f"[协议解析] 校验和不匹配: 计算{expected_checksum:02X}, 接收{checksum:02X}")
@@ -2393,231 +1625,99 @@ class NCLinkProtocolParser:
                 details=payload_contract_error,
             )
         
+        return self.build_message(func_code, payload, port_type, expected_frame_len)
+
+    def build_message(
+        self,
+        func_code: int,
+        payload,
+        port_type: PortType,
+        frame_size: int,
+        timestamp: Optional[int] = None,
+        payload_size: Optional[int] = None,
+        arrival_ns: Optional[int] = None,
+        local_port: Optional[int] = None,
+    ) -> Optional[dict]:
+        """由已校验帧的功能码与载荷构造消息字典
+
+        parse_frame 完成帧头/校验和/帧尾/长度约定检查后调用；独立进程接收模式下，
+        主进程从共享内存环形缓冲读出载荷后也经由这里还原消息。
+
+        Args:
+            func_code: 功能码
+            payload: 载荷（bytes 或 memoryview）
+            port_type: 端口类型
+            frame_size: 完整帧长度
+            timestamp: 接收时间戳（毫秒），默认取所在 datagram 的到达时间
+            payload_size: 原始载荷长度，默认 len(payload)（载荷被截断存储时传入）
+            arrival_ns: 到达时刻（time.monotonic_ns 时基），默认取所在 datagram 的到达时刻，
+                下游据此计算数据在各处理阶段的时延
+            local_port: 接收端口，默认取解析器的 local_port
+        """
+        data_len = len(payload) if payload_size is None else payload_size
+        if timestamp is None:
+            timestamp = self._rx_timestamp
+            if timestamp is None:
+                timestamp = int(time.time() * 1000)
+        if arrival_ns is None:
+            arrival_ns = self._rx_arrival_ns
+            if arrival_ns is None:
+                arrival_ns = time.monotonic_ns()
+
         # 根据功能码解析数据
         message = {
             'func_code': func_code,
             'func_code_hex': f'0x{func_code:02X}',
             'port_type': port_type,
-            'timestamp': int(time.time() * 1000),
+            'timestamp': timestamp,
+            'arrival_ns': arrival_ns,
+            'local_port': self.local_port if local_port is None else local_port,
             'payload_size': data_len,
-            'frame_size': expected_frame_len,
+            'frame_size': frame_size,
         }
         
-        # ============ 飞控数据包解析 (0x40-0x4B) ============
-        if func_code == NCLINK_RECEIVE_EXTY_FCS_PWMS:
-            # 0x41: PWM输出数据
-            self.fcs_pwms = ExtY_FCS_PWMS_T.from_bytes(payload)
-            message['type'] = 'fcs_pwms'
-            message['data'] = {'pwms': self.fcs_pwms.pwms}
-        
-        elif func_code == NCLINK_RECEIVE_EXTY_FCS_STATES:
-            # 0x42: 飞行状态数据
-            try:
-                self.fcs_states = ExtY_FCS_STATES_T.from_bytes(payload)
-                message['type'] = 'fcs_states'
-                message['data'] = self.fcs_states.to_json()
-            except Exception as e:
-                logger.warning(f"[协议解析] ExtY_FCS_STATES_T解析失败，丢弃该帧: {e}")
-                self._reject_frame(
-                    'decode_error',
-                    func_code=func_code,
-                    port_type=port_type,
-                    frame_size=expected_frame_len,
-                    payload_size=data_len,
-                    details=str(e),
-                )
-                return None
-        
-        elif func_code == NCLINK_RECEIVE_EXTY_FCS_DATACTRL:
-            # 0x43: 控制数据循环状态
-            try:
-                self.fcs_datactrl = ExtY_FCS_DATACTRL_T.from_bytes(payload)
-                message['type'] = 'fcs_datactrl'
-                message['data'] = self.fcs_datactrl.to_json()
-            except Exception as e:
-                logger.warning(f"[协议解析] ExtY_FCS_DATACTRL_T解析失败，丢弃该帧: {e}")
-                self._reject_frame(
-                    'decode_error',
-                    func_code=func_code,
-                    port_type=port_type,
-                    frame_size=expected_frame_len,
-                    payload_size=data_len,
-                    details=str(e),
-                )
-                return None
-        
-        elif func_code == NCLINK_RECEIVE_EXTY_FCS_GNCBUS:
-            # 0x44: GN&C总线状态
+        # ============ 按功能字查表解码 (0x41-0x4B, 0x71) ============
+        codec = TELEMETRY_CODECS.get(func_code)
+        if codec is not None and codec.layout is not None and not codec.skip_recording \
+                and len(payload) >= codec.layout.size:
+            # 定长结构体长度足够时 unpack 不会失败，'data' 推迟到首次读取时再解码；
+            # payload 可能是接收缓冲区上的 memoryview，这里必须复制出独立的 bytes
+            message['type'] = codec.msg_type
+            message = DecodedMessage(message, codec, bytes(payload))
+            self.latest_messages[func_code] = message
+
+        elif codec is not None:
             try:
-                self.fcs_gncbus = ExtY_FCS_GNCBUS_T.from_bytes(payload)
-                message['type'] = 'fcs_gncbus'
-                message['data'] = self.fcs_gncbus.to_json()
+                data = codec.decode(payload)
             except Exception as e:
-                logger.warning(f"[协议解析] ExtY_FCS_GNCBUS_T解析失败，丢弃该帧: {e}")
+                logger.warning(f"[协议解析] {codec.struct_name}解析失败，丢弃该帧: {e}")
                 self._reject_frame(
                     'decode_error',
                     func_code=func_code,
                     port_type=port_type,
-                    frame_size=expected_frame_len,
+                    frame_size=frame_size,
                     payload_size=data_len,
                     details=str(e),
                 )
                 return None
-        
-        elif func_code == NCLINK_RECEIVE_EXTY_FCS_AVOIFLAG:
-            # 0x45: 避障标志
-            self.avoiflag = ExtY_FCS_AVOIFLAG_T.from_bytes(payload)
-            message['type'] = 'avoiflag'
-            message['data'] = self.avoiflag.to_json()
-        
-        elif func_code == NCLINK_RECEIVE_EXTY_FCS_DATAGCS:
-            # 0x46: 地面站发送数据 (GCS Telemetry)
-            try:
-                self.fcs_datagcs = ExtY_FCS_DATAGCS_T.from_bytes(payload)
-                message['type'] = 'fcs_datagcs'
-                message['data'] = self.fcs_datagcs.to_json()
-            except Exception as e:
-                logger.warning(f"[协议解析] ExtY_FCS_DATAGCS_T解析失败，丢弃该帧: {e}")
-                self._reject_frame(
-                    'decode_error',
-                    func_code=func_code,
-                    port_type=port_type,
-                    frame_size=expected_frame_len,
-                    payload_size=data_len,
-                    details=str(e),
-                )
-                return None
-        
-        elif func_code == NCLINK_RECEIVE_EXTY_FCS_LINESTRUC_AIM2AB:
-            # 0x47: aim2AB航迹线结构
-            try:
-                self.fcs_line_aim2ab = ExtY_FCS_LINESTRUC_ac_aim2AB_T.from_bytes(payload)
-                message['type'] = 'fcs_line_aim2ab'
-                message['data'] = self.fcs_line_aim2ab.to_json()
-            except Exception as e:
-                logger.warning(f"[协议解析] ExtY_FCS_LINESTRUC_ac_aim2AB_T解析失败，丢弃该帧: {e}")
+            if data is None:
                 self._reject_frame(
                     'decode_error',
                     func_code=func_code,
                     port_type=port_type,
-                    frame_size=expected_frame_len,
+                    frame_size=frame_size,
                     payload_size=data_len,
-                    details=str(e),
-                )
-                return None
-        
-        elif func_code == NCLINK_RECEIVE_EXTY_FCS_LINESTRUC_AB:
-            # 0x48: AB航迹线结构
-            try:
-                self.fcs_line_ab = ExtY_FCS_LINESTRUC_acAB_T.from_bytes(payload)
-                message['type'] = 'fcs_line_ab'
-                message['data'] = self.fcs_line_ab.to_json()
-            except Exception as e:
-                logger.warning(f"[协议解析] ExtY_FCS_LINESTRUC_acAB_T解析失败，丢弃该帧: {e}")
-                self._reject_frame(
-                    'decode_error',
-                    func_code=func_code,
-                    port_type=port_type,
-                    frame_size=expected_frame_len,
-                    payload_size=data_len,
-                    details=str(e),
-                )
-                return None
-        
-        elif func_code == NCLINK_RECEIVE_EXTY_FCS_ESC:
-            # 0x4A: 电机ESC数据
-            self.fcs_esc = ExtY_FCS_ESC_T.from_bytes(payload)
-            message['type'] = 'fcs_esc'
-            message['data'] = {
-                **self.fcs_esc.to_json(),
-                'error_counts': [
-                    self.fcs_esc.esc1_error_count, self.fcs_esc.esc2_error_count,
-                    self.fcs_esc.esc3_error_count, self.fcs_esc.esc4_error_count,
-                    self.fcs_esc.esc5_error_count, self.fcs_esc.esc6_error_count,
-                ],
-                'voltages': [
-                    self.fcs_esc.esc1_voltage, self.fcs_esc.esc2_voltage,
-                    self.fcs_esc.esc3_voltage, self.fcs_esc.esc4_voltage,
-                    self.fcs_esc.esc5_voltage, self.fcs_esc.esc6_voltage,
-                ],
-                'currents': [
-                    self.fcs_esc.esc1_current, self.fcs_esc.esc2_current,
-                    self.fcs_esc.esc3_current, self.fcs_esc.esc4_current,
-                    self.fcs_esc.esc5_current, self.fcs_esc.esc6_current,
-                ],
-                'temperatures': [
-                    self.fcs_esc.esc1_temperature, self.fcs_esc.esc2_temperature,
-                    self.fcs_esc.esc3_temperature, self.fcs_esc.esc4_temperature,
-                    self.fcs_esc.esc5_temperature, self.fcs_esc.esc6_temperature,
-                ],
-                'rpms': [
-                    self.fcs_esc.esc1_rpm, self.fcs_esc.esc2_rpm,
-                    self.fcs_esc.esc3_rpm, self.fcs_esc.esc4_rpm,
-                    self.fcs_esc.esc5_rpm, self.fcs_esc.esc6_rpm,
-                ],
-                'power_ratings': [
-                    self.fcs_esc.esc1_power_rating_pct, self.fcs_esc.esc2_power_rating_pct,
-                    self.fcs_esc.esc3_power_rating_pct, self.fcs_esc.esc4_power_rating_pct,
-                    self.fcs_esc.esc5_power_rating_pct, self.fcs_esc.esc6_power_rating_pct,
-                ]
-            }
-        
-        elif func_code == NCLINK_RECEIVE_EXTY_FCS_PARAM:
-            # 0x49: 飞控参数
-            try:
-                self.fcs_param = ExtY_FCS_PARAM_T.from_bytes(payload)
-                message['type'] = 'fcs_param'
-                message['data'] = self.fcs_param.to_json()
-            except Exception as e:
-                logger.warning(f"[协议解析] ExtY_FCS_PARAM_T解析失败，丢弃该帧: {e}")
-                self._reject_frame(
-                    'decode_error',
-                    func_code=func_code,
-                    port_type=port_type,
-                    frame_size=expected_frame_len,
-                    payload_size=data_len,
-                    details=str(e),
+                    details=f'{codec.struct_name} returned None',
                 )
                 return None
+            message['type'] = codec.msg_type
+            message['data'] = data
+            if codec.skip_recording:
+                # 当前链路保留功能字定义，但不再做字段解析或记录
+                logger.info('[协议解析] 收到0x%02X功能字，当前按保留功能字跳过字段解析与记录', func_code)
+                message['skip_recording'] = True
+            self.latest_messages[func_code] = message
 
-        elif func_code == NCLINK_RECEIVE_EXTY_FCS_ROOT:
-            # 0x4B: 当前链路保留功能字定义，但不再做字段解析或记录
-            logger.info('[协议解析] 收到0x4B功能字，当前按保留功能字跳过字段解析与记录')
-            message['type'] = 'fcs_root'
-            message['data'] = {}
-            message['skip_recording'] = True
-        
-        # ============ 规划系统数据包解析 (0x70-0x71) ============
-        elif func_code == NCLINK_GCS_TELEMETRY:
-            # 0x71: 规划系统遥测
-            try:
-                self.gcs_telemetry = GCSTelemetry_T.from_bytes(payload)
-                if self.gcs_telemetry:
-                    message['type'] = 'planning_telemetry'
-                    message['data'] = self.gcs_telemetry.to_json()
-                    logger.debug(f"[协议解析] 成功解析规划遥测数据 (0x71): {message['data']}")
-                else:
-                    self._reject_frame(
-                        'decode_error',
-                        func_code=func_code,
-                        port_type=port_type,
-                        frame_size=expected_frame_len,
-                        payload_size=data_len,
-                        details='GCSTelemetry_T returned None',
-                    )
-                    return None
-            except Exception as e:
-                logger.error(f"[协议解析] 解析规划遥测数据 (0x71) 时发生异常: {e}")
-                self._reject_frame(
-                    'decode_error',
-                    func_code=func_code,
-                    port_type=port_type,
-                    frame_size=expected_frame_len,
-                    payload_size=data_len,
-                    details=str(e),
-                )
-                return None
-        
         elif func_code == 0x00 and len(payload) == 0:
             message['type'] = 'heartbeat_ack'
             message['data'] = {}
@@ -2627,10 +1727,11 @@ class NCLinkProtocolParser:
             message['type'] = 'unknown'
             message['data'] = {
                 'hex_payload': payload.hex()[:32],
-                'length': len(payload)
+                'length': data_len
             }
 
-        self._emit_event('message_parsed', message=message)
+        if self.emit_parsed_events:
+            self._emit_event('message_parsed', message=message)
         
         return message
 
@@ -2646,7 +1747,8 @@ __all__ = [
     'ExtY_FCS_PWMS_T', 'ExtY_FCS_STATES_T', 'ExtY_FCS_DATACTRL_T',
     'ExtY_FCS_GNCBUS_T', 'ExtY_FCS_AVOIFLAG_T', 'ExtY_FCS_ESC_T',
     'ExtY_FCS_PARAM_T',
-    'GCSTelemetry_T', 'ExtY_FCS_LINESTRUC_ac_aim2AB_T', 'ExtY_FCS_LINESTRUC_acAB_T',
+    'GCSTelemetry_T', 'GCSTelemetryArrays', 'ExtY_FCS_LINESTRUC_ac_aim2AB_T', 'ExtY_FCS_LINESTRUC_acAB_T',
+    'TelemetryCodec', 'TELEMETRY_CODECS', 'get_telemetry_codec', 'DecodedMessage',
     'NCLinkFrame', 'encode_command_packet',
     'encode_takeoff_command', 'encode_land_command',
     'encode_hover_command', 'encode_rtl_command',
@@ -0,0 +1,130 @@
+"""
+原始 UDP 数据包采样追踪
+
+按端口保留最近 N 个原始 datagram（接收/发送方向、时间戳、对端地址、原始字节）的有界环形缓冲，
+用于现场排查链路问题，可经 /api/trace/packets 下载。
+关闭时调用方只读取一次 enabled 属性，不做任何编码或日志格式化。
+采样率与环大小可在运行时通过 /api/trace/config 修改。
+独立进程接收模式（process）下接收的 datagram 不经过主进程，只能追踪发送方向。
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from config import FIXED_PACKET_TRACE_ENABLED, FIXED_PACKET_TRACE_RING_SIZE, FIXED_PACKET_TRACE_SAMPLE_RATE
+
+MAX_RING_SIZE = 100000
+
+# (时间戳 s, 方向 rx/tx, 对端地址, 原始字节)
+TraceEntry = Tuple[float, str, Optional[Tuple[str, int]], bytes]
+
+
+class PacketTracer:
+    """按端口分组的原始数据包采样环（接收线程与事件循环均可写入）"""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        sample_rate: float = 1.0,
+        ring_size: int = 256,
+    ):
+        self.enabled = False
+        self.sample_rate = 1.0
+        self.ring_size = 256
+        self._rings: Dict[int, Deque[TraceEntry]] = {}
+        self._lock = threading.Lock()
+        self._credit = 0.0
+        self.captured_total = 0
+        self.configure(enabled=enabled, sample_rate=sample_rate, ring_size=ring_size)
+
+    def configure(
+        self,
+        enabled: Optional[bool] = None,
+        sample_rate: Optional[float] = None,
+        ring_size: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """修改追踪参数；修改环大小时保留各端口最近的记录"""
+        with self._lock:
+            if sample_rate is not None:
+                self.sample_rate = min(1.0, max(0.0, float(sample_rate)))
+                self._credit = 0.0
+            if ring_size is not None:
+                ring_size = min(MAX_RING_SIZE, max(1, int(ring_size)))
+                if ring_size != self.ring_size:
+                    self.ring_size = ring_size
+                    self._rings = {port: deque(ring, maxlen=ring_size) for port, ring in self._rings.items()}
+            if enabled is not None:
+                self.enabled = bool(enabled)
+        return self.get_config()
+
+    def get_config(self) -> Dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'sample_rate': self.sample_rate,
+            'ring_size': self.ring_size,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rings = {}
+            self.captured_total = 0
+
+    def record(self, direction: str, port: int, data: bytes, addr: Optional[Tuple[str, int]] = None) -> None:
+        """记录一个 datagram；调用方应先检查 enabled，关闭时不进入这里
+
+        采样率只作用于接收方向，发送的指令包频率低，全部记录。
+        """
+        rate = self.sample_rate
+        if rate < 1.0 and direction == 'rx':
+            # 累积采样额度，按比例均匀抽取，不依赖随机数
+            credit = self._credit + rate
+            if credit < 1.0:
+                self._credit = credit
+                return
+            self._credit = credit - 1.0
+
+        ring = self._rings.get(port)
+        if ring is None:
+            with self._lock:
+                ring = self._rings.setdefault(port, deque(maxlen=self.ring_size))
+        ring.append((time.time(), direction, addr, bytes(data)))
+        self.captured_total += 1
+
+    def snapshot(self, port: Optional[int] = None) -> Dict[str, Any]:
+        """导出当前环中的记录（十六进制编码），按时间排序"""
+        with self._lock:
+            rings = {key: list(ring) for key, ring in self._rings.items() if port is None or key == port}
+
+        ports: Dict[str, List[Dict[str, Any]]] = {}
+        for key, entries in sorted(rings.items()):
+            ports[str(key)] = [
+                {
+                    'timestamp': round(timestamp, 6),
+                    'direction': direction,
+                    'peer': f'{addr[0]}:{addr[1]}' if addr else None,
+                    'length': len(data),
+                    'hex': data.hex(),
+                }
+                for timestamp, direction, addr, data in sorted(entries, key=lambda entry: entry[0])
+            ]
+        return {
+            **self.get_config(),
+            'captured_total': self.captured_total,
+            'ports': ports,
+        }
+
+
+# 全局追踪器（UDPHandler 重建时保留已采集的记录与运行时配置）
+packet_tracer = PacketTracer(
+    enabled=FIXED_PACKET_TRACE_ENABLED,
+    sample_rate=FIXED_PACKET_TRACE_SAMPLE_RATE,
+    ring_size=FIXED_PACKET_TRACE_RING_SIZE,
+)
+
+
+__all__ = [
+    'PacketTracer',
+    'packet_tracer',
+]
@@ -7,13 +7,20 @@ import asyncio
 import logging
 import socket
 import time
-from typing import Optional, Callable, Any, Dict, List
+from typing import Optional, Callable, Any, Dict, List, Tuple
 
 from .nclink_protocol import (
     NCLINK_HEAD0, NCLINK_HEAD1, NCLINK_END0, NCLINK_END1,
     NCLinkProtocolParser,
     PortType,
 )
+from .data_age import data_age_tracker
+from .ingest_process import IngestProcess
+from .ingress_limit import HELD_RELEASE_INTERVAL_SEC, ingress_limiter
+from .link_quality import LinkQualityMonitor
+from .packet_trace import packet_tracer
+from .udp_receiver import IngestBatch, ShardMerger, UDPReceiverThread
+from recorder.raw_capture import RawCaptureWriter
 # 导入config模块：直接导入（main.py已将src-python添加到sys.path）
 from config import config, FIXED_COMMAND_SOURCE_PORT
 
@@ -29,57 +36,81 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class _WindowSlots:
+    """单个统计键的环形秒级槽位：下标 second % window，seconds 记录各槽位当前所属的秒"""
+    __slots__ = ('seconds', 'packets', 'payload_bytes', 'frame_bytes')
+
+    def __init__(self, window_seconds: int):
+        self.seconds = [-1] * window_seconds
+        self.packets = [0] * window_seconds
+        self.payload_bytes = [0] * window_seconds
+        self.frame_bytes = [0] * window_seconds
+
+    def add(self, index: int, second: int, packets: int, payload_bytes: int, frame_bytes: int) -> None:
+        if self.seconds[index] != second:
+            # 槽位上残留的是 window 秒之前的数据，直接覆盖
+            self.seconds[index] = second
+            self.packets[index] = packets
+            self.payload_bytes[index] = payload_bytes
+            self.frame_bytes[index] = frame_bytes
+            return
+        self.packets[index] += packets
+        self.payload_bytes[index] += payload_bytes
+        self.frame_bytes[index] += frame_bytes
+
+    def summarize(self, cutoff: int) -> Dict[str, int]:
+        packets = payload_bytes = frame_bytes = 0
+        for index, second in enumerate(self.seconds):
+            if second >= cutoff:
+                packets += self.packets[index]
+                payload_bytes += self.payload_bytes[index]
+                frame_bytes += self.frame_bytes[index]
+        return {'packets': packets, 'payload_bytes': payload_bytes, 'frame_bytes': frame_bytes}
+
+    def is_expired(self, cutoff: int) -> bool:
+        return max(self.seconds) < cutoff
+
+
 class _RollingTrafficWindow:
-    def __init__(self, window_seconds: int = 10):
+    """最近 window_seconds 秒的计数窗口：add 为 O(1)，snapshot 为 O(键数 × window)"""
+
+    def __init__(self, window_seconds: int = 10, clock: Callable[[], float] = time.monotonic):
         self.window_seconds = max(1, int(window_seconds))
-        self._overall: Dict[int, Dict[str, int]] = {}
-        self._by_key: Dict[str, Dict[int, Dict[str, int]]] = {}
+        self._clock = clock
+        self._overall = _WindowSlots(self.window_seconds)
+        self._by_key: Dict[str, _WindowSlots] = {}
 
     def add(self, key: Optional[str], payload_bytes: int, frame_bytes: int, packets: int = 1) -> None:
-        now_sec = int(time.monotonic())
-        self._add_bucket(self._overall, now_sec, packets, payload_bytes, frame_bytes)
+        now_sec = int(self._clock())
+        index = now_sec % self.window_seconds
+        if payload_bytes < 0:
+            payload_bytes = 0
+        if frame_bytes < 0:
+            frame_bytes = 0
+        self._overall.add(index, now_sec, packets, payload_bytes, frame_bytes)
         if key:
-            self._add_bucket(self._by_key.setdefault(key, {}), now_sec, packets, payload_bytes, frame_bytes)
-        self._prune(now_sec)
+            slots = self._by_key.get(key)
+            if slots is None:
+                slots = self._by_key[key] = _WindowSlots(self.window_seconds)
+            slots.add(index, now_sec, packets, payload_bytes, frame_bytes)
 
     def snapshot(self) -> Dict[str, Any]:
-        now_sec = int(time.monotonic())
-        self._prune(now_sec)
+        now_sec = int(self._clock())
         cutoff = now_sec - self.window_seconds + 1
         by_key: Dict[str, Dict[str, Any]] = {}
-        for key, buckets in sorted(self._by_key.items()):
-            summary = self._summarize(buckets, cutoff)
+        for key, slots in sorted(self._by_key.items()):
+            summary = slots.summarize(cutoff)
             if summary['packets'] > 0:
                 by_key[key] = self._build_rate_snapshot(summary)
+        # 整个窗口内没有数据的键随快照一并回收
+        for key in [key for key, slots in self._by_key.items() if slots.is_expired(cutoff)]:
+            del self._by_key[key]
         return {
             'window_seconds': self.window_seconds,
-            'overall': self._build_rate_snapshot(self._summarize(self._overall, cutoff)),
+            'overall': self._build_rate_snapshot(self._overall.summarize(cutoff)),
             'by_key': by_key,
         }
 
-    def _add_bucket(
-        self,
-        container: Dict[int, Dict[str, int]],
-        second_key: int,
-        packets: int,
-        payload_bytes: int,
-        frame_bytes: int,
-    ) -> None:
-        bucket = container.setdefault(second_key, {'packets': 0, 'payload_bytes': 0, 'frame_bytes': 0})
-        bucket['packets'] += int(packets)
-        bucket['payload_bytes'] += max(0, int(payload_bytes))
-        bucket['frame_bytes'] += max(0, int(frame_bytes))
-
-    def _summarize(self, buckets: Dict[int, Dict[str, int]], cutoff: int) -> Dict[str, int]:
-        summary = {'packets': 0, 'payload_bytes': 0, 'frame_bytes': 0}
-        for second_key, values in buckets.items():
-            if second_key < cutoff:
-                continue
-            summary['packets'] += values['packets']
-            summary['payload_bytes'] += values['payload_bytes']
-            summary['frame_bytes'] += values['frame_bytes']
-        return summary
-
     def _build_rate_snapshot(self, summary: Dict[str, int]) -> Dict[str, Any]:
         duration = float(self.window_seconds)
         return {
@@ -91,20 +122,6 @@ class _RollingTrafficWindow:
             'frame_kbps': round((summary['frame_bytes'] * 8.0) / 1000.0 / duration, 3),
         }
 
-    def _prune(self, now_sec: int) -> None:
-        cutoff = now_sec - self.window_seconds + 1
-        self._prune_bucket_map(self._overall, cutoff)
-        for key in list(self._by_key.keys()):
-            buckets = self._by_key[key]
-            self._prune_bucket_map(buckets, cutoff)
-            if not buckets:
-                del self._by_key[key]
-
-    @staticmethod
-    def _prune_bucket_map(buckets: Dict[int, Dict[str, int]], cutoff: int) -> None:
-        for second_key in [key for key in buckets.keys() if key < cutoff]:
-            del buckets[second_key]
-
 
 class RuntimeTrafficMonitor:
     def __init__(self, window_seconds: int = 10):
@@ -134,6 +151,14 @@ class RuntimeTrafficMonitor:
         self._bump_counter(self.rx_by_port, key, packets=1, payload_bytes=size)
         self._rx_window.add(key, size, size)
 
+    def record_rx_batch(self, local_port: int, packets: int, size: int) -> None:
+        """同一端口一批 datagram 合并计数（接收线程模式）"""
+        key = str(local_port)
+        self.rx_totals['packets'] += packets
+        self.rx_totals['payload_bytes'] += size
+        self._bump_counter(self.rx_by_port, key, packets=packets, payload_bytes=size)
+        self._rx_window.add(key, size, size, packets=packets)
+
     def record_tx_packet(self, source_port: Optional[int], target_host: str, target_port: int, size: int) -> None:
         self.tx_totals['packets'] += 1
         self.tx_totals['payload_bytes'] += size
@@ -153,15 +178,42 @@ class RuntimeTrafficMonitor:
         self._bump_counter(self.parsed_by_type, msg_type, packets=1, payload_bytes=payload_size, frame_bytes=frame_size)
         self._parsed_window.add(msg_type, payload_size, frame_size)
 
-    def record_parser_rejection(self, reason: str, frame_size: int = 0) -> None:
-        self.rejected_total += 1
-        self.rejected_by_reason[reason] = self.rejected_by_reason.get(reason, 0) + 1
-        self._reject_window.add(reason, 0, frame_size)
-
-    def record_parser_issue(self, reason: str, frame_size: int = 0) -> None:
-        self.issue_total += 1
-        self.issues_by_reason[reason] = self.issues_by_reason.get(reason, 0) + 1
-        self._issue_window.add(reason, 0, frame_size)
+    def record_parsed_batch(self, messages: List[dict]) -> None:
+        """按消息类型聚合一批解析结果后再计数，每种类型只更新一次计数器与滑动窗口"""
+        if not messages:
+            return
+        by_type: Dict[str, List[int]] = {}
+        for message in messages:
+            msg_type = str(message.get('type') or 'unknown')
+            payload_size = int(message.get('payload_size', 0) or 0)
+            frame_size = int(message.get('frame_size', payload_size) or payload_size)
+            counter = by_type.get(msg_type)
+            if counter is None:
+                by_type[msg_type] = [1, payload_size, frame_size]
+            else:
+                counter[0] += 1
+                counter[1] += payload_size
+                counter[2] += frame_size
+
+        for msg_type, (packets, payload_bytes, frame_bytes) in by_type.items():
+            self.parsed_totals['messages'] += packets
+            self.parsed_totals['payload_bytes'] += payload_bytes
+            self.parsed_totals['frame_bytes'] += frame_bytes
+            self._bump_counter(
+                self.parsed_by_type, msg_type,
+                packets=packets, payload_bytes=payload_bytes, frame_bytes=frame_bytes,
+            )
+            self._parsed_window.add(msg_type, payload_bytes, frame_bytes, packets=packets)
+
+    def record_parser_rejection(self, reason: str, frame_size: int = 0, count: int = 1) -> None:
+        self.rejected_total += count
+        self.rejected_by_reason[reason] = self.rejected_by_reason.get(reason, 0) + count
+        self._reject_window.add(reason, 0, frame_size, packets=count)
+
+    def record_parser_issue(self, reason: str, frame_size: int = 0, count: int = 1) -> None:
+        self.issue_total += count
+        self.issues_by_reason[reason] = self.issues_by_reason.get(reason, 0) + count
+        self._issue_window.add(reason, 0, frame_size, packets=count)
 
     def snapshot(self) -> Dict[str, Any]:
         return {
@@ -218,23 +270,58 @@ class RuntimeTrafficMonitor:
 # UDP协议处理器
 # ================================================================
 
+def _configure_receive_buffer(sock: socket.socket, port: int) -> None:
+    try:
+        # Increase the UDP receive buffer to reduce packet drops under sustained high-rate telemetry.
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        actual_size = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        logger.info(f"UDP端口 {port} 接收缓冲区已设置为 {actual_size} 字节")
+    except OSError as exc:
+        logger.warning(f"UDP端口 {port} 设置接收缓冲区失败: {exc}")
+
+
 class UDPHandler:
     """UDP数据包处理器（多端口支持）"""
     
-    def __init__(self, on_message: Optional[Callable[[dict], None]] = None):
+    def __init__(
+        self,
+        on_message: Optional[Callable[[dict], None]] = None,
+        on_messages: Optional[Callable[[List[dict]], None]] = None,
+    ):
         """
         初始化UDP处理器
         
         Args:
-            on_message: 消息回调函数
+            on_message: 消息回调函数（逐条调用）
+            on_messages: 批量消息回调函数；设置后同一 datagram 解析出的全部消息一次性交付，
+                优先于 on_message
         """
         self.on_message = on_message
+        self.on_messages = on_messages
         self._loop: Optional[asyncio.BaseEventLoop] = None
         
         # 多个UDP传输对象（每个端口一个）
         self._transports: Dict[int, asyncio.DatagramTransport] = {}
         self._protocols: Dict[int, NCLinkUDPServerProtocol] = {}
+        # 接收线程模式下的监听 socket 与接收线程
+        self._sockets: Dict[int, socket.socket] = {}
+        # 分片接收时每个分片一组 socket / 一个接收线程；_sockets 即第 0 组（兼作发送 socket）
+        self._shard_sockets: List[Dict[int, socket.socket]] = []
+        self._receivers: List[UDPReceiverThread] = []
+        self._merger: Optional[ShardMerger] = None
+        # 接收进程模式下的接收进程控制器（监听 socket 同样保存在 _sockets 中用于发送）
+        self._ingest_process: Optional[IngestProcess] = None
+        self.ingest_mode: str = 'asyncio'
         self.runtime_monitor = RuntimeTrafficMonitor()
+        self.link_quality = LinkQualityMonitor(self.runtime_monitor.window_seconds)
+        self.packet_tracer = packet_tracer
+        self.data_age = data_age_tracker
+        # 解析前的按端口/功能字令牌桶准入（见 protocol.ingress_limit）
+        self.ingress_limiter = ingress_limiter
+        self._held_release_handle: Optional[asyncio.TimerHandle] = None
+        # 录制期间的原始 datagram 抓包（见 recorder.raw_capture），未录制时为 None
+        self.raw_capture: Optional[RawCaptureWriter] = None
+        self._listen_host: Optional[str] = None
         
         # 从配置加载目标地址
         udp_config = config.get_udp_config()
@@ -243,8 +330,32 @@ class UDPHandler:
         
         logger.info(f"UDP处理器初始化完成 (目标: {self.target_host}:{self.target_port})")
     
+    @staticmethod
+    def _port_type_for(port: int) -> PortType:
+        """根据端口设置对应的端口类型"""
+        if port == 18504:
+            return PortType.PORT_18504_RECEIVE
+        if port == 18506:
+            return PortType.PORT_18506_TELEMETRY
+        if port == 18507:
+            return PortType.PORT_18507_LIDAR
+        if port == 18511:
+            return PortType.PORT_18511_PLANNING
+        if port == 30509:
+            # 当前实机主聚合接收口：飞控业务遥测与心跳回执统一从这里进入
+            return PortType.PORT_18506_TELEMETRY
+        return PortType.PORT_18504_RECEIVE
+
+    @staticmethod
+    def _log_port_role(listen_host: str, port: int) -> None:
+        if port == 30509:
+            logger.info(f"[OK] 已确认 {listen_host}:{port} 为当前实机主聚合接收口")
+        elif port == 18506:
+            logger.info(f"[OK] 已确认 {listen_host}:{port} 仅保留为飞控遥测兼容降级监听口")
+
     async def start_server(self, host: Optional[str] = None, ports: Optional[list] = None,
-                         target_host: Optional[str] = None, target_port: Optional[int] = None):
+                         target_host: Optional[str] = None, target_port: Optional[int] = None,
+                         ingest_mode: Optional[str] = None, receive_shards: Optional[int] = None):
         """启动UDP服务器
         
         Args:
@@ -252,6 +363,8 @@ class UDPHandler:
             ports: 端口列表（默认从配置读取或使用单端口模式）
             target_host: 目标主机地址（可选，设置发送目标）
             target_port: 目标端口（可选，设置发送目标）
+            ingest_mode: 接收模式 asyncio / thread / process（默认从配置读取）
+            receive_shards: thread 模式下每个端口的 SO_REUSEPORT 分片数（默认从配置读取）
         """
         try:
             # 如果提供了目标地址，更新目标
@@ -263,46 +376,24 @@ class UDPHandler:
             # 从配置或参数获取监听端口
             udp_config = config.get_udp_config()
             listen_host = host or udp_config.listen_host
+            self._listen_host = listen_host
             
             # 如果未指定端口列表，使用配置中的监听端口
             if ports is None:
                 # 使用配置中的listen_ports，如果不存在则使用默认值
                 ports = getattr(udp_config, 'listen_ports', [30509, 18511, 18507, 18506])
-            
-            logger.info(f"监听地址: {listen_host}, 端口列表: {ports}")
-            
-            for port in ports:
-                # 为每个端口创建一个独立的UDP端点
-                transport, protocol = await self._loop.create_datagram_endpoint(
-                    lambda p=port: NCLinkUDPServerProtocol(self, p),
-                    local_addr=(listen_host, port)
-                )
-                
-                self._transports[port] = transport
-                self._protocols[port] = protocol
-                
-                # 根据端口设置对应的端口类型
-                if port == 18504:
-                    port_type = PortType.PORT_18504_RECEIVE
-                elif port == 18506:
-                    port_type = PortType.PORT_18506_TELEMETRY
-                elif port == 18507:
-                    port_type = PortType.PORT_18507_LIDAR
-                elif port == 18511:
-                    port_type = PortType.PORT_18511_PLANNING
-                elif port == 30509:
-                    # 当前实机主聚合接收口：飞控业务遥测与心跳回执统一从这里进入
-                    port_type = PortType.PORT_18506_TELEMETRY
-                else:
-                    port_type = PortType.PORT_18504_RECEIVE
-                
-                protocol.set_port_type(port_type)
-                logger.info(f"[OK] UDP监听器已启动: {listen_host}:{port} (类型: {port_type.name})")
 
-                if port == 30509:
-                    logger.info(f"[OK] 已确认 {listen_host}:{port} 为当前实机主聚合接收口")
-                elif port == 18506:
-                    logger.info(f"[OK] 已确认 {listen_host}:{port} 仅保留为飞控遥测兼容降级监听口")
+            self.ingest_mode = ingest_mode or getattr(udp_config, 'ingest_mode', 'asyncio')
+            
+            logger.info(f"监听地址: {listen_host}, 端口列表: {ports}, 接收模式: {self.ingest_mode}")
+
+            if self.ingest_mode == 'thread':
+                shards = receive_shards or getattr(udp_config, 'receive_shards', 1)
+                self._start_receiver_threads(listen_host, ports, shards)
+            elif self.ingest_mode == 'process':
+                self._start_ingest_process(listen_host, ports, getattr(udp_config, 'ingest_ring_slots', 1024))
+            else:
+                await self._start_datagram_endpoints(listen_host, ports)
             
             logger.info(f"[OK] 所有UDP服务器已启动，共监听 {len(ports)} 个端口")
             logger.info(f"→ 将发送指令到: {self.target_host}:{self.target_port}")
@@ -310,14 +401,143 @@ class UDPHandler:
         except Exception as e:
             logger.error(f"[ERR] 启动UDP服务器失败: {e}")
             raise
+
+    async def _start_datagram_endpoints(self, listen_host: str, ports: list) -> None:
+        for port in ports:
+            # 为每个端口创建一个独立的UDP端点
+            transport, protocol = await self._loop.create_datagram_endpoint(
+                lambda p=port: NCLinkUDPServerProtocol(self, p),
+                local_addr=(listen_host, port)
+            )
+            
+            self._transports[port] = transport
+            self._protocols[port] = protocol
+            
+            port_type = self._port_type_for(port)
+            protocol.set_port_type(port_type)
+            logger.info(f"[OK] UDP监听器已启动: {listen_host}:{port} (类型: {port_type.name})")
+            self._log_port_role(listen_host, port)
+
+    def _bind_sockets(
+        self, listen_host: str, ports: list, role: str, reuse_port: bool = False,
+    ) -> Tuple[Dict[int, socket.socket], Dict[int, PortType]]:
+        sockets: Dict[int, socket.socket] = {}
+        port_types: Dict[int, PortType] = {}
+        try:
+            for port in ports:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                sockets[port] = sock
+                if reuse_port:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+                _configure_receive_buffer(sock, port)
+                sock.bind((listen_host, port))
+                port_types[port] = self._port_type_for(port)
+                logger.info(f"[OK] UDP监听器已启动: {listen_host}:{port} (类型: {port_types[port].name}, {role})")
+                self._log_port_role(listen_host, port)
+        except OSError:
+            for sock in sockets.values():
+                sock.close()
+            raise
+        return sockets, port_types
+
+    def _start_receiver_threads(self, listen_host: str, ports: list, shards: int = 1) -> None:
+        shards = max(1, int(shards))
+        if shards > 1 and not hasattr(socket, 'SO_REUSEPORT'):
+            logger.warning(f"当前平台不支持 SO_REUSEPORT，接收分片数 {shards} 回退为 1")
+            shards = 1
+
+        try:
+            for index in range(shards):
+                role = '接收线程' if shards == 1 else f'接收分片 {index + 1}/{shards}'
+                sockets, port_types = self._bind_sockets(listen_host, ports, role, reuse_port=shards > 1)
+                if index == 0:
+                    self._sockets = sockets
+                else:
+                    self._shard_sockets.append(sockets)
+        except OSError:
+            self._close_sockets()
+            raise
+
+        on_batch = self._handle_ingest_batch
+        if shards > 1:
+            # 多个线程的批次先按到达时间归并，再进入统一的分发路径
+            self._merger = ShardMerger(self._loop, self._handle_ingest_batch)
+            on_batch = self._merger.add
+
+        for index, sockets in enumerate([self._sockets] + self._shard_sockets):
+            name = 'nclink-udp-receiver' if shards == 1 else f'nclink-udp-receiver-{index}'
+            receiver = UDPReceiverThread(
+                self._loop, sockets, port_types, on_batch, name=name, tracer=self.packet_tracer,
+                limiter=self.ingress_limiter,
+            )
+            receiver.capture = self.raw_capture
+            self._receivers.append(receiver)
+            receiver.start()
+
+    def _start_ingest_process(self, listen_host: str, ports: list, slot_count: int) -> None:
+        self._sockets, port_types = self._bind_sockets(listen_host, ports, '接收进程')
+        self._ingest_process = IngestProcess(
+            self._loop, self._sockets, port_types, self._handle_ingest_batch, slot_count=slot_count,
+            ingress_config=self.ingress_limiter.export_config(),
+        )
+        try:
+            self._ingest_process.start()
+        except Exception:
+            self._ingest_process.stop()
+            self._ingest_process = None
+            self._close_sockets()
+            raise
+
+    def _handle_ingest_batch(self, batch: IngestBatch) -> None:
+        """在事件循环中处理接收线程投递的一批结果：统计一次、分发一次"""
+        monitor = self.runtime_monitor
+        for port, packets, size in batch.rx_by_port:
+            monitor.record_rx_batch(port, packets, size)
+        for reason, frame_size, count in batch.rejections:
+            monitor.record_parser_rejection(reason, frame_size, count)
+        for reason, frame_size, count in batch.issues:
+            monitor.record_parser_issue(reason, frame_size, count)
+        if batch.socket_delays:
+            self.data_age.record_ages('socket', batch.socket_delays)
+        if batch.messages:
+            self.data_age.record_messages('dispatch', batch.messages)
+            monitor.record_parsed_batch(batch.messages)
+            self.link_quality.record_messages(batch.messages)
+            try:
+                self.dispatch_messages(batch.messages)
+            except Exception as e:
+                logger.error(f"分发UDP消息批次失败: {e}")
+
+    def _close_sockets(self) -> None:
+        for sockets in [self._sockets] + self._shard_sockets:
+            for port, sock in sockets.items():
+                try:
+                    sock.close()
+                    logger.info(f"UDP端口 {port} 已关闭")
+                except OSError as e:
+                    logger.error(f"关闭UDP端口 {port} 失败: {e}")
+        self._sockets = {}
+        self._shard_sockets = []
     
     def is_running(self):
         """检查UDP服务器是否正在运行"""
-        return len(self._transports) > 0
+        return len(self._transports) > 0 or len(self._sockets) > 0
     
     async def stop_server(self):
         """停止所有UDP服务器"""
-        logger.info(f"停止UDP服务器，当前运行的端口数量: {len(self._transports)}")
+        logger.info(f"停止UDP服务器，当前运行的端口数量: {len(self._transports) + len(self._sockets)}")
+
+        for receiver in self._receivers:
+            await asyncio.to_thread(receiver.stop)
+        self._receivers = []
+        if self._merger is not None:
+            self._merger.close()
+            self._merger = None
+        if self._ingest_process is not None:
+            self._ingest_process.cancel_polling()
+            await asyncio.to_thread(self._ingest_process.stop)
+            self._ingest_process = None
+        self._close_sockets()
         
         for port, transport in self._transports.items():
             try:
@@ -328,6 +548,9 @@ class UDPHandler:
         
         self._transports.clear()
         self._protocols.clear()
+        if self._held_release_handle is not None:
+            self._held_release_handle.cancel()
+            self._held_release_handle = None
         logger.info("所有UDP服务器已停止")
     
     def set_target(self, host: str, port: int):
@@ -352,30 +575,32 @@ class UDPHandler:
         host = target_host or self.target_host
         port = target_port or self.target_port
 
-        if not self._transports:
+        senders = self._transports or self._sockets
+        if not senders:
             logger.error(f"没有可用的UDP transport，无法发送数据到 {host}:{port}")
             return False
         
         try:
-            transport = self._transports.get(FIXED_COMMAND_SOURCE_PORT)
-            if transport is None:
+            sender = senders.get(FIXED_COMMAND_SOURCE_PORT)
+            if sender is None:
                 listen_port = config.get_udp_config().listen_port
-                transport = self._transports.get(listen_port)
-            if transport is None:
-                transport = next(iter(self._transports.values()))
-
-            transport.sendto(data, (host, port))
-            sockname = transport.get_extra_info('sockname')
+                sender = senders.get(listen_port)
+            if sender is None:
+                sender = next(iter(senders.values()))
+
+            # 接收线程模式直接用监听 socket 发送（socket.sendto 可跨线程调用）
+            sender.sendto(data, (host, port))
+            if isinstance(sender, socket.socket):
+                sockname = sender.getsockname()
+            else:
+                sockname = sender.get_extra_info('sockname')
             source_port = sockname[1] if isinstance(sockname, tuple) and len(sockname) > 1 else None
             self.runtime_monitor.record_tx_packet(source_port, host, port, len(data))
+            if self.packet_tracer.enabled:
+                self.packet_tracer.record('tx', source_port or 0, data, (host, port))
+            if self.raw_capture is not None:
+                self.raw_capture.write(source_port or 0, data, (host, port), direction='tx')
             logger.info(f"已发送 {len(data)} 字节到 {host}:{port}")
-
-            # 打印数据包头部用于调试（兼容Python 3.7）
-            if len(data) >= 10:
-                import binascii
-                hex_bytes = binascii.hexlify(data[:10]).decode('ascii')
-                hex_preview = ' '.join([hex_bytes[i:i+2] for i in range(0, len(hex_bytes), 2)])
-                logger.debug(f"发送数据预览: {hex_preview}")
             return True
                 
         except Exception as e:
@@ -397,19 +622,124 @@ class UDPHandler:
             logger.error(f"处理UDP数据异常: {e}")
 
     def dispatch_messages(self, messages: List[dict]) -> None:
-        """分发已解析消息。"""
-        if not self.on_message or not messages:
+        """分发已解析消息：有批量回调时整批交付一次，否则逐条回调。"""
+        if not messages:
+            return
+
+        if self.on_messages:
+            self.on_messages(messages)
+            return
+
+        if not self.on_message:
             return
 
         for message in messages:
             self.on_message(message)
 
+    def start_raw_capture(self, path: str) -> RawCaptureWriter:
+        """开始把收发的原始 datagram 追加写入抓包文件（录制开始时调用）
+
+        process 接收模式下抓包文件由接收进程写入，发送方向的记录经队列转交（见 ingest_process.WorkerCapture）。
+        """
+        previous = self._attach_raw_capture(None)
+        if previous is not None:
+            logger.warning(f"已有进行中的原始抓包，先结束: {previous.path}")
+            previous.stop()
+        local_host = self._listen_host or config.get_udp_config().listen_host
+        if self._ingest_process is not None:
+            writer = self._ingest_process.start_capture(path, local_host)
+        else:
+            writer = RawCaptureWriter(path, local_host=local_host)
+            writer.start()
+        self._attach_raw_capture(writer)
+        return writer
+
+    async def stop_raw_capture(self) -> Optional[Dict[str, Any]]:
+        """结束原始抓包并写完剩余记录，返回抓包统计"""
+        writer = self._attach_raw_capture(None)
+        if writer is None:
+            return None
+        await asyncio.to_thread(writer.stop)
+        return writer.snapshot()
+
+    def _attach_raw_capture(self, writer: Optional[RawCaptureWriter]) -> Optional[RawCaptureWriter]:
+        previous = self.raw_capture
+        self.raw_capture = writer
+        for receiver in self._receivers:
+            receiver.capture = writer
+        return previous
+
+    def configure_ingress_limits(self, **kwargs) -> Dict[str, Any]:
+        """修改入口限流参数（见 IngressLimiter.configure），process 模式下同步到接收进程"""
+        config_data = self.ingress_limiter.configure(**kwargs)
+        if self._ingest_process is not None:
+            self._ingest_process.configure_ingress(
+                self.ingress_limiter.export_config(), clear=bool(kwargs.get('clear')),
+            )
+        return config_data
+
+    def get_ingress_stats(self) -> Dict[str, Any]:
+        """入口限流配置与丢弃计数；process 模式下计数来自接收进程"""
+        if self._ingest_process is not None:
+            worker_stats = self._ingest_process.snapshot()['worker'].get('ingress')
+            if worker_stats:
+                return worker_stats
+        return self.ingress_limiter.snapshot()
+
+    def _schedule_held_release(self) -> None:
+        """asyncio 接收模式：有暂存的最新值时定时检查令牌并补发"""
+        if self._held_release_handle is None and self._loop is not None:
+            self._held_release_handle = self._loop.call_later(HELD_RELEASE_INTERVAL_SEC, self._release_held)
+
+    def _release_held(self) -> None:
+        self._held_release_handle = None
+        limiter = self.ingress_limiter
+        for port, (data, arrival_ns, timestamp) in limiter.release_held(self._protocols):
+            protocol = self._protocols.get(port)
+            if protocol is not None:
+                # 保留原到达时刻，数据时延如实反映限流等待（与 thread / process 模式一致）
+                protocol.process_datagram(data, arrival_ns, timestamp)
+        if limiter.enabled and limiter.holds() and self._protocols:
+            self._schedule_held_release()
+
     def get_runtime_stats(self) -> Dict[str, Any]:
         stats = self.runtime_monitor.snapshot()
         stats['is_running'] = self.is_running()
-        stats['listening_ports'] = sorted(self._transports.keys())
+        stats['listening_ports'] = sorted(list(self._transports.keys()) + list(self._sockets.keys()))
+        stats['ingest_mode'] = self.ingest_mode
+        stats['link_quality'] = self.link_quality.snapshot()
+        stats['ingress'] = self.get_ingress_stats()
+        if self._receivers:
+            stats['receiver_threads'] = [receiver.snapshot() for receiver in self._receivers]
+        if self._merger is not None:
+            stats['shard_merger'] = self._merger.snapshot()
+        if self._ingest_process is not None:
+            stats['ingest_process'] = self._ingest_process.snapshot()
+        if self.raw_capture is not None:
+            stats['raw_capture'] = self.raw_capture.snapshot()
         return stats
 
+    def get_ingest_status(self) -> Dict[str, Any]:
+        """接收通路健康状态：接收模式、接收线程/进程存活情况与环形缓冲占用/溢出"""
+        status: Dict[str, Any] = {'mode': self.ingest_mode, 'running': self.is_running()}
+        if self._receivers:
+            status['receiver_alive'] = all(receiver.is_alive() for receiver in self._receivers)
+            status['receive_shards'] = len(self._receivers)
+        if self._ingest_process is not None:
+            snapshot = self._ingest_process.snapshot()
+            ring = snapshot.get('ring') or {}
+            status['receiver_alive'] = snapshot['alive']
+            status['feed_errors'] = snapshot['worker'].get('feed_errors', 0)
+            status['ring'] = {
+                'max_occupancy': ring.get('max_occupancy', 0.0),
+                'overruns_total': ring.get('overruns_total', 0),
+                'lanes': {
+                    key: {'occupancy': lane['occupancy'], 'overruns': lane['overruns']}
+                    for key, lane in (ring.get('lanes') or {}).items()
+                },
+            }
+        return status
+
 
 # ================================================================
 # UDP服务器协议（异步IO）
@@ -425,7 +755,10 @@ class NCLinkUDPServerProtocol(asyncio.DatagramProtocol):
         self.port_type = PortType.PORT_18504_RECEIVE
         self.loop = asyncio.get_event_loop()
         # UDP 端口之间不能共享帧缓冲状态，避免多端口数据交叉污染。
-        self.parser = NCLinkProtocolParser(on_event=self._handle_parser_event)
+        # 解析计数按 datagram 批量统计（见 datagram_received），不再逐帧回调 message_parsed。
+        self.parser = NCLinkProtocolParser(
+            on_event=self._handle_parser_event, emit_parsed_events=False, local_port=port,
+        )
     
     def set_port_type(self, port_type: PortType):
         """设置端口类型"""
@@ -436,30 +769,38 @@ class NCLinkUDPServerProtocol(asyncio.DatagramProtocol):
         self.transport = transport
         sock = transport.get_extra_info('socket')
         if sock is not None:
-            try:
-                # Increase the UDP receive buffer to reduce packet drops under sustained high-rate telemetry.
-                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
-                actual_size = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
-                logger.info(f"UDP端口 {self.port} 接收缓冲区已设置为 {actual_size} 字节")
-            except OSError as exc:
-                logger.warning(f"UDP端口 {self.port} 设置接收缓冲区失败: {exc}")
+            _configure_receive_buffer(sock, self.port)
         logger.info(f"UDP端口 {self.port} 连接已建立 (类型: {self.port_type.name})")
     
     def datagram_received(self, data: bytes, addr):
         """收到UDP数据包的回调"""
-        logger.debug(f"[端口{self.port}] 收到来自 {addr} 的数据，长度: {len(data)}")
-        self.handler.runtime_monitor.record_rx_datagram(self.port, len(data))
-
-        # 打印前10字节用于调试（兼容Python 3.7）
-        import binascii
-        preview_data = data[:10] if len(data) >= 10 else data
-        hex_preview = binascii.hexlify(preview_data).decode('ascii')
-        hex_preview = ' '.join([hex_preview[i:i+2] for i in range(0, len(hex_preview), 2)])
-        logger.debug(f"[端口{self.port}] 数据预览: {hex_preview}")
-        
+        # DatagramProtocol 拿不到内核时间戳，到达时刻取回调进入时刻
+        arrival_ns = time.monotonic_ns()
+        timestamp = time.time_ns() // 1_000_000
+        handler = self.handler
+        handler.runtime_monitor.record_rx_datagram(self.port, len(data))
+        # 原始数据包仅在开启追踪时采样保存（见 protocol.packet_trace）
+        if handler.packet_tracer.enabled:
+            handler.packet_tracer.record('rx', self.port, data, addr)
+        if handler.raw_capture is not None:
+            handler.raw_capture.write(self.port, data, addr)
+        limiter = handler.ingress_limiter
+        if limiter.enabled and not limiter.admit(self.port, data, (data, arrival_ns, timestamp)):
+            if limiter.holds():
+                handler._schedule_held_release()
+            return
+        self.process_datagram(data, arrival_ns, timestamp)
+
+    def process_datagram(self, data: bytes, arrival_ns: Optional[int] = None, timestamp: Optional[int] = None) -> None:
+        """解析一个已准入的 datagram 并分发；arrival_ns / timestamp 为 datagram 到达时刻（缺省取当前时刻）"""
+        handler = self.handler
         try:
-            messages = self.parser.feed_data(data, self.port_type)
-            self.handler.dispatch_messages(messages)
+            messages = self.parser.feed_data(data, self.port_type, arrival_ns, timestamp)
+            if messages:
+                handler.data_age.record_messages('dispatch', messages)
+                handler.runtime_monitor.record_parsed_batch(messages)
+                handler.link_quality.record_messages(messages, self.port)
+                handler.dispatch_messages(messages)
         except Exception as e:
             logger.error(f"[端口{self.port}] 处理UDP数据包失败: {e}")
 
@@ -0,0 +1,304 @@
+"""
+共享内存环形缓冲（独立进程接收模式）
+
+接收进程把每个已校验的 NCLink 帧载荷写入 multiprocessing.shared_memory 中的定长槽位，
+每个功能字一条 lane（单写单读），未登记的功能字（心跳、未知帧等）共用一条 lane。
+主进程轮询读出（各 lane 轮转起点、平分单轮额度），再经 NCLinkProtocolParser.build_message 还原为消息。
+
+内存布局（小端）：
+    [lane 0 写序号 u64 | 填充至 64 字节] [lane 0 槽位 × slot_count] [lane 1 ...] ...
+    槽位 = 槽头 SLOT_HEADER + 载荷区（capacity 字节，按 8 字节对齐）
+
+写入方不等待读取方：lane 写满后覆盖最旧的槽位，读取方据写序号差值与槽位序号
+识别被覆盖的记录并计入 overruns（遥测只关心最新值，宁丢旧帧也不阻塞接收）。
+槽位写入顺序为 “序号置 0 -> 写槽头与载荷 -> 写槽位序号 -> 写 lane 写序号”，
+读取方在复制前后各检查一次槽位序号，读到被覆盖中的槽位时按 overrun 丢弃。
+"""
+
+import struct
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .nclink_protocol import BUFFER_SIZE_MAX, NCLINK_GCS_TELEMETRY, STRICT_PAYLOAD_SIZES
+
+# 槽头（40 字节）：槽位序号, 接收时间戳(ms), 到达时刻(monotonic ns), 原始载荷长度, 存储长度,
+# 功能码, 端口类型, 接收端口, 填充
+SLOT_HEADER = struct.Struct('<QqqIIBBH4x')
+_SEQ = struct.Struct('<Q')
+LANE_HEADER_SIZE = 64
+
+# 未登记功能字共用的 lane 标识
+OTHER_LANE = -1
+
+DEFAULT_SLOT_COUNT = 1024
+OTHER_SLOT_COUNT = 256
+OTHER_SLOT_CAPACITY = 256
+
+
+@dataclass(frozen=True)
+class RingLaneSpec:
+    """单条 lane：功能字、单槽载荷容量、槽位数"""
+    func_code: int
+    capacity: int
+    slot_count: int
+
+    @property
+    def slot_stride(self) -> int:
+        return SLOT_HEADER.size + ((self.capacity + 7) & ~7)
+
+    @property
+    def size(self) -> int:
+        return LANE_HEADER_SIZE + self.slot_stride * self.slot_count
+
+
+def default_lane_specs(slot_count: int = DEFAULT_SLOT_COUNT) -> Tuple[RingLaneSpec, ...]:
+    """定长遥测每个功能字一条 lane；0x71 按最大帧长预留；其余功能字共用一条小槽 lane"""
+    specs = [
+        RingLaneSpec(func_code, size, slot_count)
+        for func_code, size in sorted(STRICT_PAYLOAD_SIZES.items())
+    ]
+    # 0x71 单槽按最大帧长预留，槽位数取定长 lane 的 1/8 控制共享内存体积（默认 128 × 16KB）
+    specs.append(RingLaneSpec(NCLINK_GCS_TELEMETRY, BUFFER_SIZE_MAX, max(16, slot_count // 8)))
+    specs.append(RingLaneSpec(OTHER_LANE, OTHER_SLOT_CAPACITY, OTHER_SLOT_COUNT))
+    return tuple(specs)
+
+
+def ring_size(specs: Sequence[RingLaneSpec]) -> int:
+    return sum(spec.size for spec in specs)
+
+
+@dataclass
+class RingRecord:
+    """从环形缓冲读出的一条记录"""
+    func_code: int
+    port_type: int
+    timestamp: int
+    payload_size: int
+    payload: bytes
+    arrival_ns: int = 0
+    local_port: int = 0
+
+
+class _Lane:
+    __slots__ = ('spec', 'offset', 'read_seq', 'overruns', 'truncated', 'write_seq_local')
+
+    def __init__(self, spec: RingLaneSpec, offset: int):
+        self.spec = spec
+        self.offset = offset
+        self.read_seq = 0
+        self.overruns = 0
+        self.truncated = 0
+        # 写入方本地维护的写序号，避免每次写入都回读共享内存
+        self.write_seq_local = 0
+
+    def slot_offset(self, seq: int) -> int:
+        return self.offset + LANE_HEADER_SIZE + (seq % self.spec.slot_count) * self.spec.slot_stride
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """附加到已有共享内存
+
+    附加方不负责回收：3.13+ 以 track=False 附加；更早版本由 spawn 子进程与父进程共用
+    同一个 resource_tracker，重复登记不会产生第二份记录，父进程 unlink 时一并注销。
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedMemoryRing:
+    """按功能字分 lane 的共享内存环形缓冲（每条 lane 单写单读）"""
+
+    def __init__(self, specs: Sequence[RingLaneSpec], shm: shared_memory.SharedMemory, owner: bool):
+        self.specs = tuple(specs)
+        self.shm = shm
+        self.owner = owner
+        self._buf = shm.buf
+        self._lanes: Dict[int, _Lane] = {}
+        offset = 0
+        for spec in self.specs:
+            self._lanes[spec.func_code] = _Lane(spec, offset)
+            offset += spec.size
+        self._other = self._lanes.get(OTHER_LANE)
+        # 读取方轮转起点
+        self._order: List[_Lane] = list(self._lanes.values())
+        self._next_lane = 0
+
+    @classmethod
+    def create(cls, specs: Optional[Sequence[RingLaneSpec]] = None, name: Optional[str] = None) -> 'SharedMemoryRing':
+        specs = tuple(specs or default_lane_specs())
+        shm = shared_memory.SharedMemory(name=name, create=True, size=ring_size(specs))
+        shm.buf[:shm.size] = bytes(shm.size)
+        return cls(specs, shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, specs: Sequence[RingLaneSpec]) -> 'SharedMemoryRing':
+        return cls(specs, _attach_shared_memory(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self) -> None:
+        self._buf = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    # ------------------------------------------------------------
+    # 写入方（接收进程）
+    # ------------------------------------------------------------
+
+    def write(
+        self,
+        func_code: int,
+        payload,
+        timestamp: int,
+        port_type: int,
+        payload_size: Optional[int] = None,
+        arrival_ns: int = 0,
+        local_port: int = 0,
+    ) -> bool:
+        """写入一条记录；载荷超出槽位容量时截断存储并返回 False
+
+        arrival_ns 为 time.monotonic_ns 时基，CLOCK_MONOTONIC 在同一主机的进程间一致，主进程可直接使用。
+        """
+        lane = self._lanes.get(func_code) or self._other
+        if lane is None:
+            return False
+        buf = self._buf
+        capacity = lane.spec.capacity
+        size = len(payload)
+        stored = size if size <= capacity else capacity
+
+        seq = lane.write_seq_local + 1
+        slot = lane.slot_offset(seq)
+        _SEQ.pack_into(buf, slot, 0)
+        SLOT_HEADER.pack_into(
+            buf, slot, 0, timestamp, arrival_ns,
+            size if payload_size is None else payload_size,
+            stored, func_code, int(port_type), local_port,
+        )
+        data_start = slot + SLOT_HEADER.size
+        buf[data_start:data_start + stored] = payload[:stored]
+        _SEQ.pack_into(buf, slot, seq)
+        _SEQ.pack_into(buf, lane.offset, seq)
+        lane.write_seq_local = seq
+        if stored < size:
+            lane.truncated += 1
+            return False
+        return True
+
+    # ------------------------------------------------------------
+    # 读取方（主进程）
+    # ------------------------------------------------------------
+
+    def read_available(self, max_records: int = 4096) -> List[RingRecord]:
+        """读出尚未消费的记录，最多 max_records 条（按 lane 分组依次拼接）"""
+        return [record for records in self.read_lanes(max_records) for record in records]
+
+    def read_lanes(self, max_records: int = 4096) -> List[List[RingRecord]]:
+        """按 lane 分组读出尚未消费的记录，合计最多 max_records 条
+
+        每次调用从下一条 lane 开始轮转：先给每条有积压的 lane 平分 max_records，
+        剩余额度再按同一顺序补给仍有积压的 lane，避免固定顺序下排在后面的 lane 持续饿死。
+        各组内按写入顺序排列，跨 lane 的先后由调用方按 arrival_ns 归并。
+        """
+        buf = self._buf
+        order = self._order
+        start = self._next_lane
+        self._next_lane = (start + 1) % len(order)
+
+        pending: List[Tuple[_Lane, int, List[RingRecord]]] = []
+        for lane in order[start:] + order[:start]:
+            write_seq = _SEQ.unpack_from(buf, lane.offset)[0]
+            if write_seq > lane.read_seq:
+                pending.append((lane, write_seq, []))
+        if not pending:
+            return []
+
+        share = max(1, max_records // len(pending))
+        total = 0
+        for lane, write_seq, records in pending:
+            if total >= max_records:
+                break
+            total += self._read_lane(lane, write_seq, min(share, max_records - total), records)
+        for lane, write_seq, records in pending:
+            if total >= max_records:
+                break
+            if lane.read_seq < write_seq:
+                total += self._read_lane(lane, write_seq, max_records - total, records)
+        return [records for _, _, records in pending if records]
+
+    def _read_lane(self, lane: _Lane, write_seq: int, limit: int, records: List[RingRecord]) -> int:
+        """从单条 lane 读出至多 limit 条记录（不超过 write_seq），返回追加的条数"""
+        buf = self._buf
+        read_seq = lane.read_seq
+        oldest = write_seq - lane.spec.slot_count + 1
+        if read_seq + 1 < oldest:
+            lane.overruns += oldest - read_seq - 1
+            read_seq = oldest - 1
+
+        end_seq = min(write_seq, read_seq + limit)
+        before = len(records)
+        for seq in range(read_seq + 1, end_seq + 1):
+            slot = lane.slot_offset(seq)
+            (slot_seq, timestamp, arrival_ns, payload_size, stored,
+             func_code, port_type, local_port) = SLOT_HEADER.unpack_from(buf, slot)
+            data_start = slot + SLOT_HEADER.size
+            payload = bytes(buf[data_start:data_start + stored])
+            # 复制期间被写入方覆盖则丢弃
+            if slot_seq != seq or _SEQ.unpack_from(buf, slot)[0] != seq:
+                lane.overruns += 1
+                continue
+            records.append(RingRecord(func_code, port_type, timestamp, payload_size, payload, arrival_ns, local_port))
+        lane.read_seq = end_seq
+        return len(records) - before
+
+    def snapshot(self) -> Dict[str, object]:
+        """各 lane 的写入量、积压占用率与溢出计数（读取方视角）
+
+        overruns 含已被写入方覆盖、但读取方尚未跳过的记录（pending_overruns），
+        读取方落后时 /health 不必等到下次读取才看到溢出。
+        """
+        buf = self._buf
+        lanes = {}
+        total_overruns = 0
+        for func_code, lane in self._lanes.items():
+            write_seq = _SEQ.unpack_from(buf, lane.offset)[0] if buf is not None else 0
+            backlog = max(0, min(write_seq - lane.read_seq, lane.spec.slot_count))
+            pending_overruns = max(0, write_seq - lane.read_seq - lane.spec.slot_count)
+            overruns = lane.overruns + pending_overruns
+            key = 'other' if func_code == OTHER_LANE else f'0x{func_code:02X}'
+            lanes[key] = {
+                'slot_count': lane.spec.slot_count,
+                'slot_capacity': lane.spec.capacity,
+                'written': write_seq,
+                'backlog': backlog,
+                'occupancy': round(backlog / lane.spec.slot_count, 4),
+                'overruns': overruns,
+                'pending_overruns': pending_overruns,
+            }
+            total_overruns += overruns
+        return {
+            'name': self.shm.name,
+            'size_bytes': self.shm.size,
+            'overruns_total': total_overruns,
+            'max_occupancy': max((item['occupancy'] for item in lanes.values()), default=0.0),
+            'lanes': lanes,
+        }
+
+
+__all__ = [
+    'OTHER_LANE',
+    'RingLaneSpec',
+    'RingRecord',
+    'SharedMemoryRing',
+    'default_lane_specs',
+    'ring_size',
+]
@@ -0,0 +1,129 @@
+"""
+NCLink 遥测结构体的 numpy 结构化 dtype
+
+与 nclink_protocol 中各 ExtY_FCS_*_T 的 pack(1) 小端布局逐字节对应；定长遥测的
+格式与字段名经解码注册表取自 telemetry_schema 字段表。同类型的一批 payload 拼接后可以用一次 np.frombuffer
+解出全部记录，不再逐帧 struct.unpack + 构造 dataclass。
+"""
+
+from dataclasses import fields
+from typing import Dict, Sequence
+
+import numpy as np
+
+from .nclink_protocol import (
+    NCLINK_GCS_TELEMETRY,
+    NCLINK_RECEIVE_EXTY_FCS_AVOIFLAG,
+    NCLINK_RECEIVE_EXTY_FCS_DATACTRL,
+    NCLINK_RECEIVE_EXTY_FCS_DATAGCS,
+    NCLINK_RECEIVE_EXTY_FCS_ESC,
+    NCLINK_RECEIVE_EXTY_FCS_GNCBUS,
+    NCLINK_RECEIVE_EXTY_FCS_LINESTRUC_AB,
+    NCLINK_RECEIVE_EXTY_FCS_LINESTRUC_AIM2AB,
+    NCLINK_RECEIVE_EXTY_FCS_PARAM,
+    NCLINK_RECEIVE_EXTY_FCS_PWMS,
+    NCLINK_RECEIVE_EXTY_FCS_STATES,
+    TELEMETRY_CODECS,
+    GCSTelemetry_T,
+    Object3d_T,
+    PathPoint_T,
+)
+
+# struct 格式字符 -> numpy 小端基础类型
+_STRUCT_CODE_TO_NUMPY = {
+    'b': 'i1',
+    'B': 'u1',
+    'h': '<i2',
+    'H': '<u2',
+    'i': '<i4',
+    'I': '<u4',
+    'q': '<i8',
+    'Q': '<u8',
+    'f': '<f4',
+    'd': '<f8',
+}
+
+
+def _expand_struct_format(fmt: str) -> list:
+    codes = []
+    count = ''
+    for char in fmt.lstrip('<>!=@'):
+        if char.isdigit():
+            count += char
+            continue
+        codes.extend([char] * int(count or 1))
+        count = ''
+    return codes
+
+
+def struct_format_to_dtype(fmt: str, names: Sequence[str]) -> np.dtype:
+    """把 struct 格式串（逐字段展开后与 names 一一对应）转换为紧凑排列的结构化 dtype"""
+    codes = _expand_struct_format(fmt)
+    if len(codes) != len(names):
+        raise ValueError(f'字段数与格式不一致: {len(names)} != {len(codes)} ({fmt})')
+    return np.dtype({
+        'names': list(names),
+        'formats': [_STRUCT_CODE_TO_NUMPY[code] for code in codes],
+    })
+
+
+def _dataclass_field_names(struct_cls) -> list:
+    return [item.name for item in fields(struct_cls)]
+
+
+def _codec_dtype(func_code: int) -> np.dtype:
+    codec = TELEMETRY_CODECS[func_code]
+    dtype = struct_format_to_dtype(codec.layout.format, codec.field_names)
+    if dtype.itemsize != codec.layout.size:
+        raise ValueError(f'0x{func_code:02X} dtype 长度 {dtype.itemsize} 与 struct 长度 {codec.layout.size} 不一致')
+    return dtype
+
+
+# 0x41: 8 路 PWM 作为一个定长子数组字段，与 to_json 的 'pwms' 列表对应
+PWMS_DTYPE = np.dtype([('pwms', '<f8', (8,))])
+STATES_DTYPE = _codec_dtype(NCLINK_RECEIVE_EXTY_FCS_STATES)
+DATACTRL_DTYPE = _codec_dtype(NCLINK_RECEIVE_EXTY_FCS_DATACTRL)
+GNCBUS_DTYPE = _codec_dtype(NCLINK_RECEIVE_EXTY_FCS_GNCBUS)
+AVOIFLAG_DTYPE = _codec_dtype(NCLINK_RECEIVE_EXTY_FCS_AVOIFLAG)
+DATAGCS_DTYPE = _codec_dtype(NCLINK_RECEIVE_EXTY_FCS_DATAGCS)
+LINESTRUC_AIM2AB_DTYPE = _codec_dtype(NCLINK_RECEIVE_EXTY_FCS_LINESTRUC_AIM2AB)
+LINESTRUC_AB_DTYPE = _codec_dtype(NCLINK_RECEIVE_EXTY_FCS_LINESTRUC_AB)
+PARAM_DTYPE = _codec_dtype(NCLINK_RECEIVE_EXTY_FCS_PARAM)
+ESC_DTYPE = _codec_dtype(NCLINK_RECEIVE_EXTY_FCS_ESC)
+
+# 0x71: 固定 48 字节头部 + 变长路径点 / 障碍物数组
+GCS_TELEMETRY_HEADER_DTYPE = struct_format_to_dtype(
+    '<II4dBB3H',
+    [name for name in _dataclass_field_names(GCSTelemetry_T) if name not in ('global_path', 'local_path', 'obstacles')],
+)
+PATH_POINT_DTYPE = struct_format_to_dtype('<3d', _dataclass_field_names(PathPoint_T))
+OBJECT3D_DTYPE = struct_format_to_dtype('<9d', _dataclass_field_names(Object3d_T))
+
+# 定长遥测功能字 -> dtype
+TELEMETRY_DTYPES: Dict[int, np.dtype] = {
+    NCLINK_RECEIVE_EXTY_FCS_PWMS: PWMS_DTYPE,
+    NCLINK_RECEIVE_EXTY_FCS_STATES: STATES_DTYPE,
+    NCLINK_RECEIVE_EXTY_FCS_DATACTRL: DATACTRL_DTYPE,
+    NCLINK_RECEIVE_EXTY_FCS_GNCBUS: GNCBUS_DTYPE,
+    NCLINK_RECEIVE_EXTY_FCS_AVOIFLAG: AVOIFLAG_DTYPE,
+    NCLINK_RECEIVE_EXTY_FCS_DATAGCS: DATAGCS_DTYPE,
+    NCLINK_RECEIVE_EXTY_FCS_LINESTRUC_AIM2AB: LINESTRUC_AIM2AB_DTYPE,
+    NCLINK_RECEIVE_EXTY_FCS_LINESTRUC_AB: LINESTRUC_AB_DTYPE,
+    NCLINK_RECEIVE_EXTY_FCS_PARAM: PARAM_DTYPE,
+    NCLINK_RECEIVE_EXTY_FCS_ESC: ESC_DTYPE,
+}
+
+# 变长功能字的头部 dtype
+TELEMETRY_HEADER_DTYPES: Dict[int, np.dtype] = {
+    NCLINK_GCS_TELEMETRY: GCS_TELEMETRY_HEADER_DTYPE,
+}
+
+
+__all__ = [
+    'struct_format_to_dtype',
+    'PWMS_DTYPE', 'STATES_DTYPE', 'DATACTRL_DTYPE', 'GNCBUS_DTYPE',
+    'AVOIFLAG_DTYPE', 'DATAGCS_DTYPE', 'LINESTRUC_AIM2AB_DTYPE', 'LINESTRUC_AB_DTYPE',
+    'PARAM_DTYPE', 'ESC_DTYPE',
+    'GCS_TELEMETRY_HEADER_DTYPE', 'PATH_POINT_DTYPE', 'OBJECT3D_DTYPE',
+    'TELEMETRY_DTYPES', 'TELEMETRY_HEADER_DTYPES',
+]
@@ -0,0 +1,443 @@
+"""
+NCLink 定长遥测的声明式字段表
+
+每个结构体只在这里列一次字段（名称 / struct 格式字符 / CSV 输出格式 / 旧版键名），
+由此在导入时生成：
+- struct.Struct 布局与字段名（nclink_protocol 的解码注册表与 dataclass 的 from_bytes / to_bytes）
+- 短 payload 的按完整字段前缀解包
+- JSON 构造函数（扁平键、分组嵌套、别名、列表键）
+- CSV 宽表表头与按列下标写入的格式化计划（recorder.csv_helper_full）
+- numpy 结构化 dtype（telemetry_dtypes 经注册表间接使用）
+
+字段名与 interface.h 的成员名、CSV 列名、dataclass 字段名保持一致。
+"""
+
+import struct
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# CSV 输出格式：浮点按小数位数，整数 str(int)，原样 str，布尔输出 0/1
+CSV_FLOAT2 = 'float2'
+CSV_FLOAT3 = 'float3'
+CSV_FLOAT4 = 'float4'
+CSV_FLOAT8 = 'float8'
+CSV_INT = 'int'
+CSV_RAW = 'raw'
+CSV_BOOL = 'bool'
+
+# JSON 布尔转换范围：所有输出键 / 仅别名键
+JSON_BOOL_ALL = 'all'
+JSON_BOOL_ALIAS = 'alias'
+
+
+@dataclass(frozen=True)
+class SchemaField:
+    """单个结构体成员
+
+    - name: JSON 扁平键 / CSV 列名 / dataclass 字段名
+    - code: struct 格式字符（pack(1) 小端）
+    - csv: CSV 输出格式
+    - group / short_name: 分组嵌套输出时的路径 data[group][short_name]
+    - alias: 旧版 payload 使用的短键名（CSV 读取时作为回退；json_aliases 为真时 JSON 也输出该键）
+    - json_bool: JSON 输出是否转换为 bool
+    """
+    name: str
+    code: str
+    csv: str
+    group: Optional[str] = None
+    short_name: Optional[str] = None
+    alias: Optional[str] = None
+    json_bool: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class TelemetrySchema:
+    """单个定长遥测结构体
+
+    - json_flat: JSON 是否输出扁平键
+    - json_nested: JSON 是否按 group 输出嵌套字典
+    - json_aliases: JSON 是否在扁平键之后追加别名短键
+    - json_lists: 额外输出的列表键 (键名, 起始下标, 结束下标)
+    - csv_columns: CSV 表头中的列名（默认与字段名一致）
+    """
+    msg_type: str
+    struct_name: str
+    fields: Tuple[SchemaField, ...]
+    json_flat: bool = True
+    json_nested: bool = False
+    json_aliases: bool = False
+    json_lists: Tuple[Tuple[str, int, int], ...] = ()
+    csv_columns: Optional[Tuple[str, ...]] = None
+
+    @property
+    def field_names(self) -> Tuple[str, ...]:
+        return tuple(item.name for item in self.fields)
+
+    @property
+    def format(self) -> str:
+        return '<' + ''.join(item.code for item in self.fields)
+
+    @property
+    def layout(self) -> struct.Struct:
+        return struct.Struct(self.format)
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return self.csv_columns or self.field_names
+
+
+def _flat(names: Iterable[str], code: str, csv: str, **extra: Any) -> List[SchemaField]:
+    return [SchemaField(name, code, csv, **extra) for name in names]
+
+
+def _grouped(prefix: str, group: str, spec: Iterable[Tuple[str, str, str]]) -> List[SchemaField]:
+    return [
+        SchemaField(f'{prefix}{group}_{short_name}', code, csv, group=group, short_name=short_name)
+        for short_name, code, csv in spec
+    ]
+
+
+def _same(short_names: str, code: str, csv: str) -> List[Tuple[str, str, str]]:
+    return [(short_name, code, csv) for short_name in short_names.split()]
+
+
+# ==================== 结构体字段表 ====================
+
+PWMS_SCHEMA = TelemetrySchema(
+    'fcs_pwms', 'ExtY_FCS_PWMS_T',
+    tuple(_flat([f'pwms_{index}' for index in range(8)], 'd', CSV_FLOAT2)),
+    json_flat=False,
+    json_lists=(('pwms', 0, 8),),
+    csv_columns=tuple(f'pwm{index}' for index in range(1, 9)),
+)
+
+STATES_SCHEMA = TelemetrySchema('fcs_states', 'ExtY_FCS_STATES_T', tuple(
+    _flat(['states_lat', 'states_lon'], 'd', CSV_FLOAT8)
+    + _flat(['states_height', 'states_Vx_GS', 'states_Vy_GS', 'states_Vz_GS'], 'f', CSV_FLOAT3)
+    + _flat(['states_p', 'states_q', 'states_r', 'states_phi', 'states_theta', 'states_psi'], 'f', CSV_FLOAT4)
+))
+
+_DATACTRL_PREFIX = 'dataCtrl_n_'
+DATACTRL_SCHEMA = TelemetrySchema('fcs_datactrl', 'ExtY_FCS_DATACTRL_T', tuple(
+    _grouped(_DATACTRL_PREFIX, 'ailOutLoop', _same(
+        'dY_delta Vy_dY2Vy Vy_var Vy_delta Vy_P Vy_Int Vy_D ail_ffc', 'f', CSV_FLOAT4))
+    + _grouped(_DATACTRL_PREFIX, 'ailInLoop', _same(
+        'ail_trim phi_trim phi_var delta_phi phi_P phi_D ail_fbc ail_law_out', 'f', CSV_FLOAT4))
+    + _grouped(_DATACTRL_PREFIX, 'eleOutLoop', _same(
+        'dX_delta Vx_dX2Vx Vx_var Vx_delta Vx_P Vx_Int Vx_D ele_ffc', 'f', CSV_FLOAT4))
+    + _grouped(_DATACTRL_PREFIX, 'EleInLoop', _same(
+        'theta_trim ele_trim theta_var delta_theta theta_P theta_D ele_fbc ele_law_out', 'f', CSV_FLOAT4))
+    + _grouped(_DATACTRL_PREFIX, 'RudOutLoop', _same('psi_dy psi_delta R_dPsi2R', 'f', CSV_FLOAT4))
+    + _grouped(_DATACTRL_PREFIX, 'rudInLoop', _same(
+        'rud_trim R_var dR_delta R_P R_Int rud_fbc rud_law_out', 'f', CSV_FLOAT4))
+    + _grouped(_DATACTRL_PREFIX, 'colOutLoop', _same(
+        'H_delta Hdot_dH2Vz Hdot_var Hdot_delta Hdot_P Hdot_Int Hdot_D col_fbc', 'f', CSV_FLOAT4))
+    + _grouped(_DATACTRL_PREFIX, 'colInLoop', _same('col_Vx col_law col_law_out', 'f', CSV_FLOAT4))
+), json_flat=False, json_nested=True)
+
+_GNCBUS_PREFIX = 'GNCBus_'
+_GNCBUS_TOKEN_MODE = _grouped(_GNCBUS_PREFIX, 'TokenMode', _same(
+    'OnSky Ctrl_Mode Pre_CMD rud_state ail_state ele_state col_state nav_guid cmd_guid '
+    'mode_guid step_guid mode_nav token_nav step_nav mode_vert token_vert step_vert', 'b', CSV_RAW))
+# OnSky / Ctrl_Mode 对外按布尔量输出（扁平键与嵌套键一致）
+_GNCBUS_TOKEN_MODE[0:2] = [
+    SchemaField(item.name, item.code, item.csv, item.group, item.short_name, json_bool=JSON_BOOL_ALL)
+    for item in _GNCBUS_TOKEN_MODE[0:2]
+]
+GNCBUS_SCHEMA = TelemetrySchema('fcs_gncbus', 'ExtY_FCS_GNCBUS_T', tuple(
+    _GNCBUS_TOKEN_MODE
+    + _grouped(_GNCBUS_PREFIX, 'FtbOpt', _same(
+        'ele_opt ail_opt rud_opt col_opt R_opt Vx_opt Vy_opt coldt_opt col0_opt', 'f', CSV_FLOAT4)
+        + [('Ftb_Switch', 'b', CSV_RAW)])
+    + _grouped(_GNCBUS_PREFIX, 'SrcValue', _same('ac_SrcCmdV SrcV_fus', 'b', CSV_RAW))
+    + _grouped(_GNCBUS_PREFIX, 'MixValue', _same(
+        'col_mix phi_mix Vx_mix dX_mix theta_mix Vy_mix dY_mix psi_mix Hdot_mix height_mix', 'f', CSV_FLOAT4))
+    + _grouped(_GNCBUS_PREFIX, 'CmdValue', _same(
+        'phi_cmd Hdot_cmd R_cmd psi_cmd Vx_cmd Vy_cmd height_cmd', 'f', CSV_FLOAT4))
+    + _grouped(_GNCBUS_PREFIX, 'VarValue', _same('psi_var height_var dX_var dY_var', 'f', CSV_FLOAT4))
+    + _grouped(_GNCBUS_PREFIX, 'TrimValue', _same('Vx_trim col_trim col_autotrim', 'f', CSV_FLOAT4))
+    + _grouped(_GNCBUS_PREFIX, 'ParamsLMT', _same(
+        'Vx_LMT Vy_LMT R_LMT Hdot_ILmt Hdot_UpLMT Hdot_DownLMT R_FLYTURN R_unit Hdot_unit Vx_unit Vy_unit',
+        'f', CSV_FLOAT4))
+    + _grouped(_GNCBUS_PREFIX, 'AcValue', _same('ac_dY ac_dX ac_dPsi ac_dL', 'f', CSV_FLOAT4))
+    + _grouped(_GNCBUS_PREFIX, 'HoverValue', _same('lon_hov lat_hov', 'd', CSV_FLOAT8)
+               + [('IsHovStatus_hov', 'b', CSV_RAW)])
+    + _grouped(_GNCBUS_PREFIX, 'HomeValue', _same('lon_home lat_home', 'd', CSV_FLOAT8))
+), json_nested=True)
+
+AVOIFLAG_SCHEMA = TelemetrySchema('avoiflag', 'ExtY_FCS_AVOIFLAG_T', (
+    SchemaField('AvoiFlag_LaserRadar_Enabled', 'B', CSV_BOOL, alias='laser_radar_enabled', json_bool=JSON_BOOL_ALL),
+    SchemaField('AvoiFlag_AvoidanceFlag', 'B', CSV_BOOL, alias='avoidance_flag', json_bool=JSON_BOOL_ALL),
+    SchemaField('AvoiFlag_GuideFlag', 'B', CSV_BOOL, alias='guide_flag', json_bool=JSON_BOOL_ALL),
+))
+
+DATAFUTABA_SCHEMA = TelemetrySchema('fcs_datafutaba', 'ExtY_FCS_DATAFUTABA_T', (
+    SchemaField('Tele_ftb_Roll', 'H', CSV_INT, alias='roll'),
+    SchemaField('Tele_ftb_Pitch', 'H', CSV_INT, alias='pitch'),
+    SchemaField('Tele_ftb_Yaw', 'H', CSV_INT, alias='yaw'),
+    SchemaField('Tele_ftb_Col', 'H', CSV_INT, alias='col'),
+    SchemaField('Tele_ftb_Switch', 'b', CSV_INT, alias='switch'),
+    SchemaField('Tele_ftb_com_Ftb_fail', 'b', CSV_INT, alias='ftb_fail'),
+))
+
+DATAGCS_SCHEMA = TelemetrySchema('fcs_datagcs', 'ExtY_FCS_DATAGCS_T', (
+    SchemaField('Tele_GCS_CmdIdx', 'i', CSV_INT, alias='CmdIdx'),
+    SchemaField('Tele_GCS_Mission', 'i', CSV_INT, alias='Mission'),
+    SchemaField('Tele_GCS_Val', 'f', CSV_FLOAT4, alias='Val'),
+    SchemaField('Tele_GCS_com_GCS_fail', 'b', CSV_INT, alias='fail', json_bool=JSON_BOOL_ALIAS),
+), json_aliases=True)
+
+# 0x47 / 0x48 共用同一布局，仅字段前缀不同；JSON 同时输出不带前缀的短键
+_LINESTRUC_SPEC = (
+    ('lon', 'd', CSV_FLOAT8), ('lat', 'd', CSV_FLOAT8),
+    ('psi', 'f', CSV_FLOAT4), ('alt', 'f', CSV_FLOAT4), ('len', 'f', CSV_FLOAT4),
+    ('rad', 'f', CSV_FLOAT4), ('Vx2nextdot', 'f', CSV_FLOAT4),
+    ('next_num', 'b', CSV_INT), ('next_dot', 'b', CSV_INT),
+    ('type_dot', 'B', CSV_INT), ('clockwise_WP', 'B', CSV_INT),
+    ('R_WP', 'f', CSV_FLOAT4),
+    ('type_WP', 'B', CSV_INT), ('Num_type_WP', 'B', CSV_INT),
+    ('dL_WP', 'f', CSV_FLOAT4),
+    ('Vx_type', 'B', CSV_INT), ('TTC_Fault_Mode', 'B', CSV_INT), ('deltaY_ctrl', 'B', CSV_INT),
+    ('turn_type', 'B', CSV_INT), ('Inv_type', 'B', CSV_INT), ('type_line', 'B', CSV_INT),
+)
+
+
+def _linestruc_fields(prefix: str) -> Tuple[SchemaField, ...]:
+    return tuple(
+        SchemaField(
+            f'{prefix}{short_name}', code, csv, alias=short_name,
+            json_bool=JSON_BOOL_ALIAS if short_name == 'clockwise_WP' else None,
+        )
+        for short_name, code, csv in _LINESTRUC_SPEC
+    )
+
+
+LINESTRUC_AIM2AB_SCHEMA = TelemetrySchema(
+    'fcs_line_aim2ab', 'ExtY_FCS_LINESTRUC_ac_aim2AB_T', _linestruc_fields('ac_aim2AB_'), json_aliases=True,
+)
+LINESTRUC_AB_SCHEMA = TelemetrySchema(
+    'fcs_line_ab', 'ExtY_FCS_LINESTRUC_acAB_T', _linestruc_fields('acAB_'), json_aliases=True,
+)
+
+PARAM_SCHEMA = TelemetrySchema('fcs_param', 'ExtY_FCS_PARAM_T', tuple(_flat([
+    'ParamAil_F_KaPHI', 'ParamAil_F_KaP', 'ParamAil_F_KaY', 'ParamAil_F_IaY',
+    'ParamAil_F_KaVy', 'ParamAil_F_IaVy', 'ParamAil_F_KaAy', 'ParamAil_YaccLMT',
+    'ParamEle_F_KeTHETA', 'ParamEle_F_KeQ', 'ParamEle_F_KeX', 'ParamEle_F_IeX',
+    'ParamEle_F_KeVx', 'ParamEle_F_IeVx', 'ParamEle_F_KeAx', 'ParamEle_XaccLMT',
+    'ParamRud_F_KrR', 'ParamRud_F_IrR', 'ParamRud_F_KrAy', 'ParamRud_F_KrPSI',
+    'ParamH_F_KcH', 'ParamH_F_IcH', 'ParamH_F_KcHdot', 'ParamH_F_IcHdot', 'ParamH_F_KcAz',
+    'ParamRPM_F_KgRPM', 'ParamRPM_F_IgRPM',
+    'ParamScale_F_scale_factor', 'ParamGuide_Hground', 'ParamGuide_AutoTakeoffHcmd',
+], 'f', CSV_FLOAT4)))
+
+
+def _esc_fields(suffix: str, code: str, csv: str) -> List[SchemaField]:
+    return _flat([f'esc{index}_{suffix}' for index in range(1, 7)], code, csv)
+
+
+ESC_SCHEMA = TelemetrySchema('fcs_esc', 'ExtY_FCS_ESC_T', tuple(
+    _esc_fields('error_count', 'I', CSV_INT)
+    + _esc_fields('voltage', 'f', CSV_FLOAT4)
+    + _esc_fields('current', 'f', CSV_FLOAT4)
+    + _esc_fields('temperature', 'f', CSV_FLOAT4)
+    + _esc_fields('rpm', 'i', CSV_INT)
+    + _esc_fields('power_rating_pct', 'B', CSV_INT)
+), json_lists=(
+    ('error_counts', 0, 6),
+    ('voltages', 6, 12),
+    ('currents', 12, 18),
+    ('temperatures', 18, 24),
+    ('rpms', 24, 30),
+    ('power_ratings', 30, 36),
+))
+
+# CSV 宽表中各结构体的先后顺序（timestamp 之后）
+CSV_SCHEMAS: Tuple[TelemetrySchema, ...] = (
+    PWMS_SCHEMA,
+    STATES_SCHEMA,
+    DATACTRL_SCHEMA,
+    GNCBUS_SCHEMA,
+    AVOIFLAG_SCHEMA,
+    DATAFUTABA_SCHEMA,
+    DATAGCS_SCHEMA,
+    LINESTRUC_AIM2AB_SCHEMA,
+    LINESTRUC_AB_SCHEMA,
+    PARAM_SCHEMA,
+    ESC_SCHEMA,
+)
+
+SCHEMAS_BY_TYPE: Dict[str, TelemetrySchema] = {schema.msg_type: schema for schema in CSV_SCHEMAS}
+
+
+# ==================== JSON 构造 ====================
+
+def make_json_builder(schema: TelemetrySchema) -> Callable[[tuple], dict]:
+    """根据字段表生成 “解包元组 -> 输出字典” 的构造函数，键顺序：扁平键、嵌套分组、别名、列表键"""
+    fields = schema.fields
+    names = schema.field_names
+    bool_indexes = tuple(index for index, item in enumerate(fields) if item.json_bool == JSON_BOOL_ALL)
+    aliases = tuple(
+        (item.alias, index, item.json_bool == JSON_BOOL_ALIAS)
+        for index, item in enumerate(fields) if item.alias and schema.json_aliases
+    )
+    groups: List[Tuple[str, List[str], int]] = []
+    if schema.json_nested:
+        for index, item in enumerate(fields):
+            if not groups or groups[-1][0] != item.group:
+                groups.append((item.group, [], index))
+            groups[-1][1].append(item.short_name)
+    nested = tuple(
+        (group, tuple(short_names), start, start + len(short_names))
+        for group, short_names, start in groups
+    )
+    json_flat = schema.json_flat
+    json_lists = schema.json_lists
+
+    def build_json(values: tuple) -> dict:
+        if bool_indexes:
+            values = list(values)
+            for index in bool_indexes:
+                values[index] = bool(values[index])
+        data = dict(zip(names, values)) if json_flat else {}
+        for group, short_names, start, end in nested:
+            data[group] = dict(zip(short_names, values[start:end]))
+        for alias, index, as_bool in aliases:
+            data[alias] = bool(values[index]) if as_bool else values[index]
+        for key, start, end in json_lists:
+            data[key] = list(values[start:end])
+        return data
+
+    return build_json
+
+
+def make_partial_unpacker(schema: TelemetrySchema) -> Callable[[bytes], tuple]:
+    """生成短 payload 的解包函数：解出完整落在 payload 内的前缀字段，其余字段取 0"""
+    codes = [item.code for item in schema.fields]
+    ends = [struct.calcsize('<' + ''.join(codes[:count])) for count in range(1, len(codes) + 1)]
+    prefixes = ['<' + ''.join(codes[:count]) for count in range(len(codes) + 1)]
+    defaults = tuple(0.0 if code in 'df' else 0 for code in codes)
+
+    def unpack_partial(payload) -> tuple:
+        count = bisect_right(ends, len(payload))
+        return struct.unpack_from(prefixes[count], payload) + defaults[count:]
+
+    return unpack_partial
+
+
+# ==================== CSV 宽表 ====================
+
+_MISSING = object()
+
+
+def _csv_float(digits: int) -> Callable[[Any], str]:
+    template = f'{{:.{digits}f}}'
+
+    def format_value(value: Any) -> str:
+        try:
+            return template.format(float(value) if value is not None else 0.0)
+        except (TypeError, ValueError):
+            return template.format(0.0)
+    return format_value
+
+
+def _csv_int(value: Any) -> str:
+    try:
+        return str(int(value) if value is not None else 0)
+    except (TypeError, ValueError):
+        return '0'
+
+
+def _csv_raw(value: Any) -> str:
+    return str(value)
+
+
+def _csv_bool(value: Any) -> str:
+    return str(int(bool(value)))
+
+
+CSV_FORMATTERS: Dict[str, Callable[[Any], str]] = {
+    CSV_FLOAT2: _csv_float(2),
+    CSV_FLOAT3: _csv_float(3),
+    CSV_FLOAT4: _csv_float(4),
+    CSV_FLOAT8: _csv_float(8),
+    CSV_INT: _csv_int,
+    CSV_RAW: _csv_raw,
+    CSV_BOOL: _csv_bool,
+}
+
+
+@dataclass(frozen=True)
+class CsvColumnPlan:
+    """单个结构体写入宽表的预编译计划
+
+    columns 每项为 (列下标, 扁平键, 分组, 短键, 别名, 格式化函数)。
+    先按扁平键取值，缺失时才依次回退到 data[分组][短键] 与别名键。
+    """
+    msg_type: str
+    columns: Tuple[Tuple[int, str, Optional[str], Optional[str], Optional[str], Callable[[Any], str]], ...]
+    list_key: Optional[str] = None
+
+    def fill(self, data: Dict[str, Any], row: list) -> None:
+        """把 data 的各字段格式化后写入 row 对应列"""
+        if self.list_key is not None:
+            values = data.get(self.list_key)
+            if not isinstance(values, (list, tuple)):
+                values = ()
+            for position, (column, _, _, _, _, format_value) in enumerate(self.columns):
+                row[column] = format_value(values[position] if position < len(values) else 0)
+            return
+
+        get = data.get
+        for column, key, group, short_name, alias, format_value in self.columns:
+            value = get(key, _MISSING)
+            if value is _MISSING:
+                value = _lookup_fallback(data, group, short_name, alias)
+            row[column] = format_value(value)
+
+
+def _lookup_fallback(data: Dict[str, Any], group: Optional[str], short_name: Optional[str], alias: Optional[str]):
+    if group is not None:
+        nested = data.get(group)
+        if isinstance(nested, dict) and short_name in nested:
+            return nested[short_name]
+    if alias is not None and alias in data:
+        return data[alias]
+    return 0
+
+
+def _build_csv_layout() -> Tuple[Tuple[str, ...], Dict[str, int], Dict[str, CsvColumnPlan]]:
+    header: List[str] = ['timestamp']
+    offsets: Dict[str, int] = {}
+    plans: Dict[str, CsvColumnPlan] = {}
+    for schema in CSV_SCHEMAS:
+        offset = len(header)
+        offsets[schema.msg_type] = offset
+        header.extend(schema.columns)
+        columns = tuple(
+            (offset + position, item.name, item.group, item.short_name, item.alias, CSV_FORMATTERS[item.csv])
+            for position, item in enumerate(schema.fields)
+        )
+        # 只以列表形式输出的结构体（PWMS）按列表键逐项取值
+        list_key = None
+        if schema.json_lists and not (schema.json_flat or schema.json_nested):
+            list_key = schema.json_lists[0][0]
+        plans[schema.msg_type] = CsvColumnPlan(schema.msg_type, columns, list_key)
+    return tuple(header), offsets, plans
+
+
+CSV_HEADER, CSV_OFFSETS, CSV_COLUMN_PLANS = _build_csv_layout()
+CSV_TOTAL_COLUMNS = len(CSV_HEADER)
+
+
+__all__ = [
+    'CSV_BOOL', 'CSV_FLOAT2', 'CSV_FLOAT3', 'CSV_FLOAT4', 'CSV_FLOAT8', 'CSV_INT', 'CSV_RAW',
+    'JSON_BOOL_ALL', 'JSON_BOOL_ALIAS',
+    'SchemaField', 'TelemetrySchema', 'CsvColumnPlan',
+    'PWMS_SCHEMA', 'STATES_SCHEMA', 'DATACTRL_SCHEMA', 'GNCBUS_SCHEMA', 'AVOIFLAG_SCHEMA',
+    'DATAFUTABA_SCHEMA', 'DATAGCS_SCHEMA', 'LINESTRUC_AIM2AB_SCHEMA', 'LINESTRUC_AB_SCHEMA',
+    'PARAM_SCHEMA', 'ESC_SCHEMA',
+    'CSV_SCHEMAS', 'SCHEMAS_BY_TYPE', 'CSV_FORMATTERS',
+    'CSV_HEADER', 'CSV_OFFSETS', 'CSV_COLUMN_PLANS', 'CSV_TOTAL_COLUMNS',
+    'make_json_builder', 'make_partial_unpacker',
+]
@@ -0,0 +1,390 @@
+"""
+UDP 独立接收线程
+
+一个线程持有全部监听 socket（30509 / 18511 / 18507 / 18506），用 selectors 等待可读后
+对每个就绪 socket 以非阻塞 recvmsg 连续读到 EAGAIN，在线程内完成 NCLink 帧解析，
+再把整批结果通过一次 loop.call_soon_threadsafe 投递回事件循环。
+事件循环忙于 WebSocket / HTTP 时接收不会停顿，减少内核接收缓冲区溢出。
+
+分片接收（receive_shards > 1）：每个端口以 SO_REUSEPORT 打开 K 个 socket，由 K 个接收线程
+各持一组，内核按源地址四元组把 datagram 固定分配到其中一个 socket，同一来源的帧缓冲状态
+仍只存在于一个解析器中。各线程的批次经 ShardMerger 按到达时间排序后再进入处理管线。
+
+到达时间：平台支持时开启 SO_TIMESTAMPNS，经 recvmsg 辅助数据取得内核收包时刻并换算到
+time.monotonic_ns 时基；不支持时取 recvmsg 返回时的 time.monotonic_ns。
+"""
+
+import asyncio
+import heapq
+import logging
+import selectors
+import socket
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .ingress_limit import HELD_RELEASE_INTERVAL_SEC
+from .nclink_protocol import NCLinkProtocolParser, PortType
+
+logger = logging.getLogger(__name__)
+
+# 单个 UDP datagram 的最大长度
+MAX_DATAGRAM_SIZE = 65535
+# 单个 socket 每轮最多连续读取的 datagram 数，避免一个高速端口饿死其他端口
+MAX_DATAGRAMS_PER_SOCKET = 256
+# selector 等待超时（秒），同时决定 stop() 的最长响应时间
+SELECT_TIMEOUT_SEC = 0.1
+
+# 内核收包时间戳：socket 模块未导出该常量，Linux 上取值 35（SCM_TIMESTAMPNS 同值）
+SO_TIMESTAMPNS = getattr(socket, 'SO_TIMESTAMPNS', 35 if sys.platform.startswith('linux') else None)
+_TIMESPEC = struct.Struct('@qq')
+# recvmsg 辅助数据缓冲大小；未开启内核时间戳时为 0（不接收辅助数据）
+RX_ANCILLARY_SIZE = socket.CMSG_SPACE(_TIMESPEC.size) if hasattr(socket, 'CMSG_SPACE') else 0
+
+
+def enable_kernel_timestamps(sock: socket.socket) -> bool:
+    """为 socket 开启 SO_TIMESTAMPNS；平台不支持时返回 False"""
+    if SO_TIMESTAMPNS is None or not RX_ANCILLARY_SIZE:
+        return False
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, SO_TIMESTAMPNS, 1)
+    except OSError:
+        return False
+    return True
+
+
+def resolve_arrival(ancdata) -> Tuple[int, int, Optional[int]]:
+    """由 recvmsg 辅助数据得到 (到达时刻 monotonic ns, 到达墙钟 ms, 内核到应用读出的延迟 ns)
+
+    内核时间戳是 CLOCK_REALTIME，按读出时刻两个时钟的差值换算到单调时钟；
+    没有内核时间戳时延迟为 None，到达时刻即读出时刻。
+    """
+    now_ns = time.monotonic_ns()
+    wall_ns = time.time_ns()
+    for level, kind, data in ancdata:
+        if level == socket.SOL_SOCKET and kind == SO_TIMESTAMPNS and len(data) >= _TIMESPEC.size:
+            seconds, nanos = _TIMESPEC.unpack_from(data)
+            kernel_ns = seconds * 1_000_000_000 + nanos
+            delay = wall_ns - kernel_ns
+            if delay < 0:
+                delay = 0
+            return now_ns - delay, kernel_ns // 1_000_000, delay
+    return now_ns, wall_ns // 1_000_000, None
+
+
+@dataclass
+class IngestBatch:
+    """接收线程一轮读取的结果，在事件循环中一次性处理"""
+    # (端口, datagram 数, 字节数)
+    rx_by_port: List[Tuple[int, int, int]] = field(default_factory=list)
+    messages: List[dict] = field(default_factory=list)
+    # 与 messages 一一对应的到达时间（time.monotonic_ns，取所在 datagram 的接收时刻）
+    arrivals: List[int] = field(default_factory=list)
+    # 各 datagram 从内核收包到应用读出的延迟（ns，仅内核时间戳可用时）
+    socket_delays: List[int] = field(default_factory=list)
+    # (原因, 帧长, 次数)；独立进程模式下同一原因按统计周期合并
+    rejections: List[Tuple[str, int, int]] = field(default_factory=list)
+    issues: List[Tuple[str, int, int]] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (self.rx_by_port or self.messages or self.rejections or self.issues)
+
+
+def collect_parser_events(events: List[dict], batch: IngestBatch) -> None:
+    """把解析器累积的拒帧/异常事件转入批次并清空事件列表"""
+    if not events:
+        return
+    for event in events:
+        event_type = event.get('type')
+        reason = str(event.get('reason') or 'unknown')
+        frame_size = int(event.get('frame_size', 0) or 0)
+        if event_type == 'frame_rejected':
+            batch.rejections.append((reason, frame_size, 1))
+        elif event_type == 'frame_issue':
+            batch.issues.append((reason, frame_size, 1))
+    events.clear()
+
+
+class UDPReceiverThread:
+    """持有全部监听 socket 的接收线程"""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        sockets: Dict[int, socket.socket],
+        port_types: Dict[int, PortType],
+        on_batch: Callable[[IngestBatch], None],
+        max_datagrams_per_socket: int = MAX_DATAGRAMS_PER_SOCKET,
+        name: str = 'nclink-udp-receiver',
+        tracer=None,
+        limiter=None,
+    ):
+        self.loop = loop
+        self.name = name
+        # 可选的原始数据包采样追踪器（protocol.packet_trace.PacketTracer）
+        self.tracer = tracer
+        # 可选的入口限流器（protocol.ingress_limit.IngressLimiter），分片线程共用；
+        # 暂存的最新值以线程名为持有者，各分片只补发自己的
+        self.limiter = limiter
+        # 录制期间的原始抓包写入器（recorder.raw_capture.RawCaptureWriter），由 UDPHandler 动态挂载
+        self.capture = None
+        self.sockets = dict(sockets)
+        self.port_types = dict(port_types)
+        self.on_batch = on_batch
+        self.max_datagrams_per_socket = max(1, int(max_datagrams_per_socket))
+        self.kernel_timestamps = False
+
+        # 每个端口独立的帧缓冲，避免多端口数据交叉污染
+        self._pending_events: List[dict] = []
+        self.parsers: Dict[int, NCLinkProtocolParser] = {
+            port: NCLinkProtocolParser(
+                on_event=self._pending_events.append, emit_parsed_events=False, local_port=port,
+            )
+            for port in self.sockets
+        }
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats: Dict[str, Any] = {
+            'batches': 0,
+            'datagrams': 0,
+            'bytes': 0,
+            'messages': 0,
+            'max_batch_datagrams': 0,
+            'receive_errors': 0,
+            'deliver_errors': 0,
+        }
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        timestamps = True
+        for sock in self.sockets.values():
+            sock.setblocking(False)
+            timestamps = enable_kernel_timestamps(sock) and timestamps
+        self.kernel_timestamps = timestamps
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        logger.info(f"UDP接收线程 {self.name} 已启动，端口: {sorted(self.sockets)}")
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning(f"UDP接收线程 {self.name} 未能在超时时间内退出")
+        self._thread = None
+        if self.limiter is not None:
+            self.limiter.discard_held(self.name)
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats['name'] = self.name
+        stats['alive'] = self.is_alive()
+        stats['kernel_timestamps'] = self.kernel_timestamps
+        return stats
+
+    # ------------------------------------------------------------
+    # 接收线程
+    # ------------------------------------------------------------
+
+    def _run(self) -> None:
+        selector = selectors.DefaultSelector()
+        for port, sock in self.sockets.items():
+            selector.register(sock, selectors.EVENT_READ, port)
+        try:
+            limiter = self.limiter
+            owner = self.name
+            while not self._stop_event.is_set():
+                holding = limiter is not None and limiter.enabled and limiter.holds(owner)
+                try:
+                    ready = selector.select(HELD_RELEASE_INTERVAL_SEC if holding else SELECT_TIMEOUT_SEC)
+                except OSError as exc:
+                    if self._stop_event.is_set():
+                        break
+                    logger.error(f"UDP接收线程 select 失败: {exc}")
+                    time.sleep(SELECT_TIMEOUT_SEC)
+                    continue
+
+                if not ready and not holding:
+                    continue
+
+                batch = IngestBatch()
+                for key, _ in ready:
+                    self._drain_socket(key.data, key.fileobj, batch)
+                if holding:
+                    self._release_held(batch)
+                self._deliver(batch)
+        finally:
+            selector.close()
+
+    def _drain_socket(self, port: int, sock: socket.socket, batch: IngestBatch) -> None:
+        parser = self.parsers[port]
+        port_type = self.port_types.get(port, PortType.PORT_18504_RECEIVE)
+        tracer = self.tracer
+        capture = self.capture
+        limiter = self.limiter
+        ancillary_size = RX_ANCILLARY_SIZE if self.kernel_timestamps else 0
+        socket_delays = batch.socket_delays
+        datagrams = 0
+        total_bytes = 0
+        while datagrams < self.max_datagrams_per_socket:
+            try:
+                data, ancdata, _, addr = sock.recvmsg(MAX_DATAGRAM_SIZE, ancillary_size)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as exc:
+                self.stats['receive_errors'] += 1
+                if not self._stop_event.is_set():
+                    logger.error(f"[端口{port}] UDP接收失败: {exc}")
+                break
+
+            arrival, timestamp, delay = resolve_arrival(ancdata)
+            if delay is not None:
+                socket_delays.append(delay)
+            datagrams += 1
+            total_bytes += len(data)
+            if tracer is not None and tracer.enabled:
+                tracer.record('rx', port, data, addr)
+            if capture is not None:
+                capture.write(port, data, addr)
+            if limiter is not None and limiter.enabled and not limiter.admit(
+                port, data, (data, arrival, timestamp), owner=self.name,
+            ):
+                continue
+            self._feed(parser, port, port_type, data, arrival, timestamp, batch)
+
+        if datagrams:
+            batch.rx_by_port.append((port, datagrams, total_bytes))
+        self._collect_parser_events(batch)
+
+    @staticmethod
+    def _feed(parser, port, port_type, data, arrival, timestamp, batch: IngestBatch) -> None:
+        try:
+            messages = parser.feed_data(data, port_type, arrival, timestamp)
+            if messages:
+                batch.messages.extend(messages)
+                batch.arrivals.extend([arrival] * len(messages))
+        except Exception as e:
+            logger.error(f"[端口{port}] 处理UDP数据包失败: {e}")
+
+    def _release_held(self, batch: IngestBatch) -> None:
+        """补发令牌已恢复的暂存最新值（保留原到达时刻，数据时延如实反映限流等待）"""
+        for port, (data, arrival, timestamp) in self.limiter.release_held(owner=self.name):
+            port_type = self.port_types.get(port, PortType.PORT_18504_RECEIVE)
+            self._feed(self.parsers[port], port, port_type, data, arrival, timestamp, batch)
+        self._collect_parser_events(batch)
+
+    def _collect_parser_events(self, batch: IngestBatch) -> None:
+        collect_parser_events(self._pending_events, batch)
+
+    def _deliver(self, batch: IngestBatch) -> None:
+        if batch.is_empty():
+            return
+        datagrams = sum(count for _, count, _ in batch.rx_by_port)
+        stats = self.stats
+        stats['batches'] += 1
+        stats['datagrams'] += datagrams
+        stats['bytes'] += sum(size for _, _, size in batch.rx_by_port)
+        stats['messages'] += len(batch.messages)
+        if datagrams > stats['max_batch_datagrams']:
+            stats['max_batch_datagrams'] = datagrams
+        try:
+            self.loop.call_soon_threadsafe(self.on_batch, batch)
+        except RuntimeError as exc:
+            # 事件循环已关闭（停机过程中）
+            stats['deliver_errors'] += 1
+            if not self._stop_event.is_set():
+                logger.error(f"UDP接收线程投递批次失败: {exc}")
+
+
+class ShardMerger:
+    """在事件循环中合并多个分片接收线程的批次，按到达时间顺序交付
+
+    各线程投递存在几毫秒的先后差异，合并器保留一个重排窗口：到达时间早于
+    “当前时刻 - 窗口”的消息才会被排序交付，窗口内的消息留待下一次刷新。
+    统计（接收量、拒帧、异常）不参与排序，随下一次交付一并转交。
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        on_batch: Callable[[IngestBatch], None],
+        reorder_window_ms: float = 2.0,
+    ):
+        self.loop = loop
+        self.on_batch = on_batch
+        self.window_ns = max(0, int(reorder_window_ms * 1_000_000))
+        # (到达时间, 入队序号, 消息)；入队序号保证同一时刻的消息保持投递顺序
+        self._heap: List[Tuple[int, int, dict]] = []
+        self._seq = 0
+        self._stats = IngestBatch()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self.stats: Dict[str, int] = {'batches_in': 0, 'batches_out': 0, 'messages': 0, 'max_pending': 0}
+
+    def add(self, batch: IngestBatch) -> None:
+        self.stats['batches_in'] += 1
+        self._stats.rx_by_port.extend(batch.rx_by_port)
+        self._stats.rejections.extend(batch.rejections)
+        self._stats.issues.extend(batch.issues)
+        self._stats.socket_delays.extend(batch.socket_delays)
+        heap = self._heap
+        seq = self._seq
+        for arrival, message in zip(batch.arrivals, batch.messages):
+            heapq.heappush(heap, (arrival, seq, message))
+            seq += 1
+        self._seq = seq
+        if len(heap) > self.stats['max_pending']:
+            self.stats['max_pending'] = len(heap)
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self._flush_handle is None:
+            self._flush_handle = self.loop.call_later(self.window_ns / 1e9, self.flush)
+
+    def flush(self, force: bool = False) -> None:
+        self._flush_handle = None
+        heap = self._heap
+        cutoff = time.monotonic_ns() - self.window_ns
+        out = self._stats
+        self._stats = IngestBatch()
+        while heap and (force or heap[0][0] <= cutoff):
+            arrival, _, message = heapq.heappop(heap)
+            out.messages.append(message)
+            out.arrivals.append(arrival)
+
+        if not out.is_empty():
+            self.stats['batches_out'] += 1
+            self.stats['messages'] += len(out.messages)
+            self.on_batch(out)
+        if heap:
+            self._schedule_flush()
+
+    def close(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self.flush(force=True)
+
+    def snapshot(self) -> Dict[str, int]:
+        stats = dict(self.stats)
+        stats['pending'] = len(self._heap)
+        return stats
+
+
+__all__ = [
+    'RX_ANCILLARY_SIZE',
+    'IngestBatch',
+    'ShardMerger',
+    'UDPReceiverThread',
+    'collect_parser_events',
+    'enable_kernel_timestamps',
+    'resolve_arrival',
+]
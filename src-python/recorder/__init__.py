@@ -1,5 +1,6 @@
 """数据录制器模块。"""
 
 from .data_recorder import RawDataRecorder
+from .raw_capture import RawCaptureWriter, export_pcap, iter_capture, replay_capture
 
-__all__ = ['RawDataRecorder']
\ No newline at end of file
+__all__ = ['RawDataRecorder', 'RawCaptureWriter', 'export_pcap', 'iter_capture', 'replay_capture']
@@ -132,6 +132,29 @@ def _get_fcs_onboard_headers() -> List[str]:
     return headers
 
 
+_OBSTACLE_KEYS = ('cx', 'cy', 'cz', 'sx', 'sy', 'sz', 'vx', 'vy', 'vz')
+
+
+def unflatten_path_points(values: Any) -> List[Dict[str, float]]:
+    """0x71 展平坐标 [x0, y0, z0, x1, ...] 还原为 {x, y, z} 列表"""
+    if not isinstance(values, list):
+        return []
+    return [
+        {'x': float(values[index]), 'y': float(values[index + 1]), 'z': float(values[index + 2])}
+        for index in range(0, len(values) - 2, 3)
+    ]
+
+
+def unflatten_obstacles(values: Any) -> List[Dict[str, float]]:
+    """0x71 展平障碍物（每个 9 个值）还原为 {cx .. vz} 列表"""
+    if not isinstance(values, list):
+        return []
+    return [
+        {key: float(value) for key, value in zip(_OBSTACLE_KEYS, values[index:index + 9])}
+        for index in range(0, len(values) - 8, 9)
+    ]
+
+
 class RawDataRecorder:
     NODE_UNKNOWN = 0
     NODE_MCU = 1
@@ -249,10 +272,9 @@ class RawDataRecorder:
         self._write_data_quality_report()
 
     def _init_fcs_cycle_cache(self):
-        header = csv_helper.get_full_header()
-        self.fcs_cache = [''] * len(header.split(','))
+        self.fcs_cache = [''] * csv_helper.TOTAL_COLUMNS
         for msg_type in FCS_VIEW_PRIMER_TYPES:
-            csv_helper.update_cache_and_get_line(msg_type, {'timestamp': '', 'data': {}}, self.fcs_cache)
+            csv_helper.update_cache(msg_type, {'timestamp': '', 'data': {}}, self.fcs_cache)
         if self.fcs_cache:
             self.fcs_cache[0] = ''
         self.fcs_cycle_seen.clear()
@@ -398,9 +420,28 @@ class RawDataRecorder:
             })
         return normalized
 
+    def _unflatten_path_points(self, values: Any) -> List[Dict[str, float]]:
+        return unflatten_path_points(values)
+
+    def _unflatten_obstacles(self, values: Any) -> List[Dict[str, float]]:
+        return unflatten_obstacles(values)
+
+    def _get_planning_global_path(self, data: dict) -> List[dict]:
+        # 0x71 实时解码输出展平坐标（global_path_flat），旧版/离线数据仍为 {x, y, z} 列表
+        if 'global_path_flat' in data:
+            return self._unflatten_path_points(data.get('global_path_flat'))
+        return self._normalize_path_points(data.get('global_path', []))
+
     def _get_planning_local_path(self, data: dict) -> List[dict]:
+        if 'local_path_flat' in data:
+            return self._unflatten_path_points(data.get('local_path_flat'))
         return self._normalize_path_points(data.get('local_path') or data.get('local_traj') or [])
 
+    def _get_planning_obstacles(self, data: dict) -> List[dict]:
+        if 'obstacles_flat' in data:
+            return self._unflatten_obstacles(data.get('obstacles_flat'))
+        return self._normalize_obstacles(data.get('obstacles', []))
+
     def _get_planning_position(self, data: dict) -> Dict[str, float]:
         position = data.get('position', {}) if isinstance(data.get('position'), dict) else {}
         return {
@@ -472,8 +513,8 @@ class RawDataRecorder:
         if writer is None:
             return
         local_path = self._get_planning_local_path(data)
-        global_path = self._normalize_path_points(data.get('global_path', []))
-        obstacles = self._normalize_obstacles(data.get('obstacles', []))
+        global_path = self._get_planning_global_path(data)
+        obstacles = self._get_planning_obstacles(data)
         position = self._get_planning_position(data)
         writer.writerow([
             f'{self._as_epoch_seconds(arrival_ts_ms):.6f}' if arrival_ts_ms is not None else '',
@@ -503,7 +544,7 @@ class RawDataRecorder:
         writer = self.csv_writers.get('radar_data')
         if writer is None:
             return
-        obstacles = self._normalize_obstacles(data.get('obstacles', []))
+        obstacles = self._get_planning_obstacles(data)
         obs_count = int(data.get('obstacle_count', len(obstacles)) or 0)
         for obstacle_index, obstacle in enumerate(obstacles):
             writer.writerow([
@@ -619,7 +660,7 @@ class RawDataRecorder:
         if msg_type == 'fcs_pwms':
             self._flush_fcs_snapshot_if_pending()
 
-        csv_helper.update_cache_and_get_line(msg_type, {
+        csv_helper.update_cache(msg_type, {
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3],
             'data': data,
         }, self.fcs_cache)
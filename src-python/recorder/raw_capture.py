@@ -0,0 +1,348 @@
+"""
+原始 UDP datagram 抓包文件（.gcscap）
+
+录制会话期间把收到/发出的每个 datagram 原样追加写入二进制文件，解析器修复后可按原始字节
+逐位重放整次飞行。写入只做一次 struct.pack 与拼接，由后台线程批量落盘，开销远低于 CSV 格式化。
+
+文件格式（小端）：
+    文件头  FILE_HEADER: 魔数 b'GCSCAP\\0' + 版本(u8) + 创建时间 ns(i64) + 本机 IPv4(4s)
+    记录    RECORD_HEADER: 时间戳 ns(i64), 本地端口(u16), 方向(u8, 0=rx 1=tx), 保留(u8),
+                           对端 IPv4(4s), 对端端口(u16), 长度(u32)，其后紧跟原始字节
+进程异常退出时文件尾部可能残留半条记录，读取时忽略。
+
+另提供：
+    iter_capture  逐条读取记录
+    export_pcap   导出为 pcap（LINKTYPE_RAW，合成 IPv4/UDP 头），可用 Wireshark 等工具查看
+    replay_capture 把接收方向的 datagram 按原始节奏（1× / N× / 不限速）重新发往本机端口
+"""
+
+import logging
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_MAGIC = b'GCSCAP\x00'
+CAPTURE_VERSION = 1
+FILE_HEADER = struct.Struct('<7sBq4s')
+RECORD_HEADER = struct.Struct('<qHBx4sHI')
+
+# 录制会话中抓包文件的默认文件名（位于 records 目录下）
+DEFAULT_CAPTURE_FILENAME = 'udp_capture.gcscap'
+
+DIRECTION_RX = 0
+DIRECTION_TX = 1
+_DIRECTIONS = {'rx': DIRECTION_RX, 'tx': DIRECTION_TX}
+
+# 后台线程落盘周期（秒）与写缓冲大小
+FLUSH_INTERVAL_SEC = 0.2
+WRITE_BUFFER_SIZE = 1024 * 1024
+# 待写记录上限：磁盘长时间阻塞时丢弃新记录并计数，避免内存无限增长
+MAX_PENDING_RECORDS = 200000
+
+_ZERO_IP = b'\x00\x00\x00\x00'
+
+
+def _pack_ipv4(host: Optional[str]) -> bytes:
+    if not host:
+        return _ZERO_IP
+    try:
+        return socket.inet_aton(host)
+    except OSError:
+        return _ZERO_IP
+
+
+@dataclass
+class CaptureRecord:
+    """抓包文件中的一条记录"""
+    timestamp_ns: int
+    local_port: int
+    direction: int
+    peer: Tuple[str, int]
+    data: bytes
+
+    @property
+    def is_rx(self) -> bool:
+        return self.direction == DIRECTION_RX
+
+
+class RawCaptureWriter:
+    """追加写入 .gcscap 文件；write() 可在事件循环与接收线程中并发调用"""
+
+    def __init__(self, path: str, local_host: Optional[str] = None):
+        self.path = path
+        self.local_host = local_host
+        self._pending: deque = deque()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self.stats: Dict[str, int] = {
+            'records': 0,
+            'bytes': 0,
+            'dropped': 0,
+            'write_errors': 0,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+        self._file = open(self.path, 'ab', buffering=WRITE_BUFFER_SIZE)
+        if self._file.tell() == 0:
+            self._file.write(FILE_HEADER.pack(
+                CAPTURE_MAGIC, CAPTURE_VERSION, time.time_ns(), _pack_ipv4(self.local_host),
+            ))
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='raw-capture-writer', daemon=True)
+        self._thread.start()
+        logger.info(f"原始数据包抓包已开始: {self.path}")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """停止后台线程并把剩余记录写完（阻塞调用）"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._file is not None:
+            self._drain()
+            self._file.close()
+            self._file = None
+            logger.info(f"原始数据包抓包已结束: {self.path} ({self.stats['records']} 条, {self.stats['bytes']} 字节)")
+
+    def write(
+        self,
+        local_port: int,
+        data: bytes,
+        peer: Optional[Tuple[str, int]] = None,
+        direction: str = 'rx',
+        timestamp_ns: Optional[int] = None,
+    ) -> None:
+        pending = self._pending
+        if len(pending) >= MAX_PENDING_RECORDS:
+            self.stats['dropped'] += 1
+            return
+        if peer:
+            peer_ip = _pack_ipv4(peer[0])
+            peer_port = peer[1]
+        else:
+            peer_ip = _ZERO_IP
+            peer_port = 0
+        header = RECORD_HEADER.pack(
+            time.time_ns() if timestamp_ns is None else timestamp_ns,
+            local_port,
+            _DIRECTIONS.get(direction, DIRECTION_RX),
+            peer_ip,
+            peer_port,
+            len(data),
+        )
+        # 单次 append 保证多线程写入时记录头与数据不会交错
+        pending.append(header + data)
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = dict(self.stats)
+        stats['path'] = self.path
+        stats['pending'] = len(self._pending)
+        stats['running'] = self.is_running
+        return stats
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(FLUSH_INTERVAL_SEC):
+            self._drain()
+            try:
+                self._file.flush()
+            except OSError as exc:
+                self.stats['write_errors'] += 1
+                logger.error(f"抓包文件刷新失败: {exc}")
+
+    def _drain(self) -> None:
+        pending = self._pending
+        count = len(pending)
+        if not count:
+            return
+        popleft = pending.popleft
+        chunk = b''.join([popleft() for _ in range(count)])
+        try:
+            self._file.write(chunk)
+        except OSError as exc:
+            self.stats['write_errors'] += 1
+            self.stats['dropped'] += count
+            logger.error(f"写入抓包文件失败: {exc}")
+            return
+        self.stats['records'] += count
+        self.stats['bytes'] += len(chunk)
+
+
+# ================================================================
+# 读取 / 导出 / 重放
+# ================================================================
+
+def read_capture_header(handle) -> Dict[str, Any]:
+    raw = handle.read(FILE_HEADER.size)
+    if len(raw) < FILE_HEADER.size:
+        raise ValueError('抓包文件头不完整')
+    magic, version, created_ns, local_ip = FILE_HEADER.unpack(raw)
+    if magic != CAPTURE_MAGIC:
+        raise ValueError('不是 .gcscap 抓包文件')
+    if version != CAPTURE_VERSION:
+        raise ValueError(f'不支持的抓包文件版本: {version}')
+    return {
+        'version': version,
+        'created_ns': created_ns,
+        'local_host': socket.inet_ntoa(local_ip),
+    }
+
+
+def iter_capture(path: str) -> Iterator[CaptureRecord]:
+    """按写入顺序逐条读取记录；尾部不完整的记录被忽略"""
+    with open(path, 'rb') as handle:
+        read_capture_header(handle)
+        header_size = RECORD_HEADER.size
+        while True:
+            header = handle.read(header_size)
+            if len(header) < header_size:
+                return
+            timestamp_ns, local_port, direction, peer_ip, peer_port, length = RECORD_HEADER.unpack(header)
+            data = handle.read(length)
+            if len(data) < length:
+                return
+            yield CaptureRecord(timestamp_ns, local_port, direction, (socket.inet_ntoa(peer_ip), peer_port), data)
+
+
+def summarize_capture(path: str) -> Dict[str, Any]:
+    with open(path, 'rb') as handle:
+        header = read_capture_header(handle)
+    records = 0
+    total_bytes = 0
+    by_port: Dict[str, int] = {}
+    first_ns = last_ns = None
+    for record in iter_capture(path):
+        records += 1
+        total_bytes += len(record.data)
+        key = f"{'rx' if record.is_rx else 'tx'}:{record.local_port}"
+        by_port[key] = by_port.get(key, 0) + 1
+        if first_ns is None:
+            first_ns = record.timestamp_ns
+        last_ns = record.timestamp_ns
+    return {
+        **header,
+        'records': records,
+        'payload_bytes': total_bytes,
+        'duration_sec': round((last_ns - first_ns) / 1e9, 6) if records else 0.0,
+        'by_direction_port': by_port,
+    }
+
+
+# pcap 全局头：魔数(微秒精度), 版本 2.4, 时区, 精度, snaplen, LINKTYPE_RAW(101)
+_PCAP_GLOBAL_HEADER = struct.Struct('<IHHiIII')
+_PCAP_RECORD_HEADER = struct.Struct('<IIII')
+_IPV4_HEADER = struct.Struct('!BBHHHBBH4s4s')
+_UDP_HEADER = struct.Struct('!HHHH')
+_LINKTYPE_RAW = 101
+
+
+def _ipv4_checksum(header: bytes) -> int:
+    total = sum(struct.unpack('!10H', header))
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    return ~total & 0xFFFF
+
+
+def _build_ipv4_udp(src_ip: bytes, src_port: int, dst_ip: bytes, dst_port: int, payload: bytes, ident: int) -> bytes:
+    udp_length = _UDP_HEADER.size + len(payload)
+    total_length = _IPV4_HEADER.size + udp_length
+    header = _IPV4_HEADER.pack(0x45, 0, total_length, ident & 0xFFFF, 0, 64, socket.IPPROTO_UDP, 0, src_ip, dst_ip)
+    header = header[:10] + struct.pack('!H', _ipv4_checksum(header)) + header[12:]
+    # IPv4 下 UDP 校验和为 0 表示未计算
+    return header + _UDP_HEADER.pack(src_port, dst_port, udp_length, 0) + payload
+
+
+def export_pcap(capture_path: str, pcap_path: str, local_host: Optional[str] = None) -> int:
+    """导出为 pcap；本机地址默认取抓包文件头中记录的监听地址。返回导出的记录数"""
+    with open(capture_path, 'rb') as handle:
+        header = read_capture_header(handle)
+    local_ip = _pack_ipv4(local_host or header['local_host'])
+
+    count = 0
+    with open(pcap_path, 'wb') as out:
+        out.write(_PCAP_GLOBAL_HEADER.pack(0xA1B2C3D4, 2, 4, 0, 0, 65535, _LINKTYPE_RAW))
+        for record in iter_capture(capture_path):
+            peer_ip = _pack_ipv4(record.peer[0])
+            if record.is_rx:
+                packet = _build_ipv4_udp(peer_ip, record.peer[1], local_ip, record.local_port, record.data, count)
+            else:
+                packet = _build_ipv4_udp(local_ip, record.local_port, peer_ip, record.peer[1], record.data, count)
+            seconds, nanos = divmod(record.timestamp_ns, 1_000_000_000)
+            out.write(_PCAP_RECORD_HEADER.pack(seconds, nanos // 1000, len(packet), len(packet)))
+            out.write(packet)
+            count += 1
+    return count
+
+
+def replay_capture(
+    capture_path: str,
+    host: str = '127.0.0.1',
+    speed: float = 1.0,
+    ports: Optional[Sequence[int]] = None,
+    port_map: Optional[Dict[int, int]] = None,
+    stop_event: Optional[threading.Event] = None,
+) -> Dict[str, Any]:
+    """把接收方向的 datagram 重新发往 host 上的原端口（阻塞调用）
+
+    Args:
+        speed: 1.0 为原始节奏，N 为 N 倍速，<= 0 为不限速
+        ports: 只重放这些本地端口的记录（默认全部）
+        port_map: 端口改写 {原端口: 目标端口}
+        stop_event: 置位时提前结束
+    """
+    wanted = set(ports) if ports else None
+    port_map = port_map or {}
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sent = 0
+    sent_bytes = 0
+    first_ns = None
+    started = time.perf_counter()
+    try:
+        for record in iter_capture(capture_path):
+            if not record.is_rx or (wanted is not None and record.local_port not in wanted):
+                continue
+            if stop_event is not None and stop_event.is_set():
+                break
+            if first_ns is None:
+                first_ns = record.timestamp_ns
+            if speed > 0:
+                due = started + (record.timestamp_ns - first_ns) / 1e9 / speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            sender.sendto(record.data, (host, port_map.get(record.local_port, record.local_port)))
+            sent += 1
+            sent_bytes += len(record.data)
+    finally:
+        sender.close()
+    elapsed = time.perf_counter() - started
+    return {
+        'sent': sent,
+        'bytes': sent_bytes,
+        'elapsed_sec': round(elapsed, 6),
+        'pps': round(sent / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+__all__ = [
+    'DEFAULT_CAPTURE_FILENAME',
+    'CaptureRecord',
+    'RawCaptureWriter',
+    'export_pcap',
+    'iter_capture',
+    'read_capture_header',
+    'replay_capture',
+    'summarize_capture',
+]
@@ -9,8 +9,28 @@ import logging
 from typing import Dict, Any, List
 from datetime import datetime
 
+from .data_recorder import unflatten_obstacles, unflatten_path_points
+
 logger = logging.getLogger(__name__)
 
+
+def _planning_list(data: dict, flat_key: str, list_key: str, unflatten) -> list:
+    # 0x71 实时解码只输出展平坐标（*_flat），旧版/离线数据仍为对象列表
+    if flat_key in data:
+        return unflatten(data.get(flat_key))
+    return data.get(list_key, [])
+
+
+def _unflatten_obstacles_nested(values) -> list:
+    # obstacles_json 保持旧版 Object3d_T.to_json 的 {center, size, velocity} 嵌套结构
+    return [
+        {
+            part: {axis: obstacle[f'{prefix}{axis}'] for axis in 'xyz'}
+            for part, prefix in (('center', 'c'), ('size', 's'), ('velocity', 'v'))
+        }
+        for obstacle in unflatten_obstacles(values)
+    ]
+
 class UnifiedRecorder:
     def __init__(self, session_dir: str):
         self.session_dir = session_dir
@@ -99,24 +119,15 @@ class UnifiedRecorder:
                 'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
                 'data': data
             }
-            # 利用 helper 获取数据行 (可能含有空值)
-            # 注意: csv_helper_full 是针对 ExtY_FCS_T 结构的
-            line = csv_helper_full.get_data_for_type(msg_type, wrapped)
-            
             # 这里的逻辑是实现"最后值保持" (Zero-Order Hold)
-            # 1. 拆分新数据行
-            new_vals = line.split(',')
-            
-            # 2. 确保缓存初始化且大小匹配
-            if not hasattr(self, 'fcs_cache') or self.fcs_cache is None or len(self.fcs_cache) != len(new_vals):
-                self.fcs_cache = [""] * len(new_vals)
-                
-            # 3. 将新数据中非空的值更新到缓存中
-            for i, val in enumerate(new_vals):
-                if val != "":
-                    self.fcs_cache[i] = val
-            
-            # 4. 写入完整缓存行 (不再是稀疏矩阵)
+            # 1. 确保缓存初始化且大小匹配
+            if not hasattr(self, 'fcs_cache') or self.fcs_cache is None or len(self.fcs_cache) != csv_helper_full.TOTAL_COLUMNS:
+                self.fcs_cache = [""] * csv_helper_full.TOTAL_COLUMNS
+
+            # 2. 按列下标把当前帧写入缓存 (注意: csv_helper_full 是针对 ExtY_FCS_T 结构的)
+            csv_helper_full.update_cache(msg_type, wrapped, self.fcs_cache)
+
+            # 3. 写入完整缓存行 (不再是稀疏矩阵)
             self.files['fcs'].write(",".join(self.fcs_cache) + "\n")
             self._flush_if_needed('fcs')
         except Exception as e:
@@ -130,9 +141,12 @@ class UnifiedRecorder:
             # 使用JSON序列化完整保留列表数据 (PathPoint_T list, Object3d_T list)
             # 假设 data 中的 global_path 等已经是 dict 或 list[dict]
             # 如果是对象实例，需要 ensure_ascii=False 并且使用 default处理器
-            gp_json = json.dumps(data.get('global_path', []), ensure_ascii=False, default=lambda o: o.__dict__)
-            lp_json = json.dumps(data.get('local_path', []), ensure_ascii=False, default=lambda o: o.__dict__)
-            obs_json = json.dumps(data.get('obstacles', []), ensure_ascii=False, default=lambda o: o.__dict__)
+            global_path = _planning_list(data, 'global_path_flat', 'global_path', unflatten_path_points)
+            local_path = _planning_list(data, 'local_path_flat', 'local_path', unflatten_path_points)
+            obstacles = _planning_list(data, 'obstacles_flat', 'obstacles', _unflatten_obstacles_nested)
+            gp_json = json.dumps(global_path, ensure_ascii=False, default=lambda o: o.__dict__)
+            lp_json = json.dumps(local_path, ensure_ascii=False, default=lambda o: o.__dict__)
+            obs_json = json.dumps(obstacles, ensure_ascii=False, default=lambda o: o.__dict__)
 
             row = [
                 ts,
@@ -169,7 +183,8 @@ class UnifiedRecorder:
                 row[3] = data.get('frame_id', 0)
                 row[4] = f"{data.get('timestamp_sec', 0):.4f}"
                 # 记录障碍物列表JSON
-                row[15] = json.dumps(data.get('obstacles', []), ensure_ascii=False, default=lambda o: o.__dict__)
+                obstacles = _planning_list(data, 'obstacles_flat', 'obstacles', _unflatten_obstacles_nested)
+                row[15] = json.dumps(obstacles, ensure_ascii=False, default=lambda o: o.__dict__)
             
             elif msg_type == 'lidar_performance':
                 # perf fields
@@ -1,9 +1,15 @@
 from .config_routes import create_config_router
 from .general_routes import create_general_router
+from .ingress_routes import create_ingress_router
 from .operations_routes import create_operations_router
+from .pipeline_routes import create_pipeline_router
+from .trace_routes import create_trace_router
 
 __all__ = [
     'create_config_router',
     'create_general_router',
+    'create_ingress_router',
     'create_operations_router',
+    'create_pipeline_router',
+    'create_trace_router',
 ]
\ No newline at end of file
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from app_models import IngressLimitConfig
+
+
+def create_ingress_router(
+    *,
+    get_ingress_config_handler,
+    update_ingress_config_handler,
+) -> APIRouter:
+    router = APIRouter()
+
+    @router.get('/api/ingress/config')
+    async def get_ingress_config() -> dict:
+        return await get_ingress_config_handler()
+
+    @router.post('/api/ingress/config')
+    async def update_ingress_config(config_payload: IngressLimitConfig) -> dict:
+        return await update_ingress_config_handler(config_payload)
+
+    return router
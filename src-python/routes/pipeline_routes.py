@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from app_models import DecimationConfig
+
+
+def create_pipeline_router(
+    *,
+    get_pipeline_latency_handler,
+    reset_pipeline_latency_handler,
+    get_decimation_config_handler,
+    update_decimation_config_handler,
+) -> APIRouter:
+    router = APIRouter()
+
+    @router.get('/api/pipeline/latency')
+    async def get_pipeline_latency() -> dict:
+        return await get_pipeline_latency_handler()
+
+    @router.post('/api/pipeline/latency/reset')
+    async def reset_pipeline_latency() -> dict:
+        return await reset_pipeline_latency_handler()
+
+    @router.get('/api/pipeline/decimation')
+    async def get_decimation_config() -> dict:
+        return await get_decimation_config_handler()
+
+    @router.post('/api/pipeline/decimation')
+    async def update_decimation_config(config_payload: DecimationConfig) -> dict:
+        return await update_decimation_config_handler(config_payload)
+
+    return router
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter
+
+from app_models import PacketTraceConfig
+
+
+def create_trace_router(
+    *,
+    get_packet_trace_config_handler,
+    update_packet_trace_config_handler,
+    download_packet_trace_handler,
+) -> APIRouter:
+    router = APIRouter()
+
+    @router.get('/api/trace/config')
+    async def get_packet_trace_config() -> dict:
+        return await get_packet_trace_config_handler()
+
+    @router.post('/api/trace/config')
+    async def update_packet_trace_config(config_payload: PacketTraceConfig) -> dict:
+        return await update_packet_trace_config_handler(config_payload)
+
+    @router.get('/api/trace/packets')
+    async def download_packet_trace(port: Optional[int] = None):
+        return await download_packet_trace_handler(port)
+
+    return router
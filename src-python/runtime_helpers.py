@@ -9,21 +9,23 @@ def cache_ws_snapshot(manager: Any, payload: dict, cache_key: str) -> dict:
     return payload
 
 
-def get_pipeline_status(
-    packet_processing_queue: Any,
-    recording_queue: Any,
-    online_analysis_queue: Any,
-    pending_latest_packets: dict,
-    pending_online_analysis_packets: dict,
-    packet_drop_counters: dict,
-) -> dict:
+def get_pipeline_status(stage_snapshots: dict) -> dict:
+    def _stage(name: str) -> dict:
+        return stage_snapshots.get(name) or {}
+
+    drop_counters = {}
+    for name, snapshot in stage_snapshots.items():
+        drop_counters[f'{name}_queue_full'] = snapshot.get('dropped', 0)
+        drop_counters[f'{name}_queue_coalesced'] = snapshot.get('coalesced', 0)
+
     return {
-        'packet_queue_size': packet_processing_queue.qsize() if packet_processing_queue else 0,
-        'recording_queue_size': recording_queue.qsize() if recording_queue else 0,
-        'online_analysis_queue_size': online_analysis_queue.qsize() if online_analysis_queue else 0,
-        'pending_latest_packet_types': len(pending_latest_packets),
-        'pending_online_analysis_packet_types': len(pending_online_analysis_packets),
-        'drop_counters': dict(packet_drop_counters),
+        'packet_queue_size': _stage('processing').get('queue_size', 0),
+        'recording_queue_size': _stage('recording').get('queue_size', 0),
+        'online_analysis_queue_size': _stage('online_analysis').get('queue_size', 0),
+        'pending_latest_packet_types': _stage('processing').get('pending_keys', 0),
+        'pending_online_analysis_packet_types': _stage('online_analysis').get('pending_keys', 0),
+        'drop_counters': drop_counters,
+        'stages': stage_snapshots,
     }
 
 
@@ -64,10 +66,27 @@ def get_transport_runtime_stats(udp_handler: Any, empty_recent_snapshot: dict) -
                 'by_reason_total': {},
                 'recent': recent,
             },
+            'link_quality': {
+                'window_seconds': recent['window_seconds'],
+                'streams': 0,
+                'degraded_streams': [],
+                'by_port': {},
+            },
+            'ingress': {
+                'shed_total': 0,
+                'shed_by_port': {},
+                'shed_by_func_code': {},
+            },
         }
     return udp_handler.get_runtime_stats()
 
 
+def get_ingest_status(udp_handler: Any) -> dict:
+    if not udp_handler:
+        return {'mode': None, 'running': False}
+    return udp_handler.get_ingest_status()
+
+
 def resolve_command_channel(command_type: str) -> Optional[str]:
     if command_type in {'cmd_idx', 'cmd_mission', 'set_pids'}:
         return 'flight_control'
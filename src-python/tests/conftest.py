@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 测试以 src-python 为导入根（与 main.py 运行时一致）
+SRC_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SRC_ROOT not in sys.path:
+    sys.path.insert(0, SRC_ROOT)
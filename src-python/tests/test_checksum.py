@@ -0,0 +1,93 @@
+"""XOR 校验和：快速实现与逐字节参考实现在随机载荷上的一致性"""
+
+import random
+
+import pytest
+
+from benchmarks.frame_generator import random_planning_payload
+from protocol.checksum import frame_checksum, xor_checksum, xor_checksum_reference
+from protocol.nclink_protocol import (
+    NCLINK_END0,
+    NCLINK_END1,
+    NCLINK_GCS_COMMAND,
+    NCLINK_GCS_TELEMETRY,
+    NCLINK_HEAD0,
+    NCLINK_HEAD1,
+    NCLinkFrame,
+    NCLinkProtocolParser,
+    PortType,
+)
+
+# 含向量化阈值（160）两侧与非 8 字节对齐的长度
+SIZES = (0, 1, 7, 8, 9, 15, 16, 17, 159, 160, 161, 245, 2448, 4097)
+
+
+def _reference_frame_checksum(func_code: int, payload: bytes) -> int:
+    size = len(payload)
+    header = bytes((NCLINK_HEAD0, NCLINK_HEAD1, func_code, (size >> 8) & 0xFF, size & 0xFF))
+    return xor_checksum_reference(header + payload)
+
+
+def _planning_payloads(rng: random.Random):
+    return [
+        random_planning_payload(rng, rng.randint(0, 20), rng.randint(0, 50), rng.randint(0, 10))
+        for _ in range(8)
+    ]
+
+
+def _random_payloads(rng: random.Random):
+    payloads = [rng.randbytes(size) for size in SIZES for _ in range(4)]
+    payloads += [rng.randbytes(rng.randrange(0, 4096)) for _ in range(200)]
+    return payloads + _planning_payloads(rng)
+
+
+@pytest.fixture(scope='module')
+def payloads():
+    return _random_payloads(random.Random(20260330))
+
+
+def test_xor_checksum_matches_reference(payloads):
+    for payload in payloads:
+        expected = xor_checksum_reference(payload)
+        for candidate in (payload, bytearray(payload), memoryview(payload)):
+            assert xor_checksum(candidate) == expected, len(payload)
+        assert xor_checksum(payload, 0x5A) == xor_checksum_reference(payload, 0x5A)
+
+
+def test_frame_checksum_matches_reference(payloads):
+    rng = random.Random(7)
+    for payload in payloads:
+        func_code = rng.randrange(256)
+        expected = _reference_frame_checksum(func_code, payload)
+        assert frame_checksum(func_code, payload) == expected
+        assert NCLinkFrame.calculate_checksum(func_code, payload) == expected
+
+
+def test_create_frame_layout(payloads):
+    for payload in payloads:
+        frame = NCLinkFrame.create_frame(NCLINK_GCS_TELEMETRY, payload)
+        raw = frame.to_bytes()
+        size = len(payload)
+        assert raw[:5] == bytes((NCLINK_HEAD0, NCLINK_HEAD1, NCLINK_GCS_TELEMETRY, size >> 8, size & 0xFF))
+        assert raw[5:5 + size] == payload
+        assert raw[-3] == xor_checksum_reference(raw[:-3])
+        assert raw[-2:] == bytes((NCLINK_END0, NCLINK_END1))
+        assert frame.validate()
+
+
+@pytest.mark.parametrize('func_code', [NCLINK_GCS_TELEMETRY, NCLINK_GCS_COMMAND])
+def test_parse_frame_checksum(payloads, func_code):
+    events = []
+    parser = NCLinkProtocolParser(on_event=events.append, emit_parsed_events=False)
+    for payload in payloads:
+        raw = NCLinkFrame.create_frame(func_code, payload).to_bytes()
+        parser.parse_frame(raw, PortType.PORT_18511_PLANNING)
+        parser.parse_frame(memoryview(raw), PortType.PORT_18511_PLANNING)
+    assert not [event for event in events if event.get('reason') == 'checksum_mismatch']
+
+    for payload in payloads[:32]:
+        raw = bytearray(NCLinkFrame.create_frame(func_code, payload).to_bytes())
+        raw[-3] ^= 0x01
+        parser.parse_frame(bytes(raw), PortType.PORT_18511_PLANNING)
+    mismatches = [event for event in events if event.get('reason') == 'checksum_mismatch']
+    assert len(mismatches) == 32
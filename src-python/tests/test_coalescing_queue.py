@@ -0,0 +1,78 @@
+"""CoalescingQueue：FIFO 与最新值通道的顺序、容量、等待与 join"""
+
+import asyncio
+
+import pytest
+
+from pipeline.coalescing_queue import CoalescingQueue
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_fifo_before_latest_and_replace_keeps_position():
+    async def scenario():
+        queue = CoalescingQueue(maxsize=2)
+        queue.put_nowait('a')
+        assert queue.replace('x', 'x1') is False
+        assert queue.replace('y', 'y1') is False
+        assert queue.replace('x', 'x2') is True
+        queue.put_nowait('b')
+        with pytest.raises(asyncio.QueueFull):
+            queue.put_nowait('c')
+        assert queue.qsize() == 4 and queue.superseded == 1
+        return [queue.get_nowait() for _ in range(4)]
+
+    assert _run(scenario()) == ['a', 'b', 'x2', 'y1']
+
+
+def test_get_waits_for_replace_and_put_waits_for_space():
+    async def scenario():
+        queue = CoalescingQueue(maxsize=1)
+        getter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+        queue.replace('k', 'v')
+        assert await asyncio.wait_for(getter, 1.0) == 'v'
+
+        queue.put_nowait('first')
+        putter = asyncio.create_task(queue.put('second'))
+        await asyncio.sleep(0)
+        assert not putter.done()
+        assert queue.get_nowait() == 'first'
+        await asyncio.wait_for(putter, 1.0)
+        assert queue.get_nowait() == 'second'
+        with pytest.raises(asyncio.QueueEmpty):
+            queue.get_nowait()
+
+    _run(scenario())
+
+
+def test_join_counts_replaced_keys_once_and_barrier_orders_latest():
+    async def scenario():
+        queue = CoalescingQueue()
+        queue.replace('k', 1)
+        queue.replace('k', 2)
+        queue.put_barrier('barrier')
+        items = []
+        while not queue.empty():
+            items.append(await queue.get())
+            queue.task_done()
+        await asyncio.wait_for(queue.join(), 1.0)
+        with pytest.raises(ValueError):
+            queue.task_done()
+        return items
+
+    assert _run(scenario()) == [2, 'barrier']
+
+
+def test_multiple_getters_each_receive_one_item():
+    async def scenario():
+        queue = CoalescingQueue()
+        getters = [asyncio.create_task(queue.get()) for _ in range(3)]
+        await asyncio.sleep(0)
+        for index in range(3):
+            queue.put_nowait(index)
+        return sorted(await asyncio.wait_for(asyncio.gather(*getters), 1.0))
+
+    assert _run(scenario()) == [0, 1, 2]
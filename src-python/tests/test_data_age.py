@@ -0,0 +1,56 @@
+"""数据时延统计：按消息类型分流、processed_ns 起点与对数分桶分位数"""
+
+import time
+
+from protocol.data_age import DataAgeTracker, LatencyHistogram, bucket_highest_value, bucket_index
+
+MS = 1_000_000
+
+
+def test_bucket_relative_error_is_bounded():
+    for value_us in (0, 1, 15, 16, 17, 100, 1_000, 12_345, 10_000_000):
+        highest = bucket_highest_value(bucket_index(value_us))
+        assert value_us <= highest <= value_us * (1 + 1 / 8) + 1
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for value_us in range(1, 1001):
+        histogram.add(value_us)
+    assert histogram.percentile_us(0.5) in range(500, 564)
+    assert histogram.percentile_us(1.0) == 1000
+
+
+def test_downstream_stage_records_both_origins_per_type():
+    tracker = DataAgeTracker()
+    now = time.monotonic_ns()
+    messages = [
+        {'type': 'fcs_states', 'arrival_ns': now - 30 * MS, 'processed_ns': now - 10 * MS},
+        {'type': 'planning_telemetry', 'arrival_ns': now - 50 * MS, 'processed_ns': now - 20 * MS},
+        {'type': 'fcs_states'},
+    ]
+    tracker.record_messages('broadcast', messages, now)
+    tracker.record_messages('processing', messages, now)
+
+    summary = tracker.snapshot()
+    assert summary['broadcast']['count'] == 2
+    assert summary['broadcast']['max_ms'] == 50.0
+    assert summary['broadcast']['since_processing']['max_ms'] == 20.0
+    # processing 只从到达起算
+    assert 'since_processing' not in summary['processing']
+
+    detail = tracker.snapshot_by_type()['stages']['broadcast']['by_type']
+    assert detail['fcs_states']['mean_ms'] == 30.0
+    assert detail['fcs_states']['since_processing']['mean_ms'] == 10.0
+    assert detail['planning_telemetry']['recent_p99_ms'] >= 49.0
+
+
+def test_untyped_samples_and_reset():
+    tracker = DataAgeTracker()
+    tracker.record_ages('socket', [2 * MS, 4 * MS])
+    snapshot = tracker.snapshot()
+    assert snapshot['socket']['count'] == 2
+    assert snapshot['socket']['last_ms'] == 4.0
+    assert tracker.snapshot_by_type()['stages']['socket']['by_type'] == {}
+    tracker.reset()
+    assert tracker.snapshot()['socket']['count'] == 0
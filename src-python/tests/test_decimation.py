@@ -0,0 +1,40 @@
+"""抽稀规则更新：显式 null 不应覆盖已有字段"""
+
+from pipeline.decimation import CONSUMER_WEBSOCKET, KEEP_LATEST, DecimationPolicy, DecimationRule
+
+
+def _policy():
+    return DecimationPolicy({
+        CONSUMER_WEBSOCKET: {
+            'fcs_states': {'max_rate_hz': 20.0, 'keep': KEEP_LATEST, 'fields': ['roll']},
+        },
+    })
+
+
+def test_null_fields_keep_existing_rule():
+    policy = _policy()
+    policy.configure({CONSUMER_WEBSOCKET: {'fcs_states': {'enabled': None, 'keep': None, 'max_rate_hz': 5.0}}})
+    rule = policy.rule(CONSUMER_WEBSOCKET, 'fcs_states')
+    assert rule.enabled is True
+    assert rule.keep == KEEP_LATEST
+    assert rule.max_rate_hz == 5.0
+    assert rule.fields == ('roll',)
+
+
+def test_null_projection_clears_fields():
+    policy = _policy()
+    policy.configure({CONSUMER_WEBSOCKET: {'fcs_states': {'fields': None}}})
+    rule = policy.rule(CONSUMER_WEBSOCKET, 'fcs_states')
+    assert rule.fields is None
+    assert rule.max_rate_hz == 20.0
+
+
+def test_null_rule_removes_message_type():
+    policy = _policy()
+    policy.configure({CONSUMER_WEBSOCKET: {'fcs_states': None}})
+    assert policy.rule(CONSUMER_WEBSOCKET, 'fcs_states').max_rate_hz == 0.0
+
+
+def test_new_rule_with_nulls_uses_defaults():
+    rule = DecimationRule.from_value({'enabled': None, 'max_rate_hz': None, 'keep': None})
+    assert rule.to_dict() == DecimationRule().to_dict()
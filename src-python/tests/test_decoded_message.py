@@ -0,0 +1,61 @@
+"""DecodedMessage 延迟解码：并发读取时不会看到缺失的 data"""
+
+import threading
+import time
+
+from protocol.nclink_protocol import DecodedMessage
+
+
+class _SlowCodec:
+    """解码前等待，放大事件循环与录制线程同时展开同一条消息的窗口"""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.started = threading.Event()
+        self.calls = 0
+
+    def decode(self, payload):
+        self.calls += 1
+        self.started.set()
+        time.sleep(self.delay)
+        return {'value': payload[0]}
+
+
+def _message(codec):
+    return DecodedMessage({'type': 'fcs_states', 'func_code': 0x42}, codec, b'\x07')
+
+
+def test_concurrent_get_during_materialize():
+    codec = _SlowCodec()
+    message = _message(codec)
+    worker = threading.Thread(target=message.materialize)
+    worker.start()
+    assert codec.started.wait(1.0)
+
+    # 另一线程正在解码时读取：必须拿到 data，而不是 None / KeyError
+    assert 'data' in message
+    assert message.get('data') == {'value': 7}
+    assert message['data'] == {'value': 7}
+    worker.join()
+    assert message.is_materialized
+    assert dict.__getitem__(message, 'data') == {'value': 7}
+
+
+def test_many_threads_read_data():
+    for _ in range(20):
+        message = _message(_SlowCodec(delay=0.005))
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(message.get('data'))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [{'value': 7}] * 8
+
+
+def test_materialized_message_behaves_like_dict():
+    message = _message(_SlowCodec(delay=0))
+    assert len(message) == 3
+    assert dict(message) == {'type': 'fcs_states', 'func_code': 0x42, 'data': {'value': 7}}
+    message['data'] = {'value': 1}
+    assert message.get('data') == {'value': 1}
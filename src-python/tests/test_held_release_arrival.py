@@ -0,0 +1,41 @@
+"""asyncio 接收模式：限流暂存后补发的 datagram 保留原到达时刻"""
+
+import asyncio
+import time
+
+from protocol.ingress_limit import IngressLimiter
+from protocol.nclink_protocol import NCLINK_RECEIVE_EXTY_FCS_STATES, NCLinkFrame, PortType
+from protocol.protocol_parser import NCLinkUDPServerProtocol, UDPHandler
+
+PORT = 18507
+
+
+def _datagram(value: int) -> bytes:
+    return NCLinkFrame.create_frame(NCLINK_RECEIVE_EXTY_FCS_STATES, bytes([value]) * 56).to_bytes()
+
+
+def test_released_datagram_keeps_original_arrival():
+    async def scenario():
+        received = []
+        handler = UDPHandler(on_messages=received.extend)
+        handler.ingress_limiter = IngressLimiter(enabled=True, port_limits={PORT: {'rate': 20.0, 'burst': 1.0}})
+        handler._loop = asyncio.get_running_loop()
+        protocol = NCLinkUDPServerProtocol(handler, PORT)
+        protocol.set_port_type(PortType.PORT_18506_TELEMETRY)
+        handler._protocols[PORT] = protocol
+
+        protocol.datagram_received(_datagram(1), ('127.0.0.1', 9000))
+        before_held = time.monotonic_ns()
+        protocol.datagram_received(_datagram(2), ('127.0.0.1', 9000))
+        after_held = time.monotonic_ns()
+        assert len(received) == 1 and handler.ingress_limiter.holds()
+
+        await asyncio.sleep(0.15)
+        released_at = time.monotonic_ns()
+        handler._release_held()
+        handler._protocols.clear()
+        return received, before_held, after_held, released_at
+
+    received, before_held, after_held, released_at = asyncio.run(scenario())
+    assert len(received) == 2
+    assert before_held <= received[1]['arrival_ns'] <= after_held < released_at
@@ -0,0 +1,50 @@
+"""process 接收模式：原始抓包由接收进程写入，发送方向的记录经队列转交"""
+
+import asyncio
+import socket
+import time
+
+from protocol.ingest_process import IngestProcess
+from protocol.nclink_protocol import PortType
+from recorder.raw_capture import iter_capture
+
+
+async def _capture_session(path):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    ingest = IngestProcess(
+        asyncio.get_running_loop(), {port: sock}, {port: PortType.PORT_18504_RECEIVE},
+        on_batch=lambda batch: None, slot_count=16,
+    )
+    ingest.start()
+    try:
+        capture = ingest.start_capture(str(path), '127.0.0.1')
+        # 控制命令在接收进程的下个统计周期生效，等到接收进程回报抓包已开始
+        deadline = time.monotonic() + 10.0
+        while not capture.snapshot().get('running') and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        assert capture.snapshot().get('running')
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            for index in range(3):
+                sender.sendto(bytes((0xFF, 0xFC, index)), ('127.0.0.1', port))
+        capture.write(port, b'command', ('127.0.0.1', 18506), direction='tx')
+        await asyncio.sleep(0.3)
+        await asyncio.to_thread(capture.stop)
+    finally:
+        await asyncio.to_thread(ingest.stop)
+        ingest.cancel_polling()
+        sock.close()
+    return port
+
+
+def test_worker_writes_received_and_sent_datagrams(tmp_path):
+    path = tmp_path / 'udp_capture.gcscap'
+    port = asyncio.run(_capture_session(path))
+
+    records = list(iter_capture(str(path)))
+    rx = [record.data for record in records if record.is_rx]
+    tx = [record for record in records if not record.is_rx]
+    assert rx == [bytes((0xFF, 0xFC, index)) for index in range(3)]
+    assert [record.data for record in tx] == [b'command']
+    assert tx[0].local_port == port and tx[0].peer == ('127.0.0.1', 18506)
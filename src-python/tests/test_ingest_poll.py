@@ -0,0 +1,28 @@
+"""独立进程接收模式：主进程轮询时跨 lane 的记录按到达顺序还原"""
+
+import asyncio
+
+from protocol.ingest_process import IngestProcess
+from protocol.nclink_protocol import STRICT_PAYLOAD_SIZES
+from protocol.shm_ring import SharedMemoryRing
+
+# (功能码, 到达时刻) —— 交错写入两条 lane
+WRITES = [(0x41, 10), (0x42, 20), (0x41, 30), (0x42, 40), (0x45, 50)]
+
+
+def test_poll_merges_lanes_by_arrival():
+    loop = asyncio.new_event_loop()
+    ingest = IngestProcess(loop, {}, {}, on_batch=None, slot_count=16)
+    ingest.ring = SharedMemoryRing.create(ingest.lane_specs)
+    try:
+        for func_code, arrival in WRITES:
+            payload = bytes(STRICT_PAYLOAD_SIZES[func_code])
+            ingest.ring.write(func_code, payload, timestamp=arrival, port_type=0, arrival_ns=arrival)
+        batch, full = ingest.poll()
+    finally:
+        ingest.ring.close()
+        loop.close()
+
+    assert not full
+    assert batch.arrivals == [arrival for _, arrival in WRITES]
+    assert [m['func_code'] for m in batch.messages] == [func_code for func_code, _ in WRITES]
@@ -0,0 +1,48 @@
+"""接收进程内帧解析异常计入 feed_errors 并随统计回传"""
+
+import queue
+import socket
+import threading
+import time
+
+from protocol import ingest_process
+from protocol.nclink_protocol import PortType
+from protocol.shm_ring import SharedMemoryRing, default_lane_specs
+
+
+def test_feed_errors_are_counted(monkeypatch):
+    def broken_feed(self, *args, **kwargs):
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(ingest_process._RingWriterParser, 'feed_data', broken_feed)
+
+    specs = default_lane_specs(16)
+    ring = SharedMemoryRing.create(specs)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    stats_queue = queue.Queue()
+    stop_event = threading.Event()
+    worker = threading.Thread(
+        target=ingest_process.run_ingest_worker,
+        args=(ring.name, specs, {port: sock}, {port: int(PortType.PORT_18504_RECEIVE)}, stats_queue, stop_event),
+    )
+    worker.start()
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            for _ in range(3):
+                sender.sendto(b'\xff\xfc\x45\x00\x03abc', ('127.0.0.1', port))
+        deadline = time.monotonic() + 2.0
+        totals = {}
+        while totals.get('feed_errors', 0) < 3 and time.monotonic() < deadline:
+            try:
+                totals = stats_queue.get(timeout=0.2)['totals']
+            except queue.Empty:
+                pass
+    finally:
+        stop_event.set()
+        worker.join(2.0)
+        ring.close()
+
+    assert totals['feed_errors'] == 3
+    assert totals['datagrams'] == 3
@@ -0,0 +1,64 @@
+"""入口限流暂存的最新值按持有者（分片接收线程）分开补发"""
+
+import time
+
+from protocol.ingress_limit import IngressLimiter
+from protocol.nclink_protocol import NCLINK_RECEIVE_EXTY_FCS_STATES
+
+PORT = 18507
+
+
+def _datagram(tag: int) -> bytes:
+    return bytes((0xFF, 0xFC, NCLINK_RECEIVE_EXTY_FCS_STATES, 0x00, 0x01, tag))
+
+
+def _limiter():
+    """桶容量 1、每秒 1 个令牌：第一个放行，之后的同键 datagram 被暂存；返回 (限流器, 起始时刻)"""
+    limiter = IngressLimiter(enabled=True, port_limits={PORT: {'rate': 1.0, 'burst': 1.0}})
+    return limiter, time.monotonic() + 1.0
+
+
+def test_shards_only_release_their_own_held_items():
+    limiter, start = _limiter()
+    assert limiter.admit(PORT, _datagram(0), now=start, owner='shard-0')
+    assert not limiter.admit(PORT, _datagram(1), 'a', now=start + 0.1, owner='shard-0')
+    assert not limiter.admit(PORT, _datagram(2), 'b', now=start + 0.2, owner='shard-1')
+    assert limiter.holds('shard-0') and limiter.holds('shard-1')
+
+    # 令牌恢复后 shard-1 只取回自己的暂存，shard-0 的仍在
+    assert limiter.release_held([PORT], now=start + 1.5, owner='shard-1') == [(PORT, 'b')]
+    assert limiter.holds('shard-0')
+    assert not limiter.holds('shard-1')
+    assert limiter.release_held([PORT], now=start + 3.0, owner='shard-0') == [(PORT, 'a')]
+    assert not limiter.has_held
+
+
+def test_admit_supersedes_only_same_owner():
+    limiter, start = _limiter()
+    assert limiter.admit(PORT, _datagram(0), now=start, owner='shard-0')
+    assert not limiter.admit(PORT, _datagram(1), 'a', now=start + 0.1, owner='shard-0')
+    assert not limiter.admit(PORT, _datagram(2), 'b', now=start + 0.2, owner='shard-1')
+
+    # shard-1 新的 datagram 放行，只作废 shard-1 的暂存
+    assert limiter.admit(PORT, _datagram(3), now=start + 1.5, owner='shard-1')
+    assert limiter.holds('shard-0')
+    assert not limiter.holds('shard-1')
+    assert limiter.held_superseded == 1
+
+
+def test_discard_held_on_receiver_stop():
+    limiter, start = _limiter()
+    assert limiter.admit(PORT, _datagram(0), now=start, owner='shard-0')
+    assert not limiter.admit(PORT, _datagram(1), now=start + 0.1, owner='shard-0')
+    assert limiter.snapshot()['held_latest'] == 1
+    assert limiter.discard_held('shard-0') == 1
+    assert not limiter.has_held
+    assert limiter.release_held(now=start + 5.0, owner='shard-0') == []
+
+
+def test_default_owner_keeps_single_receiver_behavior():
+    limiter, start = _limiter()
+    assert limiter.admit(PORT, _datagram(0), now=start)
+    assert not limiter.admit(PORT, _datagram(1), now=start + 0.1)
+    assert limiter.holds()
+    assert limiter.release_held(now=start + 1.5) == [(PORT, _datagram(1))]
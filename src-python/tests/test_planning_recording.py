@@ -0,0 +1,54 @@
+"""0x71 实时解码只输出展平坐标时，录制结果仍应包含路径与障碍物"""
+
+import csv
+import json
+import os
+
+from recorder.data_recorder import RawDataRecorder, unflatten_path_points
+from recorder.unified_recorder import UnifiedRecorder
+
+
+OBSTACLES_FLAT = [float(value) for value in range(18)]
+PLANNING_DATA = {
+    'frame_id': 7,
+    'timestamp_sec': 1.5,
+    'global_path_flat': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+    'local_path_flat': [7.0, 8.0, 9.0],
+    'obstacles_flat': OBSTACLES_FLAT,
+    'obstacle_count': 2,
+}
+
+
+def _read_rows(path):
+    with open(path, newline='', encoding='utf-8') as handle:
+        return list(csv.reader(handle))
+
+
+def test_raw_recorder_writes_radar_rows_from_flat_obstacles(tmp_path):
+    recorder = RawDataRecorder('session', base_directory=str(tmp_path), case_id_override='case')
+    recorder.start_recording()
+    try:
+        recorder.record_planning_telemetry(dict(PLANNING_DATA))
+    finally:
+        recorder.stop_recording()
+
+    rows = _read_rows(os.path.join(recorder.lidar_directory, 'radar_data.csv'))
+    assert len(rows) == 1 + 2
+
+
+def test_unified_recorder_unflattens_planning_lists(tmp_path):
+    recorder = UnifiedRecorder(str(tmp_path))
+    recorder.init_files()
+    recorder.record_planning(dict(PLANNING_DATA))
+    recorder.close()
+
+    header, row = _read_rows(tmp_path / 'planning_telemetry.csv')
+    assert json.loads(row[header.index('global_path_json')]) == unflatten_path_points(PLANNING_DATA['global_path_flat'])
+    # obstacles_json 保持旧版 Object3d_T.to_json 的嵌套结构
+    obstacles = json.loads(row[header.index('obstacles_json')])
+    assert len(obstacles) == 2
+    assert obstacles[1] == {
+        'center': {'x': 9.0, 'y': 10.0, 'z': 11.0},
+        'size': {'x': 12.0, 'y': 13.0, 'z': 14.0},
+        'velocity': {'x': 15.0, 'y': 16.0, 'z': 17.0},
+    }
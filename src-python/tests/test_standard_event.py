@@ -0,0 +1,58 @@
+"""LazyStandardEvent 延迟构造：并发读取时不会看到缺失的字段"""
+
+import threading
+import time
+
+from events import LazyStandardEvent, build_standard_event
+
+
+class _SlowMessage(dict):
+    """读取 data 前等待，放大两个线程同时展开同一个事件的窗口"""
+
+    def __init__(self, *args, delay: float = 0.05, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delay = delay
+        self.started = threading.Event()
+
+    def get(self, key, default=None):
+        if key == 'data':
+            self.started.set()
+            time.sleep(self.delay)
+        return super().get(key, default)
+
+
+def _message(delay: float = 0.05):
+    return _SlowMessage(
+        {'type': 'fcs_states', 'func_code': 0x42, 'timestamp': 1000, 'data': {'value': 7}},
+        delay=delay,
+    )
+
+
+def test_concurrent_get_during_materialize():
+    message = _message()
+    event = LazyStandardEvent(message)
+    worker = threading.Thread(target=event.materialize)
+    worker.start()
+    assert message.started.wait(1.0)
+
+    # 另一线程正在展开时读取：必须拿到 payload，而不是 None / KeyError
+    assert 'payload' in event
+    assert event.get('payload') == {'value': 7}
+    assert event['event_type'] == build_standard_event(message)['event_type']
+    worker.join()
+    assert event.is_materialized
+
+
+def test_routing_key_does_not_materialize():
+    event = LazyStandardEvent(_message(delay=0))
+    assert event['routing_key'] == 'fcs_states'
+    assert event.get('schema_version')
+    assert not event.is_materialized
+
+
+def test_materialized_event_matches_eager_build():
+    message = _message(delay=0)
+    lazy = dict(LazyStandardEvent(message))
+    eager = build_standard_event(message)
+    assert lazy.pop('event_id') != eager.pop('event_id')
+    assert lazy == eager
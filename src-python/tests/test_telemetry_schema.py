@@ -0,0 +1,73 @@
+"""定长遥测 dataclass 的 from_bytes / to_bytes / to_json 由 telemetry_schema 字段表生成"""
+
+import dataclasses
+import random
+
+import pytest
+
+from protocol.nclink_protocol import (
+    NCLINK_RECEIVE_EXTY_FCS_STATES,
+    TELEMETRY_CODECS,
+    ExtY_FCS_DATAFUTABA_T,
+    ExtY_FCS_PWMS_T,
+    ExtY_FCS_STATES_T,
+    _schema_codec,
+    _SchemaStruct,
+)
+from protocol.telemetry_schema import STATES_SCHEMA
+
+
+def _random_values(schema, rng):
+    ranges = {'b': (-128, 127), 'B': (0, 255), 'H': (0, 65535), 'i': (-2 ** 31, 2 ** 31 - 1), 'I': (0, 2 ** 32 - 1)}
+    return tuple(
+        rng.uniform(-1e3, 1e3) if item.code in 'df' else rng.randint(*ranges[item.code])
+        for item in schema.fields
+    )
+
+
+def _schema_structs():
+    codecs = {codec.struct_name: codec for codec in TELEMETRY_CODECS.values()}
+    return [
+        (cls, codecs.get(cls.__name__))
+        for cls in _SchemaStruct.__subclasses__() if cls.__module__ == _SchemaStruct.__module__
+    ]
+
+
+def test_dataclasses_match_schema_and_registry():
+    rng = random.Random(20260330)
+    structs = _schema_structs()
+    assert ExtY_FCS_DATAFUTABA_T in [cls for cls, _ in structs]
+    for cls, codec in structs:
+        schema = cls.schema
+        if cls is not ExtY_FCS_PWMS_T:
+            assert tuple(item.name for item in dataclasses.fields(cls)) == schema.field_names
+        payload = schema.layout.pack(*_random_values(schema, rng))
+        decoded = cls.from_bytes(payload)
+        assert decoded.to_bytes() == payload
+        if codec is not None:
+            assert decoded.to_json() == codec.decode(payload)
+
+
+def test_short_payload_keeps_whole_field_prefix():
+    values = (30.5, 120.25, 88.5) + (1.5,) * 9
+    # 截在 states_Vx_GS 中间：lat / lon / height 完整，其余取 0
+    payload = STATES_SCHEMA.layout.pack(*values)[:22]
+    states = ExtY_FCS_STATES_T.from_bytes(payload)
+    assert (states.states_lat, states.states_lon, states.states_height) == (30.5, 120.25, 88.5)
+    assert states.states_Vx_GS == 0.0 and states.states_psi == 0.0
+    assert TELEMETRY_CODECS[NCLINK_RECEIVE_EXTY_FCS_STATES].decode(payload) == states.to_json()
+
+
+def test_pwms_pads_missing_channels():
+    pwms = ExtY_FCS_PWMS_T(pwms=[1.0, 2.0])
+    assert ExtY_FCS_PWMS_T.from_bytes(pwms.to_bytes()).pwms == [1.0, 2.0] + [0.0] * 6
+
+
+def test_dataclass_field_drift_is_rejected():
+    @dataclasses.dataclass
+    class Drifted(_SchemaStruct, schema=STATES_SCHEMA):
+        states_lon: float = 0.0
+        states_lat: float = 0.0
+
+    with pytest.raises(ValueError, match='dataclass'):
+        _schema_codec(NCLINK_RECEIVE_EXTY_FCS_STATES, Drifted)
@@ -0,0 +1,75 @@
+"""原始 UDP 抓包文件（.gcscap）查看、导出 pcap 与重放
+
+用法（在 src-python 目录下）：
+    python -m tools.raw_capture_tool info <capture.gcscap>
+    python -m tools.raw_capture_tool export-pcap <capture.gcscap> <out.pcap>
+    python -m tools.raw_capture_tool replay <capture.gcscap> [--host 127.0.0.1] [--speed 1.0]
+                                            [--ports 30509,18511] [--port-map 30509:40509]
+
+replay 把接收方向的 datagram 按原始时间间隔重新发往 host 上的原端口：
+--speed 1 为原速，N 为 N 倍速，0 为不限速。后端以本机地址监听时即可逐字节重演一次飞行。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from recorder.raw_capture import export_pcap, replay_capture, summarize_capture
+
+
+def _parse_ports(value: str) -> list[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _parse_port_map(value: str) -> dict[int, int]:
+    mapping = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        source, target = item.split(":", 1)
+        mapping[int(source)] = int(target)
+    return mapping
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m tools.raw_capture_tool")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    info = commands.add_parser("info", help="统计抓包文件内容")
+    info.add_argument("capture")
+
+    export = commands.add_parser("export-pcap", help="导出为 pcap（LINKTYPE_RAW）")
+    export.add_argument("capture")
+    export.add_argument("pcap")
+    export.add_argument("--local-host", default=None, help="覆盖抓包文件中记录的本机地址")
+
+    replay = commands.add_parser("replay", help="把接收方向的 datagram 重新发往本机端口")
+    replay.add_argument("capture")
+    replay.add_argument("--host", default="127.0.0.1")
+    replay.add_argument("--speed", type=float, default=1.0)
+    replay.add_argument("--ports", type=_parse_ports, default=None)
+    replay.add_argument("--port-map", type=_parse_port_map, default=None)
+
+    args = parser.parse_args(argv[1:])
+
+    if args.command == "info":
+        result = summarize_capture(args.capture)
+    elif args.command == "export-pcap":
+        result = {"pcap": args.pcap, "packets": export_pcap(args.capture, args.pcap, args.local_host)}
+    else:
+        result = replay_capture(
+            args.capture,
+            host=args.host,
+            speed=args.speed,
+            ports=args.ports,
+            port_map=args.port_map,
+        )
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
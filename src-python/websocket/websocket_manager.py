@@ -6,7 +6,7 @@ WebSocket 连接管理器
 import asyncio
 import json
 import logging
-from typing import Dict, Optional, Set
+from typing import Callable, Dict, List, Optional, Set
 from fastapi import WebSocket
 from fastapi.websockets import WebSocketState
 
@@ -29,6 +29,8 @@ class WebSocketManager:
         self._snapshot_messages: Dict[str, dict] = {}
         self._pending_latest_messages: Dict[str, dict] = {}
         self._latest_broadcast_task: Optional[asyncio.Task] = None
+        # 最新值广播写出完成后的回调（参数为本轮写出的消息列表），用于统计数据到达前端时的时延
+        self.on_latest_broadcast: Optional[Callable[[List[dict]], None]] = None
         self._broadcast_error_count = 0  # 连续广播错误计数
         self._max_consecutive_errors = 50  # 超过此阈值打印告警
         self._send_timeout_seconds = 1.0
@@ -170,7 +172,13 @@ class WebSocketManager:
         while self._pending_latest_messages:
             pending_messages = list(self._pending_latest_messages.values())
             self._pending_latest_messages.clear()
+            had_connections = bool(self.active_connections)
             await asyncio.gather(*(self.broadcast(message) for message in pending_messages))
+            if had_connections and self.on_latest_broadcast is not None:
+                try:
+                    self.on_latest_broadcast(pending_messages)
+                except Exception as e:
+                    logger.debug(f"广播完成回调执行失败: {e}")
 
         self._latest_broadcast_task = None
     